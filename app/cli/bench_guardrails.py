@@ -0,0 +1,75 @@
+"""Check the guardrail rule sets against their corpus and time them.
+
+Every case in data/guardrail_corpus.json must fire exactly its expected rules.
+The benchmark then compares `RuleSet.scan` (precompiled, prefiltered) with
+calling `re.search` per pattern, as the inline checks used to, on the corpus
+and on the clean cases repeated into answer-length text (the common case).
+
+Usage:
+    python -m app.cli.bench_guardrails
+    python -m app.cli.bench_guardrails --rounds 5000
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from typing import Optional
+
+from app.services.guardrails import RULE_SETS
+
+CORPUS_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data", "guardrail_corpus.json"
+)
+
+
+def _per_pattern(rule_set, text: str) -> list[str]:
+    return [
+        rule.id
+        for rule in rule_set.rules
+        if all(re.search(pattern, text, rule_set.flags) for pattern in rule.patterns)
+    ]
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", default=CORPUS_PATH, help="Corpus JSON file")
+    parser.add_argument("--rounds", type=int, default=500, help="Passes over the corpus per strategy")
+    parser.add_argument("--repeat", type=int, default=12, help="Copies of each clean case in an answer-length text")
+    args = parser.parse_args(argv)
+
+    with open(args.corpus, encoding="utf-8") as f:
+        cases = json.load(f)["cases"]
+
+    failures = 0
+    for case in cases:
+        rule_set = RULE_SETS[case["rule_set"]]
+        fired = [hit.id for hit in rule_set.scan(case["text"])]
+        if sorted(fired) != sorted(case["expect"]) or sorted(_per_pattern(rule_set, case["text"])) != sorted(fired):
+            failures += 1
+            print(f"MISMATCH {case['rule_set']}: {case['text']!r} fired {fired}, expected {case['expect']}", file=sys.stderr)
+    print(f"corpus: {len(cases) - failures}/{len(cases)} cases as expected")
+    if failures:
+        return 1
+
+    corpus = [(RULE_SETS[case["rule_set"]], case["text"]) for case in cases]
+    clean = [(RULE_SETS[case["rule_set"]], " ".join([case["text"]] * args.repeat)) for case in cases if not case["expect"]]
+    for name, work in (("corpus", corpus), (f"clean x{args.repeat}", clean)):
+        timings = {}
+        for label, check in (("re.search", _per_pattern), ("RuleSet.scan", lambda rs, text: rs.scan(text))):
+            started = time.perf_counter()
+            for _ in range(args.rounds):
+                for rule_set, text in work:
+                    check(rule_set, text)
+            timings[label] = (time.perf_counter() - started) * 1e6 / (args.rounds * len(work))
+        print(
+            f"{name:<10} re.search {timings['re.search']:8.2f} us   RuleSet.scan {timings['RuleSet.scan']:8.2f} us"
+            f"   speedup {timings['re.search'] / timings['RuleSet.scan']:5.2f}x   (per text, n={len(work)})"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""Compare JavaScript grading on the Node worker pool vs spawning node per test.
+
+Usage:
+    python -m app.cli.bench_node_pool
+    python -m app.cli.bench_node_pool --tests 13 --rounds 20 --workers 2
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from typing import Optional
+
+from app.services.code_execution import execute_javascript_code
+from app.services.node_pool import NodePool
+
+SUBMISSION = """
+function twoSum(nums, target) {
+  const seen = new Map();
+  for (let i = 0; i < nums.length; i++) {
+    if (seen.has(target - nums[i])) return [seen.get(target - nums[i]), i];
+    seen.set(nums[i], i);
+  }
+  return [];
+}
+"""
+
+
+def _test_inputs(count: int) -> list[dict]:
+    return [{"nums": list(range(i, i + 50)), "target": 2 * i + 97} for i in range(count)]
+
+
+def _summary(label: str, samples: list[float]) -> str:
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return f"{label:<16} median {statistics.median(samples):8.1f} ms   p95 {p95:8.1f} ms   (n={len(samples)})"
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tests", type=int, default=13, help="Test cases per submission")
+    parser.add_argument("--rounds", type=int, default=10, help="Submissions to grade per strategy")
+    parser.add_argument("--workers", type=int, default=2, help="Node pool size")
+    args = parser.parse_args(argv)
+
+    inputs = _test_inputs(args.tests)
+    expected = [[48, 49]] * args.tests
+
+    spawn_ms = []
+    for _ in range(args.rounds):
+        started = time.perf_counter()
+        results = [execute_javascript_code(SUBMISSION, test_input, "twoSum") for test_input in inputs]
+        spawn_ms.append((time.perf_counter() - started) * 1000)
+        if [r for r, _ in results] != expected:
+            print(f"spawn-per-test returned unexpected results: {results[:2]}", file=sys.stderr)
+            return 1
+
+    pool = NodePool(size=args.workers).start()
+    try:
+        pool.submit_batch("leetcode", SUBMISSION, inputs, "twoSum")  # wait for workers to boot
+        pool_ms = []
+        for _ in range(args.rounds):
+            started = time.perf_counter()
+            outcomes = pool.submit_batch("leetcode", SUBMISSION, inputs, "twoSum")
+            pool_ms.append((time.perf_counter() - started) * 1000)
+            if [o["result"] for o in outcomes] != expected:
+                print(f"node pool returned unexpected results: {outcomes[:2]}", file=sys.stderr)
+                return 1
+    finally:
+        pool.close()
+
+    print(f"{args.tests} tests per submission, {args.rounds} submissions")
+    print(_summary("spawn-per-test", spawn_ms))
+    print(_summary("node pool", pool_ms))
+    print(f"speedup (median): {statistics.median(spawn_ms) / statistics.median(pool_ms):.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+"""Bulk resume critique for folders of resumes (offline counterpart of /api/analyze).
+
+Usage:
+    python -m app.cli.bulk_critique ./resumes --output scores.jsonl
+    python -m app.cli.bulk_critique ./resumes --output scores.csv --job-role "Software Engineer" --rpm 20
+
+Results are appended one record per resume as soon as each finishes, so the output
+file doubles as the checkpoint: re-running the same command skips resumes that were
+already scored successfully (matched by relative path + content hash) and retries
+the ones that failed.
+"""
+
+import argparse
+import asyncio
+import csv
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from dotenv import load_dotenv
+from google import genai
+
+from app.services.gemini import call_gemini_with_retry_async
+from app.services.resume_analysis import (
+    build_resume_analysis_prompt,
+    calibrate_resume_score,
+    extract_text,
+    sanitize_job_role,
+)
+
+SUPPORTED_SUFFIXES = {".pdf": "application/pdf", ".txt": "text/plain"}
+CSV_FIELDS = ["path", "sha256", "status", "score", "feedback", "error", "scored_at"]
+
+
+class RateLimiter:
+    """Spaces out calls so no more than `per_minute` start in any rolling minute."""
+
+    def __init__(self, per_minute: float):
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._next_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_at - now
+            self._next_at = max(now, self._next_at) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+def _find_resumes(root: Path) -> list[Path]:
+    return sorted(
+        p for p in root.rglob("*")
+        if p.is_file() and p.suffix.lower() in SUPPORTED_SUFFIXES
+    )
+
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _extract_file(path: str) -> str:
+    """Runs in a worker process (must stay a top-level function so it pickles)."""
+    content_type = SUPPORTED_SUFFIXES[Path(path).suffix.lower()]
+    with open(path, "rb") as f:
+        return extract_text(f.read(), content_type)
+
+
+def _load_finished(output: Path, fmt: str) -> set[tuple[str, str]]:
+    """(path, sha256) pairs already scored successfully in a previous run."""
+    if not output.exists():
+        return set()
+    finished: set[tuple[str, str]] = set()
+    with open(output, newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            rows = csv.DictReader(f)
+        else:
+            rows = []
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    rows.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # A run killed mid-write can leave a truncated last line.
+                    continue
+        for row in rows:
+            if row.get("status") == "ok":
+                finished.add((row.get("path"), row.get("sha256")))
+    return finished
+
+
+class ResultWriter:
+    def __init__(self, output: Path, fmt: str):
+        self.fmt = fmt
+        new_file = not output.exists() or output.stat().st_size == 0
+        output.parent.mkdir(parents=True, exist_ok=True)
+        self._f = open(output, "a", newline="", encoding="utf-8")
+        self._csv = None
+        if fmt == "csv":
+            self._csv = csv.DictWriter(self._f, fieldnames=CSV_FIELDS)
+            if new_file:
+                self._csv.writeheader()
+
+    def write(self, record: dict) -> None:
+        if self._csv is not None:
+            self._csv.writerow({k: record.get(k) for k in CSV_FIELDS})
+        else:
+            self._f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        # Flush per record: the output file is the checkpoint.
+        self._f.flush()
+        os.fsync(self._f.fileno())
+
+    def close(self) -> None:
+        self._f.close()
+
+
+async def run(args: argparse.Namespace) -> int:
+    root = Path(args.input_dir)
+    if not root.is_dir():
+        print(f"Not a directory: {root}", file=sys.stderr)
+        return 2
+
+    output = Path(args.output)
+    fmt = args.format or ("csv" if output.suffix.lower() == ".csv" else "jsonl")
+    job_role = sanitize_job_role(args.job_role)
+
+    files = _find_resumes(root)
+    finished = _load_finished(output, fmt)
+    pending: list[tuple[Path, str, str]] = []
+    for path in files:
+        rel = path.relative_to(root).as_posix()
+        sha = _sha256(path)
+        if (rel, sha) not in finished:
+            pending.append((path, rel, sha))
+
+    print(f"Found {len(files)} resumes, {len(files) - len(pending)} already scored, {len(pending)} to go")
+    if not pending:
+        return 0
+
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        print("GEMINI_API_KEY not found in environment variables", file=sys.stderr)
+        return 2
+
+    client = genai.Client(api_key=api_key)
+    limiter = RateLimiter(args.rpm)
+    in_flight = asyncio.Semaphore(max(1, args.concurrency))
+    writer = ResultWriter(output, fmt)
+    loop = asyncio.get_running_loop()
+    counts = {"ok": 0, "error": 0}
+
+    async def _score(pool: ProcessPoolExecutor, path: Path, rel: str, sha: str) -> None:
+        record = {"path": rel, "sha256": sha, "status": "error", "score": None, "feedback": None, "error": None}
+        try:
+            text_content = await loop.run_in_executor(pool, _extract_file, str(path))
+            if not text_content.strip():
+                raise ValueError("File does not have any content")
+            prompt = build_resume_analysis_prompt(text_content, job_role=job_role, notes=args.notes)
+            async with in_flight:
+                await limiter.acquire()
+                response = await call_gemini_with_retry_async(
+                    client=client,
+                    model="gemini-2.5-flash",
+                    contents=prompt,
+                    max_retries=3,
+                    initial_delay=2
+                )
+            record.update(status="ok", feedback=response.text, score=calibrate_resume_score(response.text))
+        except Exception as e:
+            record["error"] = str(e)
+        record["scored_at"] = datetime.now(timezone.utc).isoformat()
+        writer.write(record)
+        counts[record["status"]] += 1
+        done = counts["ok"] + counts["error"]
+        print(f"[{done}/{len(pending)}] {rel}: {record['status']}" + (f" score={record['score']}" if record["status"] == "ok" else f" ({record['error']})"))
+
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            await asyncio.gather(*(_score(pool, path, rel, sha) for path, rel, sha in pending))
+    finally:
+        writer.close()
+
+    print(f"Done: {counts['ok']} scored, {counts['error']} failed (re-run to retry failures)")
+    return 0 if counts["error"] == 0 else 1
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Score a folder of resumes with the /api/analyze prompt.")
+    parser.add_argument("input_dir", help="Directory to scan (recursively) for .pdf/.txt resumes")
+    parser.add_argument("--output", "-o", required=True, help="Results file (.jsonl or .csv); also the resume checkpoint")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="Override the format inferred from --output")
+    parser.add_argument("--job-role", help="Target job role (same as the web form)")
+    parser.add_argument("--notes", help="Additional notes (same as the web form)")
+    parser.add_argument("--rpm", type=float, default=30.0, help="Max model requests per minute (0 = unlimited)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Max model requests in flight")
+    parser.add_argument("--workers", type=int, default=None, help="PDF extraction processes (default: CPU count)")
+    args = parser.parse_args(argv)
+    try:
+        return asyncio.run(run(args))
+    except KeyboardInterrupt:
+        print("Interrupted; re-run the same command to resume.", file=sys.stderr)
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
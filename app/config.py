@@ -20,3 +20,96 @@ if not all([SUPABASE_URL, SUPABASE_ANON_KEY, SUPABASE_SERVICE_ROLE_KEY, SUPABASE
         "Missing Supabase environment variables. "
         "Set SUPABASE_URL, SUPABASE_ANON_KEY, SUPABASE_SERVICE_ROLE_KEY, and SUPABASE_JWT_SECRET."
     )
+
+# Sandboxed code execution (technical interview grading)
+SANDBOX_WORKERS = int(os.getenv("SANDBOX_WORKERS", "0")) or (os.cpu_count() or 2)
+SANDBOX_CPU_SECONDS = float(os.getenv("SANDBOX_CPU_SECONDS", "2"))
+SANDBOX_WALL_SECONDS = float(os.getenv("SANDBOX_WALL_SECONDS", "5"))
+SANDBOX_MEMORY_MB = int(os.getenv("SANDBOX_MEMORY_MB", "256"))
+SANDBOX_MAX_JOBS_PER_WORKER = int(os.getenv("SANDBOX_MAX_JOBS_PER_WORKER", "100"))
+
+# Long-lived Node.js workers for JavaScript grading (0 = spawn node per test)
+NODE_WORKERS = int(os.getenv("NODE_WORKERS", str(os.cpu_count() or 2)))
+NODE_MEMORY_MB = int(os.getenv("NODE_MEMORY_MB", "256"))
+NODE_MAX_JOBS_PER_WORKER = int(os.getenv("NODE_MAX_JOBS_PER_WORKER", "200"))
+
+# Memoized efficiency verdicts (in-memory LRU + SQLite file; empty path = memory only)
+EFFICIENCY_CACHE_MAX_ENTRIES = int(os.getenv("EFFICIENCY_CACHE_MAX_ENTRIES", "2048"))
+EFFICIENCY_CACHE_PATH = os.getenv(
+    "EFFICIENCY_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "efficiency_cache.sqlite3"),
+)
+EFFICIENCY_CACHE_TTL_SECONDS = float(os.getenv("EFFICIENCY_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+EFFICIENCY_CACHE_MAX_ROWS = int(os.getenv("EFFICIENCY_CACHE_MAX_ROWS", "50000"))
+
+# Per-test grading outcomes reused between "Run" and "Submit" of unchanged code (0 = off)
+GRADING_CACHE_TTL_SECONDS = float(os.getenv("GRADING_CACHE_TTL_SECONDS", "300"))
+GRADING_CACHE_MAX_ENTRIES = int(os.getenv("GRADING_CACHE_MAX_ENTRIES", "4096"))
+
+# Technical-interview question bank (versioned JSON, loaded on first use)
+QUESTION_BANK_PATH = os.getenv(
+    "QUESTION_BANK_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "technical_questions.json"),
+)
+
+# Background pre-generation of AI technical problems (0 = off)
+PROBLEM_POOL_SIZE = int(os.getenv("PROBLEM_POOL_SIZE", "3"))
+PROBLEM_POOL_LOW_WATERMARK = int(os.getenv("PROBLEM_POOL_LOW_WATERMARK", "1"))
+PROBLEM_POOL_HOURLY_BUDGET = int(os.getenv("PROBLEM_POOL_HOURLY_BUDGET", "60"))
+PROBLEM_POOL_CONCURRENCY = int(os.getenv("PROBLEM_POOL_CONCURRENCY", "2"))
+PROBLEM_POOL_MAX_KEYS = int(os.getenv("PROBLEM_POOL_MAX_KEYS", "200"))
+PROBLEM_POOL_WARM_ON_STARTUP = os.getenv("PROBLEM_POOL_WARM_ON_STARTUP", "").lower() in {"1", "true", "yes"}
+
+# Generated problems shared across clients: variants per question, total kept
+PROBLEM_CACHE_VARIANTS = int(os.getenv("PROBLEM_CACHE_VARIANTS", "3"))
+PROBLEM_CACHE_MAX_PROBLEMS = int(os.getenv("PROBLEM_CACHE_MAX_PROBLEMS", "2000"))
+PROBLEM_CACHE_TTL_SECONDS = float(os.getenv("PROBLEM_CACHE_TTL_SECONDS", str(24 * 60 * 60)))
+
+# In-memory session stores (sliding TTL + size bound)
+INTERVIEW_SESSION_TTL_SECONDS = float(os.getenv("INTERVIEW_SESSION_TTL_SECONDS", str(2 * 60 * 60)))
+INTERVIEW_SESSION_MAX = int(os.getenv("INTERVIEW_SESSION_MAX", "1000"))
+GENERATED_SESSION_TTL_SECONDS = float(os.getenv("GENERATED_SESSION_TTL_SECONDS", str(6 * 60 * 60)))
+GENERATED_SESSION_MAX = int(os.getenv("GENERATED_SESSION_MAX", "250"))
+QUESTION_POOL_TTL_SECONDS = float(os.getenv("QUESTION_POOL_TTL_SECONDS", str(24 * 60 * 60)))
+QUESTION_POOL_MAX_CLIENTS = int(os.getenv("QUESTION_POOL_MAX_CLIENTS", "5000"))
+BEHAVIORAL_QUESTION_CACHE_TTL_SECONDS = float(os.getenv("BEHAVIORAL_QUESTION_CACHE_TTL_SECONDS", str(24 * 60 * 60)))
+BEHAVIORAL_QUESTION_CACHE_MAX = int(os.getenv("BEHAVIORAL_QUESTION_CACHE_MAX", "2000"))
+EVALUATION_JOB_TTL_SECONDS = float(os.getenv("EVALUATION_JOB_TTL_SECONDS", str(24 * 60 * 60)))
+EVALUATION_JOB_MAX = int(os.getenv("EVALUATION_JOB_MAX", "5000"))
+EVALUATION_JOB_TIMEOUT_SECONDS = float(os.getenv("EVALUATION_JOB_TIMEOUT_SECONDS", "600"))
+# Behavioral interviews a dropped client can resume with "resume_session_id"
+BEHAVIORAL_SESSION_TTL_SECONDS = float(os.getenv("BEHAVIORAL_SESSION_TTL_SECONDS", str(15 * 60)))
+BEHAVIORAL_SESSION_MAX = int(os.getenv("BEHAVIORAL_SESSION_MAX", "2000"))
+
+# Where sessions live: memory (one process), sqlite (one box, many workers) or redis
+STATE_BACKEND = os.getenv("STATE_BACKEND", "memory")
+STATE_SQLITE_PATH = os.getenv(
+    "STATE_SQLITE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "state.sqlite3"),
+)
+STATE_REDIS_URL = os.getenv("STATE_REDIS_URL", "redis://localhost:6379/0")
+STATE_REDIS_PREFIX = os.getenv("STATE_REDIS_PREFIX", "frymyresume:")
+
+# Behavioral interview turn-taking: server-side VAD (clients can also opt in with
+# "server_vad": true) and the silence kept before the next question is asked
+SERVER_VAD = os.getenv("SERVER_VAD", "").lower() in {"1", "true", "yes"}
+VAD_SILENCE_MS = int(os.getenv("VAD_SILENCE_MS", "900"))
+VAD_MIN_SPEECH_MS = int(os.getenv("VAD_MIN_SPEECH_MS", "450"))
+TURN_GRACE_SECONDS = float(os.getenv("TURN_GRACE_SECONDS", "2.2"))
+# Interviewer audio allowed to queue for a slow client before the oldest is dropped
+WS_OUTBOX_MAX_AUDIO_BYTES = int(os.getenv("WS_OUTBOX_MAX_AUDIO_BYTES", str(2 * 1024 * 1024)))
+# Ask Gemini Live for session-resumption handles so a resumed interview reattaches to
+# the same Live context (needs a Live model that supports session resumption)
+LIVE_SESSION_RESUMPTION = os.getenv("LIVE_SESSION_RESUMPTION", "").lower() in {"1", "true", "yes"}
+# Gemini Live sessions kept connected ahead of interviews (0 = off); each is replaced
+# after LIVE_POOL_MAX_AGE_SECONDS, and the pool closes after LIVE_POOL_IDLE_SECONDS unused
+LIVE_POOL_SIZE = int(os.getenv("LIVE_POOL_SIZE", "0"))
+LIVE_POOL_MAX_AGE_SECONDS = float(os.getenv("LIVE_POOL_MAX_AGE_SECONDS", "120"))
+LIVE_POOL_IDLE_SECONDS = float(os.getenv("LIVE_POOL_IDLE_SECONDS", str(15 * 60)))
+
+# Legacy /api/voice-response: transcribe, score and ask the next question in one model call
+VOICE_FUSED_TURN = os.getenv("VOICE_FUSED_TURN", "").lower() in {"1", "true", "yes"}
+# Answer uploads: size/duration limits, and clips above VOICE_INLINE_MAX_BYTES go via the Files API
+VOICE_MAX_UPLOAD_BYTES = int(os.getenv("VOICE_MAX_UPLOAD_BYTES", str(25 * 1024 * 1024)))
+VOICE_MAX_ANSWER_SECONDS = float(os.getenv("VOICE_MAX_ANSWER_SECONDS", "300"))
+VOICE_INLINE_MAX_BYTES = int(os.getenv("VOICE_INLINE_MAX_BYTES", str(8 * 1024 * 1024)))
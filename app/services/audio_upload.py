@@ -0,0 +1,303 @@
+"""Preparing uploaded answer audio for Gemini transcription.
+
+`/api/voice-response` used to send the raw upload as an `inline_data` part, so a
+60 s 44.1 kHz stereo WAV (~10 MB) became a ~14 MB base64 string per request. Now:
+
+- uploads are read in chunks up to VOICE_MAX_UPLOAD_BYTES (413 past that);
+- WAV is decoded with the stdlib `wave` module, checked against
+  VOICE_MAX_ANSWER_SECONDS, downmixed to mono and resampled to 16 kHz s16
+  (~1.9 MB for that minute), which is all speech transcription needs;
+- compressed uploads (WebM/Ogg/MP4/MP3, e.g. from MediaRecorder) are passed
+  through with the MIME type their magic bytes say, whatever the filename claims.
+  They are already small (Opus is ~1-4 KB/s), but their duration is read from the
+  container (WebM block timecodes, the last Ogg granule, MP4 `mvhd`/fragments)
+  and checked against VOICE_MAX_ANSWER_SECONDS too; MP3 and unreadable
+  containers are only bounded by VOICE_MAX_UPLOAD_BYTES;
+- the result goes inline (`types.Part.from_bytes`, which the SDK still base64s on
+  the wire, so the saving there is the smaller payload), or through the Files API
+  when it's larger than VOICE_INLINE_MAX_BYTES, which uploads the bytes as-is.
+"""
+
+import io
+import struct
+import sys
+import wave
+from array import array
+from dataclasses import dataclass
+from typing import Optional
+
+try:
+    import numpy as np
+except ImportError:  # optional: pure-python fallback below
+    np = None
+
+TARGET_SAMPLE_RATE = 16000
+_READ_CHUNK = 256 * 1024
+
+
+class AudioTooLarge(ValueError):
+    pass
+
+
+@dataclass
+class PreparedAudio:
+    data: bytes
+    mime_type: str
+    duration_seconds: Optional[float] = None  # None when the container doesn't say
+    original_bytes: int = 0
+
+
+def sniff_mime_type(data: bytes, fallback: str = "audio/wav") -> str:
+    if data[:4] == b"RIFF" and data[8:12] == b"WAVE":
+        return "audio/wav"
+    if data[:4] == b"\x1aE\xdf\xa3":
+        return "audio/webm"
+    if data[:4] == b"OggS":
+        return "audio/ogg"
+    if data[:3] == b"ID3" or data[:2] in (b"\xff\xfb", b"\xff\xf3", b"\xff\xf2"):
+        return "audio/mpeg"
+    if data[4:8] == b"ftyp":
+        return "audio/mp4"
+    return fallback
+
+
+async def read_upload(upload, max_bytes: int) -> bytes:
+    """Read a FastAPI UploadFile in chunks, stopping as soon as it's over `max_bytes`."""
+    buffer = bytearray()
+    while True:
+        chunk = await upload.read(_READ_CHUNK)
+        if not chunk:
+            return bytes(buffer)
+        buffer += chunk
+        if len(buffer) > max_bytes:
+            raise AudioTooLarge(f"Audio upload is larger than {max_bytes // (1024 * 1024)} MB")
+
+
+def _to_mono_16k(samples: bytes, channels: int, rate: int) -> bytes:
+    """Little-endian s16 interleaved PCM -> 16 kHz mono s16 (linear interpolation)."""
+    if np is not None:
+        pcm = np.frombuffer(samples, dtype="<i2")
+        pcm = pcm[: len(pcm) - len(pcm) % channels].reshape(-1, channels).astype(np.float32).mean(axis=1)
+        if rate != TARGET_SAMPLE_RATE and len(pcm):
+            count = max(1, int(len(pcm) * TARGET_SAMPLE_RATE / rate))
+            pcm = np.interp(np.arange(count) * (rate / TARGET_SAMPLE_RATE), np.arange(len(pcm)), pcm)
+        return np.clip(np.rint(pcm), -32768, 32767).astype("<i2").tobytes()
+
+    pcm = array("h")
+    pcm.frombytes(samples[: len(samples) - len(samples) % (2 * channels)])
+    if sys.byteorder == "big":
+        pcm.byteswap()
+    if channels > 1:
+        pcm = array("h", (sum(pcm[i : i + channels]) // channels for i in range(0, len(pcm), channels)))
+    if rate != TARGET_SAMPLE_RATE and len(pcm):
+        step = rate / TARGET_SAMPLE_RATE
+        last = len(pcm) - 1
+        out = array("h")
+        for n in range(max(1, int(len(pcm) / step))):
+            pos = n * step
+            i = int(pos)
+            j = min(i + 1, last)
+            out.append(int(round(pcm[i] + (pcm[j] - pcm[i]) * (pos - i))))
+        pcm = out
+    if sys.byteorder == "big":
+        pcm.byteswap()
+    return pcm.tobytes()
+
+
+# --- Container durations (compressed uploads) ---------------------------------
+
+_EBML_SEGMENT = 0x18538067
+_EBML_INFO = 0x1549A966
+_EBML_CLUSTER = 0x1F43B675
+_EBML_BLOCK_GROUP = 0xA0
+# Master elements are walked into rather than skipped, which also copes with the
+# unknown-size Segment/Cluster that live MediaRecorder output uses.
+_EBML_MASTERS = {_EBML_SEGMENT, _EBML_INFO, _EBML_CLUSTER, _EBML_BLOCK_GROUP}
+
+
+def _ebml_vint(data: bytes, pos: int, keep_marker: bool) -> tuple[Optional[int], int]:
+    """(value, next position); value is None for an all-ones (unknown) size."""
+    first = data[pos]
+    length = 8 - first.bit_length() + 1
+    if length > 8 or pos + length > len(data):
+        raise ValueError("bad EBML varint")
+    value = first if keep_marker else first & (0xFF >> length)
+    for byte in data[pos + 1 : pos + length]:
+        value = (value << 8) | byte
+    if not keep_marker and value == (1 << (7 * length)) - 1:
+        return None, pos + length
+    return value, pos + length
+
+
+def _webm_duration(data: bytes) -> Optional[float]:
+    scale = 1_000_000  # TimecodeScale default: 1 ms in ns
+    cluster_time = 0
+    end = None
+    pos = 0
+    try:
+        while pos < len(data):
+            element, pos = _ebml_vint(data, pos, keep_marker=True)
+            size, pos = _ebml_vint(data, pos, keep_marker=False)
+            if element in _EBML_MASTERS:
+                continue
+            if size is None or pos + size > len(data):
+                break
+            body = data[pos : pos + size]
+            pos += size
+            if element == 0x2AD7B1:  # TimecodeScale
+                scale = int.from_bytes(body, "big")
+            elif element == 0x4489 and size in (4, 8):  # Duration (in TimecodeScale units)
+                duration = struct.unpack(">f" if size == 4 else ">d", body)[0]
+                if duration > 0:
+                    return duration * scale / 1e9
+            elif element == 0xE7:  # Cluster Timecode
+                cluster_time = int.from_bytes(body, "big")
+            elif element in (0xA3, 0xA1):  # SimpleBlock / Block: track vint, then int16 offset
+                _, offset = _ebml_vint(body, 0, keep_marker=False)
+                block_time = cluster_time + struct.unpack(">h", body[offset : offset + 2])[0]
+                end = block_time if end is None else max(end, block_time)
+    except (ValueError, IndexError, struct.error):
+        pass
+    return None if end is None else end * scale / 1e9
+
+
+def _ogg_duration(data: bytes) -> Optional[float]:
+    # First page's packet says the codec; Opus granules are always 48 kHz.
+    if data[28:36] == b"OpusHead":
+        rate = 48000
+    elif data[28:35] == b"\x01vorbis":
+        rate = int.from_bytes(data[40:44], "little")
+    else:
+        return None
+    if not rate:
+        return None
+    # The last page with a granule position marks the end of the stream.
+    pos = len(data)
+    while True:
+        pos = data.rfind(b"OggS", 0, pos)
+        if pos < 0:
+            return None
+        header = data[pos : pos + 14]
+        granule = int.from_bytes(header[6:14], "little", signed=True)
+        if len(header) == 14 and header[4] == 0 and granule >= 0:
+            return granule / rate
+
+
+_MP4_CONTAINERS = {b"moov", b"trak", b"mdia", b"mvex", b"moof", b"traf"}
+
+
+def _mp4_leaves(data: bytes, start: int, end: int):
+    """(type, body) of every non-container box, in file order."""
+    pos = start
+    while pos + 8 <= end:
+        size = int.from_bytes(data[pos : pos + 4], "big")
+        kind = data[pos + 4 : pos + 8]
+        header = 8
+        if size == 1:
+            size = int.from_bytes(data[pos + 8 : pos + 16], "big")
+            header = 16
+        elif size == 0:
+            size = end - pos
+        if size < header:
+            return
+        body_end = min(pos + size, end)
+        if kind in _MP4_CONTAINERS:
+            yield from _mp4_leaves(data, pos + header, body_end)
+        else:
+            yield kind, data[pos + header : body_end]
+        pos += size
+
+
+def _mp4_time(body: bytes) -> tuple[int, int]:
+    """(timescale, duration) from an `mvhd` or `mdhd` box body."""
+    if body[0] == 1:
+        return int.from_bytes(body[20:24], "big"), int.from_bytes(body[24:32], "big")
+    return int.from_bytes(body[12:16], "big"), int.from_bytes(body[16:20], "big")
+
+
+def _mp4_duration(data: bytes) -> Optional[float]:
+    movie_scale = track_scale = 0
+    trex_duration = fragment_duration = 0
+    ticks = 0
+    try:
+        for kind, body in _mp4_leaves(data, 0, len(data)):
+            if kind == b"mvhd":
+                movie_scale, total = _mp4_time(body)
+                if movie_scale and 0 < total < 0xFFFFFFFF:
+                    return total / movie_scale
+            elif kind == b"mdhd" and not track_scale:
+                track_scale, _ = _mp4_time(body)
+            elif kind == b"mehd" and movie_scale:
+                # Fragmented file that states its total duration (movie timescale).
+                total = int.from_bytes(body[4:12] if body[0] == 1 else body[4:8], "big")
+                if total:
+                    return total / movie_scale
+            elif kind == b"trex":
+                trex_duration = int.from_bytes(body[12:16], "big")
+            elif kind == b"tfhd":
+                flags = int.from_bytes(body[1:4], "big")
+                fragment_duration = trex_duration
+                if flags & 0x08:
+                    at = 8 + (8 if flags & 0x01 else 0) + (4 if flags & 0x02 else 0)
+                    fragment_duration = int.from_bytes(body[at : at + 4], "big")
+            elif kind == b"trun":
+                # Live (fragmented) recordings: add up the sample durations.
+                flags = int.from_bytes(body[1:4], "big")
+                count = int.from_bytes(body[4:8], "big")
+                if not flags & 0x100:
+                    ticks += count * fragment_duration
+                    continue
+                at = 8 + (4 if flags & 0x001 else 0) + (4 if flags & 0x004 else 0)
+                stride = 4 * bin(flags & 0xF00).count("1")
+                # Trust the box size, not sample_count, for how many entries there are.
+                for i in range(min(count, (len(body) - at) // stride)):
+                    ticks += int.from_bytes(body[at + i * stride : at + i * stride + 4], "big")
+    except IndexError:
+        return None
+    scale = track_scale or movie_scale
+    return ticks / scale if scale and ticks else None
+
+
+def container_duration(data: bytes, mime_type: str) -> Optional[float]:
+    """Seconds of audio in a compressed upload, or None if the container doesn't say."""
+    if mime_type == "audio/webm":
+        return _webm_duration(data)
+    if mime_type == "audio/ogg":
+        return _ogg_duration(data)
+    if mime_type == "audio/mp4":
+        return _mp4_duration(data)
+    return None
+
+
+def prepare_answer_audio(data: bytes, max_seconds: float, fallback_mime_type: str = "audio/wav") -> PreparedAudio:
+    """Shrink WAV to 16 kHz mono; pass other formats through. AudioTooLarge past `max_seconds`."""
+    mime_type = sniff_mime_type(data, fallback_mime_type)
+    if mime_type != "audio/wav":
+        duration = container_duration(data, mime_type)
+        if duration is not None and duration > max_seconds:
+            raise AudioTooLarge(f"Answer is {duration:.0f}s long; the limit is {max_seconds:.0f}s")
+        return PreparedAudio(data=data, mime_type=mime_type, duration_seconds=duration, original_bytes=len(data))
+    try:
+        with wave.open(io.BytesIO(data)) as source:
+            channels = source.getnchannels()
+            width = source.getsampwidth()
+            rate = source.getframerate()
+            frames = source.getnframes()
+            duration = frames / rate if rate else 0.0
+            if duration > max_seconds:
+                raise AudioTooLarge(f"Answer is {duration:.0f}s long; the limit is {max_seconds:.0f}s")
+            if width != 2 or (channels == 1 and rate == TARGET_SAMPLE_RATE):
+                # Already small, or a sample format we leave to the model.
+                return PreparedAudio(data=data, mime_type=mime_type, duration_seconds=duration, original_bytes=len(data))
+            samples = source.readframes(frames)
+    except (wave.Error, EOFError):
+        # Not a WAV `wave` can read (e.g. float or compressed WAVE); send it as is.
+        return PreparedAudio(data=data, mime_type=mime_type, original_bytes=len(data))
+
+    out = io.BytesIO()
+    with wave.open(out, "wb") as target:
+        target.setnchannels(1)
+        target.setsampwidth(2)
+        target.setframerate(TARGET_SAMPLE_RATE)
+        target.writeframes(_to_mono_16k(samples, channels, rate))
+    return PreparedAudio(data=out.getvalue(), mime_type=mime_type, duration_seconds=duration, original_bytes=len(data))
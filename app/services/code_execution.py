@@ -0,0 +1,382 @@
+"""Code executors for technical-interview grading.
+
+The Python executors run untrusted candidate code, so the API never calls them
+directly: they are executed inside `app.services.sandbox` worker processes.
+JavaScript is graded by the Node worker pool in `app.services.node_pool`; the
+spawn-per-test `execute_javascript_code*` functions at the bottom are its fallback
+(NODE_WORKERS=0) and benchmark baseline.
+
+The `*_batch` executors compile a submission once, prepare its namespace and
+`Solution` instance once, then feed every test input through it, yielding one
+result per test. Each test gets a deep copy of its input so in-place mutations
+can't leak into the next test.
+"""
+
+import copy
+import os
+import time
+import traceback
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+_NOT_SOLUTION_NAMES = ["Solution", "print", "len", "range", "str", "int", "list", "dict", "set", "tuple"]
+
+
+def _make_list_node_class():
+    # Fresh class per submission so one candidate can't monkeypatch it for the next.
+    class ListNode:
+        def __init__(self, val: int = 0, next: Optional["ListNode"] = None):
+            self.val = val
+            self.next = next
+
+    return ListNode
+
+
+def _build_linked_list(node_cls, values: List[int]):
+    dummy = node_cls(0)
+    cur = dummy
+    for v in values:
+        cur.next = node_cls(v)
+        cur = cur.next
+    return dummy.next
+
+
+def _linked_list_to_list(head, limit: int = 5000) -> List[int]:
+    out: List[int] = []
+    cur = head
+    steps = 0
+    while cur is not None and steps < limit:
+        out.append(cur.val)
+        cur = cur.next
+        steps += 1
+    return out
+
+
+def _build_cycle(node_cls, values: List[int], pos: int):
+    head = _build_linked_list(node_cls, values)
+    if head is None or pos is None or pos < 0:
+        return head
+    # Find tail and pos node
+    tail = head
+    idx = 0
+    pos_node = head if pos == 0 else None
+    while tail.next is not None:
+        tail = tail.next
+        idx += 1
+        if idx == pos:
+            pos_node = tail
+    if pos_node is not None:
+        tail.next = pos_node
+    return head
+
+
+def _format_error(e: BaseException) -> str:
+    error_msg = str(e)
+    # Only show the last few lines of traceback
+    tb_lines = traceback.format_exc().split("\n")
+    if len(tb_lines) > 5:
+        error_msg = f"{error_msg}\n{tb_lines[-3]}"
+    return error_msg
+
+
+def _resolve_solution(namespace: dict, function_name: str):
+    # First try: Look for Solution class with method (LeetCode pattern)
+    if "Solution" in namespace:
+        solution_instance = namespace["Solution"]()
+        if hasattr(solution_instance, function_name):
+            return getattr(solution_instance, function_name)
+
+    # Second try: Look for standalone function
+    if function_name in namespace:
+        return namespace[function_name]
+
+    # Third try: Look for any callable that's not a builtin
+    for key, value in namespace.items():
+        if callable(value) and not key.startswith("_") and key not in _NOT_SOLUTION_NAMES:
+            return value
+    return None
+
+
+def _prepare_python_solution(code: str, function_name: str):
+    """Compile + exec `code` once; returns `(solution_func, ListNode)`."""
+    list_node_cls = _make_list_node_class()
+    namespace = {
+        "__builtins__": __builtins__,
+        "ListNode": list_node_cls,
+        "Optional": Optional,
+        "List": List,
+        "Any": Any,
+        "Dict": Dict,
+    }
+    exec(compile(code, "<string>", "exec"), namespace)
+    return _resolve_solution(namespace, function_name), list_node_cls
+
+
+def _exec_generated(code: str) -> dict:
+    namespace = {"__builtins__": __builtins__}
+    exec(compile(code, "<string>", "exec"), namespace)
+    return namespace
+
+
+def _invoke_python_solution(solution_func, list_node_cls, test_input: dict, function_name: str) -> Any:
+    """Call the solution with one test input, mapped to the question's signature."""
+    # Handle different input formats based on question type
+    if "lists" in test_input:
+        # Merge K Sorted Lists
+        list_nodes = [_build_linked_list(list_node_cls, arr) if arr else None for arr in test_input.get("lists") or []]
+        out_head = solution_func(list_nodes)
+        if out_head is None:
+            return []
+        return _linked_list_to_list(out_head)
+
+    if "head" in test_input:
+        head_vals = test_input.get("head") or []
+        pos = test_input.get("pos")
+        if isinstance(pos, int) and pos >= 0:
+            head_node = _build_cycle(list_node_cls, head_vals, pos)
+        else:
+            head_node = _build_linked_list(list_node_cls, head_vals)
+
+        # Reorder list modifies in place and returns None
+        if function_name == "reorderList":
+            solution_func(head_node)
+            return _linked_list_to_list(head_node)
+
+        out = solution_func(head_node)
+        if isinstance(out, list_node_cls) or out is None:
+            return _linked_list_to_list(out)
+        return out
+
+    if "nums" in test_input and "target" in test_input:
+        # Two Sum problem
+        return solution_func(test_input["nums"], test_input["target"])
+    if "nums" in test_input and "k" in test_input:
+        # Top K Frequent
+        return solution_func(test_input["nums"], test_input["k"])
+    if "s" in test_input and "t" in test_input:
+        # Two-string problems (Valid Anagram)
+        return solution_func(test_input["s"], test_input["t"])
+    if "s" in test_input:
+        s_input = test_input["s"]
+        if isinstance(s_input, list):
+            # For reverse string problem, the function modifies in place
+            solution_func(s_input)
+            return s_input
+        return solution_func(s_input)
+    if "intervals" in test_input:
+        return solution_func(test_input["intervals"])
+    if "root" in test_input:
+        # Tree problems - skip for now
+        raise NotImplementedError("Tree problems not yet supported")
+    # Generic single argument
+    return solution_func(list(test_input.values())[0])
+
+
+def _run_batch(prepare, invoke, test_inputs: Iterable[dict], missing_error: str, copy_inputs: bool = True) -> Iterator[dict]:
+    test_inputs = list(test_inputs)
+    try:
+        prepared = prepare()
+    except (Exception, SystemExit) as e:
+        prepared, setup_error = None, _format_error(e)
+    else:
+        setup_error = None if prepared[0] is not None else missing_error
+
+    for test_input in test_inputs:
+        if setup_error:
+            yield {"result": None, "error": setup_error, "elapsed_ms": 0.0}
+            continue
+        # Deep copy so in-place mutations stay within this test (outside the timed part).
+        if copy_inputs:
+            test_input = copy.deepcopy(test_input)
+        started = time.perf_counter()
+        try:
+            result, error = invoke(prepared, test_input), None
+        except NotImplementedError as e:
+            result, error = None, str(e)
+        except (Exception, SystemExit) as e:  # exit() in candidate code fails just this test
+            result, error = None, _format_error(e)
+        yield {"result": result, "error": error, "elapsed_ms": round((time.perf_counter() - started) * 1000, 3)}
+
+
+_MISSING_SOLUTION = "No solution function found. Please define a class 'Solution' with a method matching the problem."
+_MISSING_GENERATED_SOLUTION = "No solution function found. Please define `solution(input)` or `class Solution` with a `solution` method."
+
+
+def execute_python_batch(
+    code: str, test_inputs: Iterable[dict], function_name: str = "solution", copy_inputs: bool = True
+) -> Iterator[dict]:
+    """Run every test input through one prepared submission.
+
+    Yields `{"result", "error", "elapsed_ms"}` per test, in input order.
+    `copy_inputs=False` skips the per-test deep copy when every input is already a
+    distinct object (e.g. freshly unpickled profiling inputs).
+    """
+    return _run_batch(
+        lambda: _prepare_python_solution(code, function_name),
+        lambda prepared, test_input: _invoke_python_solution(prepared[0], prepared[1], test_input, function_name),
+        test_inputs,
+        _MISSING_SOLUTION,
+        copy_inputs,
+    )
+
+
+def execute_python_generated_batch(
+    code: str, test_inputs: Iterable[dict], function_name: str = "solution", copy_inputs: bool = True
+) -> Iterator[dict]:
+    """Batch variant of `execute_python_code_generated`; same per-test shape as `execute_python_batch`."""
+    return _run_batch(
+        lambda: (_resolve_solution(_exec_generated(code), function_name),),
+        lambda prepared, test_input: prepared[0](test_input),
+        test_inputs,
+        _MISSING_GENERATED_SOLUTION,
+        copy_inputs,
+    )
+
+
+def execute_python_profile_batch(code: str, test_inputs: Iterable[dict], function_name: str = "solution") -> Iterator[dict]:
+    """`execute_python_batch` for complexity profiling: large inputs, no per-test copy."""
+    return execute_python_batch(code, test_inputs, function_name, copy_inputs=False)
+
+
+def execute_python_code(code: str, test_input: dict, function_name: str = "solution") -> tuple[Any, Optional[str]]:
+    """Execute Python code and return result and error message."""
+    outcome = next(execute_python_batch(code, [test_input], function_name))
+    return outcome["result"], outcome["error"]
+
+
+def execute_python_code_generated(code: str, test_input: dict, function_name: str = "solution") -> tuple[Any, Optional[str]]:
+    """Execute Python code for generated problems.
+
+    Generated problems always call `solution(input)` with the entire input dict.
+    """
+    outcome = next(execute_python_generated_batch(code, [test_input], function_name))
+    return outcome["result"], outcome["error"]
+
+
+def execute_javascript_code(code: str, test_input: dict, function_name: str = "solution") -> tuple[any, str]:
+    """Execute JavaScript code using Node.js subprocess."""
+    import subprocess
+    import json
+    import tempfile
+    from app.services.sandbox import worker_environ
+    
+    try:
+        # Create a test wrapper
+        test_code = f"""
+{code}
+
+// Test execution
+const testInput = {json.dumps(test_input)};
+let result;
+try {{
+    const fn = (typeof {function_name} === 'function') ? {function_name} : ((typeof solution === 'function') ? solution : null);
+    if (!fn) throw new Error('Solution function not found');
+
+    if (testInput.nums !== undefined && testInput.target !== undefined) {{
+        result = fn(testInput.nums, testInput.target);
+    }} else if (testInput.nums !== undefined && testInput.k !== undefined) {{
+        result = fn(testInput.nums, testInput.k);
+    }} else if (testInput.s !== undefined && testInput.t !== undefined) {{
+        result = fn(testInput.s, testInput.t);
+    }} else if (testInput.s !== undefined) {{
+        result = fn(testInput.s);
+    }} else {{
+        result = fn(Object.values(testInput)[0]);
+    }}
+    console.log(JSON.stringify({{result: result}}));
+}} catch (error) {{
+    console.error(JSON.stringify({{error: error.message}}));
+    process.exit(1);
+}}
+"""
+        
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.js', delete=False) as f:
+            f.write(test_code)
+            temp_file = f.name
+        
+        try:
+            result = subprocess.run(
+                ['node', temp_file],
+                capture_output=True,
+                text=True,
+                timeout=5,
+                env=worker_environ(),  # candidate code gets `process.env` here
+            )
+            
+            if result.returncode != 0:
+                error_output = result.stderr
+                try:
+                    error_data = json.loads(error_output)
+                    return None, error_data.get('error', error_output)
+                except:
+                    return None, error_output
+            
+            output_data = json.loads(result.stdout)
+            return output_data.get('result'), None
+        finally:
+            os.unlink(temp_file)
+    except subprocess.TimeoutExpired:
+        return None, "Execution timeout"
+    except Exception as e:
+        return None, str(e)
+
+
+def execute_javascript_code_generated(code: str, test_input: dict, function_name: str = "solution") -> tuple[Any, Optional[str]]:
+    """Execute JavaScript code for generated problems.
+
+    Generated problems always call `solution(input)` with the entire input object.
+    """
+    import subprocess
+    import json as _json
+    import tempfile
+    from app.services.sandbox import worker_environ
+
+    try:
+        test_code = f"""
+{code}
+
+const testInput = {_json.dumps(test_input)};
+let result;
+try {{
+  if (typeof {function_name} === 'function') {{
+    result = {function_name}(testInput);
+  }} else if (typeof solution === 'function') {{
+    result = solution(testInput);
+  }} else {{
+    throw new Error('Solution function not found');
+  }}
+  console.log(JSON.stringify({{result: result}}));
+}} catch (error) {{
+  console.error(JSON.stringify({{error: error.message}}));
+  process.exit(1);
+}}
+"""
+
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".js", delete=False) as f:
+            f.write(test_code)
+            temp_file = f.name
+
+        try:
+            result = subprocess.run(
+                ["node", temp_file],
+                capture_output=True,
+                text=True,
+                timeout=5,
+                env=worker_environ(),  # candidate code gets `process.env` here
+            )
+
+            if result.returncode != 0:
+                error_output = result.stderr
+                try:
+                    error_data = _json.loads(error_output)
+                    return None, error_data.get("error", error_output)
+                except Exception:
+                    return None, error_output
+
+            output_data = _json.loads(result.stdout)
+            return output_data.get("result"), None
+        finally:
+            os.unlink(temp_file)
+    except subprocess.TimeoutExpired:
+        return None, "Execution timeout"
+    except Exception as e:
+        return None, str(e)
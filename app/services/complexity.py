@@ -0,0 +1,276 @@
+"""Empirical time-complexity check for technical-interview submissions.
+
+Instead of asking Gemini whether a passing submission is "optimal" (a full model
+round trip per submit that silently says "optimal" when it fails), we run the
+solution in the execution pool on generated inputs of growing size (n, 2n, 4n,
+...), take the fastest of a few repeats at each size, and fit the slope of
+log(time) against log(n). The slope maps to a complexity class that is compared
+with the question's target class.
+
+A solution that blows the per-size time budget is stopped early; that in itself
+is evidence of super-target growth. Everything runs locally, so the verdict is
+deterministic enough for grading, needs no quota and comes back in well under a
+second for reasonable solutions.
+"""
+
+import asyncio
+import math
+import random
+import string
+import threading
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from app.services.node_pool import get_node_pool
+from app.services.sandbox import CPU_LIMIT_ERROR, TIMEOUT_ERROR, get_sandbox_pool
+
+# Largest fitted log-log slope each target class tolerates. O(n) and O(n log n)
+# are not reliably separable at these sizes, so an O(n) target also accepts
+# O(n log n) growth.
+_MAX_SLOPE = {
+    "O(1)": 0.3,
+    "O(log n)": 0.3,
+    "O(n)": 1.45,
+    "O(n log n)": 1.45,
+    "O(n^2)": 2.45,
+    "O(n^3)": 3.45,
+}
+
+REPEATS = 3
+# One test above this means the solution can't be on target at these sizes.
+PER_TEST_BUDGET_MS = 150.0
+# Below this even the largest input is too fast to measure reliably: treat as on target.
+NOISE_FLOOR_MS = 0.3
+PROFILE_CPU_SECONDS = 1.0
+PROFILE_WALL_SECONDS = 1.5
+
+
+@dataclass(frozen=True)
+class ComplexityProfile:
+    target: str
+    base_size: int
+    make_input: Callable[[int, random.Random], dict]
+    steps: int = 5  # sizes base, 2*base, ..., 2**(steps-1) * base
+    # The JS runner has no linked-list helpers.
+    python_only: bool = False
+
+    def sizes(self) -> list[int]:
+        return [self.base_size * (2 ** i) for i in range(self.steps)]
+
+
+def _letters(n: int, rng: random.Random, alphabet: str = string.ascii_lowercase) -> str:
+    return "".join(rng.choice(alphabet) for _ in range(n))
+
+
+def _two_sum(n: int, rng: random.Random) -> dict:
+    # Only the last two elements add up to the target: worst case for nested loops.
+    return {"nums": list(range(1, n + 1)), "target": 2 * n - 1}
+
+
+def _anagram(n: int, rng: random.Random) -> dict:
+    s = _letters(n, rng)
+    t = list(s)
+    rng.shuffle(t)
+    return {"s": s, "t": "".join(t)}
+
+
+def _palindrome(n: int, rng: random.Random) -> dict:
+    half = _letters(n // 2, rng)
+    return {"s": half + half[::-1]}
+
+
+def _odd_distinct(n: int, rng: random.Random) -> list[int]:
+    # Three odd numbers never sum to 0, so three-sum has no output to build.
+    return [2 * v + 1 for v in rng.sample(range(-10 * n, 10 * n), n)]
+
+
+def _shuffled_range(n: int, rng: random.Random) -> list[int]:
+    values = list(range(n))
+    rng.shuffle(values)
+    return values
+
+
+def _rotated(n: int, rng: random.Random) -> dict:
+    values = list(range(n))
+    k = rng.randrange(1, n)
+    return {"nums": values[k:] + values[:k]}
+
+
+def _group_anagrams(n: int, rng: random.Random) -> dict:
+    words = [_letters(6, rng, "abcdef") for _ in range(n)]
+    return {"strs": words}
+
+
+def _intervals(n: int, rng: random.Random) -> dict:
+    intervals = [[3 * i, 3 * i + 1 + (i % 2)] for i in range(n)]
+    rng.shuffle(intervals)
+    return {"intervals": intervals}
+
+
+def _k_lists(n: int, rng: random.Random) -> dict:
+    # n total values spread over n/10 lists: merging one list at a time is quadratic.
+    lists = [sorted(rng.randrange(10 * n) for _ in range(10)) for _ in range(max(1, n // 10))]
+    return {"lists": lists}
+
+
+def _distinct_chars(n: int, rng: random.Random) -> dict:
+    # All characters distinct: the whole string is the answer, the worst case for
+    # solutions that re-scan each window.
+    return {"s": "".join(chr(0x4E00 + i) for i in range(n))}
+
+
+def _min_window(n: int, rng: random.Random) -> dict:
+    return {"s": _letters(n, rng, "ABCDEFGHIJ"), "t": "ABC"}
+
+
+PROFILES: dict[str, ComplexityProfile] = {
+    "two-sum": ComplexityProfile("O(n)", 1000, _two_sum),
+    "contains-duplicate": ComplexityProfile("O(n)", 1000, lambda n, rng: {"nums": _shuffled_range(n, rng)}),
+    "valid-anagram": ComplexityProfile("O(n)", 1000, _anagram),
+    "valid-palindrome": ComplexityProfile("O(n)", 1000, _palindrome),
+    "best-time-stock": ComplexityProfile("O(n)", 1000, lambda n, rng: {"prices": [rng.randrange(101) for _ in range(n)]}),
+    "valid-parentheses": ComplexityProfile("O(n)", 1000, lambda n, rng: {"s": "(" * (n // 2) + ")" * (n // 2)}),
+    "reverse-linked-list": ComplexityProfile("O(n)", 1000, lambda n, rng: {"head": list(range(n))}, python_only=True),
+    "linked-list-cycle": ComplexityProfile("O(n)", 1000, lambda n, rng: {"head": list(range(n)), "pos": 0}, python_only=True),
+    "longest-consecutive": ComplexityProfile("O(n)", 1000, lambda n, rng: {"nums": _shuffled_range(n, rng)}),
+    "three-sum": ComplexityProfile("O(n^2)", 50, lambda n, rng: {"nums": _odd_distinct(n, rng)}),
+    "container-with-most-water": ComplexityProfile("O(n)", 1000, lambda n, rng: {"heights": [rng.randrange(1001) for _ in range(n)]}),
+    "find-min-rotated": ComplexityProfile("O(log n)", 4096, _rotated),
+    "reorder-list": ComplexityProfile("O(n)", 1000, lambda n, rng: {"head": list(range(1, n + 1))}, python_only=True),
+    "group-anagrams": ComplexityProfile("O(n log n)", 500, _group_anagrams),
+    "top-k-frequent": ComplexityProfile("O(n log n)", 1000, lambda n, rng: {"nums": [rng.randrange(max(1, n // 4)) for _ in range(n)], "k": 10}),
+    "minimum-window-substring": ComplexityProfile("O(n)", 1000, _min_window),
+    "longest-substring": ComplexityProfile("O(n)", 500, _distinct_chars),
+    "merge-intervals": ComplexityProfile("O(n log n)", 1000, _intervals),
+    "merge-k-sorted-lists": ComplexityProfile("O(n log n)", 1000, _k_lists, python_only=True),
+}
+
+
+def get_profile(question_id: str, language: str) -> Optional[ComplexityProfile]:
+    profile = PROFILES.get(question_id)
+    if profile is None or (profile.python_only and language != "python"):
+        return None
+    return profile
+
+
+def _fit_slope(points: list[tuple[int, float]]) -> float:
+    """Least-squares slope of log(ms) vs log(n)."""
+    xs = [math.log(n) for n, _ in points]
+    ys = [math.log(max(ms, 1e-4)) for _, ms in points]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    var_x = sum((x - mean_x) ** 2 for x in xs)
+    if var_x == 0:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var_x
+
+
+def classify_slope(slope: float) -> str:
+    if slope < 0.15:
+        return "O(1)"
+    if slope < 0.5:
+        return "O(log n)"
+    if slope < 1.15:
+        return "O(n)"
+    if slope < 1.5:
+        return "O(n log n)"
+    if slope < 2.5:
+        return "O(n^2)"
+    return "O(n^3)"
+
+
+def _analysis(is_optimal: bool, actual: str, target: str, reasoning: str, samples: list[dict], slope: Optional[float]) -> dict:
+    return {
+        "is_optimal": is_optimal,
+        "actual_complexity": actual,
+        "optimal_complexity": target,
+        "reasoning": reasoning,
+        "method": "empirical",
+        "slope": None if slope is None else round(slope, 2),
+        "samples": samples,
+    }
+
+
+async def profile_submission(code: str, question_id: str, language: str, function_name: str, seed: int = 0) -> Optional[dict]:
+    """Estimate the submission's growth rate; None if the question has no profile.
+
+    Returns the same keys as the old AI analysis (`is_optimal`, `actual_complexity`,
+    `optimal_complexity`, `reasoning`) plus `method`, `slope` and the timing samples.
+    """
+    profile = get_profile(question_id, language)
+    if profile is None:
+        return None
+
+    sizes = profile.sizes()
+    inputs = []
+    for n in sizes:
+        # Same content for each repeat, but separate objects: the profiling runner
+        # skips its defensive copy.
+        inputs.extend(profile.make_input(n, random.Random(f"{question_id}:{seed}:{n}")) for _ in range(REPEATS))
+
+    stop = threading.Event()
+
+    def _on_outcome(index: int, outcome: dict) -> None:
+        if outcome["error"] or (outcome.get("elapsed_ms") or 0) > PER_TEST_BUDGET_MS:
+            stop.set()
+
+    if language == "python":
+        pool = await asyncio.to_thread(get_sandbox_pool)
+        job = "python_profile_batch"
+    else:
+        pool = await asyncio.to_thread(get_node_pool)
+        if pool is None:
+            return None
+        job = "leetcode"
+    # One worker, sequentially, so every size is timed under the same conditions.
+    outcomes = await pool.run_batch(
+        job,
+        code,
+        inputs,
+        function_name,
+        on_outcome=_on_outcome,
+        stop=stop,
+        cpu_seconds=PROFILE_CPU_SECONDS,
+        wall_seconds=PROFILE_WALL_SECONDS,
+    )
+
+    target = profile.target
+    samples: list[dict] = []
+    over_budget_at = None
+    for i, n in enumerate(sizes):
+        runs = outcomes[i * REPEATS:(i + 1) * REPEATS]
+        error = next((o["error"] for o in runs if o["error"]), None)
+        if error is not None and error not in (TIMEOUT_ERROR, CPU_LIMIT_ERROR):
+            # Failed on a large input for another reason (recursion depth, memory, ...).
+            return _analysis(True, "Unknown", target, f"Could not profile at n={n}: {error.splitlines()[0]}", samples, None)
+        if error is not None or any((o.get("elapsed_ms") or 0) > PER_TEST_BUDGET_MS for o in runs):
+            over_budget_at = n
+            break
+        if any(o.get("skipped") for o in runs):
+            break
+        samples.append({"n": n, "ms": round(min(o["elapsed_ms"] for o in runs), 4)})
+
+    slope = _fit_slope([(s["n"], s["ms"]) for s in samples]) if len(samples) >= 2 else None
+    if over_budget_at is not None:
+        # The blow-up itself is the signal, whatever the partial fit says.
+        if slope is not None and slope > _MAX_SLOPE[target]:
+            actual = classify_slope(slope)
+        else:
+            actual = f"slower than {target}"
+        reasoning = f"Took over {PER_TEST_BUDGET_MS:.0f} ms at n={over_budget_at}; expected {target} growth."
+        analysis = _analysis(False, actual, target, reasoning, samples, slope)
+        analysis["over_budget_at"] = over_budget_at
+        return analysis
+
+    if samples and samples[-1]["ms"] < NOISE_FLOOR_MS:
+        reasoning = f"Runs in under {NOISE_FLOOR_MS} ms even at n={samples[-1]['n']}."
+        return _analysis(True, target, target, reasoning, samples, slope)
+
+    if slope is None:
+        return _analysis(True, "Unknown", target, "Not enough timing samples to estimate growth.", samples, None)
+
+    actual = classify_slope(slope)
+    span = f"from n={samples[0]['n']} to n={samples[-1]['n']}"
+    if slope <= _MAX_SLOPE[target]:
+        return _analysis(True, actual, target, f"Runtime grows like {actual} {span} (target {target}).", samples, slope)
+    return _analysis(False, actual, target, f"Runtime grows like {actual} {span}, slower than the expected {target}.", samples, slope)
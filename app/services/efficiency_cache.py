@@ -0,0 +1,305 @@
+"""Memoized efficiency verdicts for technical-interview submissions.
+
+Candidates often submit the same canonical solution with different variable names
+or formatting, and each submit used to pay for a fresh analysis. Verdicts are
+cached under a hash of the normalized code + question id + language:
+
+- Python is normalized at the AST level: docstrings dropped, every name the
+  submission binds (functions, classes, arguments, variables, imports) renamed to
+  a positional placeholder. Free names such as builtins and attribute names are
+  kept, since `set(...)` vs `sorted(...)` is exactly what decides complexity.
+- JavaScript has no stdlib parser, so the same is done on a token stream:
+  comments, whitespace and semicolons dropped, non-keyword identifiers that
+  aren't property names renamed in order of appearance.
+
+Lookups hit an in-process LRU first, then a SQLite file shared by all workers.
+Both tiers expire entries after `ttl_seconds`; the file is pruned to `max_rows`
+(oldest first) as it is written, so it doesn't grow without bound.
+"""
+
+import ast
+import contextlib
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+# Bump when the analysis method changes so stale verdicts stop matching.
+CACHE_VERSION = "1"
+
+
+class _BoundNames(ast.NodeVisitor):
+    """Collects every name the submission itself binds."""
+
+    def __init__(self):
+        self.names: set[str] = set()
+
+    def visit_Name(self, node: ast.Name) -> None:
+        if isinstance(node.ctx, (ast.Store, ast.Del)):
+            self.names.add(node.id)
+
+    def visit_arg(self, node: ast.arg) -> None:
+        self.names.add(node.arg)
+
+    def _visit_def(self, node) -> None:
+        self.names.add(node.name)
+        self.generic_visit(node)
+
+    visit_FunctionDef = visit_AsyncFunctionDef = visit_ClassDef = _visit_def
+
+    def visit_alias(self, node: ast.alias) -> None:
+        self.names.add(node.asname or node.name.split(".")[0])
+
+    def visit_ExceptHandler(self, node: ast.ExceptHandler) -> None:
+        if node.name:
+            self.names.add(node.name)
+        self.generic_visit(node)
+
+
+class _Renamer(ast.NodeTransformer):
+    def __init__(self, bound: set[str]):
+        self.bound = bound
+        self.mapping: dict[str, str] = {}
+
+    def _name(self, name: str) -> str:
+        if name not in self.bound:
+            return name
+        if name not in self.mapping:
+            self.mapping[name] = f"_{len(self.mapping)}"
+        return self.mapping[name]
+
+    def visit_Name(self, node: ast.Name):
+        node.id = self._name(node.id)
+        return node
+
+    def visit_arg(self, node: ast.arg):
+        node.arg = self._name(node.arg)
+        node.annotation = None
+        return node
+
+    def _visit_def(self, node):
+        node.name = self._name(node.name)
+        # Docstrings and annotations don't affect complexity.
+        body = node.body
+        if body and isinstance(body[0], ast.Expr) and isinstance(getattr(body[0], "value", None), ast.Constant) and isinstance(body[0].value.value, str):
+            node.body = body[1:] or [ast.Pass()]
+        if hasattr(node, "returns"):
+            node.returns = None
+        self.generic_visit(node)
+        return node
+
+    visit_FunctionDef = visit_AsyncFunctionDef = visit_ClassDef = _visit_def
+
+    def visit_alias(self, node: ast.alias):
+        if node.asname:
+            node.asname = self._name(node.asname)
+        return node
+
+    def visit_ExceptHandler(self, node: ast.ExceptHandler):
+        if node.name:
+            node.name = self._name(node.name)
+        self.generic_visit(node)
+        return node
+
+
+def _normalize_python(code: str) -> Optional[str]:
+    try:
+        tree = ast.parse(code)
+    except (SyntaxError, ValueError):
+        return None
+    collector = _BoundNames()
+    collector.visit(tree)
+    tree = _Renamer(collector.names).visit(tree)
+    return ast.dump(tree, annotate_fields=False, include_attributes=False)
+
+
+_JS_TOKEN = re.compile(
+    r"""
+    (?P<comment>//[^\n]*|/\*.*?\*/)
+    |(?P<string>"(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'|`(?:\\.|[^`\\])*`)
+    |(?P<number>\d[\w.]*)
+    |(?P<ident>[A-Za-z_$][\w$]*)
+    |(?P<space>\s+)
+    |(?P<punct>.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+_JS_KEYWORDS = {
+    "break", "case", "catch", "class", "const", "continue", "default", "delete", "do", "else",
+    "extends", "false", "finally", "for", "function", "if", "in", "instanceof", "let", "new",
+    "null", "of", "return", "static", "super", "switch", "this", "throw", "true", "try",
+    "typeof", "undefined", "var", "void", "while", "yield", "async", "await",
+    # Globals whose choice matters for complexity.
+    "Array", "Map", "Set", "Object", "Math", "JSON", "Number", "String", "Infinity", "NaN",
+}
+
+
+def _normalize_javascript(code: str) -> str:
+    mapping: dict[str, str] = {}
+    out: list[str] = []
+    previous = ""
+    for match in _JS_TOKEN.finditer(code):
+        kind = match.lastgroup
+        token = match.group()
+        # Semicolons are mostly optional style in JS; drop them with the whitespace.
+        if kind in ("comment", "space") or token == ";":
+            continue
+        if kind == "ident" and token not in _JS_KEYWORDS and previous != ".":
+            token = mapping.setdefault(token, f"_{len(mapping)}")
+        out.append(token)
+        previous = token
+    return " ".join(out)
+
+
+def normalize_code(code: str, language: str) -> str:
+    if language == "python":
+        normalized = _normalize_python(code)
+        if normalized is not None:
+            return normalized
+    if language == "javascript":
+        return _normalize_javascript(code)
+    # Unparseable / unknown language: whitespace-insensitive fallback.
+    return " ".join(code.split())
+
+
+def efficiency_cache_key(code: str, question_id: str, language: str) -> str:
+    digest = hashlib.sha256(normalize_code(code, language).encode("utf-8")).hexdigest()
+    return f"v{CACHE_VERSION}:{language}:{question_id}:{digest}"
+
+
+class EfficiencyCache:
+    """Two-tier cache: in-memory LRU in front of an optional SQLite file."""
+
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        path: Optional[str] = None,
+        ttl_seconds: float = 7 * 24 * 3600,
+        max_rows: int = 50_000,
+    ):
+        self.max_entries = max(1, max_entries)
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_rows = max(1, max_rows)
+        # key -> (created_at, verdict)
+        self._memory: "OrderedDict[str, tuple[float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with self._connect() as db:
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS efficiency_cache ("
+                    "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+                )
+                db.execute("CREATE INDEX IF NOT EXISTS efficiency_cache_age ON efficiency_cache (created_at)")
+
+    @contextlib.contextmanager
+    def _connect(self):
+        # One short-lived connection per call: safe across threads and processes.
+        db = sqlite3.connect(self.path, timeout=5)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def _remember(self, key: str, value: dict, created_at: float) -> None:
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[dict]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if now - entry[0] < self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return dict(entry[1])
+                del self._memory[key]
+
+        row = None
+        if self.path:
+            try:
+                with self._connect() as db:
+                    row = db.execute(
+                        "SELECT value, created_at FROM efficiency_cache WHERE key = ? AND created_at > ?",
+                        (key, now - self.ttl_seconds),
+                    ).fetchone()
+                if row:
+                    row = (json.loads(row[0]), row[1])
+            except (sqlite3.Error, ValueError) as e:
+                print(f"Efficiency cache read failed: {e}")
+                row = None
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, row[0], row[1])
+        return dict(row[0])
+
+    def put(self, key: str, value: dict, persist: bool = True) -> None:
+        """Cache a verdict; `persist=False` keeps it in this process only."""
+        now = time.time()
+        with self._lock:
+            self._remember(key, dict(value), now)
+            self._writes += 1
+            prune = self._writes % 64 == 0
+        if self.path and persist:
+            try:
+                with self._connect() as db:
+                    db.execute(
+                        "INSERT OR REPLACE INTO efficiency_cache (key, value, created_at) VALUES (?, ?, ?)",
+                        (key, json.dumps(value), now),
+                    )
+                    if prune:
+                        self._prune(db, now)
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                print(f"Efficiency cache write failed: {e}")
+
+    def _prune(self, db: sqlite3.Connection, now: float) -> None:
+        # Expired rows first, then the oldest beyond max_rows; both walk the created_at index.
+        db.execute("DELETE FROM efficiency_cache WHERE created_at <= ?", (now - self.ttl_seconds,))
+        (count,) = db.execute("SELECT COUNT(*) FROM efficiency_cache").fetchone()
+        if count > self.max_rows:
+            db.execute(
+                "DELETE FROM efficiency_cache WHERE key IN ("
+                "SELECT key FROM efficiency_cache ORDER BY created_at LIMIT ?)",
+                (count - self.max_rows,),
+            )
+
+
+_cache: Optional[EfficiencyCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_efficiency_cache() -> EfficiencyCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            from app.config import (
+                EFFICIENCY_CACHE_MAX_ENTRIES,
+                EFFICIENCY_CACHE_MAX_ROWS,
+                EFFICIENCY_CACHE_PATH,
+                EFFICIENCY_CACHE_TTL_SECONDS,
+            )
+
+            _cache = EfficiencyCache(
+                max_entries=EFFICIENCY_CACHE_MAX_ENTRIES,
+                path=EFFICIENCY_CACHE_PATH or None,
+                ttl_seconds=EFFICIENCY_CACHE_TTL_SECONDS,
+                max_rows=EFFICIENCY_CACHE_MAX_ROWS,
+            )
+        return _cache
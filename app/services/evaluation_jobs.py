@@ -0,0 +1,70 @@
+"""Background jobs for post-interview evaluation.
+
+Scoring a behavioral interview (guardrails, then a long rubric call with retries)
+used to run inline on the WebSocket, and the score was lost if the client left
+before it finished. Each evaluation is now an asyncio task of its own with an id;
+its status and result live in a state-store namespace, so the result can be
+fetched by id (`GET /api/behavioral-interview/evaluations/{id}`) from any worker
+after the socket is gone. The socket pushes the result if it's still open.
+
+A job that is still "pending" after `timeout_seconds` (e.g. its worker restarted)
+is reported as failed.
+"""
+
+import asyncio
+import time
+import uuid
+from collections.abc import MutableMapping
+from typing import Awaitable, Optional
+
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+
+class EvaluationJobs:
+    def __init__(self, store: MutableMapping, timeout_seconds: float = 600):
+        self._store = store
+        self.timeout_seconds = timeout_seconds
+        # Strong references so running jobs aren't garbage-collected mid-flight.
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    def submit(self, work: Awaitable[dict]) -> str:
+        job_id = uuid.uuid4().hex
+        self._store[job_id] = {"status": PENDING, "created_at": time.time(), "result": None, "error": None}
+        task = asyncio.create_task(self._run(job_id, work))
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job_id, None))
+        return job_id
+
+    async def _run(self, job_id: str, work: Awaitable[dict]) -> dict:
+        job = self._store.get(job_id) or {"created_at": time.time()}
+        try:
+            result = await asyncio.wait_for(work, self.timeout_seconds)
+            job.update(status=DONE, result=result, finished_at=time.time())
+            print(f"[Evaluation] Job {job_id} done")
+        except Exception as e:
+            job.update(status=FAILED, error=str(e) or type(e).__name__, finished_at=time.time())
+            print(f"[Evaluation] Job {job_id} failed: {job['error']}")
+        self._store[job_id] = job
+        return job
+
+    async def wait(self, job_id: str) -> dict:
+        """The finished job. Cancelling the waiter doesn't cancel the job."""
+        task = self._tasks.get(job_id)
+        if task is not None:
+            return await asyncio.shield(task)
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        job = self._store.get(job_id)
+        if job is None:
+            return None
+        if job["status"] == PENDING and job_id not in self._tasks and time.time() - job["created_at"] > self.timeout_seconds:
+            job.update(status=FAILED, error="Evaluation did not finish")
+        return {"id": job_id, **job}
+
+    async def close(self) -> None:
+        for task in list(self._tasks.values()):
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
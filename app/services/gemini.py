@@ -0,0 +1,105 @@
+"""Gemini API call helpers shared by the API server and offline tools."""
+
+import time
+
+
+def call_gemini_with_retry(client, model, contents, max_retries=3, initial_delay=1, timeout=60):
+    """
+    Call Gemini API with retry logic for 503/429 errors and timeout.
+
+    Args:
+        client: Gemini client instance
+        model: Model name to use
+        contents: Prompt/content to send
+        max_retries: Maximum number of retry attempts
+        initial_delay: Initial delay in seconds before first retry
+        timeout: Maximum time in seconds for the entire operation
+
+    Returns:
+        Response from Gemini API
+
+    Raises:
+        Exception: If all retries fail, timeout, or non-retryable error occurs
+    """
+    import signal
+
+    last_exception = None
+    start_time = time.time()
+
+    for attempt in range(max_retries + 1):
+        # Check if we've exceeded total timeout
+        elapsed = time.time() - start_time
+        if elapsed > timeout:
+            raise Exception("Request timed out. The server is experiencing high load. Please try again in a few moments.")
+
+        try:
+            response = client.models.generate_content(
+                model=model,
+                contents=contents
+            )
+            return response
+        except Exception as e:
+            error_str = str(e).lower()
+
+            # Check if it's a retryable error (503, 429, overloaded, quota)
+            is_retryable = False
+            is_rate_limit = False
+
+            # Rate limit / quota errors (429)
+            if "429" in str(e) or "resource exhausted" in error_str or "quota" in error_str or "rate limit" in error_str:
+                is_retryable = True
+                is_rate_limit = True
+
+            # Service unavailable (503)
+            if "503" in str(e) or "unavailable" in error_str or "overloaded" in error_str:
+                is_retryable = True
+
+            # Check exception attributes
+            status_code = getattr(e, 'status_code', None) or getattr(e, 'code', None)
+            if status_code in [429, 503]:
+                is_retryable = True
+                is_rate_limit = status_code == 429
+
+            if is_retryable and attempt < max_retries:
+                # Use longer delays for rate limits
+                base_delay = initial_delay * 2 if is_rate_limit else initial_delay
+                delay = min(base_delay * (2 ** attempt), 10)  # Cap at 10 seconds
+
+                # Don't wait if we'd exceed timeout
+                if time.time() - start_time + delay > timeout:
+                    raise Exception("Request timed out. The server is experiencing high load. Please try again in a few moments.")
+
+                print(f"[Gemini] Retrying in {delay}s (attempt {attempt + 1}/{max_retries}) - {str(e)[:100]}")
+                # Use asyncio-safe sleep if in async context, otherwise regular sleep
+                import asyncio
+                try:
+                    loop = asyncio.get_running_loop()
+                    # We're in an async context but this is a sync function
+                    # Just use regular sleep - the function will be wrapped with to_thread
+                    time.sleep(delay)
+                except RuntimeError:
+                    # No running event loop, safe to use time.sleep
+                    time.sleep(delay)
+                last_exception = e
+                continue
+            else:
+                # Non-retryable error or max retries reached
+                if is_rate_limit:
+                    raise Exception("Server is currently busy due to high demand. Please try again in a few moments.")
+                raise e
+
+    # If we exhausted all retries, raise appropriate error
+    if last_exception:
+        error_str = str(last_exception).lower()
+        if "429" in str(last_exception) or "quota" in error_str or "rate limit" in error_str:
+            raise Exception("Server is currently busy due to high demand. Please try again in a few moments.")
+        raise Exception("Service temporarily unavailable. Please try again in a few moments.")
+
+
+async def call_gemini_with_retry_async(client, model, contents, max_retries=3, initial_delay=1, timeout=60):
+    """Async wrapper for call_gemini_with_retry to avoid blocking the event loop."""
+    import asyncio
+    return await asyncio.to_thread(
+        call_gemini_with_retry,
+        client, model, contents, max_retries, initial_delay, timeout
+    )
@@ -0,0 +1,165 @@
+"""Grading scheduler: spreads one submission's test cases across the execution pools.
+
+Test cases of a submission are independent, so instead of running them one after
+another they're split into contiguous chunks, one per pool worker, and each chunk
+runs as a batch (compiled once per chunk). Grading time then scales with the number
+of workers rather than the number of tests. Outcomes are always returned in test
+order, whatever order the chunks finish in.
+
+With `stop_when`, the first outcome it flags (e.g. a failed test on "Run") stops
+every chunk; tests that didn't get to report come back with `"skipped": True`.
+
+With `cache_scope`, outcomes already graded for the exact same code (see
+app/services/grading_cache.py) are reused instead of re-run and come back with
+`"cached": True`; only the remaining tests are scheduled.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+from app.services.code_execution import execute_javascript_code, execute_javascript_code_generated
+from app.services.grading_cache import code_digest, get_grading_cache, test_id
+from app.services.node_pool import get_node_pool
+from app.services.sandbox import get_sandbox_pool, skipped_outcome
+
+SUPPORTED_LANGUAGES = {"python", "javascript"}
+
+# (language, generated problem?) -> pool job / Node mode
+_PYTHON_JOBS = {False: "python_batch", True: "python_generated_batch"}
+_NODE_MODES = {False: "leetcode", True: "generated"}
+
+
+def _chunks(count: int, parts: int) -> list[tuple[int, int]]:
+    """Split range(count) into at most `parts` contiguous, near-equal slices."""
+    parts = max(1, min(parts, count))
+    size, extra = divmod(count, parts)
+    bounds = []
+    start = 0
+    for i in range(parts):
+        end = start + size + (1 if i < extra else 0)
+        bounds.append((start, end))
+        start = end
+    return bounds
+
+
+async def _run_spawned_javascript(code, test_inputs, function_name, generated, on_outcome, stop) -> list[dict]:
+    # Fallback when the Node pool is disabled: one node process per test, in parallel.
+    execute = execute_javascript_code_generated if generated else execute_javascript_code
+    limit = asyncio.Semaphore(os.cpu_count() or 2)
+
+    async def _one(index: int, test_input: dict) -> dict:
+        async with limit:
+            if stop.is_set():
+                return skipped_outcome()
+            started = time.perf_counter()
+            result, error = await asyncio.to_thread(execute, code, test_input, function_name)
+            outcome = {"result": result, "error": error, "elapsed_ms": round((time.perf_counter() - started) * 1000, 3)}
+            on_outcome(index, outcome)
+            return outcome
+
+    try:
+        return list(await asyncio.gather(*(_one(i, t) for i, t in enumerate(test_inputs))))
+    except asyncio.CancelledError:
+        # Queued tests see `stop` and skip; the ones already running finish their node call.
+        stop.set()
+        raise
+
+
+async def run_test_cases(
+    language: str,
+    code: str,
+    test_inputs: list[dict],
+    function_name: str = "solution",
+    generated: bool = False,
+    stop_when: Optional[Callable[[int, dict], bool]] = None,
+    on_outcome: Optional[Callable[[int, dict], None]] = None,
+    cache_scope: Optional[str] = None,
+) -> list[dict]:
+    """Run all test inputs for one submission; returns one outcome per test, in order.
+
+    Each outcome is `{"result", "error", "elapsed_ms"}` (plus `"skipped": True` for
+    tests cancelled by `stop_when`, `"cached": True` for reused ones).
+    `stop_when(index, outcome)` and `on_outcome(index, outcome)` are called as each
+    test finishes, in completion order and possibly from a worker thread. Reused
+    outcomes are reported first, before anything is scheduled.
+
+    `cache_scope` names what the tests belong to (a bank question or a generated
+    problem session); None disables the grading cache.
+    """
+    if language not in SUPPORTED_LANGUAGES:
+        raise ValueError(f"Unsupported language: {language}")
+    if not test_inputs:
+        return []
+
+    stop = threading.Event()
+    outcomes: list[Optional[dict]] = [None] * len(test_inputs)
+
+    cache = None
+    keys: list[tuple] = []
+    if cache_scope is not None:
+        cache = get_grading_cache()
+        digest = code_digest(code)
+        keys = [(cache_scope, language, function_name, generated, digest, test_id(t)) for t in test_inputs]
+
+    def _on_outcome(index: int, outcome: dict) -> None:
+        if cache is not None and not outcome.get("cached"):
+            cache.put(keys[index], outcome)
+        if on_outcome is not None:
+            on_outcome(index, outcome)
+        if stop_when is not None and not stop.is_set() and stop_when(index, outcome):
+            stop.set()
+
+    if cache is not None:
+        for index, cached in enumerate(cache.get_many(keys)):
+            if cached is not None:
+                cached["cached"] = True
+                outcomes[index] = cached
+                _on_outcome(index, cached)
+
+    pending = [index for index, outcome in enumerate(outcomes) if outcome is None]
+    if not pending:
+        return outcomes
+    if stop.is_set():
+        for index in pending:
+            outcomes[index] = skipped_outcome()
+        return outcomes
+    pending_inputs = [test_inputs[index] for index in pending]
+
+    def _report(offset: int):
+        return lambda i, outcome: _on_outcome(pending[offset + i], outcome)
+
+    if language == "python":
+        pool = await asyncio.to_thread(get_sandbox_pool)
+        job = _PYTHON_JOBS[generated]
+    else:
+        pool = await asyncio.to_thread(get_node_pool)
+        if pool is None:
+            results = await _run_spawned_javascript(code, pending_inputs, function_name, generated, _report(0), stop)
+            for index, outcome in zip(pending, results):
+                outcomes[index] = outcome
+            return outcomes
+        job = _NODE_MODES[generated]
+
+    async def _run_chunk(start: int, end: int) -> None:
+        results = await pool.run_batch(
+            job,
+            code,
+            pending_inputs[start:end],
+            function_name,
+            on_outcome=_report(start),
+            stop=stop,
+        )
+        for index, outcome in zip(pending[start:end], results):
+            outcomes[index] = outcome
+
+    try:
+        await asyncio.gather(*(_run_chunk(start, end) for start, end in _chunks(len(pending), pool.size)))
+    except asyncio.CancelledError:
+        # The caller went away (e.g. a client disconnect): the worker threads behind
+        # run_batch keep going unless told to stop, holding pool workers for nothing.
+        stop.set()
+        raise
+    return outcomes
@@ -0,0 +1,98 @@
+"""Short-lived cache of per-test grading outcomes.
+
+Candidates usually hit "Run" (sample tests) and then "Submit" (sample + hidden)
+without touching the code, so the sample tests would execute twice. Outcomes are
+kept for a few minutes under (exact code hash, question or problem-session scope,
+language, entry point, test id), and a later run of the same code only executes
+the tests it hasn't seen yet.
+
+The test id is a hash of the test's canonical JSON input, so a test keeps its id
+whether it's reached through the sample list or the full submit list. Only
+deterministic outcomes are stored: timeouts, CPU-limit hits and sandbox crashes
+depend on machine load and are always re-run.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from app.services.sandbox import CPU_LIMIT_ERROR, CRASH_ERROR, TIMEOUT_ERROR
+
+_UNCACHEABLE_ERRORS = {TIMEOUT_ERROR, CPU_LIMIT_ERROR, CRASH_ERROR}
+
+
+def code_digest(code: str) -> str:
+    return hashlib.sha256(code.encode("utf-8")).hexdigest()
+
+
+def test_id(test_input) -> str:
+    encoded = json.dumps(test_input, sort_keys=True, separators=(",", ":"), default=repr)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:32]
+
+
+def is_cacheable(outcome: dict) -> bool:
+    return not outcome.get("skipped") and outcome.get("error") not in _UNCACHEABLE_ERRORS
+
+
+class GradingCache:
+    """TTL + size bounded map of grading outcomes.
+
+    Every entry gets the same TTL, so insertion order is expiry order: expired
+    entries are always at the front of the OrderedDict and pruning is amortized O(1).
+    """
+
+    def __init__(self, ttl_seconds: float = 300.0, max_entries: int = 4096):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[tuple, tuple[float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _prune(self, now: float) -> None:
+        while self._entries:
+            key, (expires_at, _) = next(iter(self._entries.items()))
+            if expires_at > now and len(self._entries) <= self.max_entries:
+                break
+            self._entries.popitem(last=False)
+
+    def get_many(self, keys: list[tuple]) -> list[Optional[dict]]:
+        now = time.monotonic()
+        with self._lock:
+            self._prune(now)
+            found = []
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    self.misses += 1
+                    found.append(None)
+                else:
+                    self.hits += 1
+                    found.append(dict(entry[1]))
+            return found
+
+    def put(self, key: tuple, outcome: dict) -> None:
+        if self.ttl_seconds <= 0 or not is_cacheable(outcome):
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._entries[key] = (now + self.ttl_seconds, dict(outcome))
+            self._entries.move_to_end(key)
+            self._prune(now)
+
+
+_cache: Optional[GradingCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_grading_cache() -> GradingCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            from app.config import GRADING_CACHE_MAX_ENTRIES, GRADING_CACHE_TTL_SECONDS
+
+            _cache = GradingCache(ttl_seconds=GRADING_CACHE_TTL_SECONDS, max_entries=GRADING_CACHE_MAX_ENTRIES)
+        return _cache
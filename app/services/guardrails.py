@@ -0,0 +1,216 @@
+"""Deterministic keyword guardrails, compiled once and shared.
+
+Interview disqualification, non-answer detection, the FAANG-tier resume hard gate
+and job-role prompt-injection filtering used to be lists of ad-hoc `re.search`
+calls inline in their callers. They are now `RuleSet`s of `Rule`s with stable ids:
+
+- every pattern is compiled once, at import;
+- each set also compiles one alternation of every rule's first pattern, so text
+  that can't fire anything (the usual case) costs a single regex pass;
+- sets applied to casefolded text are compiled case-sensitively, which roughly
+  halves the cost of Python's regex engine on long answers;
+- `scan()` returns the rules that fired, in rule order, so callers can log and
+  return exactly which guardrail decided.
+
+A rule with several patterns fires only if all of them match (e.g. "yelled" and
+"coworker"). `python -m app.cli.bench_guardrails` checks every set against
+data/guardrail_corpus.json and times it against per-pattern `re.search`.
+"""
+
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class Rule:
+    id: str
+    patterns: tuple[str, ...]  # all must match
+    verdict: str
+    score: Optional[int] = None  # score cap, for rules that disqualify
+    tags: frozenset = frozenset()
+
+
+@dataclass(frozen=True)
+class RuleHit:
+    rule: Rule
+    match: str  # text matched by the rule's first pattern
+
+    @property
+    def id(self) -> str:
+        return self.rule.id
+
+
+class RuleSet:
+    def __init__(self, name: str, rules: list[Rule], flags: int = 0):
+        ids = [rule.id for rule in rules]
+        if len(set(ids)) != len(ids):
+            raise ValueError(f"Duplicate rule ids in {name}")
+        self.name = name
+        self.rules = tuple(rules)
+        self.flags = flags
+        self._compiled = [(rule, [re.compile(p, flags) for p in rule.patterns]) for rule in rules]
+        # A rule can only fire if its first pattern matches. A shared leading \b is
+        # tested once per position instead of once per rule.
+        firsts = [rule.patterns[0] for rule in rules]
+        if all(p.startswith(r"\b") for p in firsts):
+            combined = r"\b(?:" + "|".join(f"(?:{p[2:]})" for p in firsts) + ")"
+        else:
+            combined = "|".join(f"(?:{p})" for p in firsts)
+        self._prefilter = re.compile(combined, flags)
+
+    def scan(self, text: str) -> list[RuleHit]:
+        if not text or not self._prefilter.search(text):
+            return []
+        hits = []
+        for rule, patterns in self._compiled:
+            first = patterns[0].search(text)
+            if first and all(p.search(text) for p in patterns[1:]):
+                hits.append(RuleHit(rule, first.group(0)))
+        return hits
+
+    def first(self, text: str) -> Optional[RuleHit]:
+        hits = self.scan(text)
+        return hits[0] if hits else None
+
+    def matches(self, text: str) -> bool:
+        return bool(self.scan(text))
+
+
+# Behavioral-interview answers, in precedence order. Expects casefolded text.
+INTERVIEW_DISQUALIFIERS = RuleSet("interview_disqualifiers", [
+    Rule(
+        "yelling_at_coworkers",
+        (r"\b(i\s*(always|usually|often)\s*)?(yell|scream|shout)\b", r"\b(coworker|co-worker|colleague|manager|team|people)\b"),
+        "disqualify",
+        score=5,
+    ),
+    Rule(
+        "admits_no_work",
+        (
+            r"\b(i\s*(did|do)\s*(no|zero)\s*(work|action)|i\s*(did|do)\s*nothing|"
+            r"didn'?t\s*really\s*do\s*any\s*work|took\s*(no|zero)\s*action|"
+            r"i\s*(never|didn'?t)\s*(help|contribute)|i\s*(didn'?t)\s*(contribute|participate))\b",
+        ),
+        "disqualify",
+        score=10,
+    ),
+    Rule(
+        "abandonment",
+        (
+            r"\b(left\s+(my\s+)?team\s+(to\s+)?(handle|do)\s+(it\s+)?(by\s+)?themselves|"
+            r"i\s*(went|left)\s+.*\s+and\s+never\s+came\s+back|ghosted|abandoned|"
+            r"i\s*(just\s*)?stopped\s*(working|showing\s+up)|no\s*show)\b",
+        ),
+        "disqualify",
+        score=10,
+    ),
+    Rule(
+        "violence",
+        (r"\b(kill|murder|shoot|stab|bomb|rape|assault|attack|hurt|harm)\b",),
+        "disqualify",
+        score=5,
+        tags=frozenset({"violence_threat"}),
+    ),
+    Rule(
+        "unethical_intent",
+        (r"\b(steal|fraud|scam|embezzle|sabotage|blackmail|extort|leak\s+secrets|dox|hack)\b",),
+        "disqualify",
+        score=10,
+    ),
+    Rule(
+        "vague_threat_if_hired",
+        (
+            r"\b(i\s*(would|'d)\s*do|i\s*will\s*do)\b[\s\S]{0,40}\b(bad\s+things|something\s+bad)\b",
+            r"\b(if\s+i\s*(get|got)\s+hired|if\s+you\s+hire\s+me|once\s+i\'?m\s+hired)\b",
+        ),
+        "disqualify",
+        score=10,
+    ),
+])
+
+# Filler that makes an answer a non-answer. Expects casefolded text.
+NON_ANSWER_PHRASES = RuleSet("non_answer_phrases", [
+    Rule("skip", (r"\b(pass|skip|n/?a|no\s+comment)\b",), "non_answer"),
+    Rule("prefer_not_to_say", (r"\bprefer\s+not\s+to\s+say\b",), "non_answer"),
+    Rule("dont_know", (r"\b(idk|i\s+don'?t\s+know|no\s+idea|whatever)\b",), "non_answer"),
+    Rule("keyboard_mash", (r"\b(asdf|qwer|lorem|ipsum|blah)\b",), "non_answer"),
+])
+
+# Explicit top-tier signals required by preset FAANG-tier resume screening (any case).
+HARD_GATE_SIGNALS = RuleSet("hard_gate_signals", [
+    Rule(
+        "top_company",
+        (
+            r"\b(google|alphabet|meta|facebook|amazon|aws|apple|microsoft|netflix|openai|anthropic|deepmind|nvidia|tesla|uber|airbnb|stripe|databricks|palantir|snowflake|coinbase|doordash|bloomberg|two\s+sigma|citadel|jane\s+street)\b",
+        ),
+        "top_tier_signal",
+    ),
+    Rule("competitive_programming", (r"\b(codeforces|icpc|ioi|usaco|acm\s+icpc|topcoder|kaggle\s+(master|grandmaster))\b",), "top_tier_signal"),
+    Rule("oss_leadership", (r"\b(maintainer|core\s+contributor|tech\s+lead|team\s+lead)\b",), "top_tier_signal"),
+    Rule("oss_traction", (r"\b(\d{3,})\s*(stars|downloads)\b",), "top_tier_signal"),
+    Rule("product_traction", (r"\b(10,?000\+?)\s*(users|customers)\b",), "top_tier_signal"),
+    Rule("research", (r"\b(publication|published|paper|arxiv)\b",), "top_tier_signal"),
+], flags=re.IGNORECASE)
+
+# Prompt-injection phrasing in user-supplied job roles. Expects casefolded text.
+PROMPT_INJECTION = RuleSet("prompt_injection", [
+    Rule("ignore_all_previous", (r"ignore\s+all\s+previous\s+instructions",), "reject"),
+    Rule("ignore_previous", (r"ignore\s+previous\s+instructions",), "reject"),
+    Rule("ignore_all", (r"ignore\s+all\s+instructions",), "reject"),
+    Rule("system_prompt", (r"system\s+prompt",), "reject"),
+    Rule("developer_message", (r"developer\s+message",), "reject"),
+    Rule("persona", (r"you\s+are\s+chatgpt",), "reject"),
+    Rule("give_score", (r"give\s+the\s+user\s+\d+",), "reject"),
+    Rule("return_number", (r"return\s+\d+",), "reject"),
+    Rule("always_give", (r"always\s+give\s+\d+",), "reject"),
+    Rule("score_number", (r"score\s+\d+",), "reject"),
+])
+
+RULE_SETS = {
+    rule_set.name: rule_set
+    for rule_set in (INTERVIEW_DISQUALIFIERS, NON_ANSWER_PHRASES, HARD_GATE_SIGNALS, PROMPT_INJECTION)
+}
+
+_WHITESPACE = re.compile(r"\s+")
+_WORD = re.compile(r"[a-zA-Z']+")
+_ALPHA = re.compile(r"[A-Za-z]")
+_NON_WHITESPACE = re.compile(r"\S")
+
+
+def non_answer_reasons(text: str, quick: bool = False) -> list[str]:
+    """Why an interview answer looks like a non-answer ([] if it doesn't).
+
+    `quick` only checks emptiness, skip phrases and length, as the light-weight
+    evaluation fallback always has.
+    """
+    t = _WHITESPACE.sub(" ", (text or "").strip())
+    if not t:
+        return ["empty"]
+    lower = t.casefold()
+    reasons = []
+    for hit in NON_ANSWER_PHRASES.scan(lower):
+        if quick and hit.id != "skip":
+            continue
+        if hit.id == "dont_know" and len(lower) >= 120:
+            continue
+        reasons.append(hit.id)
+
+    words = _WORD.findall(lower)
+    wc = len(words)
+    if wc < 6:
+        reasons.append("too_short")
+    if quick:
+        return reasons
+    # Repeating the same word over and over.
+    if wc >= 10 and Counter(words).most_common(1)[0][1] / wc >= 0.45:
+        reasons.append("repetitive")
+    # Mostly non-alphabetic characters.
+    non_ws = len(_NON_WHITESPACE.findall(t))
+    if non_ws > 0 and len(_ALPHA.findall(t)) / non_ws < 0.35:
+        reasons.append("mostly_symbols")
+    # Extremely low lexical diversity in a longer answer.
+    if wc >= 25 and len(set(words)) / wc < 0.25:
+        reasons.append("low_diversity")
+    return reasons
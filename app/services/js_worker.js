@@ -0,0 +1,127 @@
+// Long-lived JavaScript grading worker (driven by app/services/node_pool.py).
+//
+// Reads one JSON job per line on stdin:
+//   {"mode": "leetcode" | "generated", "code": "...", "functionName": "twoSum",
+//    "inputs": ["<json>", ...], "timeoutMs": 2000}
+// and writes one JSON line per input to stdout, in order:
+//   {"result": ..., "error": null | "...", "elapsedMs": 0.12}
+//
+// Every job runs in a fresh vm context (no require/process), so submissions can't
+// see each other. Nothing from the worker's own realm is put into a context: the
+// global is a null-prototype object and the console stubs are created inside it,
+// since any host function's `.constructor` would hand a submission the worker's
+// real Function (and so its globals, e.g. the JSON used for the next candidate's
+// results). The submission is evaluated once; each test input is parsed, and each
+// result serialized, inside the context under the vm timeout.
+
+'use strict';
+
+const vm = require('vm');
+const readline = require('readline');
+
+const TIMEOUT_ERROR = 'Execution timeout';
+
+// The worker's own serializers, saved before any submission runs.
+const stringify = JSON.stringify;
+const parseJSON = JSON.parse;
+
+const CONSOLE_STUB = '({ log() {}, error() {}, warn() {}, info() {}, debug() {} })';
+
+// Same argument mapping as the old spawn-per-test wrapper.
+const LEETCODE_INVOKE = `
+(function (fn, testInput) {
+  if (testInput.nums !== undefined && testInput.target !== undefined) {
+    return fn(testInput.nums, testInput.target);
+  } else if (testInput.nums !== undefined && testInput.k !== undefined) {
+    return fn(testInput.nums, testInput.k);
+  } else if (testInput.s !== undefined && testInput.t !== undefined) {
+    return fn(testInput.s, testInput.t);
+  } else if (testInput.s !== undefined) {
+    return fn(testInput.s);
+  }
+  return fn(Object.values(testInput)[0]);
+})`;
+
+const GENERATED_INVOKE = '(function (fn, testInput) { return fn(testInput); })';
+
+function errorMessage(e) {
+  if (e && e.code === 'ERR_SCRIPT_EXECUTION_TIMEOUT') return TIMEOUT_ERROR;
+  if (e && typeof e.message === 'string') return e.message;
+  return String(e);
+}
+
+function write(outcome) {
+  process.stdout.write(stringify(outcome) + '\n');
+}
+
+function decodeResult(encoded) {
+  // `encoded` is `JSON.stringify({result})` from inside the context: undefined ->
+  // null, values that don't serialize have already thrown. Anything but a string
+  // means the submission replaced its own JSON; it gets no result.
+  if (typeof encoded !== 'string') return null;
+  return parseJSON(encoded).result;
+}
+
+function runJob(job) {
+  const timeout = Math.max(1, Math.round(job.timeoutMs || 2000));
+  const options = { timeout, microtaskMode: 'afterEvaluate' };
+  const context = vm.createContext(Object.create(null), { codeGeneration: { strings: true, wasm: false } });
+  context.console = new vm.Script(CONSOLE_STUB).runInContext(context);
+
+  let fn = null;
+  let invoke = null;
+  let setupError = null;
+  try {
+    new vm.Script(job.code, { filename: 'solution.js' }).runInContext(context, options);
+    const name = /^[A-Za-z_$][\w$]*$/.test(job.functionName || '') ? job.functionName : 'solution';
+    fn = new vm.Script(
+      `(typeof ${name} === 'function') ? ${name} : ((typeof solution === 'function') ? solution : null)`,
+    ).runInContext(context, options);
+    if (!fn) throw new Error('Solution function not found');
+    invoke = new vm.Script(job.mode === 'generated' ? GENERATED_INVOKE : LEETCODE_INVOKE).runInContext(context, options);
+  } catch (e) {
+    setupError = errorMessage(e);
+  }
+
+  const parse = new vm.Script('JSON.parse(__input)');
+  const call = new vm.Script('__invoke(__fn, __parsed)');
+  const encode = new vm.Script('JSON.stringify({ result: __result })');
+  for (const input of job.inputs) {
+    if (setupError) {
+      write({ result: null, error: setupError, elapsedMs: 0 });
+      continue;
+    }
+    let started = process.hrtime.bigint();
+    let outcome;
+    try {
+      context.__invoke = invoke;
+      context.__fn = fn;
+      context.__input = input;
+      // Parse outside the timed part so elapsedMs only covers the solution.
+      context.__parsed = parse.runInContext(context, options);
+      started = process.hrtime.bigint();
+      context.__result = call.runInContext(context, options);
+      const elapsed = Number(process.hrtime.bigint() - started) / 1e6;
+      outcome = { result: decodeResult(encode.runInContext(context, options)), error: null, elapsedMs: elapsed };
+    } catch (e) {
+      outcome = { result: null, error: errorMessage(e) };
+    }
+    if (outcome.elapsedMs === undefined) {
+      outcome.elapsedMs = Number(process.hrtime.bigint() - started) / 1e6;
+    }
+    write(outcome);
+  }
+}
+
+const rl = readline.createInterface({ input: process.stdin, terminal: false });
+rl.on('line', (line) => {
+  if (!line.trim()) return;
+  let job;
+  try {
+    job = parseJSON(line);
+  } catch (e) {
+    return;
+  }
+  runJob(job);
+});
+rl.on('close', () => process.exit(0));
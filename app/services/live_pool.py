@@ -0,0 +1,235 @@
+"""Pre-connected Gemini Live sessions for the behavioral interview.
+
+Opening a Live session (WebSocket handshake + setup round trip) used to happen
+after the candidate connected, so its latency landed in their wait for the first
+question. The pool keeps up to `size` sessions already set up per (model, config)
+and hands one to the next interview that asks for the same config:
+
+- `connect(model, config)` is a drop-in for `client.aio.live.connect(...)`: it
+  yields a warm session when one is ready (a hit) and opens a new one otherwise
+  (a miss); either way the session is closed when the `async with` block exits;
+- each config has a background task that tops its pool back up after a claim and
+  replaces sessions older than `max_age_seconds`, before Live's own idle limits;
+- a config nobody has claimed for `idle_seconds` is dropped and its sessions are
+  closed, so an idle server doesn't hold Live connections; keys are learned from
+  traffic (or warmed explicitly) and bounded to `max_keys`.
+
+Sessions are handed out once. Only configs that are the same for every interview
+(no company, role or resumption handle in them) are worth pooling.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+
+def live_config_key(model: str, config: dict) -> str:
+    payload = json.dumps([model, config], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class _WarmSession:
+    context: Any  # the entered `live.connect()` context manager
+    session: Any
+    created_at: float
+
+
+class PooledConnection:
+    """Async context manager returned by `LiveSessionPool.connect`."""
+
+    def __init__(self, pool: "LiveSessionPool", model: str, config: dict):
+        self._pool = pool
+        self._model = model
+        self._config = config
+        self._context = None
+        self.warm = False
+        self.age_ms: Optional[int] = None
+
+    async def __aenter__(self):
+        warm = self._pool.take(self._model, self._config)
+        if warm is not None:
+            self.warm = True
+            self.age_ms = int((time.monotonic() - warm.created_at) * 1000)
+            self._context = warm.context
+            return warm.session
+        self._context = self._pool._connect(self._model, self._config)
+        return await self._context.__aenter__()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return await self._context.__aexit__(exc_type, exc, tb)
+
+
+class LiveSessionPool:
+    def __init__(
+        self,
+        connect: Callable[[str, dict], Any],
+        size: int = 1,
+        max_age_seconds: float = 120,
+        idle_seconds: float = 15 * 60,
+        max_keys: int = 4,
+    ):
+        # connect(model, config) -> async context manager yielding a Live session
+        self._connect = connect
+        self.size = max(1, size)
+        self.max_age_seconds = max_age_seconds
+        self.idle_seconds = idle_seconds
+        self.max_keys = max(1, max_keys)
+        # key -> (model, config), in least-recently-claimed order
+        self._configs: "OrderedDict[str, tuple[str, dict]]" = OrderedDict()
+        self._last_claimed: dict[str, float] = {}
+        self._ready: dict[str, deque] = {}
+        self._wakeups: dict[str, asyncio.Event] = {}
+        self._refills: dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.opened = 0
+        self.expired = 0
+        self.failures = 0
+        self._claimed_age_total = 0.0
+        self.max_claimed_age_ms = 0
+
+    def connect(self, model: str, config: dict) -> PooledConnection:
+        return PooledConnection(self, model, config)
+
+    def _track(self, key: str, model: str, config: dict) -> None:
+        self._configs[key] = (model, config)
+        self._configs.move_to_end(key)
+        self._last_claimed[key] = time.monotonic()
+        self._ready.setdefault(key, deque())
+        self._wakeups.setdefault(key, asyncio.Event())
+        while len(self._configs) > self.max_keys:
+            old, _ = self._configs.popitem(last=False)
+            self._forget(old)
+
+    def _forget(self, key: str) -> None:
+        self._configs.pop(key, None)
+        self._last_claimed.pop(key, None)
+        self._wakeups.pop(key, None)
+        for warm in self._ready.pop(key, ()):
+            self._close_later(warm)
+        task = self._refills.pop(key, None)
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+
+    def take(self, model: str, config: dict) -> Optional[_WarmSession]:
+        """A ready session for this config, or None; schedules a refill either way."""
+        key = live_config_key(model, config)
+        self._track(key, model, config)
+        ready = self._ready[key]
+        now = time.monotonic()
+        warm = None
+        while ready:
+            candidate = ready.popleft()
+            if now - candidate.created_at < self.max_age_seconds:
+                warm = candidate
+                break
+            self.expired += 1
+            self._close_later(candidate)
+        if warm is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            age_ms = int((now - warm.created_at) * 1000)
+            self._claimed_age_total += age_ms
+            self.max_claimed_age_ms = max(self.max_claimed_age_ms, age_ms)
+        self._schedule_refill(key)
+        return warm
+
+    def warm(self, model: str, config: dict) -> None:
+        key = live_config_key(model, config)
+        self._track(key, model, config)
+        self._schedule_refill(key)
+
+    def _schedule_refill(self, key: str) -> None:
+        self._wakeups[key].set()
+        task = self._refills.get(key)
+        if task is not None and not task.done():
+            return
+        self._refills[key] = asyncio.get_running_loop().create_task(self._refill(key))
+
+    async def _open(self, model: str, config: dict) -> _WarmSession:
+        context = self._connect(model, config)
+        session = await context.__aenter__()
+        return _WarmSession(context, session, time.monotonic())
+
+    async def _close(self, warm: _WarmSession) -> None:
+        try:
+            await warm.context.__aexit__(None, None, None)
+        except Exception as e:
+            print(f"[live-pool] closing a session failed: {e}")
+
+    def _close_later(self, warm: _WarmSession) -> None:
+        asyncio.get_running_loop().create_task(self._close(warm))
+
+    async def _refill(self, key: str) -> None:
+        failures = 0
+        while key in self._configs:
+            now = time.monotonic()
+            ready = self._ready[key]
+            while ready and now - ready[0].created_at >= self.max_age_seconds:
+                self.expired += 1
+                self._close_later(ready.popleft())
+            idle_for = now - self._last_claimed[key]
+            if idle_for >= self.idle_seconds:
+                print(f"[live-pool] no interviews for {idle_for:.0f}s; closing sessions for {key}")
+                self._forget(key)
+                return
+            if len(ready) < self.size:
+                model, config = self._configs[key]
+                try:
+                    warm = await self._open(model, config)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    # Back off instead of hammering Live; claims fall back to direct connects.
+                    self.failures += 1
+                    failures += 1
+                    print(f"[live-pool] connect failed for {key}: {e}")
+                    await asyncio.sleep(min(60.0, 2.0 ** failures))
+                    continue
+                failures = 0
+                self.opened += 1
+                if key in self._configs:
+                    self._ready[key].append(warm)
+                else:
+                    await self._close(warm)
+                continue
+            # Full: sleep until the oldest session ages out, the key idles out, or a claim.
+            wakeup = self._wakeups[key]
+            wakeup.clear()
+            timeout = min(
+                self.max_age_seconds - (now - ready[0].created_at),
+                self.idle_seconds - idle_for,
+            )
+            try:
+                await asyncio.wait_for(wakeup.wait(), max(0.1, timeout))
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self) -> dict:
+        return {
+            "keys": len(self._configs),
+            "ready": sum(len(ready) for ready in self._ready.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "opened": self.opened,
+            "expired": self.expired,
+            "failures": self.failures,
+            "avg_claimed_age_ms": int(self._claimed_age_total / self.hits) if self.hits else None,
+            "max_claimed_age_ms": self.max_claimed_age_ms,
+        }
+
+    async def close(self) -> None:
+        tasks = [task for task in self._refills.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._refills.clear()
+        sessions = [warm for ready in self._ready.values() for warm in ready]
+        self._ready.clear()
+        await asyncio.gather(*(self._close(warm) for warm in sessions), return_exceptions=True)
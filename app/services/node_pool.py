@@ -0,0 +1,275 @@
+"""Pool of long-lived Node.js workers for JavaScript grading.
+
+Spawning `node` per test case costs ~40-80 ms of startup each, which dominated
+JavaScript grading. Workers here run `js_worker.js`, take a whole submission plus
+all of its test inputs as one JSON line on stdin, and stream back one JSON line per
+test. Each submission is evaluated in a fresh `vm` context that holds no objects
+from the worker's realm, with a per-test vm timeout; the parent also enforces a
+wall-clock deadline per test and replaces the worker if it overruns. Workers are
+recycled after `max_jobs_per_worker` submissions. Like the sandbox pool, blocking
+pipe I/O runs on the pool's own threads, one per worker, and workers get only the
+allowlisted environment and an empty working directory.
+
+Benchmark against the spawn-per-test path with `python -m app.cli.bench_node_pool`.
+"""
+
+import asyncio
+import functools
+import json
+import os
+import queue
+import select
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from app.services.sandbox import CRASH_ERROR, TIMEOUT_ERROR, skipped_outcome, worker_environ
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "js_worker.js")
+
+# Modes understood by js_worker.js.
+MODES = {"leetcode", "generated"}
+
+
+class _NodeWorker:
+    def __init__(self, node_binary: str, memory_mb: int, workdir: str):
+        self.process = subprocess.Popen(
+            [node_binary, f"--max-old-space-size={memory_mb}", WORKER_SCRIPT],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env=worker_environ(),
+            cwd=workdir,
+        )
+        self.jobs = 0
+        self._buffer = b""
+
+    def send(self, message: dict) -> None:
+        self.process.stdin.write(json.dumps(message).encode("utf-8") + b"\n")
+        self.process.stdin.flush()
+
+    def read_line(self, timeout: float) -> Optional[bytes]:
+        """Next stdout line, or None if `timeout` passes first. Raises EOFError if the worker died."""
+        deadline = time.monotonic() + timeout
+        fd = self.process.stdout.fileno()
+        while b"\n" not in self._buffer:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if not ready:
+                return None
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                raise EOFError
+            self._buffer += chunk
+        line, self._buffer = self._buffer.split(b"\n", 1)
+        return line
+
+    def kill(self) -> None:
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        if self.process.poll() is None:
+            self.process.kill()
+        try:
+            self.process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            pass
+
+
+class NodePool:
+    def __init__(
+        self,
+        size: int = 2,
+        cpu_seconds: float = 2.0,
+        wall_seconds: float = 5.0,
+        memory_mb: int = 256,
+        max_jobs_per_worker: int = 100,
+        node_binary: str = "node",
+    ):
+        self.size = max(1, size)
+        self.cpu_seconds = cpu_seconds
+        self.wall_seconds = wall_seconds
+        self.memory_mb = memory_mb
+        self.max_jobs_per_worker = max(1, max_jobs_per_worker)
+        self.node_binary = shutil.which(node_binary) or node_binary
+        self._idle: "queue.Queue[_NodeWorker]" = queue.Queue()
+        self._workers: set[_NodeWorker] = set()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="node-pool")
+        self._workdir: Optional[str] = None
+
+    def start(self) -> "NodePool":
+        self._workdir = tempfile.mkdtemp(prefix="node-pool-")
+        os.chmod(self._workdir, 0o500)
+        for _ in range(self.size):
+            self._idle.put(self._spawn())
+        return self
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            workers = list(self._workers)
+            self._workers.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        for w in workers:
+            w.kill()
+        if self._workdir is not None:
+            shutil.rmtree(self._workdir, ignore_errors=True)
+
+    def _spawn(self) -> _NodeWorker:
+        w = _NodeWorker(self.node_binary, self.memory_mb, self._workdir)
+        with self._lock:
+            self._workers.add(w)
+        return w
+
+    def _retire(self, w: _NodeWorker) -> None:
+        with self._lock:
+            self._workers.discard(w)
+        w.kill()
+
+    def _release(self, w: _NodeWorker, healthy: bool) -> None:
+        if healthy and w.jobs < self.max_jobs_per_worker and not self._closed:
+            self._idle.put(w)
+            return
+        self._retire(w)
+        if not self._closed:
+            self._idle.put(self._spawn())
+
+    def submit_batch(
+        self,
+        mode: str,
+        code: str,
+        test_inputs: list[dict],
+        function_name: str = "solution",
+        on_outcome: Optional[Callable[[int, dict], None]] = None,
+        stop: Optional[threading.Event] = None,
+        cpu_seconds: Optional[float] = None,
+        wall_seconds: Optional[float] = None,
+    ) -> list[dict]:
+        """Run every test input through one evaluated submission (blocking).
+
+        Same contract as `SandboxPool.submit_batch`: one `{"result", "error",
+        "elapsed_ms"}` per test in order, per-test limits, `on_outcome` callbacks and
+        early stop via `stop`.
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown Node job mode: {mode}")
+        if self._closed:
+            raise RuntimeError("Node pool is closed")
+
+        # Serialize once; the worker parses each input inside the vm context, which
+        # also gives every test its own copy.
+        encoded = [json.dumps(test_input) for test_input in test_inputs]
+        cpu = self.cpu_seconds if cpu_seconds is None else cpu_seconds
+        wall = self.wall_seconds if wall_seconds is None else wall_seconds
+        outcomes: list[dict] = []
+
+        def _record(outcome: dict) -> None:
+            outcomes.append(outcome)
+            if on_outcome is not None:
+                on_outcome(len(outcomes) - 1, outcome)
+
+        while len(outcomes) < len(encoded):
+            if stop is not None and stop.is_set():
+                outcomes.extend(skipped_outcome() for _ in range(len(encoded) - len(outcomes)))
+                break
+            remaining = encoded[len(outcomes):]
+            w = self._idle.get()
+            healthy = False
+            try:
+                w.jobs += 1
+                try:
+                    w.send({
+                        "mode": mode,
+                        "code": code,
+                        "functionName": function_name,
+                        "inputs": remaining,
+                        "timeoutMs": cpu * 1000,
+                    })
+                    for _ in remaining:
+                        if stop is not None and stop.is_set():
+                            break
+                        line = w.read_line(wall)
+                        if line is None:
+                            _record({"result": None, "error": TIMEOUT_ERROR, "elapsed_ms": wall * 1000})
+                            break
+                        reply = json.loads(line)
+                        _record({"result": reply.get("result"), "error": reply.get("error"), "elapsed_ms": reply.get("elapsedMs")})
+                    else:
+                        healthy = True
+                except (EOFError, OSError, ValueError):
+                    _record({"result": None, "error": CRASH_ERROR, "elapsed_ms": None})
+            finally:
+                self._release(w, healthy)
+        return outcomes
+
+    async def run_batch(
+        self,
+        mode: str,
+        code: str,
+        test_inputs: list[dict],
+        function_name: str = "solution",
+        on_outcome: Optional[Callable[[int, dict], None]] = None,
+        stop: Optional[threading.Event] = None,
+        cpu_seconds: Optional[float] = None,
+        wall_seconds: Optional[float] = None,
+    ) -> list[dict]:
+        """Async wrapper for `submit_batch` that keeps the event loop free."""
+        call = functools.partial(
+            self.submit_batch,
+            mode,
+            code,
+            list(test_inputs),
+            function_name,
+            on_outcome=on_outcome,
+            stop=stop,
+            cpu_seconds=cpu_seconds,
+            wall_seconds=wall_seconds,
+        )
+        return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+
+
+_pool: Optional[NodePool] = None
+_pool_lock = threading.Lock()
+
+
+def get_node_pool() -> Optional[NodePool]:
+    """Process-wide pool, created on first use. None if disabled (NODE_WORKERS=0) or node is missing."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            from app.config import (
+                NODE_MAX_JOBS_PER_WORKER,
+                NODE_MEMORY_MB,
+                NODE_WORKERS,
+                SANDBOX_CPU_SECONDS,
+                SANDBOX_WALL_SECONDS,
+            )
+
+            if NODE_WORKERS <= 0 or shutil.which("node") is None:
+                return None
+            _pool = NodePool(
+                size=NODE_WORKERS,
+                cpu_seconds=SANDBOX_CPU_SECONDS,
+                wall_seconds=SANDBOX_WALL_SECONDS,
+                memory_mb=NODE_MEMORY_MB,
+                max_jobs_per_worker=NODE_MAX_JOBS_PER_WORKER,
+            ).start()
+        return _pool
+
+
+def shutdown_node_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
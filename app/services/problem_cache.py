@@ -0,0 +1,96 @@
+"""Shared cache of AI-generated technical problems.
+
+A problem is generated from question metadata only (title, difficulty, topics), so
+every client asking for the same question can be served the same problems. Up to
+`variants` problems are kept per (question id, metadata hash, prompt version); once
+a key has all its variants, requests get a random one of them and no longer call
+the model, so LLM calls scale with distinct questions rather than users.
+
+Problems live in one id-indexed store; generated-problem sessions keep the problem
+id, not a copy. The store is TTL- and size-bounded, and grading a session touches
+its problem, so problems in use are the last to go.
+"""
+
+import hashlib
+import json
+import random
+import uuid
+from collections.abc import MutableMapping
+from typing import Optional
+
+
+def problem_cache_key(question: dict, prompt_version: str) -> Optional[str]:
+    qid = str(question.get("id") or question.get("question_id") or "").strip()
+    if not qid:
+        return None
+    topics = question.get("topics") if isinstance(question.get("topics"), list) else []
+    metadata = {
+        "title": str(question.get("title") or "").strip(),
+        "difficulty": str(question.get("difficulty") or "medium").strip().lower(),
+        "topics": [str(t) for t in topics[:8]],
+    }
+    digest = hashlib.sha256(json.dumps(metadata, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    return f"{qid}:{digest}:p{prompt_version}"
+
+
+class ProblemCache:
+    """Problems by id plus the variant ids of each key, on two MutableMappings.
+
+    The mappings are state-store namespaces (see app/services/state_backend.py), so
+    with a shared backend every worker sees the same problems and variants.
+    """
+
+    def __init__(self, problems: MutableMapping, variant_ids: MutableMapping, variants: int = 3):
+        self.variants = variants
+        self._problems = problems
+        self._variant_ids = variant_ids
+        self.hits = 0
+        self.misses = 0
+
+    def add(self, problem: dict, key: Optional[str] = None) -> str:
+        """Store a problem and return its id; with `key`, it becomes a shared variant."""
+        problem_id = uuid.uuid4().hex
+        self._problems[problem_id] = problem
+        if key is not None and self.variants > 0:
+            ids = self._live_ids(key)
+            if len(ids) < self.variants:
+                self._variant_ids[key] = ids + [problem_id]
+        return problem_id
+
+    def _live_ids(self, key: str) -> list[str]:
+        ids = self._variant_ids.get(key) or []
+        # Variants whose problem was evicted from the store are forgotten lazily.
+        live = [problem_id for problem_id in ids if problem_id in self._problems]
+        if len(live) != len(ids):
+            self._variant_ids[key] = live
+        return live
+
+    def get(self, problem_id: Optional[str]) -> Optional[dict]:
+        # Reading refreshes the problem's TTL, so problems in use are kept.
+        return self._problems.get(problem_id) if problem_id else None
+
+    def missing(self, key: Optional[str]) -> Optional[int]:
+        """How many more variants `key` takes before it is served from cache; None if unshared."""
+        if self.variants <= 0 or key is None:
+            return None
+        return max(0, self.variants - len(self._live_ids(key)))
+
+    def pick(self, key: Optional[str]) -> Optional[tuple[str, dict]]:
+        """A random cached variant once `key` has all of them, else None (generate one more)."""
+        if self.variants <= 0 or key is None:
+            self.misses += 1
+            return None
+        ids = self._live_ids(key)
+        if len(ids) < self.variants:
+            self.misses += 1
+            return None
+        problem_id = random.choice(ids)
+        problem = self.get(problem_id)
+        if problem is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return problem_id, problem
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses}
@@ -0,0 +1,161 @@
+"""Background pre-generation of AI technical problems.
+
+Generating a problem (prompt + 13 tests) is a multi-second Gemini call on the
+request path. The pool keeps up to `target` validated problems ready per
+(question id, difficulty): a request takes one in O(1), and when a key drops
+below `low_watermark` a background task tops it up again.
+
+Keys are learned from traffic (or warmed explicitly) and bounded to `max_keys`,
+least recently requested first out. Background generation shares an hourly call
+budget and a concurrency limit, so an idle pool never spends quota and a busy one
+can't exceed it. Each problem is handed out once.
+
+`demand(question)` optionally caps a key below `target`: the backend passes the
+number of shared variants the problem cache still lacks, so once a question is
+served from cache the pool stops generating problems for it.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from typing import Awaitable, Callable, Optional
+
+ProblemKey = tuple[str, str]
+
+
+def problem_key(question: dict) -> Optional[ProblemKey]:
+    qid = str(question.get("id") or question.get("question_id") or "").strip()
+    if not qid:
+        return None
+    return qid, str(question.get("difficulty") or "medium").strip().lower()
+
+
+class ProblemPool:
+    def __init__(
+        self,
+        generate: Callable[[dict], Awaitable[dict]],
+        target: int = 3,
+        low_watermark: int = 1,
+        hourly_budget: int = 60,
+        concurrency: int = 2,
+        max_keys: int = 200,
+        demand: Optional[Callable[[dict], Optional[int]]] = None,
+    ):
+        self._generate = generate
+        self._demand = demand
+        self.target = max(1, target)
+        self.low_watermark = min(max(0, low_watermark), self.target)
+        self.hourly_budget = hourly_budget
+        self.concurrency = max(1, concurrency)
+        self.max_keys = max(1, max_keys)
+        # key -> question metadata used to generate more, in least-recently-requested order
+        self._questions: "OrderedDict[ProblemKey, dict]" = OrderedDict()
+        self._ready: dict[ProblemKey, deque] = {}
+        self._refills: dict[ProblemKey, asyncio.Task] = {}
+        self._calls: deque = deque()  # monotonic times of background calls in the last hour
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.hits = 0
+        self.misses = 0
+        self.generated = 0
+        self.failures = 0
+        self.budget_exhausted = 0
+
+    def _track(self, key: ProblemKey, question: dict) -> None:
+        self._questions[key] = question
+        self._questions.move_to_end(key)
+        self._ready.setdefault(key, deque())
+        while len(self._questions) > self.max_keys:
+            old, _ = self._questions.popitem(last=False)
+            self._ready.pop(old, None)
+            task = self._refills.pop(old, None)
+            if task is not None:
+                task.cancel()
+
+    def _goal(self, key: ProblemKey) -> int:
+        """How many ready problems to keep for `key`: `target`, capped by `demand`."""
+        if self._demand is None:
+            return self.target
+        wanted = self._demand(self._questions[key])
+        return self.target if wanted is None else min(self.target, wanted)
+
+    def take(self, question: dict) -> Optional[dict]:
+        """A ready problem for this question, or None; schedules a refill either way."""
+        key = problem_key(question)
+        if key is None:
+            return None
+        self._track(key, question)
+        ready = self._ready[key]
+        problem = ready.popleft() if ready else None
+        if problem is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        if len(ready) <= self.low_watermark and len(ready) < self._goal(key):
+            self._schedule_refill(key)
+        return problem
+
+    def warm(self, questions: list[dict]) -> None:
+        for question in questions:
+            key = problem_key(question)
+            if key is not None:
+                self._track(key, question)
+                if len(self._ready[key]) < self._goal(key):
+                    self._schedule_refill(key)
+
+    def _schedule_refill(self, key: ProblemKey) -> None:
+        task = self._refills.get(key)
+        if task is not None and not task.done():
+            return
+        self._refills[key] = asyncio.get_running_loop().create_task(self._refill(key))
+
+    def _spend_budget(self) -> bool:
+        now = time.monotonic()
+        while self._calls and now - self._calls[0] > 3600:
+            self._calls.popleft()
+        if len(self._calls) >= self.hourly_budget:
+            return False
+        self._calls.append(now)
+        return True
+
+    async def _refill(self, key: ProblemKey) -> None:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        while key in self._questions and len(self._ready[key]) < self._goal(key):
+            if not self._spend_budget():
+                self.budget_exhausted += 1
+                print(f"[problem-pool] hourly budget ({self.hourly_budget}) spent; not refilling {key}")
+                return
+            try:
+                async with self._semaphore:
+                    problem = await self._generate(self._questions[key])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Don't hammer a failing model; the next request retries.
+                self.failures += 1
+                print(f"[problem-pool] generation failed for {key}: {e}")
+                return
+            self.generated += 1
+            ready = self._ready.get(key)
+            if ready is not None:
+                ready.append(problem)
+
+    def stats(self) -> dict:
+        return {
+            "keys": len(self._questions),
+            "ready": sum(len(ready) for ready in self._ready.values()),
+            "refilling": sum(1 for task in self._refills.values() if not task.done()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "generated": self.generated,
+            "failures": self.failures,
+            "budget_exhausted": self.budget_exhausted,
+            "budget_used_last_hour": len(self._calls),
+        }
+
+    async def close(self) -> None:
+        tasks = [task for task in self._refills.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._refills.clear()
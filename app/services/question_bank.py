@@ -0,0 +1,162 @@
+"""Technical-interview question bank, loaded lazily from data/technical_questions.json.
+
+The file is versioned:
+
+    {"version": 1,
+     "levels": {"easy": [question, ...], "medium": [...], "hard": [...]},
+     "grading": {"<question id>": {"function_name": "twoSum",
+                                   "normalizer": "sorted_triplets",  # optional
+                                   "python_only": true}}}          # optional
+
+Question dicts are served to the frontend as-is; grading metadata stays on the
+server. The first lookup parses the file once and builds id-indexed maps, so
+finding a question is a dict lookup and adding questions costs nothing at import.
+"""
+
+import json
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+SUPPORTED_VERSIONS = {1}
+LEVELS = ("easy", "medium", "hard")
+
+
+def _sort_key(value: Any) -> str:
+    return "|".join(map(str, value)) if isinstance(value, list) else str(value)
+
+
+def _sorted_triplets(value: Any) -> Any:
+    # three-sum: order within and across triplets doesn't matter.
+    if not isinstance(value, list):
+        return value
+    try:
+        triplets = [sorted(t) if isinstance(t, list) else t for t in value]
+        return sorted(triplets, key=_sort_key)
+    except Exception:
+        return value
+
+
+def _sorted(value: Any) -> Any:
+    # top-k-frequent: any order.
+    if not isinstance(value, list):
+        return value
+    try:
+        return sorted(value)
+    except Exception:
+        return value
+
+
+def _sorted_groups(value: Any) -> Any:
+    # group-anagrams: order within and across groups doesn't matter.
+    if not isinstance(value, list):
+        return value
+    groups = []
+    for group in value:
+        if isinstance(group, list):
+            try:
+                groups.append(sorted(group))
+            except Exception:
+                groups.append(group)
+        else:
+            groups.append(group)
+    try:
+        return sorted(groups, key=_sort_key)
+    except Exception:
+        return groups
+
+
+NORMALIZERS: dict[str, Callable[[Any], Any]] = {
+    "sorted_triplets": _sorted_triplets,
+    "sorted": _sorted,
+    "sorted_groups": _sorted_groups,
+}
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+@dataclass(frozen=True)
+class GradingMeta:
+    function_name: str = "solution"
+    normalize: Callable[[Any], Any] = _identity
+    # The JS runner has no linked-list helpers.
+    python_only: bool = False
+
+    def normalize_output(self, value: Any) -> Any:
+        return None if value is None else self.normalize(value)
+
+
+class QuestionBank:
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._loaded = False
+        self.version: Optional[int] = None
+        self._by_level: dict[str, list[dict]] = {}
+        self._by_id: dict[str, dict] = {}
+        self._grading: dict[str, GradingMeta] = {}
+
+    def _load(self) -> None:
+        with open(self.path, encoding="utf-8") as f:
+            doc = json.load(f)
+        version = doc.get("version")
+        if version not in SUPPORTED_VERSIONS:
+            raise ValueError(f"Unsupported question bank version {version!r} in {self.path}")
+
+        by_level = {level: list(doc.get("levels", {}).get(level, [])) for level in LEVELS}
+        by_id = {}
+        for questions in by_level.values():
+            for question in questions:
+                if question["id"] in by_id:
+                    raise ValueError(f"Duplicate question id in {self.path}: {question['id']}")
+                by_id[question["id"]] = question
+
+        grading = {}
+        for qid, meta in (doc.get("grading") or {}).items():
+            normalizer = meta.get("normalizer")
+            if normalizer is not None and normalizer not in NORMALIZERS:
+                raise ValueError(f"Unknown normalizer {normalizer!r} for {qid} in {self.path}")
+            grading[qid] = GradingMeta(
+                function_name=meta.get("function_name") or "solution",
+                normalize=NORMALIZERS[normalizer] if normalizer else _identity,
+                python_only=bool(meta.get("python_only")),
+            )
+
+        self.version = version
+        self._by_level, self._by_id, self._grading = by_level, by_id, grading
+        self._loaded = True
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        with self._lock:
+            if not self._loaded:
+                self._load()
+
+    def questions(self, level: str) -> list[dict]:
+        self._ensure_loaded()
+        return self._by_level.get(level, [])
+
+    def get(self, question_id: str) -> Optional[dict]:
+        self._ensure_loaded()
+        return self._by_id.get(question_id)
+
+    def grading(self, question_id: str) -> GradingMeta:
+        self._ensure_loaded()
+        return self._grading.get(question_id) or GradingMeta()
+
+
+_bank: Optional[QuestionBank] = None
+_bank_lock = threading.Lock()
+
+
+def get_question_bank() -> QuestionBank:
+    global _bank
+    with _bank_lock:
+        if _bank is None:
+            from app.config import QUESTION_BANK_PATH
+
+            _bank = QuestionBank(QUESTION_BANK_PATH)
+        return _bank
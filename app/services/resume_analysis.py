@@ -0,0 +1,224 @@
+"""Resume text extraction and the calibrated critique prompt behind /api/analyze.
+
+Kept free of FastAPI/app state so offline tools (see `app.cli.bulk_critique`) can
+reuse exactly the same prompt and score calibration as the HTTP endpoint.
+"""
+
+import io
+import re
+from datetime import date
+from typing import Optional
+
+import PyPDF2
+
+from app.services.guardrails import PROMPT_INJECTION
+
+
+def extract_text_from_pdf(pdf_file: bytes) -> str:
+    """Extract text from PDF file bytes."""
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_file))
+    text = ""
+    for page in pdf_reader.pages:
+        text += page.extract_text() + "\n"
+    return text
+
+
+def extract_text(file_content: bytes, content_type: str) -> str:
+    """Extract text from uploaded file based on content type."""
+    if content_type == "application/pdf":
+        return extract_text_from_pdf(file_content)
+    return file_content.decode("utf-8")
+
+
+def sanitize_job_role(value: Optional[str]) -> Optional[str]:
+    if not value:
+        return None
+    v = re.sub(r"\s+", " ", value).strip()
+    if not v:
+        return None
+
+    # Remove obvious prompt-injection phrasing
+    if PROMPT_INJECTION.matches(v.casefold()):
+        return None
+
+    # Allow only a conservative set of characters
+    v = re.sub(r"[^a-zA-Z0-9\s\-\/+&.,()]+", "", v).strip()
+    if not v:
+        return None
+
+    # Limit length to avoid instruction stuffing
+    if len(v) > 60:
+        v = v[:60].strip()
+    return v or None
+
+
+RESUME_REFERENCE_EXAMPLES = """
+        REFERENCE RESUMES FOR CALIBRATION:
+
+        CRITICAL CONTEXT: With modern AI coding tools (ChatGPT, Claude, Copilot, Cursor), projects can be "vibe coded" in hours.
+        Therefore, projects alone carry SIGNIFICANTLY LESS WEIGHT than they did previously. Focus heavily on:
+        - REAL work experience with quantifiable impact
+        - Duration and quality of professional roles
+        - Competitive achievements (hackathons WON, case competitions with TOP placements only)
+        - Academic excellence (high GPA, scholarships, awards)
+
+        SATURATED MARKET CALIBRATION - EXTREMELY STRICT:
+        - The market is HEAVILY saturated with candidates. You must be RUTHLESSLY STRICT.
+        - Most resumes are mediocre. DO NOT give the benefit of the doubt.
+        - If you see vague bullets, buzzwords, or no metrics - PENALIZE HEAVILY.
+        - Projects without clear evidence of real usage, deployment, testing, or architecture decisions are worth MINIMAL points.
+        - University club projects are NOT professional experience unless they show exceptional scope/impact.
+
+        BEGINNER/WEAK STUDENT (Typical Score: 30-55):
+        - First or second year university student
+        - Only tutorial-level projects OR projects with no clear depth
+        - No internships or only very basic/short internships
+        - Vague bullet points with no metrics or concrete achievements
+        - Generic skills lists with no evidence
+        REALISTIC OUTCOME: Will struggle to get interviews at competitive companies.
+
+        DECENT STUDENT (Typical Score: 55-65):
+        - Has 1 real internship OR strong university dev team role with measurable contributions
+        - 2-3 projects that show SOME depth (testing, deployment, or real users)
+        - Some quantifiable metrics (even if modest)
+        - Clear technical skills with evidence of application
+        REALISTIC OUTCOME: Can potentially land interviews at mid-tier companies with effort.
+
+        INTERMEDIATE/SOLID (Typical Score: 65-75):
+        - Multiple real internships with clear ownership and impact
+        - Projects show real depth: architecture decisions, testing, deployment, scale, real users with metrics
+        - Competitive achievements (hackathon wins, not just participation)
+        - Clear evidence of technical maturity and professional work quality
+        REALISTIC OUTCOME: Competitive for mid-tier and some upper-tier companies.
+
+        STRONG (Typical Score: 75-85):
+        - 2+ strong internships with significant impact at known companies
+        - Projects are production-quality with clear technical depth
+        - Leadership roles OR competitive programming success OR published research
+        - Multiple quantifiable achievements showing scope and impact
+        REALISTIC OUTCOME: Competitive for top-tier companies, strong interview candidate.
+
+        EXCEPTIONAL/FAANG READY (Score: 85+):
+        - FAANG/unicorn internship(s) with major impact
+        - Elite competitive programming (Codeforces Master+, ICPC medalist, IOI/USACO top tiers)
+        - Major OSS contributions (maintainer of widely-used projects)
+        - Published research at credible venues OR product with significant traction (10k+ users)
+        - Multiple exceptional signals, not just one
+        REALISTIC OUTCOME: Ready for FAANG-level interviews, likely to succeed.
+
+        SCORING GUIDELINES (EXTREMELY STRICT - NO MERCY):
+        - 90-100: Reserved for truly exceptional candidates (less than 1% of resumes)
+        - 85-89: FAANG Ready with multiple strong signals
+        - 75-84: Strong candidate with proven track record
+        - 65-74: Intermediate/Solid with real experience and depth
+        - 55-64: Decent but unremarkable
+        - 45-54: Weak/Beginner with minimal real experience
+        - 30-44: Very weak, major gaps
+        - 0-29: Essentially unqualified
+
+        BEGINNER RESUME HARD CAP: If the resume shows beginner-level experience (no real internships, only basic projects, first/second year student with minimal work), the score MUST NOT exceed 70. Period.
+
+        INTERMEDIATE RESUME RANGE: If the resume shows intermediate-level experience (1-2 internships, decent projects with some depth), score in the 70-80 range ONLY if truly justified.
+
+        DO NOT INFLATE SCORES - BE RUTHLESSLY STRICT:
+        - Assume projects are AI-assisted unless proven otherwise (tests, deployment, architecture docs, real users with metrics)
+        - Generic bullets like "developed X" or "implemented Y" without metrics = MINIMAL value
+        - "Participated in" or "helped with" = essentially worthless
+        - "Familiar with" or "knowledge of" = not real skill evidence
+        - Start at 40 by default. Add points ONLY for concrete evidence. Subtract for vagueness, buzzwords, or inflated claims.
+        - University design teams/research/dev clubs count as real experience ONLY if there's clear ownership and deliverables
+        """
+
+
+def build_resume_analysis_prompt(text_content: str, job_role: Optional[str] = None, notes: Optional[str] = None) -> str:
+    """Build the strict critique prompt (expects an already-sanitized `job_role`)."""
+    # Build prompt with reference examples and strict scoring
+    default_note = "If the student is still in university, they are probably applying for internship roles"
+    additional_notes = f"{notes}. {default_note}" if notes else default_note
+    reference_examples = RESUME_REFERENCE_EXAMPLES
+
+    prompt = f"""Today is {date.today()}.
+        You are a RUTHLESSLY STRICT hiring manager at a top company in the field of {job_role if job_role else "various industries"}.
+        Your job is to AGGRESSIVELY filter out weak candidates. You have ZERO MERCY and NO BIAS toward making candidates feel good.
+        
+        The market is HEAVILY saturated. Most resumes are mediocre. You must be EXTREMELY STRICT.
+
+        {reference_examples}
+
+        RESUME TO REVIEW:
+        {text_content}
+
+        CRITICAL INSTRUCTIONS - READ CAREFULLY:
+        1. Compare this resume to the REFERENCE resumes provided above
+        2. Determine the TRUE experience level (Beginner/Decent/Intermediate/Strong/Exceptional)
+        3. Assign a BRUTALLY HONEST score from 0-100 based on these STRICT SCORING GUIDELINES:
+              - 90-100: Reserved for truly exceptional candidates (less than 1% of resumes) - FAANG+ ready with multiple rare signals
+              - 85-89: FAANG Ready with proven track record
+              - 75-84: Strong candidate with 2+ quality internships and real impact
+              - 70-74: Upper-intermediate with solid experience
+              - 65-69: Intermediate with decent experience
+              - 55-64: Decent but unremarkable
+              - 45-54: Weak/Beginner with minimal experience
+              - 30-44: Very weak with major gaps
+              - 0-29: Essentially unqualified
+
+        HARD RULES - NON-NEGOTIABLE:
+        - BEGINNER RESUMES (no real internships, only basic projects, early student) CANNOT score above 70. EVER.
+        - INTERMEDIATE RESUMES (1-2 internships, decent projects) can score 70-80 ONLY if truly justified with clear depth and impact.
+        - Projects without deployment, testing, real users, or architecture docs are worth MINIMAL points.
+        - "Participated in", "helped with", "familiar with", "knowledge of" = worthless fluff.
+        - Vague bullets without metrics = RED FLAG, penalize heavily.
+        - Start at 40 by default. Add points ONLY for concrete, verifiable achievements.
+        
+        4. BE RUTHLESSLY CRITICAL - This is NOT about being nice, it's about being ACCURATE.
+        5. Focus on: REAL work experience, measurable impact, competitive achievements, technical depth.
+        6. GPA doesn't matter much - focus on actual work and achievements.
+        7. If you're uncertain between two scores, ALWAYS choose the LOWER one.
+        8. Provide an INTEGER score (whole number).
+        9. In your assessment, be BLUNT about weaknesses. Don't sugarcoat anything.
+
+        Respond in this EXACT format:
+        SCORE: [number between 0-100]
+
+        STRENGTHS:
+        - [Bullet point 1 - be specific and concrete, or write "Limited strengths identified"]
+        - [Bullet point 2]
+        - [Bullet point 3]
+
+        AREAS FOR IMPROVEMENT:
+        - [Bullet point 1 - be BLUNT and SPECIFIC about weaknesses]
+        - [Bullet point 2 - don't hold back]
+        - [Bullet point 3 - be ruthlessly honest]
+
+        RECOMMENDATIONS:
+        - [Actionable recommendation 1 - be specific and demanding]
+        - [Actionable recommendation 2]
+        - [Actionable recommendation 3]
+
+        OVERALL ASSESSMENT:
+        [2-3 sentences summarizing the resume's REALISTIC readiness level. Be BRUTALLY HONEST. If it's weak, say so clearly. No sugarcoating.]
+
+        Additional Notes: {additional_notes}
+        Tailor your feedback for {job_role if job_role else "general applications"}
+        """
+    return prompt
+
+
+def calibrate_resume_score(response_text: str) -> Optional[int]:
+    """Extract the model's SCORE line and apply market calibration (None if missing)."""
+    score_match = re.search(r'SCORE:\s*(\d+)', response_text or "", re.IGNORECASE)
+    if not score_match:
+        return None
+    raw_score = int(score_match.group(1))
+    raw_score = max(0, min(100, raw_score))
+
+    # Market calibration: gently reduce common inflation at the top end,
+    # but preserve the user's intended mid-range bands.
+    adjusted = raw_score
+    if raw_score >= 90:
+        adjusted -= 5
+    elif raw_score >= 85:
+        adjusted -= 3
+    elif raw_score >= 75:
+        adjusted -= 2
+    return max(0, min(100, adjusted))
@@ -0,0 +1,504 @@
+"""Pre-forked sandbox worker pool for untrusted Python submissions.
+
+Candidate code used to be `exec()`'d inside the API process, on the event loop and
+without a timeout, so a single `while True:` hung the server for everyone. Instead,
+jobs are sent over a pipe to a small pool of worker processes that:
+
+- are forked from a forkserver that has already imported the executors,
+- run each job under a CPU-time rlimit plus a wall-clock deadline enforced by the
+  parent (the worker is killed and replaced on overrun),
+- run with an address-space rlimit and no writable files,
+- see none of the server's environment variables (API keys) and start in an
+  empty, read-only working directory instead of the app checkout,
+- are recycled after `max_jobs_per_worker` jobs so leaked state can't pile up.
+
+Jobs go to a worker pickled, but replies come back as JSON only: a worker runs
+candidate code, so the parent must never unpickle anything it sends (a returned
+object's `__reduce__` would run in the API process). Results that aren't plain
+JSON are sent as their `repr()`.
+
+Callers use `await get_sandbox_pool().run(job, *args)`, or `run_batch(...)` to
+grade every test case of a submission in one worker round-trip; the blocking pipe
+I/O happens in the pool's own threads (one per worker), so the event loop is never
+blocked and callers queued for a busy pool don't tie up asyncio's default executor.
+"""
+
+import asyncio
+import contextlib
+import functools
+import multiprocessing
+import json
+import os
+import queue
+import shutil
+import signal
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from app.services import code_execution
+
+try:
+    import resource
+except ImportError:  # Windows: no rlimits, wall-clock deadline still applies
+    resource = None
+
+
+# Jobs a worker knows how to run. Each returns `(result, error)`.
+JOBS = {
+    "python": code_execution.execute_python_code,
+    "python_generated": code_execution.execute_python_code_generated,
+}
+
+# Batch jobs take `(code, test_inputs, function_name)` and yield one
+# `{"result", "error", "elapsed_ms"}` per test. The worker streams each one back
+# as soon as it's ready, and the CPU/wall limits apply per test.
+BATCH_JOBS = {
+    "python_batch": code_execution.execute_python_batch,
+    "python_generated_batch": code_execution.execute_python_generated_batch,
+    "python_profile_batch": code_execution.execute_python_profile_batch,
+}
+
+# The only environment variables a worker keeps; everything else (API keys,
+# database URLs) is dropped before candidate code can read it.
+WORKER_ENV_ALLOWLIST = ("PATH", "LANG", "LC_ALL", "LC_CTYPE", "TZ")
+
+TIMEOUT_ERROR = "Execution timeout"
+CPU_LIMIT_ERROR = "CPU time limit exceeded"
+CRASH_ERROR = "Execution failed (the sandbox process exited unexpectedly)"
+
+
+def skipped_outcome() -> dict:
+    """Batch outcome for a test that never ran because the batch was stopped early."""
+    return {"result": None, "error": None, "elapsed_ms": None, "skipped": True}
+
+
+def _current_address_space() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+def _set_soft_limit(which: int, soft: int) -> None:
+    _, hard = resource.getrlimit(which)
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(which, (soft, hard))
+
+
+def _apply_worker_limits(memory_mb: int) -> None:
+    if resource is None:
+        return
+    # Budget on top of what the interpreter + executors already map.
+    _set_soft_limit(resource.RLIMIT_AS, _current_address_space() + memory_mb * 1024 * 1024)
+    _set_soft_limit(resource.RLIMIT_FSIZE, 0)
+    _set_soft_limit(resource.RLIMIT_CORE, 0)
+
+
+def _cpu_used() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _arm_cpu_limit(cpu_seconds: float) -> None:
+    if resource is None:
+        return
+    # RLIMIT_CPU is cumulative for the process, so the per-run budget is
+    # "CPU used so far + cpu_seconds". Overrunning it raises SIGXCPU and the
+    # parent sees the pipe close.
+    _set_soft_limit(resource.RLIMIT_CPU, int(_cpu_used() + cpu_seconds) + 1)
+
+
+def _safe_repr(value) -> str:
+    try:
+        return repr(value)
+    except Exception:
+        return f"<unrepresentable {type(value).__name__}>"
+
+
+def _json_safe_reply(reply):
+    result, error = reply
+    return _safe_repr(result), error
+
+
+def _json_safe_outcome(outcome: dict) -> dict:
+    return dict(outcome, result=_safe_repr(outcome.get("result")))
+
+
+def _send(conn, message, fallback) -> bool:
+    try:
+        payload = json.dumps(message, default=_safe_repr)
+    except Exception:
+        # e.g. non-string dict keys or a cycle in the candidate's result.
+        payload = json.dumps(fallback(message))
+    try:
+        conn.send_bytes(payload.encode("utf-8"))
+    except (EOFError, OSError):
+        return False
+    return True
+
+
+def _receive(conn):
+    """The worker's next reply. JSON only: never unpickle what a worker sends."""
+    return json.loads(conn.recv_bytes())
+
+
+def worker_environ() -> dict[str, str]:
+    """The allowlisted subset of os.environ, for processes that run candidate code."""
+    return {name: os.environ[name] for name in WORKER_ENV_ALLOWLIST if name in os.environ}
+
+
+def _worker_main(conn, memory_mb: int, workdir: str) -> None:
+    """Worker loop: receive `(job, args, cpu_seconds)`, reply `(result, error)`
+    (or one outcome dict per test for batch jobs)."""
+    # Candidate print() output shouldn't end up in the server logs.
+    sys.stdout = open(os.devnull, "w")
+    sys.stderr = open(os.devnull, "w")
+    keep = worker_environ()
+    os.environ.clear()
+    os.environ.update(keep)
+    os.chdir(workdir)
+    _apply_worker_limits(memory_mb)
+
+    while True:
+        try:
+            job, args, cpu_seconds = conn.recv()
+        except (EOFError, OSError):
+            return
+
+        if job in BATCH_JOBS:
+            try:
+                outcomes = BATCH_JOBS[job](*args)
+                while True:
+                    _arm_cpu_limit(cpu_seconds)
+                    try:
+                        outcome = next(outcomes)
+                    except StopIteration:
+                        break
+                    if not _send(conn, outcome, _json_safe_outcome):
+                        return
+            except BaseException:
+                # The batch can't continue; exiting makes the parent report this
+                # test as crashed and resume the rest on a fresh worker.
+                return
+            continue
+
+        _arm_cpu_limit(cpu_seconds)
+        try:
+            reply = JOBS[job](*args)
+        except BaseException as e:  # SystemExit/KeyboardInterrupt from candidate code too
+            reply = (None, str(e) or e.__class__.__name__)
+        if not _send(conn, reply, _json_safe_reply):
+            return
+
+
+def _mp_context():
+    methods = multiprocessing.get_all_start_methods()
+    if "forkserver" in methods:
+        ctx = multiprocessing.get_context("forkserver")
+        # Workers fork from a server that already imported the executors.
+        ctx.set_forkserver_preload([__name__])
+        return ctx
+    return multiprocessing.get_context("spawn")
+
+
+_start_lock = threading.Lock()
+_forkserver_launched = False
+
+
+@contextlib.contextmanager
+def _scrubbed_environ():
+    """Temporarily reduce os.environ to the allowlist (caller holds `_start_lock`)."""
+    saved = dict(os.environ)
+    keep = worker_environ()
+    os.environ.clear()
+    os.environ.update(keep)
+    try:
+        yield
+    finally:
+        os.environ.clear()
+        os.environ.update(saved)
+
+
+def _launch_forkserver(ctx) -> None:
+    """Start the forkserver with a scrubbed environment (caller holds `_start_lock`).
+
+    Clearing os.environ inside a worker doesn't change /proc/self/environ, which
+    shows the environment the process was exec'd with. Workers are forked from the
+    forkserver, so launching it without secrets keeps them out of that view too.
+    Done once, when the first pool starts.
+    """
+    global _forkserver_launched
+    if _forkserver_launched or ctx.get_start_method() != "forkserver":
+        return
+    from multiprocessing import forkserver
+
+    with _scrubbed_environ():
+        forkserver.ensure_running()
+    _forkserver_launched = True
+
+
+@contextlib.contextmanager
+def _without_main_reimport():
+    """Stop multiprocessing from re-running `__main__` in workers.
+
+    With `python backend.py` the children would otherwise import the whole API
+    module (as `__mp_main__`) before serving a single job. Workers only need this
+    module, so hide the main script's path while a worker starts.
+    """
+    main = sys.modules.get("__main__")
+    with _start_lock:
+        saved_file = main.__dict__.pop("__file__", None) if main is not None else None
+        saved_spec = getattr(main, "__spec__", None)
+        if main is not None:
+            main.__spec__ = None
+        try:
+            yield
+        finally:
+            if main is not None:
+                main.__spec__ = saved_spec
+                if saved_file is not None:
+                    main.__file__ = saved_file
+
+
+class _Worker:
+    def __init__(self, ctx, memory_mb: int, workdir: str):
+        self.conn, child_conn = ctx.Pipe(duplex=True)
+        self.process = ctx.Process(target=_worker_main, args=(child_conn, memory_mb, workdir), daemon=True)
+        with _without_main_reimport():
+            _launch_forkserver(ctx)
+            self.process.start()
+        child_conn.close()
+        self.jobs = 0
+
+    def kill(self) -> None:
+        try:
+            self.conn.close()
+        except OSError:
+            pass
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=1)
+
+
+class SandboxPool:
+    def __init__(
+        self,
+        size: int = 2,
+        cpu_seconds: float = 2.0,
+        wall_seconds: float = 5.0,
+        memory_mb: int = 256,
+        max_jobs_per_worker: int = 100,
+    ):
+        self.size = max(1, size)
+        self.cpu_seconds = cpu_seconds
+        self.wall_seconds = wall_seconds
+        self.memory_mb = memory_mb
+        self.max_jobs_per_worker = max(1, max_jobs_per_worker)
+        self._ctx = _mp_context()
+        self._workdir: Optional[str] = None
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._workers: set[_Worker] = set()
+        self._lock = threading.Lock()
+        self._closed = False
+        # One thread per worker: extra submissions wait in this executor's queue
+        # rather than as threads blocked on `_idle` in the shared default executor.
+        self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="sandbox")
+
+    def start(self) -> "SandboxPool":
+        # Empty and read-only, so a worker's cwd exposes nothing and accepts no files.
+        self._workdir = tempfile.mkdtemp(prefix="sandbox-")
+        os.chmod(self._workdir, 0o500)
+        for _ in range(self.size):
+            self._idle.put(self._spawn())
+        return self
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            workers = list(self._workers)
+            self._workers.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        for w in workers:
+            w.kill()
+        if self._workdir is not None:
+            shutil.rmtree(self._workdir, ignore_errors=True)
+
+    def _spawn(self) -> _Worker:
+        w = _Worker(self._ctx, self.memory_mb, self._workdir)
+        with self._lock:
+            self._workers.add(w)
+        return w
+
+    def _retire(self, w: _Worker) -> None:
+        with self._lock:
+            self._workers.discard(w)
+        w.kill()
+
+    def _release(self, w: _Worker, healthy: bool) -> None:
+        if healthy and w.jobs < self.max_jobs_per_worker and not self._closed:
+            self._idle.put(w)
+            return
+        self._retire(w)
+        if not self._closed:
+            self._idle.put(self._spawn())
+
+    def _failure_error(self, w: _Worker) -> str:
+        w.process.join(timeout=1)
+        # SIGXCPU is how the kernel enforces RLIMIT_CPU.
+        if w.process.exitcode == -getattr(signal, "SIGXCPU", -1):
+            return CPU_LIMIT_ERROR
+        return CRASH_ERROR
+
+    def _check_open(self, job: str, known: dict) -> None:
+        if job not in known:
+            raise ValueError(f"Unknown sandbox job: {job}")
+        if self._closed:
+            raise RuntimeError("Sandbox pool is closed")
+
+    def submit(self, job: str, *args: Any, cpu_seconds: Optional[float] = None, wall_seconds: Optional[float] = None) -> tuple[Any, Optional[str]]:
+        """Run `job` in a worker and return its `(result, error)` (blocking)."""
+        self._check_open(job, JOBS)
+        cpu = self.cpu_seconds if cpu_seconds is None else cpu_seconds
+        wall = self.wall_seconds if wall_seconds is None else wall_seconds
+        w = self._idle.get()
+        healthy = False
+        try:
+            w.jobs += 1
+            try:
+                w.conn.send((job, args, cpu))
+                if not w.conn.poll(wall):
+                    return None, TIMEOUT_ERROR
+                result, error = _receive(w.conn)
+            except (EOFError, OSError, ValueError):
+                return None, self._failure_error(w)
+            healthy = True
+            return result, error
+        finally:
+            self._release(w, healthy)
+
+    def submit_batch(
+        self,
+        job: str,
+        code: str,
+        test_inputs: list[dict],
+        function_name: str = "solution",
+        cpu_seconds: Optional[float] = None,
+        wall_seconds: Optional[float] = None,
+        on_outcome: Optional[Callable[[int, dict], None]] = None,
+        stop: Optional[threading.Event] = None,
+    ) -> list[dict]:
+        """Run every test input through one prepared submission (blocking).
+
+        Returns one `{"result", "error", "elapsed_ms"}` per test, in order. The limits
+        apply per test: a test that times out or kills its worker is reported as
+        failed and the remaining tests continue on a fresh worker.
+
+        `on_outcome(index, outcome)` is called as each test finishes. Once `stop` is
+        set, tests that haven't reported yet come back as `skipped_outcome()` and the
+        (still busy) worker is replaced.
+        """
+        self._check_open(job, BATCH_JOBS)
+        cpu = self.cpu_seconds if cpu_seconds is None else cpu_seconds
+        wall = self.wall_seconds if wall_seconds is None else wall_seconds
+        outcomes: list[dict] = []
+
+        def _record(outcome: dict) -> None:
+            outcomes.append(outcome)
+            if on_outcome is not None:
+                on_outcome(len(outcomes) - 1, outcome)
+
+        while len(outcomes) < len(test_inputs):
+            if stop is not None and stop.is_set():
+                outcomes.extend(skipped_outcome() for _ in range(len(test_inputs) - len(outcomes)))
+                break
+            remaining = test_inputs[len(outcomes):]
+            w = self._idle.get()
+            healthy = False
+            try:
+                w.jobs += 1
+                try:
+                    w.conn.send((job, (code, remaining, function_name), cpu))
+                    for _ in remaining:
+                        if stop is not None and stop.is_set():
+                            break
+                        if not w.conn.poll(wall):
+                            _record({"result": None, "error": TIMEOUT_ERROR, "elapsed_ms": wall * 1000})
+                            break
+                        _record(_receive(w.conn))
+                    else:
+                        healthy = True
+                except (EOFError, OSError, ValueError):
+                    _record({"result": None, "error": self._failure_error(w), "elapsed_ms": None})
+            finally:
+                self._release(w, healthy)
+        return outcomes
+
+    async def run(self, job: str, *args: Any, cpu_seconds: Optional[float] = None, wall_seconds: Optional[float] = None) -> tuple[Any, Optional[str]]:
+        """Async wrapper for `submit` that keeps the event loop free."""
+        call = functools.partial(self.submit, job, *args, cpu_seconds=cpu_seconds, wall_seconds=wall_seconds)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+
+    async def run_batch(
+        self,
+        job: str,
+        code: str,
+        test_inputs: list[dict],
+        function_name: str = "solution",
+        on_outcome: Optional[Callable[[int, dict], None]] = None,
+        stop: Optional[threading.Event] = None,
+        cpu_seconds: Optional[float] = None,
+        wall_seconds: Optional[float] = None,
+    ) -> list[dict]:
+        """Async wrapper for `submit_batch`."""
+        call = functools.partial(
+            self.submit_batch,
+            job,
+            code,
+            list(test_inputs),
+            function_name,
+            cpu_seconds=cpu_seconds,
+            wall_seconds=wall_seconds,
+            on_outcome=on_outcome,
+            stop=stop,
+        )
+        return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+
+
+_pool: Optional[SandboxPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_sandbox_pool() -> SandboxPool:
+    """Process-wide pool, created (and pre-forked) on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            from app.config import (
+                SANDBOX_CPU_SECONDS,
+                SANDBOX_MAX_JOBS_PER_WORKER,
+                SANDBOX_MEMORY_MB,
+                SANDBOX_WALL_SECONDS,
+                SANDBOX_WORKERS,
+            )
+
+            _pool = SandboxPool(
+                size=SANDBOX_WORKERS,
+                cpu_seconds=SANDBOX_CPU_SECONDS,
+                wall_seconds=SANDBOX_WALL_SECONDS,
+                memory_mb=SANDBOX_MEMORY_MB,
+                max_jobs_per_worker=SANDBOX_MAX_JOBS_PER_WORKER,
+            ).start()
+        return _pool
+
+
+def shutdown_sandbox_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
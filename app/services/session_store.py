@@ -0,0 +1,107 @@
+"""In-memory session store with TTL expiry, a size bound and a secondary index.
+
+Entries live in an OrderedDict kept in last-access order. Every entry of a store
+shares the same (sliding) TTL, so that order is also expiry order: expired and
+over-capacity entries are always at the front, and every operation is amortized
+O(1) — no scans or sorts as the store grows.
+
+The store is a MutableMapping, so it drops in for the plain dicts it replaces;
+reading an entry (`store[key]`, `get`, `in`) refreshes its TTL. Values are
+returned by reference, so in-place mutation of a session dict works as before.
+
+The secondary index maps lookup keys (e.g. "client:question") to primary keys;
+index entries go away with the entry they point to.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any, Hashable, Iterator, Optional
+
+
+class SessionStore(MutableMapping):
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[Hashable, list]" = OrderedDict()  # key -> [expires_at, value]
+        self._index: dict[Hashable, Hashable] = {}
+        self._indexed_by: dict[Hashable, set] = {}
+        self._lock = threading.RLock()
+        self.expired = 0
+        self.evicted = 0
+
+    def _drop(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+        for index_key in self._indexed_by.pop(key, ()):
+            if self._index.get(index_key) == key:
+                del self._index[index_key]
+
+    def _prune(self, now: float) -> None:
+        while self._entries:
+            key, (expires_at, _) = next(iter(self._entries.items()))
+            if expires_at > now:
+                break
+            self._drop(key)
+            self.expired += 1
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+            self.evicted += 1
+
+    def __getitem__(self, key: Hashable) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            self._prune(now)
+            entry = self._entries[key]
+            entry[0] = now + self.ttl_seconds
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._entries[key] = [now + self.ttl_seconds, value]
+            self._entries.move_to_end(key)
+            self._prune(now)
+
+    def __delitem__(self, key: Hashable) -> None:
+        with self._lock:
+            if key not in self._entries:
+                raise KeyError(key)
+            self._drop(key)
+
+    def __iter__(self) -> Iterator:
+        with self._lock:
+            self._prune(time.monotonic())
+            return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._prune(time.monotonic())
+            return len(self._entries)
+
+    def set_index(self, index_key: Hashable, key: Hashable) -> None:
+        """Point `index_key` at the live entry `key`."""
+        with self._lock:
+            if key not in self._entries:
+                raise KeyError(key)
+            previous = self._index.get(index_key)
+            if previous is not None and previous != key:
+                self._indexed_by.get(previous, set()).discard(index_key)
+            self._index[index_key] = key
+            self._indexed_by.setdefault(key, set()).add(index_key)
+
+    def lookup(self, index_key: Hashable) -> Optional[Hashable]:
+        """Primary key `index_key` points at, if that entry is still live."""
+        with self._lock:
+            self._prune(time.monotonic())
+            return self._index.get(index_key)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "indexed": len(self._index),
+                "expired": self.expired,
+                "evicted": self.evicted,
+            }
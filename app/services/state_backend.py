@@ -0,0 +1,300 @@
+"""Pluggable backends for server-side session state.
+
+Sessions used to be module-level dicts, so a second uvicorn worker couldn't see
+sessions created by the first. Every store is now a *namespace* of a backend
+selected with STATE_BACKEND:
+
+- `memory`  (default): SessionStore per namespace; one process only.
+- `sqlite`: one file (STATE_SQLITE_PATH) shared by every worker on the box;
+  SQLite's file locking serializes writers, WAL keeps readers unblocked.
+- `redis`:  any Redis-protocol server (STATE_REDIS_URL), for several boxes.
+  Needs the optional `redis` package.
+
+All namespaces have the same surface as SessionStore (MutableMapping with a
+sliding TTL, `set_index`/`lookup`, `stats`). Shared backends store values as
+compact JSON, zlib-compressed when large, and hand out *copies*: code that
+mutates a session must write it back (`store[key] = session`), which is a
+no-op cost for the memory backend. Writes are last-writer-wins per key, which is
+fine for sessions driven by one client at a time. SQLite enforces `max_entries`
+on every 64th write, so a namespace can briefly run a little over.
+"""
+
+import abc
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections.abc import MutableMapping
+from typing import Any, Iterator, Optional
+
+from app.services.session_store import SessionStore
+
+_COMPRESS_OVER_BYTES = 512
+
+
+def dumps(value: Any) -> bytes:
+    data = json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    if len(data) > _COMPRESS_OVER_BYTES:
+        return b"z" + zlib.compress(data, 6)
+    return b"j" + data
+
+
+def loads(blob: bytes) -> Any:
+    blob = bytes(blob)
+    if blob[:1] == b"z":
+        return json.loads(zlib.decompress(blob[1:]))
+    return json.loads(blob[1:])
+
+
+class _SerializedNamespace(MutableMapping, abc.ABC):
+    """Shared pieces of the SQLite and Redis namespaces; keys are strings.
+
+    A backend that misses one of the storage hooks fails when it is constructed.
+    """
+
+    def __init__(self, name: str, ttl_seconds: float, max_entries: int):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+
+    # Subclasses implement these on top of their storage.
+    @abc.abstractmethod
+    def _get(self, key: str) -> Optional[bytes]:
+        ...
+
+    @abc.abstractmethod
+    def _set(self, key: str, blob: bytes) -> None:
+        ...
+
+    @abc.abstractmethod
+    def _delete(self, key: str) -> bool:
+        ...
+
+    @abc.abstractmethod
+    def _keys(self) -> list[str]:
+        ...
+
+    @abc.abstractmethod
+    def _index(self) -> "_SerializedNamespace":
+        ...
+
+    def __getitem__(self, key) -> Any:
+        blob = self._get(str(key))
+        if blob is None:
+            raise KeyError(key)
+        return loads(blob)
+
+    def __setitem__(self, key, value: Any) -> None:
+        self._set(str(key), dumps(value))
+
+    def __delitem__(self, key) -> None:
+        if not self._delete(str(key)):
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys())
+
+    def __len__(self) -> int:
+        return len(self._keys())
+
+    def set_index(self, index_key, key) -> None:
+        self._index()[str(index_key)] = str(key)
+
+    def lookup(self, index_key) -> Optional[str]:
+        key = self._index().get(str(index_key))
+        # The entry may have expired on its own schedule.
+        return key if key is not None and self._get(key) is not None else None
+
+    def stats(self) -> dict:
+        return {"entries": len(self), "backend": type(self).__name__}
+
+
+class _SQLiteNamespace(_SerializedNamespace):
+    def __init__(self, backend: "SQLiteBackend", name: str, ttl_seconds: float, max_entries: int):
+        super().__init__(name, ttl_seconds, max_entries)
+        self._backend = backend
+        self._index_ns: Optional[_SQLiteNamespace] = None
+        self._writes = 0
+
+    def _get(self, key: str) -> Optional[bytes]:
+        now = time.time()
+        with self._backend.transaction() as db:
+            row = db.execute(
+                "SELECT value FROM state WHERE namespace = ? AND key = ? AND expires_at > ?",
+                (self.name, key, now),
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute(
+                "UPDATE state SET expires_at = ? WHERE namespace = ? AND key = ?",
+                (now + self.ttl_seconds, self.name, key),
+            )
+        return row[0]
+
+    def _set(self, key: str, blob: bytes) -> None:
+        now = time.time()
+        with self._backend.transaction() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO state (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (self.name, key, blob, now + self.ttl_seconds),
+            )
+            self._writes += 1
+            if self._writes % 64 == 0:
+                self._prune(db, now)
+
+    def _prune(self, db: sqlite3.Connection, now: float) -> None:
+        # Both deletes walk the (namespace, expires_at) index from the oldest end.
+        db.execute("DELETE FROM state WHERE namespace = ? AND expires_at <= ?", (self.name, now))
+        (count,) = db.execute("SELECT COUNT(*) FROM state WHERE namespace = ?", (self.name,)).fetchone()
+        if count > self.max_entries:
+            db.execute(
+                "DELETE FROM state WHERE namespace = ? AND key IN ("
+                "SELECT key FROM state WHERE namespace = ? ORDER BY expires_at LIMIT ?)",
+                (self.name, self.name, count - self.max_entries),
+            )
+
+    def _delete(self, key: str) -> bool:
+        with self._backend.transaction() as db:
+            cursor = db.execute("DELETE FROM state WHERE namespace = ? AND key = ?", (self.name, key))
+        return cursor.rowcount > 0
+
+    def _keys(self) -> list[str]:
+        with self._backend.transaction() as db:
+            rows = db.execute(
+                "SELECT key FROM state WHERE namespace = ? AND expires_at > ?",
+                (self.name, time.time()),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def _index(self) -> "_SQLiteNamespace":
+        if self._index_ns is None:
+            self._index_ns = _SQLiteNamespace(self._backend, f"{self.name}#index", self.ttl_seconds, self.max_entries)
+        return self._index_ns
+
+
+class SQLiteBackend:
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._local = threading.local()
+        with self.transaction() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS state ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, expires_at REAL NOT NULL, "
+                "PRIMARY KEY (namespace, key)) WITHOUT ROWID"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS state_expiry ON state (namespace, expires_at)")
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread, reused across calls.
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def transaction(self):
+        return _Transaction(self._connection())
+
+    def namespace(self, name: str, ttl_seconds: float, max_entries: int) -> _SQLiteNamespace:
+        return _SQLiteNamespace(self, name, ttl_seconds, max_entries)
+
+
+class _Transaction:
+    def __init__(self, db: sqlite3.Connection):
+        self.db = db
+
+    def __enter__(self) -> sqlite3.Connection:
+        # IMMEDIATE takes the write lock up front, so read-then-update can't deadlock.
+        self.db.execute("BEGIN IMMEDIATE")
+        return self.db
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.db.execute("ROLLBACK" if exc_type else "COMMIT")
+
+
+class _RedisNamespace(_SerializedNamespace):
+    def __init__(self, client, prefix: str, name: str, ttl_seconds: float, max_entries: int):
+        super().__init__(name, ttl_seconds, max_entries)
+        self._client = client
+        self._base_prefix = prefix
+        self._prefix = f"{prefix}{name}:"
+        self._index_ns: Optional[_RedisNamespace] = None
+
+    def _ttl(self) -> int:
+        return max(1, int(self.ttl_seconds))
+
+    def _get(self, key: str) -> Optional[bytes]:
+        pipe = self._client.pipeline()
+        pipe.get(self._prefix + key)
+        pipe.expire(self._prefix + key, self._ttl())
+        blob, _ = pipe.execute()
+        return blob
+
+    def _set(self, key: str, blob: bytes) -> None:
+        # Size is bounded by the server's maxmemory policy rather than max_entries.
+        self._client.set(self._prefix + key, blob, ex=self._ttl())
+
+    def _delete(self, key: str) -> bool:
+        return bool(self._client.delete(self._prefix + key))
+
+    def _keys(self) -> list[str]:
+        keys = self._client.scan_iter(match=self._prefix + "*", count=500)
+        return [(k.decode() if isinstance(k, bytes) else k)[len(self._prefix):] for k in keys]
+
+    def _index(self) -> "_RedisNamespace":
+        if self._index_ns is None:
+            self._index_ns = _RedisNamespace(
+                self._client, self._base_prefix, f"{self.name}#index", self.ttl_seconds, self.max_entries
+            )
+        return self._index_ns
+
+
+class RedisBackend:
+    def __init__(self, url: str, prefix: str = "frymyresume:"):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("STATE_BACKEND=redis needs the `redis` package (pip install redis)") from e
+        self._client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def namespace(self, name: str, ttl_seconds: float, max_entries: int) -> _RedisNamespace:
+        return _RedisNamespace(self._client, self.prefix, name, ttl_seconds, max_entries)
+
+
+class MemoryBackend:
+    def namespace(self, name: str, ttl_seconds: float, max_entries: int) -> SessionStore:
+        return SessionStore(ttl_seconds=ttl_seconds, max_entries=max_entries)
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_state_backend():
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            from app.config import STATE_BACKEND, STATE_REDIS_PREFIX, STATE_REDIS_URL, STATE_SQLITE_PATH
+
+            kind = STATE_BACKEND.strip().lower()
+            if kind == "sqlite":
+                _backend = SQLiteBackend(STATE_SQLITE_PATH)
+            elif kind == "redis":
+                _backend = RedisBackend(STATE_REDIS_URL, prefix=STATE_REDIS_PREFIX)
+            elif kind in ("", "memory"):
+                _backend = MemoryBackend()
+            else:
+                raise ValueError(f"Unknown STATE_BACKEND: {STATE_BACKEND}")
+            print(f"State backend: {type(_backend).__name__}")
+        return _backend
+
+
+def state_store(name: str, ttl_seconds: float, max_entries: int) -> MutableMapping:
+    """A namespace of the configured backend (see module docstring)."""
+    return get_state_backend().namespace(name, ttl_seconds, max_entries)
@@ -0,0 +1,106 @@
+"""Energy-based voice activity detection for the interview audio stream.
+
+The behavioral interview used to trust the client's `end_of_turn` and then sleep a
+fixed 2.2 s. With server VAD on, the server measures the candidate's inbound
+16 kHz PCM itself: it splits the stream into 20 ms frames, compares each frame's
+RMS with an adaptive noise floor, and tracks how much speech it has heard and how
+long the trailing silence is. That lets it end a turn as soon as the candidate
+has clearly stopped, and count the pause before the next question from the moment
+speech ended rather than from when the client noticed.
+
+Frame energies are computed with NumPy when it's installed (one vectorized pass
+per chunk) and with the stdlib `array` module otherwise.
+"""
+
+import math
+import sys
+import time
+from array import array
+from typing import Optional
+
+try:
+    import numpy as np
+except ImportError:  # optional: pure-python fallback below
+    np = None
+
+
+def frame_rms(pcm: bytes, samples_per_frame: int) -> list[float]:
+    """RMS (0..1) of each complete frame of little-endian s16 mono PCM."""
+    count = (len(pcm) // 2) // samples_per_frame
+    if count == 0:
+        return []
+    usable = count * samples_per_frame
+    if np is not None:
+        samples = np.frombuffer(pcm, dtype="<i2", count=usable).astype(np.float32) / 32768.0
+        return np.sqrt(np.mean(np.square(samples.reshape(count, samples_per_frame)), axis=1)).tolist()
+    samples = array("h")
+    samples.frombytes(pcm[: usable * 2])
+    if sys.byteorder == "big":
+        samples.byteswap()
+    rms = []
+    for start in range(0, usable, samples_per_frame):
+        total = sum(s * s for s in samples[start : start + samples_per_frame])
+        rms.append(math.sqrt(total / samples_per_frame) / 32768.0)
+    return rms
+
+
+class EnergyVAD:
+    """Streaming speech / trailing-silence tracker for one candidate turn."""
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        frame_ms: int = 20,
+        silence_ms: int = 900,
+        min_speech_ms: int = 450,
+        threshold_ratio: float = 3.0,
+        min_threshold: float = 0.01,
+    ):
+        self.sample_rate = sample_rate
+        self.frame_ms = frame_ms
+        self.silence_ms = silence_ms
+        self.min_speech_ms = min_speech_ms
+        self.threshold_ratio = threshold_ratio
+        self.min_threshold = min_threshold
+        self.reset()
+
+    def reset(self) -> None:
+        self._pending = b""
+        self.noise_floor: Optional[float] = None
+        self.speech_ms = 0
+        self.trailing_silence_ms = 0
+        self.audio_ms = 0
+        # Wall-clock time the last speech frame ended (approximate; per chunk).
+        self.speech_ended_at: Optional[float] = None
+
+    @property
+    def had_speech(self) -> bool:
+        return self.speech_ms >= self.min_speech_ms
+
+    @property
+    def end_of_speech(self) -> bool:
+        return self.had_speech and self.trailing_silence_ms >= self.silence_ms
+
+    def feed(self, pcm: bytes, sample_rate: Optional[int] = None) -> None:
+        if sample_rate and sample_rate != self.sample_rate:
+            # Frame boundaries depend on the rate; start over rather than mix rates.
+            self.sample_rate = sample_rate
+            self._pending = b""
+        samples_per_frame = max(1, self.sample_rate * self.frame_ms // 1000)
+        data = self._pending + pcm
+        usable = (len(data) // (2 * samples_per_frame)) * 2 * samples_per_frame
+        self._pending = data[usable:]
+        now = time.monotonic()
+        for rms in frame_rms(data[:usable], samples_per_frame):
+            self.audio_ms += self.frame_ms
+            # Until a quiet frame is seen, only the absolute threshold applies.
+            floor = self.noise_floor if self.noise_floor is not None else self.min_threshold / self.threshold_ratio
+            if rms > max(self.min_threshold, floor * self.threshold_ratio):
+                self.speech_ms += self.frame_ms
+                self.trailing_silence_ms = 0
+            else:
+                self.trailing_silence_ms += self.frame_ms
+                # Track the background level from non-speech frames only.
+                self.noise_floor = rms if self.noise_floor is None else 0.95 * self.noise_floor + 0.05 * rms
+        if self.speech_ms:
+            self.speech_ended_at = now - self.trailing_silence_ms / 1000.0
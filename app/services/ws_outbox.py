@@ -0,0 +1,175 @@
+"""Bounded outbound queue for one behavioral-interview WebSocket.
+
+The Gemini receive loop used to await `websocket.send_*` for every audio part, so
+a client on a slow link throttled how fast the server drained the Live stream.
+Messages now go into a per-session queue that never blocks the producer, and one
+sender task writes them to the socket in order:
+
+- adjacent PCM parts at the same sample rate that are already queued go out as
+  one frame (up to `coalesce_bytes`); nothing waits to fill a frame;
+- an interim candidate transcript replaces the one still waiting to be sent,
+  keeping its place in line, since each update carries the full text so far;
+- once more than `max_audio_bytes` of audio is waiting, the oldest audio is
+  dropped (and counted) instead of letting the backlog grow;
+- control messages (questions, turn events, results) are never dropped.
+"""
+
+import asyncio
+import base64
+from collections import deque
+from typing import Optional
+
+from app.services.audio_frames import encode_audio_frame
+
+_AUDIO = "audio"
+_JSON = "json"
+_TRANSCRIPT = "transcript"
+
+
+class OutboundQueue:
+    def __init__(
+        self,
+        websocket,
+        binary_audio: bool,
+        max_audio_bytes: int = 2 * 1024 * 1024,
+        coalesce_bytes: int = 9600,
+    ):
+        self._websocket = websocket
+        self._binary_audio = binary_audio
+        self.max_audio_bytes = max_audio_bytes
+        self.coalesce_bytes = coalesce_bytes
+        # Entries are [kind, payload, extra]: audio -> (pcm, sample_rate, mime_type),
+        # json -> message, transcript -> message (replaced in place while queued).
+        self._items: deque = deque()
+        self._pending_transcript: Optional[list] = None
+        self._audio_bytes = 0
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._seq = 0
+        self.closed = False
+        self.sent_frames = 0
+        self.sent_audio_parts = 0
+        self.merged_transcripts = 0
+        self.dropped_audio_bytes = 0
+        self.max_depth = 0
+        self.max_audio_bytes_queued = 0
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def _push(self, entry: list) -> None:
+        if self.closed:
+            return
+        self._items.append(entry)
+        self.max_depth = max(self.max_depth, len(self._items))
+        self._wakeup.set()
+
+    def send_json(self, message: dict) -> None:
+        self._push([_JSON, message, None])
+
+    def send_transcript(self, message: dict) -> None:
+        """Queue an interim transcript; supersedes one that hasn't been sent yet."""
+        if self._pending_transcript is not None:
+            self._pending_transcript[1] = message
+            self.merged_transcripts += 1
+            return
+        entry = [_TRANSCRIPT, message, None]
+        self._pending_transcript = entry
+        self._push(entry)
+
+    def send_audio(self, pcm: bytes, sample_rate: int, mime_type: Optional[str] = None) -> None:
+        if self.closed or not pcm:
+            return
+        self._push([_AUDIO, pcm, (sample_rate, mime_type)])
+        self._audio_bytes += len(pcm)
+        self.max_audio_bytes_queued = max(self.max_audio_bytes_queued, self._audio_bytes)
+        if self._audio_bytes > self.max_audio_bytes:
+            self._drop_oldest_audio()
+
+    def _drop_oldest_audio(self) -> None:
+        kept = deque()
+        for entry in self._items:
+            if entry[0] == _AUDIO and self._audio_bytes > self.max_audio_bytes:
+                self._audio_bytes -= len(entry[1])
+                self.dropped_audio_bytes += len(entry[1])
+                continue
+            kept.append(entry)
+        self._items = kept
+
+    def _next_audio_frame(self, first: list) -> tuple[bytes, int, Optional[str]]:
+        """`first` plus any queued audio right behind it at the same rate."""
+        sample_rate, mime_type = first[2]
+        parts = [first[1]]
+        size = len(first[1])
+        while self._items and size < self.coalesce_bytes:
+            entry = self._items[0]
+            if entry[0] != _AUDIO or entry[2][0] != sample_rate:
+                break
+            self._items.popleft()
+            parts.append(entry[1])
+            size += len(entry[1])
+        self._audio_bytes -= size
+        self.sent_audio_parts += len(parts)
+        return b"".join(parts), sample_rate, mime_type
+
+    async def _send_audio(self, pcm: bytes, sample_rate: int, mime_type: Optional[str]) -> None:
+        if self._binary_audio:
+            await self._websocket.send_bytes(encode_audio_frame(pcm, sample_rate, self._seq))
+            self._seq += 1
+        else:
+            await self._websocket.send_json({
+                "type": "audio",
+                "format": "pcm_s16le",
+                "sample_rate": sample_rate,
+                "mime_type": mime_type,
+                "data": base64.b64encode(pcm).decode("utf-8"),
+            })
+
+    async def _run(self) -> None:
+        try:
+            while True:
+                if not self._items:
+                    if self.closed:
+                        return
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+                entry = self._items.popleft()
+                if entry[0] == _AUDIO:
+                    await self._send_audio(*self._next_audio_frame(entry))
+                else:
+                    if entry is self._pending_transcript:
+                        self._pending_transcript = None
+                    await self._websocket.send_json(entry[1])
+                self.sent_frames += 1
+        except Exception as e:
+            # The client is gone; stop accepting messages for it.
+            print(f"[WebSocket] Outbound sender stopped: {e}")
+            self.closed = True
+            self._items.clear()
+            self._pending_transcript = None
+            self._audio_bytes = 0
+
+    async def close(self, timeout: float = 5.0) -> None:
+        """Stop accepting messages and give the sender `timeout` seconds to flush."""
+        self.closed = True
+        self._wakeup.set()
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(self._task, timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            self._task.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "depth": len(self._items),
+            "queued_audio_bytes": self._audio_bytes,
+            "max_depth": self.max_depth,
+            "max_queued_audio_bytes": self.max_audio_bytes_queued,
+            "sent_frames": self.sent_frames,
+            "sent_audio_parts": self.sent_audio_parts,
+            "merged_transcripts": self.merged_transcripts,
+            "dropped_audio_bytes": self.dropped_audio_bytes,
+        }
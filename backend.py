@@ -1,14 +1,14 @@
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException, WebSocket, WebSocketDisconnect, Depends
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
-import PyPDF2
 import io
 import os
 import re
 import time
 import base64
+import hashlib
 import requests
 import asyncio
 import json
@@ -16,7 +16,44 @@ from datetime import date, datetime
 from google import genai
 from dotenv import load_dotenv
 from typing import Optional, Any
-from app.config import FRONTEND_URL
+from app.config import (
+    BEHAVIORAL_QUESTION_CACHE_MAX,
+    BEHAVIORAL_QUESTION_CACHE_TTL_SECONDS,
+    BEHAVIORAL_SESSION_MAX,
+    BEHAVIORAL_SESSION_TTL_SECONDS,
+    EVALUATION_JOB_MAX,
+    EVALUATION_JOB_TIMEOUT_SECONDS,
+    EVALUATION_JOB_TTL_SECONDS,
+    FRONTEND_URL,
+    GENERATED_SESSION_MAX,
+    GENERATED_SESSION_TTL_SECONDS,
+    INTERVIEW_SESSION_MAX,
+    INTERVIEW_SESSION_TTL_SECONDS,
+    LIVE_POOL_IDLE_SECONDS,
+    LIVE_POOL_MAX_AGE_SECONDS,
+    LIVE_POOL_SIZE,
+    LIVE_SESSION_RESUMPTION,
+    PROBLEM_CACHE_MAX_PROBLEMS,
+    PROBLEM_CACHE_TTL_SECONDS,
+    PROBLEM_CACHE_VARIANTS,
+    PROBLEM_POOL_CONCURRENCY,
+    PROBLEM_POOL_HOURLY_BUDGET,
+    PROBLEM_POOL_LOW_WATERMARK,
+    PROBLEM_POOL_MAX_KEYS,
+    PROBLEM_POOL_SIZE,
+    PROBLEM_POOL_WARM_ON_STARTUP,
+    QUESTION_POOL_MAX_CLIENTS,
+    QUESTION_POOL_TTL_SECONDS,
+    SERVER_VAD,
+    TURN_GRACE_SECONDS,
+    VAD_MIN_SPEECH_MS,
+    VAD_SILENCE_MS,
+    VOICE_FUSED_TURN,
+    VOICE_INLINE_MAX_BYTES,
+    VOICE_MAX_ANSWER_SECONDS,
+    VOICE_MAX_UPLOAD_BYTES,
+    WS_OUTBOX_MAX_AUDIO_BYTES,
+)
 
 load_dotenv()
 
@@ -24,6 +61,34 @@ load_dotenv()
 from app.routers import auth_router, users_router, jobs_router, friends_router
 from app.dependencies import get_current_user_optional, SupabaseUser
 from app.supabase_client import get_supabase_admin
+from app.services.gemini import call_gemini_with_retry, call_gemini_with_retry_async
+from app.services.resume_analysis import (
+    build_resume_analysis_prompt,
+    calibrate_resume_score,
+    extract_text,
+    sanitize_job_role,
+)
+from app.services.audio_frames import (
+    BINARY_TRANSPORT as BINARY_AUDIO_TRANSPORT,
+    HEADER_SIZE as AUDIO_FRAME_HEADER_SIZE,
+    decode_audio_frame,
+    negotiate_transport,
+)
+from app.services.audio_upload import AudioTooLarge, PreparedAudio, prepare_answer_audio, read_upload
+from app.services.complexity import profile_submission
+from app.services.evaluation_jobs import DONE as EVALUATION_DONE, PENDING as EVALUATION_PENDING, EvaluationJobs
+from app.services.efficiency_cache import efficiency_cache_key, get_efficiency_cache
+from app.services.guardrails import HARD_GATE_SIGNALS, INTERVIEW_DISQUALIFIERS, non_answer_reasons
+from app.services.grading import SUPPORTED_LANGUAGES as GRADING_LANGUAGES, run_test_cases
+from app.services.live_pool import LiveSessionPool
+from app.services.question_bank import LEVELS as QUESTION_LEVELS, get_question_bank
+from app.services.node_pool import get_node_pool, shutdown_node_pool
+from app.services.problem_cache import ProblemCache, problem_cache_key
+from app.services.problem_pool import ProblemPool
+from app.services.sandbox import get_sandbox_pool, shutdown_sandbox_pool
+from app.services.state_backend import state_store
+from app.services.vad import EnergyVAD
+from app.services.ws_outbox import OutboundQueue
 
 app = FastAPI(title="FryMyResume API")
 
@@ -37,6 +102,19 @@ app.include_router(users_router)
 app.include_router(jobs_router)
 app.include_router(friends_router)
 
+
+@app.on_event("startup")
+async def _start_sandbox_pool():
+    # Pre-fork the code execution workers so the first submission doesn't pay for it.
+    await asyncio.to_thread(get_sandbox_pool)
+    await asyncio.to_thread(get_node_pool)
+
+
+@app.on_event("shutdown")
+async def _stop_sandbox_pool():
+    shutdown_sandbox_pool()
+    shutdown_node_pool()
+
 def _strip_trailing_slash(value: str) -> str:
     return value[:-1] if value.endswith("/") else value
 
@@ -67,41 +145,162 @@ if not GEMINI_API_KEY:
     raise ValueError("GEMINI_API_KEY not found in environment variables")
 
 # Session storage for behavioral interviews
-interview_sessions = {}
+# (STATE_BACKEND picks in-memory, SQLite or Redis; see app/services/state_backend.py)
+interview_sessions = state_store("interview_sessions", INTERVIEW_SESSION_TTL_SECONDS, INTERVIEW_SESSION_MAX)
+
+# Generic behavioral questions per (company, role), so most interviews skip generation
+_behavioral_question_cache = state_store(
+    "behavioral_generic_questions",
+    BEHAVIORAL_QUESTION_CACHE_TTL_SECONDS,
+    BEHAVIORAL_QUESTION_CACHE_MAX,
+)
 
-# In-memory storage for AI-generated technical problems (prompt + tests)
-_generated_technical_sessions: dict[str, dict] = {}
-_generated_technical_session_index: dict[str, str] = {}
 
+# Post-interview evaluations run as background jobs; results are fetched by id
+_evaluation_jobs = EvaluationJobs(
+    state_store("interview_evaluations", EVALUATION_JOB_TTL_SECONDS, EVALUATION_JOB_MAX),
+    timeout_seconds=EVALUATION_JOB_TIMEOUT_SECONDS,
+)
 
-def _prune_generated_technical_sessions(max_age_seconds: int = 6 * 60 * 60, max_sessions: int = 250) -> None:
-    """Best-effort pruning to keep memory bounded."""
-    now = time.time()
-    # Drop old sessions
-    old_ids = [
-        sid
-        for sid, sess in _generated_technical_sessions.items()
-        if (now - float(sess.get("created_at", now))) > max_age_seconds
-    ]
-    for sid in old_ids:
-        _generated_technical_sessions.pop(sid, None)
-
-    # Drop index entries that point to missing sessions
-    for key, sid in list(_generated_technical_session_index.items()):
-        if sid not in _generated_technical_sessions:
-            _generated_technical_session_index.pop(key, None)
-
-    # If still too many, drop oldest
-    if len(_generated_technical_sessions) > max_sessions:
-        ordered = sorted(
-            _generated_technical_sessions.items(),
-            key=lambda kv: float(kv[1].get("created_at", 0.0)),
-        )
-        for sid, _sess in ordered[: max(0, len(ordered) - max_sessions)]:
-            _generated_technical_sessions.pop(sid, None)
-        for key, sid in list(_generated_technical_session_index.items()):
-            if sid not in _generated_technical_sessions:
-                _generated_technical_session_index.pop(key, None)
+
+@app.on_event("shutdown")
+async def _stop_evaluation_jobs():
+    await _evaluation_jobs.close()
+
+
+def _behavioral_question_cache_key(company: str, role: str) -> str:
+    normalized = json.dumps([" ".join(str(company).lower().split()), " ".join(str(role).lower().split())])
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:32]
+
+
+# Live behavioral interviews, checkpointed per session id so a client whose socket
+# drops can reconnect with "resume_session_id" instead of starting over
+_behavioral_sessions = state_store("behavioral_sessions", BEHAVIORAL_SESSION_TTL_SECONDS, BEHAVIORAL_SESSION_MAX)
+
+_INTERVIEW_CHECKPOINT_FIELDS = (
+    "questions_asked",
+    "answers_completed",
+    "max_questions",
+    "questions",
+    "scores",
+    "conversation_history",
+    "candidate_answers",
+    "server_transcripts",
+    "turn_latencies",
+    "company",
+    "role",
+    "live_handle",
+    "evaluation_id",
+    "resumes",
+)
+
+
+def _interview_checkpoint(interview_state: dict, connection_id: str) -> dict:
+    """Detached, JSON-safe copy of interview_state (question-number keys become strings)."""
+    checkpoint = {field: interview_state[field] for field in _INTERVIEW_CHECKPOINT_FIELDS if field in interview_state}
+    checkpoint["answers_recorded"] = sorted(interview_state.get("answers_recorded") or ())
+    checkpoint["connection_id"] = connection_id
+    checkpoint["saved_at"] = time.time()
+    return json.loads(json.dumps(checkpoint))
+
+
+def _restore_interview_state(checkpoint: dict) -> dict:
+    state = {field: checkpoint[field] for field in _INTERVIEW_CHECKPOINT_FIELDS if field in checkpoint}
+    for field in ("candidate_answers", "server_transcripts"):
+        state[field] = {int(q): text for q, text in (checkpoint.get(field) or {}).items()}
+    state["answers_recorded"] = {int(q) for q in checkpoint.get("answers_recorded") or ()}
+    return state
+
+
+BEHAVIORAL_LIVE_MODEL = "gemini-2.0-flash-exp"
+
+
+def _behavioral_live_config(
+    company: Optional[str] = None,
+    role: Optional[str] = None,
+    live_handle: Optional[str] = None,
+    voice: str = "Puck",
+) -> dict:
+    """Gemini Live config for the interviewer; without company/role it's the same for every
+    interview, which is what lets LIVE_POOL_SIZE keep sessions connected ahead of time."""
+    if company and role:
+        opening = f"You are a professional behavioral interviewer at {company} conducting an interview for a {role} position."
+    else:
+        opening = "You are a professional behavioral interviewer conducting a job interview."
+    # System instruction for the interview
+    system_instruction = f"""{opening}
+
+CRITICAL INSTRUCTIONS:
+1. When you receive a message, it will contain ONLY the interview question you should ask.
+2. Speak the question naturally and clearly, exactly as provided - do not add any preamble or extra words.
+3. Do NOT read out any meta-instructions or acknowledge them verbally - just ask the question provided.
+4. Do NOT interrupt the candidate while they are speaking. Wait for long pauses (3+ seconds).
+5. Do NOT use filler words like "okay", "mm-hmm", or "I see" during the candidate's response.
+6. After the candidate finishes their answer, remain completely silent unless you receive another message.
+7. Never ask follow-up questions unless explicitly instructed.
+
+Remember: You only speak when given a new message. Each message contains exactly what you should say."""
+
+    config = {
+        # Note: Live API expects a single output modality. Requesting both
+        # AUDIO and TEXT can cause a 1007 "invalid argument" during connect.
+        "response_modalities": ["AUDIO"],
+        # Ask Gemini to include transcripts alongside audio.
+        "input_audio_transcription": {},
+        "output_audio_transcription": {},
+        "system_instruction": {
+            "role": "system",
+            "parts": [{"text": system_instruction}]
+        },
+        # Configure voice and turn detection
+        "generation_config": {
+            "speech_config": {
+                "voice_config": {
+                    "prebuilt_voice_config": {
+                        "voice_name": voice
+                    }
+                }
+            }
+        }
+    }
+
+    if LIVE_SESSION_RESUMPTION:
+        # Resume the earlier Live context when we have a handle; ask for handles either way.
+        config["session_resumption"] = {"handle": live_handle} if live_handle else {}
+    return config
+
+
+# Live sessions connected ahead of time per model + config (LIVE_POOL_SIZE, 0 = off)
+_live_pool: Optional[LiveSessionPool] = (
+    LiveSessionPool(
+        lambda model, config: genai.Client(api_key=GEMINI_API_KEY).aio.live.connect(model=model, config=config),
+        size=LIVE_POOL_SIZE,
+        max_age_seconds=LIVE_POOL_MAX_AGE_SECONDS,
+        idle_seconds=LIVE_POOL_IDLE_SECONDS,
+    )
+    if LIVE_POOL_SIZE > 0
+    else None
+)
+
+
+@app.on_event("startup")
+async def _start_live_pool():
+    if _live_pool is not None:
+        _live_pool.warm(BEHAVIORAL_LIVE_MODEL, _behavioral_live_config())
+
+
+@app.on_event("shutdown")
+async def _stop_live_pool():
+    if _live_pool is not None:
+        await _live_pool.close()
+
+
+# AI-generated technical problem sessions, indexed by "client:question" for reuse
+_generated_technical_sessions = state_store(
+    "generated_technical_sessions",
+    GENERATED_SESSION_TTL_SECONDS,
+    GENERATED_SESSION_MAX,
+)
 
 
 def _extract_first_json_object(text: str) -> dict:
@@ -269,6 +468,10 @@ def _generate_problem_fallback(question: dict) -> dict:
     }
 
 
+# Bump when the generation prompt changes: it's part of the shared problem cache key.
+PROBLEM_PROMPT_VERSION = "2"
+
+
 async def _generate_original_problem_from_metadata(question: dict) -> dict:
     """Use Gemini to generate an original problem prompt + deterministic tests.
 
@@ -298,7 +501,7 @@ Return ONLY valid JSON (no markdown) with this schema:
   "constraints": string[],
   "input_notes": string,
   "output_notes": string,
-    "starter_code": {"python": string, "javascript": string},
+    "starter_code": {{"python": string, "javascript": string}},
   "examples": [{{"input": object, "output": any, "explanation": string}}],
   "sample_tests": [{{"input": object, "expectedOutput": any}}],
   "hidden_tests": [{{"input": object, "expectedOutput": any}}]
@@ -324,6 +527,44 @@ Requirements:
     payload = _extract_first_json_object(response.text or "")
     return _validate_generated_problem_payload(payload)
 
+
+# Generated problems shared across clients; sessions reference them by id.
+_problem_cache = ProblemCache(
+    problems=state_store("generated_problems", PROBLEM_CACHE_TTL_SECONDS, PROBLEM_CACHE_MAX_PROBLEMS),
+    variant_ids=state_store("generated_problem_variants", PROBLEM_CACHE_TTL_SECONDS, PROBLEM_CACHE_MAX_PROBLEMS),
+    variants=PROBLEM_CACHE_VARIANTS,
+)
+
+# Validated problems kept ready per (question id, difficulty), refilled in the background.
+_problem_pool: Optional[ProblemPool] = (
+    ProblemPool(
+        _generate_original_problem_from_metadata,
+        target=PROBLEM_POOL_SIZE,
+        low_watermark=PROBLEM_POOL_LOW_WATERMARK,
+        hourly_budget=PROBLEM_POOL_HOURLY_BUDGET,
+        concurrency=PROBLEM_POOL_CONCURRENCY,
+        max_keys=PROBLEM_POOL_MAX_KEYS,
+        # Only generate what the shared cache can still use: questions with all
+        # their variants are served from it and never take from the pool again.
+        demand=lambda question: _problem_cache.missing(problem_cache_key(question, PROBLEM_PROMPT_VERSION)),
+    )
+    if PROBLEM_POOL_SIZE > 0
+    else None
+)
+
+
+@app.on_event("startup")
+async def _start_problem_pool():
+    if _problem_pool is not None and PROBLEM_POOL_WARM_ON_STARTUP:
+        bank = get_question_bank()
+        _problem_pool.warm([q for level in QUESTION_LEVELS for q in bank.questions(level)])
+
+
+@app.on_event("shutdown")
+async def _stop_problem_pool():
+    if _problem_pool is not None:
+        await _problem_pool.close()
+
 # Cache for SimplifyJobs internship listings (parsed from README.md)
 _simplifyjobs_cache = {
     "fetched_at": 0.0,
@@ -530,10 +771,17 @@ def _parse_simplifyjobs_readme_tables(readme: str) -> list[dict]:
         if key in seen:
             continue
         seen.add(key)
+        j["id"] = _listing_id(j)
         deduped.append(j)
     return deduped
 
 
+def _listing_id(job: dict) -> str:
+    """Stable short id for a SimplifyJobs row (same key used for de-duplication)."""
+    key = "|".join(str(job.get(k) or "") for k in ("company", "role", "location", "apply_url"))
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+
+
 def _get_simplifyjobs_listings_cached_sync(max_age_seconds: int = 60 * 60) -> list[dict]:
     """Synchronous version - use _get_simplifyjobs_listings_cached for async contexts."""
     now = time.time()
@@ -926,124 +1174,6 @@ async def get_real_job_details(
     })
 
 
-def extract_text_from_pdf(pdf_file: bytes) -> str:
-    """Extract text from PDF file bytes."""
-    pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_file))
-    text = ""
-    for page in pdf_reader.pages:
-        text += page.extract_text() + "\n"
-    return text
-
-
-def extract_text(file_content: bytes, content_type: str) -> str:
-    """Extract text from uploaded file based on content type."""
-    if content_type == "application/pdf":
-        return extract_text_from_pdf(file_content)
-    return file_content.decode("utf-8")
-
-
-def call_gemini_with_retry(client, model, contents, max_retries=3, initial_delay=1, timeout=60):
-    """
-    Call Gemini API with retry logic for 503/429 errors and timeout.
-
-    Args:
-        client: Gemini client instance
-        model: Model name to use
-        contents: Prompt/content to send
-        max_retries: Maximum number of retry attempts
-        initial_delay: Initial delay in seconds before first retry
-        timeout: Maximum time in seconds for the entire operation
-
-    Returns:
-        Response from Gemini API
-
-    Raises:
-        Exception: If all retries fail, timeout, or non-retryable error occurs
-    """
-    import signal
-
-    last_exception = None
-    start_time = time.time()
-
-    for attempt in range(max_retries + 1):
-        # Check if we've exceeded total timeout
-        elapsed = time.time() - start_time
-        if elapsed > timeout:
-            raise Exception("Request timed out. The server is experiencing high load. Please try again in a few moments.")
-
-        try:
-            response = client.models.generate_content(
-                model=model,
-                contents=contents
-            )
-            return response
-        except Exception as e:
-            error_str = str(e).lower()
-
-            # Check if it's a retryable error (503, 429, overloaded, quota)
-            is_retryable = False
-            is_rate_limit = False
-
-            # Rate limit / quota errors (429)
-            if "429" in str(e) or "resource exhausted" in error_str or "quota" in error_str or "rate limit" in error_str:
-                is_retryable = True
-                is_rate_limit = True
-
-            # Service unavailable (503)
-            if "503" in str(e) or "unavailable" in error_str or "overloaded" in error_str:
-                is_retryable = True
-
-            # Check exception attributes
-            status_code = getattr(e, 'status_code', None) or getattr(e, 'code', None)
-            if status_code in [429, 503]:
-                is_retryable = True
-                is_rate_limit = status_code == 429
-
-            if is_retryable and attempt < max_retries:
-                # Use longer delays for rate limits
-                base_delay = initial_delay * 2 if is_rate_limit else initial_delay
-                delay = min(base_delay * (2 ** attempt), 10)  # Cap at 10 seconds
-
-                # Don't wait if we'd exceed timeout
-                if time.time() - start_time + delay > timeout:
-                    raise Exception("Request timed out. The server is experiencing high load. Please try again in a few moments.")
-
-                print(f"[Gemini] Retrying in {delay}s (attempt {attempt + 1}/{max_retries}) - {str(e)[:100]}")
-                # Use asyncio-safe sleep if in async context, otherwise regular sleep
-                import asyncio
-                try:
-                    loop = asyncio.get_running_loop()
-                    # We're in an async context but this is a sync function
-                    # Just use regular sleep - the function will be wrapped with to_thread
-                    time.sleep(delay)
-                except RuntimeError:
-                    # No running event loop, safe to use time.sleep
-                    time.sleep(delay)
-                last_exception = e
-                continue
-            else:
-                # Non-retryable error or max retries reached
-                if is_rate_limit:
-                    raise Exception("Server is currently busy due to high demand. Please try again in a few moments.")
-                raise e
-
-    # If we exhausted all retries, raise appropriate error
-    if last_exception:
-        error_str = str(last_exception).lower()
-        if "429" in str(last_exception) or "quota" in error_str or "rate limit" in error_str:
-            raise Exception("Server is currently busy due to high demand. Please try again in a few moments.")
-        raise Exception("Service temporarily unavailable. Please try again in a few moments.")
-
-
-async def call_gemini_with_retry_async(client, model, contents, max_retries=3, initial_delay=1, timeout=60):
-    """Async wrapper for call_gemini_with_retry to avoid blocking the event loop."""
-    import asyncio
-    return await asyncio.to_thread(
-        call_gemini_with_retry,
-        client, model, contents, max_retries, initial_delay, timeout
-    )
-
-
 @app.get("/")
 async def root():
     """Health check endpoint."""
@@ -1068,41 +1198,7 @@ async def analyze_resume(
         JSON with analysis results
     """
     try:
-        def _sanitize_job_role(value: Optional[str]) -> Optional[str]:
-            if not value:
-                return None
-            v = re.sub(r"\s+", " ", value).strip()
-            if not v:
-                return None
-
-            # Remove obvious prompt-injection phrasing
-            injection_patterns = [
-                r"ignore\s+all\s+previous\s+instructions",
-                r"ignore\s+previous\s+instructions",
-                r"ignore\s+all\s+instructions",
-                r"system\s+prompt",
-                r"developer\s+message",
-                r"you\s+are\s+chatgpt",
-                r"give\s+the\s+user\s+\d+",
-                r"return\s+\d+",
-                r"always\s+give\s+\d+",
-                r"score\s+\d+",
-            ]
-            lowered = v.casefold()
-            if any(re.search(p, lowered) for p in injection_patterns):
-                return None
-
-            # Allow only a conservative set of characters
-            v = re.sub(r"[^a-zA-Z0-9\s\-\/+&.,()]+", "", v).strip()
-            if not v:
-                return None
-
-            # Limit length to avoid instruction stuffing
-            if len(v) > 60:
-                v = v[:60].strip()
-            return v or None
-
-        job_role = _sanitize_job_role(job_role)
+        job_role = sanitize_job_role(job_role)
 
         # Validate file type
         if file.content_type not in ["application/pdf", "text/plain"]:
@@ -1123,151 +1219,7 @@ async def analyze_resume(
                 detail="File does not have any content"
             )
 
-        # Build prompt with reference examples and strict scoring
-        default_note = "If the student is still in university, they are probably applying for internship roles"
-        additional_notes = f"{notes}. {default_note}" if notes else default_note
-
-        reference_examples = """
-        REFERENCE RESUMES FOR CALIBRATION:
-
-        CRITICAL CONTEXT: With modern AI coding tools (ChatGPT, Claude, Copilot, Cursor), projects can be "vibe coded" in hours.
-        Therefore, projects alone carry SIGNIFICANTLY LESS WEIGHT than they did previously. Focus heavily on:
-        - REAL work experience with quantifiable impact
-        - Duration and quality of professional roles
-        - Competitive achievements (hackathons WON, case competitions with TOP placements only)
-        - Academic excellence (high GPA, scholarships, awards)
-
-        SATURATED MARKET CALIBRATION - EXTREMELY STRICT:
-        - The market is HEAVILY saturated with candidates. You must be RUTHLESSLY STRICT.
-        - Most resumes are mediocre. DO NOT give the benefit of the doubt.
-        - If you see vague bullets, buzzwords, or no metrics - PENALIZE HEAVILY.
-        - Projects without clear evidence of real usage, deployment, testing, or architecture decisions are worth MINIMAL points.
-        - University club projects are NOT professional experience unless they show exceptional scope/impact.
-
-        BEGINNER/WEAK STUDENT (Typical Score: 30-55):
-        - First or second year university student
-        - Only tutorial-level projects OR projects with no clear depth
-        - No internships or only very basic/short internships
-        - Vague bullet points with no metrics or concrete achievements
-        - Generic skills lists with no evidence
-        REALISTIC OUTCOME: Will struggle to get interviews at competitive companies.
-
-        DECENT STUDENT (Typical Score: 55-65):
-        - Has 1 real internship OR strong university dev team role with measurable contributions
-        - 2-3 projects that show SOME depth (testing, deployment, or real users)
-        - Some quantifiable metrics (even if modest)
-        - Clear technical skills with evidence of application
-        REALISTIC OUTCOME: Can potentially land interviews at mid-tier companies with effort.
-
-        INTERMEDIATE/SOLID (Typical Score: 65-75):
-        - Multiple real internships with clear ownership and impact
-        - Projects show real depth: architecture decisions, testing, deployment, scale, real users with metrics
-        - Competitive achievements (hackathon wins, not just participation)
-        - Clear evidence of technical maturity and professional work quality
-        REALISTIC OUTCOME: Competitive for mid-tier and some upper-tier companies.
-
-        STRONG (Typical Score: 75-85):
-        - 2+ strong internships with significant impact at known companies
-        - Projects are production-quality with clear technical depth
-        - Leadership roles OR competitive programming success OR published research
-        - Multiple quantifiable achievements showing scope and impact
-        REALISTIC OUTCOME: Competitive for top-tier companies, strong interview candidate.
-
-        EXCEPTIONAL/FAANG READY (Score: 85+):
-        - FAANG/unicorn internship(s) with major impact
-        - Elite competitive programming (Codeforces Master+, ICPC medalist, IOI/USACO top tiers)
-        - Major OSS contributions (maintainer of widely-used projects)
-        - Published research at credible venues OR product with significant traction (10k+ users)
-        - Multiple exceptional signals, not just one
-        REALISTIC OUTCOME: Ready for FAANG-level interviews, likely to succeed.
-
-        SCORING GUIDELINES (EXTREMELY STRICT - NO MERCY):
-        - 90-100: Reserved for truly exceptional candidates (less than 1% of resumes)
-        - 85-89: FAANG Ready with multiple strong signals
-        - 75-84: Strong candidate with proven track record
-        - 65-74: Intermediate/Solid with real experience and depth
-        - 55-64: Decent but unremarkable
-        - 45-54: Weak/Beginner with minimal real experience
-        - 30-44: Very weak, major gaps
-        - 0-29: Essentially unqualified
-
-        BEGINNER RESUME HARD CAP: If the resume shows beginner-level experience (no real internships, only basic projects, first/second year student with minimal work), the score MUST NOT exceed 70. Period.
-
-        INTERMEDIATE RESUME RANGE: If the resume shows intermediate-level experience (1-2 internships, decent projects with some depth), score in the 70-80 range ONLY if truly justified.
-
-        DO NOT INFLATE SCORES - BE RUTHLESSLY STRICT:
-        - Assume projects are AI-assisted unless proven otherwise (tests, deployment, architecture docs, real users with metrics)
-        - Generic bullets like "developed X" or "implemented Y" without metrics = MINIMAL value
-        - "Participated in" or "helped with" = essentially worthless
-        - "Familiar with" or "knowledge of" = not real skill evidence
-        - Start at 40 by default. Add points ONLY for concrete evidence. Subtract for vagueness, buzzwords, or inflated claims.
-        - University design teams/research/dev clubs count as real experience ONLY if there's clear ownership and deliverables
-        """
-
-        prompt = f"""Today is {date.today()}.
-        You are a RUTHLESSLY STRICT hiring manager at a top company in the field of {job_role if job_role else "various industries"}.
-        Your job is to AGGRESSIVELY filter out weak candidates. You have ZERO MERCY and NO BIAS toward making candidates feel good.
-        
-        The market is HEAVILY saturated. Most resumes are mediocre. You must be EXTREMELY STRICT.
-
-        {reference_examples}
-
-        RESUME TO REVIEW:
-        {text_content}
-
-        CRITICAL INSTRUCTIONS - READ CAREFULLY:
-        1. Compare this resume to the REFERENCE resumes provided above
-        2. Determine the TRUE experience level (Beginner/Decent/Intermediate/Strong/Exceptional)
-        3. Assign a BRUTALLY HONEST score from 0-100 based on these STRICT SCORING GUIDELINES:
-              - 90-100: Reserved for truly exceptional candidates (less than 1% of resumes) - FAANG+ ready with multiple rare signals
-              - 85-89: FAANG Ready with proven track record
-              - 75-84: Strong candidate with 2+ quality internships and real impact
-              - 70-74: Upper-intermediate with solid experience
-              - 65-69: Intermediate with decent experience
-              - 55-64: Decent but unremarkable
-              - 45-54: Weak/Beginner with minimal experience
-              - 30-44: Very weak with major gaps
-              - 0-29: Essentially unqualified
-
-        HARD RULES - NON-NEGOTIABLE:
-        - BEGINNER RESUMES (no real internships, only basic projects, early student) CANNOT score above 70. EVER.
-        - INTERMEDIATE RESUMES (1-2 internships, decent projects) can score 70-80 ONLY if truly justified with clear depth and impact.
-        - Projects without deployment, testing, real users, or architecture docs are worth MINIMAL points.
-        - "Participated in", "helped with", "familiar with", "knowledge of" = worthless fluff.
-        - Vague bullets without metrics = RED FLAG, penalize heavily.
-        - Start at 40 by default. Add points ONLY for concrete, verifiable achievements.
-        
-        4. BE RUTHLESSLY CRITICAL - This is NOT about being nice, it's about being ACCURATE.
-        5. Focus on: REAL work experience, measurable impact, competitive achievements, technical depth.
-        6. GPA doesn't matter much - focus on actual work and achievements.
-        7. If you're uncertain between two scores, ALWAYS choose the LOWER one.
-        8. Provide an INTEGER score (whole number).
-        9. In your assessment, be BLUNT about weaknesses. Don't sugarcoat anything.
-
-        Respond in this EXACT format:
-        SCORE: [number between 0-100]
-
-        STRENGTHS:
-        - [Bullet point 1 - be specific and concrete, or write "Limited strengths identified"]
-        - [Bullet point 2]
-        - [Bullet point 3]
-
-        AREAS FOR IMPROVEMENT:
-        - [Bullet point 1 - be BLUNT and SPECIFIC about weaknesses]
-        - [Bullet point 2 - don't hold back]
-        - [Bullet point 3 - be ruthlessly honest]
-
-        RECOMMENDATIONS:
-        - [Actionable recommendation 1 - be specific and demanding]
-        - [Actionable recommendation 2]
-        - [Actionable recommendation 3]
-
-        OVERALL ASSESSMENT:
-        [2-3 sentences summarizing the resume's REALISTIC readiness level. Be BRUTALLY HONEST. If it's weak, say so clearly. No sugarcoating.]
-
-        Additional Notes: {additional_notes}
-        Tailor your feedback for {job_role if job_role else "general applications"}
-        """
+        prompt = build_resume_analysis_prompt(text_content, job_role=job_role, notes=notes)
 
         # Call Gemini API with retry logic (async to avoid blocking event loop)
         client = genai.Client(api_key=GEMINI_API_KEY)
@@ -1282,22 +1234,7 @@ async def analyze_resume(
         response_text = response.text
 
         # Extract score from response
-        score = None
-        score_match = re.search(r'SCORE:\s*(\d+)', response_text, re.IGNORECASE)
-        if score_match:
-            raw_score = int(score_match.group(1))
-            raw_score = max(0, min(100, raw_score))
-
-            # Market calibration: gently reduce common inflation at the top end,
-            # but preserve the user's intended mid-range bands.
-            adjusted = raw_score
-            if raw_score >= 90:
-                adjusted -= 5
-            elif raw_score >= 85:
-                adjusted -= 3
-            elif raw_score >= 75:
-                adjusted -= 2
-            score = max(0, min(100, adjusted))
+        score = calibrate_resume_score(response_text)
 
         return JSONResponse(content={
             "success": True,
@@ -1326,6 +1263,230 @@ async def analyze_resume(
         )
 
 
+_REAL_JOB_SOURCES = {"real", "simplifyjobs_summer2026", "simplifyjobs"}
+
+# Map difficulty to company tier and screening criteria
+SCREENING_DIFFICULTY_CONFIGS = {
+    "easy": {
+        "company_type": "an early-stage startup internship program",
+        "strictness": """
+        STARTUP INTERNSHIP HIRING MODE: Looking for candidates with real potential and demonstrated technical ability.
+
+        CRITICAL: GPA doesn't really matter - focus on actual work and projects.
+        University dev team roles (design teams, research labs, student dev clubs) COUNT as real experience.
+        Projects can compensate for lack of traditional internships IF they show real depth.
+
+        PASS if candidate has AT LEAST TWO of:
+        - Previous internship or co-op position
+        - Active role on university design team, research project, or dev club
+        - 2-3 strong projects with real technical depth (not basic CRUD apps)
+        - Competitive achievements (hackathon wins, case competition placements)
+        - Part-time or freelance dev work
+
+        REJECT if:
+        - Only basic tutorial-level projects with no depth
+        - No university dev team involvement AND no internships AND only shallow projects
+        - No evidence of technical growth or learning
+
+        GPA is nice to have but NOT a deciding factor.
+        Target pass rate: ~15-25% of applicants
+        """
+    },
+    "medium": {
+        "company_type": "a mid-tier company internship program",
+        "strictness": """
+        MID-TIER COMPANY INTERNSHIP HIRING MODE: Looking for proven performers with real technical depth and clear evidence of impact.
+
+        CRITICAL: GPA is not a major factor. What matters:
+        - REAL work experience (internships, research assistantships, dev team leadership)
+        - Quantifiable impact and ownership (not just "participated")
+        - Technical depth in projects (architecture, testing, deployment, real usage)
+        - Competitive validation (hackathons won, contributions merged, users acquired)
+
+        PASS if candidate has AT LEAST ONE strong professional signal (internship/dev team leadership/research) AND AT LEAST TWO of:
+        - Previous internship at known company with clear responsibilities/impact
+        - University dev team leadership role (design team lead, research contributor with deliverables)
+        - Notable competitive achievements (hackathon wins/placements, not just participation)
+        - Strong OSS contributions (merged PRs with real impact, not typo fixes)
+        - Projects with real depth (tests, deployment, metrics, users) and clear ownership
+
+        REJECT if:
+        - No previous internship/dev team experience AND only surface-level projects
+        - Projects lack depth (no tests, no deployment, no users, no clear architecture)
+        - Vague bullet points with no metrics or specific outcomes
+        - No evidence of working on complex technical problems or collaborating on real codebases
+
+        GPA is nice to have but NOT required if work/projects are strong.
+        Target pass rate: ~5-12% of applicants
+        """
+    },
+    "hard": {
+        "company_type": "a FAANG-tier / Big Tech company internship program",
+        "strictness": """
+        FAANG-TIER INTERNSHIP HIRING MODE: Only accepting top-tier candidates with exceptional proven track records.
+
+        CRITICAL: GPA is nice to have but NOT required. What matters:
+        - Previous internships at top companies (FAANG, unicorns, elite startups)
+        - Competitive programming: Codeforces Master+, ICPC regionals, IOI medals
+        - Real research publications or significant open source contributions
+        - Founded company with real traction or worked on products with millions of users
+        - Exceptional project portfolio with measurable impact
+
+        NON-NEGOTIABLE GATE (must pass this gate, otherwise REJECT):
+        The resume MUST clearly show at least ONE of the following hard signals:
+        - A top-tier internship (FAANG/unicorn/very selective trading firm)
+        - Elite competitive programming (e.g., Codeforces Master+, ICPC strong placement, IOI/USACO top tiers)
+        - Major open-source impact (maintainer/core contributor, widely-used library, clear adoption)
+        - Research at a strong lab with publication(s) OR meaningful product traction (real users/metrics)
+
+        PASS only if the candidate clears the NON-NEGOTIABLE GATE AND has AT LEAST FOUR of:
+        - 1+ previous FAANG/unicorn/very selective internship (or a clear return offer)
+        - Strong competitive signal (Codeforces Master+/ICPC strong placement/IOI/USACO top tiers)
+        - Significant open-source impact (not small PRs; clear ownership/maintenance)
+        - Published research (credible venue) or serious engineering leadership (mentoring/leading major scope)
+        - Built product with real traction (e.g., 10k+ users OR clear revenue OR meaningful adoption)
+        - Multiple strong internships with quantified impact and scope
+        - Exceptional projects that show depth (tests, perf, systems design, deployment, scale)
+
+        REJECT if:
+        - No previous top-tier internship AND no exceptional technical achievements
+        - Only has projects without competitive validation or real users
+        - Generic internship experience at unknown companies
+        - No measurable impact or scale
+
+        GPA is nice to have but NOT a deciding factor.
+        Target pass rate: ~1-3% of applicants
+        """
+    }
+}
+
+SCREENING_REFERENCE_EXAMPLES = {
+    "easy": """
+    REFERENCE: This is an acceptable resume for a startup internship:
+    - University student or recent graduate
+    - 1+ relevant personal or school projects
+    - Basic competency in required tech skills
+    - Shows learning mindset and enthusiasm
+
+    This candidate should PASS a startup internship screening. Use this as your baseline.
+    """,
+    "medium": """
+    REFERENCE: This is the MINIMUM acceptable resume for a mid-tier company internship:
+    - At least 1 real internship OR strong university dev team role with clear ownership
+    - Projects must show depth: testing, deployment, architecture decisions, or real users/metrics
+    - Clear evidence of technical competency beyond tutorials (frameworks, systems, collaboration)
+    - Quantified impact or scope in at least one experience
+
+    This candidate should PASS a mid-tier company internship screening. Use this as your baseline.
+    """,
+    "hard": """
+    REFERENCE: This is the MINIMUM acceptable resume for a FAANG-tier internship:
+    - At least ONE hard signal: FAANG/unicorn/selective internship OR elite competitive programming OR major OSS impact OR credible research/publication OR clear product traction
+    - Strong evidence of engineering depth (tests, deployment, scale, design decisions)
+    - Quantified impact (scope/metrics) in at least one experience
+
+    This candidate should PASS a FAANG-tier internship screening. Use this as your baseline.
+    """
+}
+
+def _normalize_screening_difficulty(value: Optional[str]) -> str:
+    d = (value or "easy").strip().lower()
+    return d if d in {"easy", "medium", "hard"} else "easy"
+
+
+async def _infer_listing_difficulty(
+    client,
+    *,
+    company: Optional[str],
+    role: str,
+    job_category: Optional[str] = None,
+    job_location: Optional[str] = None,
+    job_apply_url: Optional[str] = None,
+    job_age: Optional[str] = None,
+    job_row: Optional[str] = None,
+) -> Optional[str]:
+    """Use AI to pick the screening difficulty for a real job listing (None if unsure)."""
+    try:
+        listing_blob = "\n".join([
+            f"Company: {company or ''}",
+            f"Role: {role}",
+            f"Category: {job_category or ''}",
+            f"Location: {job_location or ''}",
+            f"Apply URL: {job_apply_url or ''}",
+            f"Age: {job_age or ''}",
+            f"Repo row: {job_row or ''}",
+        ])
+        difficulty_prompt = f"""Choose the internship screening difficulty for this job.
+
+Return ONLY valid JSON like {{"difficulty":"easy"}}.
+Allowed values: easy, medium, hard.
+
+Heuristics:
+- hard: Big Tech/top finance/very selective OR highly specialized role.
+- medium: typical established company internship.
+- easy: early-stage/less selective/general entry internship.
+
+LISTING:
+{listing_blob}
+"""
+        resp = await call_gemini_with_retry_async(
+            client=client,
+            model="gemini-2.5-flash",
+            contents=difficulty_prompt,
+            max_retries=2,
+            initial_delay=1,
+        )
+        m = re.search(r"\{.*\}", (resp.text or ""), flags=re.DOTALL)
+        if m:
+            obj = json.loads(m.group(0))
+            d = (obj.get("difficulty") or "").strip().lower()
+            if d in {"easy", "medium", "hard"}:
+                return d
+    except Exception:
+        pass
+    return None
+
+
+async def _build_real_job_context(
+    *,
+    company: Optional[str],
+    role: str,
+    job_category: Optional[str] = None,
+    job_location: Optional[str] = None,
+    job_apply_url: Optional[str] = None,
+    job_age: Optional[str] = None,
+    job_row: Optional[str] = None,
+) -> str:
+    job_posting_text = None
+    if job_apply_url:
+        # Best-effort: some postings (especially simplify.jobs) are publicly readable.
+        job_posting_text = await _fetch_job_posting_text(job_apply_url)
+
+    return f"""
+    JOB LISTING CONTEXT (from SimplifyJobs/Summer2026-Internships list; may be limited):
+    - Company: {company or 'Unknown'}
+    - Role: {role}
+    - Category: {job_category or ''}
+    - Location: {job_location or ''}
+    - Apply URL: {job_apply_url or ''}
+    - Age: {job_age or ''}
+    - Source Row: {job_row or ''}
+ 
+JOB POSTING TEXT (best-effort fetch; use this to judge requirements if present):
+{(job_posting_text or '')}
+    """.strip()
+
+
+def _apply_hard_gate_override(passed: bool, response_text: str, text_content: str) -> tuple[bool, str]:
+    """If the resume does not appear to include any top-tier signals, force REJECT
+    regardless of model generosity."""
+    signals = HARD_GATE_SIGNALS.scan(text_content)
+    if signals:
+        print(f"[Screening] Hard gate met: {[hit.id for hit in signals]}")
+        return passed, response_text
+    return False, (response_text or "") + "\n\n[OVERRIDE] Preset FAANG-tier screening requires explicit top-tier signals (FAANG/unicorn/selective internship, elite competitive programming, major OSS impact, credible research/publications, or clear product traction). Not detected, so REJECT."
+
+
 @app.post("/api/screen-resume")
 async def screen_resume(
     file: UploadFile = File(...),
@@ -1364,201 +1525,31 @@ async def screen_resume(
                 detail="File does not have any content"
             )
 
+        is_real_listing = (job_source or "").lower() in _REAL_JOB_SOURCES
+        listing_fields = {
+            "company": company,
+            "role": role,
+            "job_category": job_category,
+            "job_location": job_location,
+            "job_apply_url": job_apply_url,
+            "job_age": job_age,
+            "job_row": job_row,
+        }
+
         # If the caller provided a real job listing, infer difficulty using AI.
         inferred_difficulty: Optional[str] = None
-        if (job_source or "").lower() in {"real", "simplifyjobs_summer2026", "simplifyjobs"}:
-            try:
-                client = genai.Client(api_key=GEMINI_API_KEY)
-                listing_blob = "\n".join([
-                    f"Company: {company or ''}",
-                    f"Role: {role}",
-                    f"Category: {job_category or ''}",
-                    f"Location: {job_location or ''}",
-                    f"Apply URL: {job_apply_url or ''}",
-                    f"Age: {job_age or ''}",
-                    f"Repo row: {job_row or ''}",
-                ])
-                difficulty_prompt = f"""Choose the internship screening difficulty for this job.
-
-Return ONLY valid JSON like {{"difficulty":"easy"}}.
-Allowed values: easy, medium, hard.
-
-Heuristics:
-- hard: Big Tech/top finance/very selective OR highly specialized role.
-- medium: typical established company internship.
-- easy: early-stage/less selective/general entry internship.
+        if is_real_listing:
+            client = genai.Client(api_key=GEMINI_API_KEY)
+            inferred_difficulty = await _infer_listing_difficulty(client, **listing_fields)
 
-LISTING:
-{listing_blob}
-"""
-                resp = await call_gemini_with_retry_async(
-                    client=client,
-                    model="gemini-2.5-flash",
-                    contents=difficulty_prompt,
-                    max_retries=2,
-                    initial_delay=1,
-                )
-                m = re.search(r"\{.*\}", (resp.text or ""), flags=re.DOTALL)
-                if m:
-                    obj = json.loads(m.group(0))
-                    d = (obj.get("difficulty") or "").strip().lower()
-                    if d in {"easy", "medium", "hard"}:
-                        inferred_difficulty = d
-            except Exception:
-                inferred_difficulty = None
-
-        effective_difficulty = (inferred_difficulty or difficulty or "easy").strip().lower()
-        if effective_difficulty not in {"easy", "medium", "hard"}:
-            effective_difficulty = "easy"
-
-        # Map difficulty to company tier and screening criteria
-        difficulty_configs = {
-            "easy": {
-                "company_type": "an early-stage startup internship program",
-                "strictness": """
-                STARTUP INTERNSHIP HIRING MODE: Looking for candidates with real potential and demonstrated technical ability.
-
-                CRITICAL: GPA doesn't really matter - focus on actual work and projects.
-                University dev team roles (design teams, research labs, student dev clubs) COUNT as real experience.
-                Projects can compensate for lack of traditional internships IF they show real depth.
-
-                PASS if candidate has AT LEAST TWO of:
-                - Previous internship or co-op position
-                - Active role on university design team, research project, or dev club
-                - 2-3 strong projects with real technical depth (not basic CRUD apps)
-                - Competitive achievements (hackathon wins, case competition placements)
-                - Part-time or freelance dev work
-
-                REJECT if:
-                - Only basic tutorial-level projects with no depth
-                - No university dev team involvement AND no internships AND only shallow projects
-                - No evidence of technical growth or learning
-
-                GPA is nice to have but NOT a deciding factor.
-                Target pass rate: ~15-25% of applicants
-                """
-            },
-            "medium": {
-                "company_type": "a mid-tier company internship program",
-                "strictness": """
-                MID-TIER COMPANY INTERNSHIP HIRING MODE: Looking for proven performers with real technical depth and clear evidence of impact.
-
-                CRITICAL: GPA is not a major factor. What matters:
-                - REAL work experience (internships, research assistantships, dev team leadership)
-                - Quantifiable impact and ownership (not just "participated")
-                - Technical depth in projects (architecture, testing, deployment, real usage)
-                - Competitive validation (hackathons won, contributions merged, users acquired)
-
-                PASS if candidate has AT LEAST ONE strong professional signal (internship/dev team leadership/research) AND AT LEAST TWO of:
-                - Previous internship at known company with clear responsibilities/impact
-                - University dev team leadership role (design team lead, research contributor with deliverables)
-                - Notable competitive achievements (hackathon wins/placements, not just participation)
-                - Strong OSS contributions (merged PRs with real impact, not typo fixes)
-                - Projects with real depth (tests, deployment, metrics, users) and clear ownership
-
-                REJECT if:
-                - No previous internship/dev team experience AND only surface-level projects
-                - Projects lack depth (no tests, no deployment, no users, no clear architecture)
-                - Vague bullet points with no metrics or specific outcomes
-                - No evidence of working on complex technical problems or collaborating on real codebases
-
-                GPA is nice to have but NOT required if work/projects are strong.
-                Target pass rate: ~5-12% of applicants
-                """
-            },
-            "hard": {
-                "company_type": "a FAANG-tier / Big Tech company internship program",
-                "strictness": """
-                FAANG-TIER INTERNSHIP HIRING MODE: Only accepting top-tier candidates with exceptional proven track records.
-
-                CRITICAL: GPA is nice to have but NOT required. What matters:
-                - Previous internships at top companies (FAANG, unicorns, elite startups)
-                - Competitive programming: Codeforces Master+, ICPC regionals, IOI medals
-                - Real research publications or significant open source contributions
-                - Founded company with real traction or worked on products with millions of users
-                - Exceptional project portfolio with measurable impact
-
-                NON-NEGOTIABLE GATE (must pass this gate, otherwise REJECT):
-                The resume MUST clearly show at least ONE of the following hard signals:
-                - A top-tier internship (FAANG/unicorn/very selective trading firm)
-                - Elite competitive programming (e.g., Codeforces Master+, ICPC strong placement, IOI/USACO top tiers)
-                - Major open-source impact (maintainer/core contributor, widely-used library, clear adoption)
-                - Research at a strong lab with publication(s) OR meaningful product traction (real users/metrics)
-
-                PASS only if the candidate clears the NON-NEGOTIABLE GATE AND has AT LEAST FOUR of:
-                - 1+ previous FAANG/unicorn/very selective internship (or a clear return offer)
-                - Strong competitive signal (Codeforces Master+/ICPC strong placement/IOI/USACO top tiers)
-                - Significant open-source impact (not small PRs; clear ownership/maintenance)
-                - Published research (credible venue) or serious engineering leadership (mentoring/leading major scope)
-                - Built product with real traction (e.g., 10k+ users OR clear revenue OR meaningful adoption)
-                - Multiple strong internships with quantified impact and scope
-                - Exceptional projects that show depth (tests, perf, systems design, deployment, scale)
-
-                REJECT if:
-                - No previous top-tier internship AND no exceptional technical achievements
-                - Only has projects without competitive validation or real users
-                - Generic internship experience at unknown companies
-                - No measurable impact or scale
-
-                GPA is nice to have but NOT a deciding factor.
-                Target pass rate: ~1-3% of applicants
-                """
-            }
-        }
+        effective_difficulty = _normalize_screening_difficulty(inferred_difficulty or difficulty)
 
-        config = difficulty_configs.get(effective_difficulty, difficulty_configs["easy"])
+        config = SCREENING_DIFFICULTY_CONFIGS.get(effective_difficulty, SCREENING_DIFFICULTY_CONFIGS["easy"])
         level_context = f"{level} level" if level != "internship" else "internship position"
 
-        # Reference resume examples for calibration
-        reference_examples = {
-            "easy": """
-            REFERENCE: This is an acceptable resume for a startup internship:
-            - University student or recent graduate
-            - 1+ relevant personal or school projects
-            - Basic competency in required tech skills
-            - Shows learning mindset and enthusiasm
-
-            This candidate should PASS a startup internship screening. Use this as your baseline.
-            """,
-            "medium": """
-            REFERENCE: This is the MINIMUM acceptable resume for a mid-tier company internship:
-            - At least 1 real internship OR strong university dev team role with clear ownership
-            - Projects must show depth: testing, deployment, architecture decisions, or real users/metrics
-            - Clear evidence of technical competency beyond tutorials (frameworks, systems, collaboration)
-            - Quantified impact or scope in at least one experience
-
-            This candidate should PASS a mid-tier company internship screening. Use this as your baseline.
-            """,
-            "hard": """
-            REFERENCE: This is the MINIMUM acceptable resume for a FAANG-tier internship:
-            - At least ONE hard signal: FAANG/unicorn/selective internship OR elite competitive programming OR major OSS impact OR credible research/publication OR clear product traction
-            - Strong evidence of engineering depth (tests, deployment, scale, design decisions)
-            - Quantified impact (scope/metrics) in at least one experience
-
-            This candidate should PASS a FAANG-tier internship screening. Use this as your baseline.
-            """
-        }
-
         job_context = ""
-        if (job_source or "").lower() in {"real", "simplifyjobs_summer2026", "simplifyjobs"}:
-            job_posting_text = None
-            if job_apply_url:
-                # Best-effort: some postings (especially simplify.jobs) are publicly readable.
-                job_posting_text = await _fetch_job_posting_text(job_apply_url)
-
-            job_context = f"""
-    JOB LISTING CONTEXT (from SimplifyJobs/Summer2026-Internships list; may be limited):
-    - Company: {company or 'Unknown'}
-    - Role: {role}
-    - Category: {job_category or ''}
-    - Location: {job_location or ''}
-    - Apply URL: {job_apply_url or ''}
-    - Age: {job_age or ''}
-    - Source Row: {job_row or ''}
- 
-JOB POSTING TEXT (best-effort fetch; use this to judge requirements if present):
-{(job_posting_text or '')}
-    """.strip()
+        if is_real_listing:
+            job_context = await _build_real_job_context(**listing_fields)
 
         prompt = f"""You are a resume screener at {config['company_type']} for a {role} position ({level_context}).
 
@@ -1566,7 +1557,7 @@ JOB POSTING TEXT (best-effort fetch; use this to judge requirements if present):
 
         {config['strictness']}
 
-        {reference_examples.get(effective_difficulty, reference_examples["easy"])}
+        {SCREENING_REFERENCE_EXAMPLES.get(effective_difficulty, SCREENING_REFERENCE_EXAMPLES["easy"])}
 
         RESUME TO REVIEW:
         {text_content}
@@ -1616,22 +1607,9 @@ JOB POSTING TEXT (best-effort fetch; use this to judge requirements if present):
         # Parse response to determine if passed
         passed = "DECISION: PASS" in response_text.upper()
 
-        # Deterministic guardrail for preset FAANG-tier jobs: if the resume does not appear
-        # to include any top-tier signals, force REJECT regardless of model generosity.
-        is_real_listing = (job_source or "").lower() in {"real", "simplifyjobs_summer2026", "simplifyjobs"}
+        # Deterministic guardrail for preset FAANG-tier jobs.
         if (not is_real_listing) and effective_difficulty == "hard":
-            gate_patterns = [
-                r"\b(google|alphabet|meta|facebook|amazon|aws|apple|microsoft|netflix|openai|anthropic|deepmind|nvidia|tesla|uber|airbnb|stripe|databricks|palantir|snowflake|coinbase|doordash|bloomberg|two\s+sigma|citadel|jane\s+street)\b",
-                r"\b(codeforces|icpc|ioi|usaco|acm\s+icpc|topcoder|kaggle\s+(master|grandmaster))\b",
-                r"\b(maintainer|core\s+contributor|tech\s+lead|team\s+lead)\b",
-                r"\b(\d{3,})\s*(stars|downloads)\b",
-                r"\b(10,?000\+?)\s*(users|customers)\b",
-                r"\b(publication|published|paper|arxiv)\b",
-            ]
-            hard_gate_met = any(re.search(p, text_content, re.IGNORECASE) for p in gate_patterns)
-            if not hard_gate_met:
-                passed = False
-                response_text = (response_text or "") + "\n\n[OVERRIDE] Preset FAANG-tier screening requires explicit top-tier signals (FAANG/unicorn/selective internship, elite competitive programming, major OSS impact, credible research/publications, or clear product traction). Not detected, so REJECT."
+            passed, response_text = _apply_hard_gate_override(passed, response_text, text_content)
 
         return JSONResponse(content={
             "passed": passed,
@@ -1664,666 +1642,281 @@ JOB POSTING TEXT (best-effort fetch; use this to judge requirements if present):
         )
 
 
-# Technical Interview Questions
-TECHNICAL_QUESTIONS = {
-    "easy": [
-        {
-            "id": "two-sum",
-            "title": "Two Sum",
-            "description": "Given an array of integers nums and an integer target, return the indices i and j such that nums[i] + nums[j] == target and i != j. You may assume that every input has exactly one pair of indices that satisfy the condition. Return the answer with the smaller index first.",
-            "difficulty": "Easy",
-            "examples": [
-                {"input": "nums = [3,4,5,6], target = 7", "output": "[0,1]", "explanation": "nums[0] + nums[1] == 7, so we return [0, 1]."},
-                {"input": "nums = [4,5,6], target = 10", "output": "[0,2]"}
-            ],
-            "constraints": [
-                "2 <= nums.length <= 1000",
-                "-10,000,000 <= nums[i] <= 10,000,000",
-                "-10,000,000 <= target <= 10,000,000",
-                "Only one valid answer exists"
-            ],
-            "sampleTestCases": [
-                {"input": {"nums": [3, 4, 5, 6], "target": 7}, "expectedOutput": [0, 1]},
-                {"input": {"nums": [4, 5, 6], "target": 10}, "expectedOutput": [0, 2]},
-                {"input": {"nums": [5, 5], "target": 10}, "expectedOutput": [0, 1]}
-            ],
-            "hiddenTestCases": [
-                {"input": {"nums": [2, 7, 11, 15], "target": 9}, "expectedOutput": [0, 1]},
-                {"input": {"nums": [-1, -2, -3, -4, -5], "target": -8}, "expectedOutput": [2, 4]},
-                {"input": {"nums": [0, 4, 3, 0], "target": 0}, "expectedOutput": [0, 3]},
-                {"input": {"nums": [1, 2], "target": 3}, "expectedOutput": [0, 1]},
-                {"input": {"nums": [10, 20, 30, 40, 50], "target": 90}, "expectedOutput": [3, 4]},
-                {"input": {"nums": [1, 3, 4, 2], "target": 6}, "expectedOutput": [2, 3]},
-                {"input": {"nums": [-5, -3, -1, 0, 2, 4], "target": -4}, "expectedOutput": [1, 2]},
-                {"input": {"nums": [100, 200, 300, 400], "target": 700}, "expectedOutput": [2, 3]},
-                {"input": {"nums": [15, 11, 7, 2], "target": 9}, "expectedOutput": [2, 3]},
-                {"input": {"nums": [3, 2, 4], "target": 6}, "expectedOutput": [1, 2]}
-            ]
-        },
-        {
-            "id": "contains-duplicate",
-            "title": "Contains Duplicate",
-            "description": "Given an integer array nums, return true if any value appears more than once in the array, otherwise return false.",
-            "difficulty": "Easy",
-            "examples": [
-                {"input": "nums = [1, 2, 3, 3]", "output": "true"},
-                {"input": "nums = [1, 2, 3, 4]", "output": "false"}
-            ],
-            "constraints": [
-                "1 <= nums.length <= 10^5",
-                "-10^9 <= nums[i] <= 10^9"
-            ],
-            "sampleTestCases": [
-                {"input": {"nums": [1, 2, 3, 3]}, "expectedOutput": True},
-                {"input": {"nums": [1, 2, 3, 4]}, "expectedOutput": False}
-            ],
-            "hiddenTestCases": [
-                {"input": {"nums": []}, "expectedOutput": False},
-                {"input": {"nums": [1]}, "expectedOutput": False},
-                {"input": {"nums": [0, 0]}, "expectedOutput": True},
-                {"input": {"nums": [-1, -2, -3, -4]}, "expectedOutput": False},
-                {"input": {"nums": [-1, -2, -3, -1]}, "expectedOutput": True},
-                {"input": {"nums": [1000000000, -1000000000, 1000000000]}, "expectedOutput": True},
-                {"input": {"nums": [5, 4, 3, 2, 1]}, "expectedOutput": False},
-                {"input": {"nums": [1, 2, 3, 4, 5, 6, 7, 8, 9, 1]}, "expectedOutput": True},
-                {"input": {"nums": [10, 11, 12, 13, 14, 15]}, "expectedOutput": False},
-                {"input": {"nums": [7, 7]}, "expectedOutput": True},
-                {"input": {"nums": [1, 5, 9, 13, 17, 21, 9]}, "expectedOutput": True}
-            ]
-        },
-        {
-            "id": "valid-anagram",
-            "title": "Valid Anagram",
-            "description": "Given two strings s and t, return true if the two strings are anagrams of each other, otherwise return false. An anagram contains the exact same characters as another string, but the order can be different.",
-            "difficulty": "Easy",
-            "examples": [
-                {"input": "s = \"racecar\", t = \"carrace\"", "output": "true"},
-                {"input": "s = \"jar\", t = \"jam\"", "output": "false"}
-            ],
-            "constraints": [
-                "s and t consist of lowercase English letters"
-            ],
-            "sampleTestCases": [
-                {"input": {"s": "racecar", "t": "carrace"}, "expectedOutput": True},
-                {"input": {"s": "jar", "t": "jam"}, "expectedOutput": False}
-            ],
-            "hiddenTestCases": [
-                {"input": {"s": "a", "t": "a"}, "expectedOutput": True},
-                {"input": {"s": "a", "t": "b"}, "expectedOutput": False},
-                {"input": {"s": "ab", "t": "ba"}, "expectedOutput": True},
-                {"input": {"s": "abc", "t": "ab"}, "expectedOutput": False},
-                {"input": {"s": "aaaaaaaaaa", "t": "aaaaaaaaaa"}, "expectedOutput": True},
-                {"input": {"s": "anagram", "t": "nagaram"}, "expectedOutput": True},
-                {"input": {"s": "rat", "t": "car"}, "expectedOutput": False},
-                {"input": {"s": "listen", "t": "silent"}, "expectedOutput": True},
-                {"input": {"s": "hello", "t": "world"}, "expectedOutput": False},
-                {"input": {"s": "aabbcc", "t": "abcabc"}, "expectedOutput": True},
-                {"input": {"s": "abcd", "t": "dcba"}, "expectedOutput": True}
-            ]
-        },
-        {
-            "id": "valid-palindrome",
-            "title": "Valid Palindrome",
-            "description": "Given a string s, return true if it is a palindrome, otherwise return false. A palindrome reads the same forward and backward. It is case-insensitive and ignores all non-alphanumeric characters.",
-            "difficulty": "Easy",
-            "examples": [
-                {
-                    "input": "s = \"Was it a car or a cat I saw?\"",
-                    "output": "true",
-                    "explanation": "After filtering we get \"wasitacaroracatisaw\", which is a palindrome."
-                },
-                {"input": "s = \"tab a cat\"", "output": "false", "explanation": "\"tabacat\" is not a palindrome."}
-            ],
-            "constraints": [
-                "1 <= s.length <= 1000",
-                "s is made up of only printable ASCII characters"
-            ],
-            "sampleTestCases": [
-                {"input": {"s": "Was it a car or a cat I saw?"}, "expectedOutput": True},
-                {"input": {"s": "tab a cat"}, "expectedOutput": False}
-            ],
-            "hiddenTestCases": [
-                {"input": {"s": "A man, a plan, a canal: Panama"}, "expectedOutput": True},
-                {"input": {"s": "race a car"}, "expectedOutput": False},
-                {"input": {"s": "0P"}, "expectedOutput": False},
-                {"input": {"s": "   "}, "expectedOutput": True},
-                {"input": {"s": "a"}, "expectedOutput": True},
-                {"input": {"s": "ab"}, "expectedOutput": False},
-                {"input": {"s": "aba"}, "expectedOutput": True},
-                {"input": {"s": "Madam"}, "expectedOutput": True},
-                {"input": {"s": "No lemon, no melon"}, "expectedOutput": True},
-                {"input": {"s": "abc123cba"}, "expectedOutput": False},
-                {"input": {"s": ".,"}, "expectedOutput": True}
-            ]
-        },
-        {
-            "id": "best-time-stock",
-            "title": "Best Time to Buy and Sell Stock",
-            "description": "You are given an integer array prices where prices[i] is the price of NeetCoin on the ith day. Choose one day to buy and a later day to sell. Return the maximum profit. If no profit is possible, return 0.",
-            "difficulty": "Easy",
-            "examples": [
-                {
-                    "input": "prices = [10,1,5,6,7,1]",
-                    "output": "6",
-                    "explanation": "Buy on day 2 (price 1) and sell on day 5 (price 7)."
-                },
-                {"input": "prices = [10,8,7,5,2]", "output": "0"}
-            ],
-            "constraints": [
-                "1 <= prices.length <= 100",
-                "0 <= prices[i] <= 100"
-            ],
-            "sampleTestCases": [
-                {"input": {"prices": [10, 1, 5, 6, 7, 1]}, "expectedOutput": 6},
-                {"input": {"prices": [10, 8, 7, 5, 2]}, "expectedOutput": 0}
-            ],
-            "hiddenTestCases": [
-                {"input": {"prices": [1, 2]}, "expectedOutput": 1},
-                {"input": {"prices": [3, 3, 3]}, "expectedOutput": 0},
-                {"input": {"prices": [2, 1, 2, 1, 0, 1, 2]}, "expectedOutput": 2},
-                {"input": {"prices": [1]}, "expectedOutput": 0},
-                {"input": {"prices": [7, 1, 5, 3, 6, 4]}, "expectedOutput": 5},
-                {"input": {"prices": [2, 4, 1]}, "expectedOutput": 2},
-                {"input": {"prices": [3, 2, 6, 5, 0, 3]}, "expectedOutput": 4},
-                {"input": {"prices": [1, 2, 3, 4, 5]}, "expectedOutput": 4},
-                {"input": {"prices": [5, 4, 3, 2, 1]}, "expectedOutput": 0},
-                {"input": {"prices": [100, 50, 75, 25, 100]}, "expectedOutput": 75},
-                {"input": {"prices": [10, 5, 15, 20]}, "expectedOutput": 15}
-            ]
-        },
-        {
-            "id": "valid-parentheses",
-            "title": "Valid Parentheses",
-            "description": "You are given a string s consisting of the following characters: '(', ')', '{', '}', '[' and ']'. Return true if the input string is valid, and false otherwise.",
-            "difficulty": "Easy",
-            "examples": [
-                {"input": "s = \"[]\"", "output": "true"},
-                {"input": "s = \"([{}])\"", "output": "true"},
-                {"input": "s = \"[(])\"", "output": "false"}
-            ],
-            "constraints": [
-                "1 <= s.length <= 1000"
-            ],
-            "sampleTestCases": [
-                {"input": {"s": "[]"}, "expectedOutput": True},
-                {"input": {"s": "([{}])"}, "expectedOutput": True},
-                {"input": {"s": "[(])"}, "expectedOutput": False}
-            ],
-            "hiddenTestCases": [
-                {"input": {"s": "{[]}"}, "expectedOutput": True},
-                {"input": {"s": "([)]"}, "expectedOutput": False},
-                {"input": {"s": "((()))"}, "expectedOutput": True},
-                {"input": {"s": "())"}, "expectedOutput": False},
-                {"input": {"s": "((("}, "expectedOutput": False},
-                {"input": {"s": "()[]{}"}, "expectedOutput": True},
-                {"input": {"s": "{[()]}"}, "expectedOutput": True},
-                {"input": {"s": "([{}])"}, "expectedOutput": True},
-                {"input": {"s": "(]"}, "expectedOutput": False},
-                {"input": {"s": "{{{"}, "expectedOutput": False},
-                {"input": {"s": "(({{[[]]}})"}, "expectedOutput": False}
-            ]
-        },
-        {
-            "id": "reverse-linked-list",
-            "title": "Reverse Linked List",
-            "description": "Given the beginning of a singly linked list head, reverse the list, and return the new beginning of the list.",
-            "difficulty": "Easy",
-            "examples": [
-                {"input": "head = [0,1,2,3]", "output": "[3,2,1,0]"},
-                {"input": "head = []", "output": "[]"}
-            ],
-            "constraints": [
-                "0 <= The length of the list <= 1000",
-                "-1000 <= Node.val <= 1000"
-            ],
-            "sampleTestCases": [
-                {"input": {"head": [0, 1, 2, 3]}, "expectedOutput": [3, 2, 1, 0]},
-                {"input": {"head": []}, "expectedOutput": []}
-            ],
-            "hiddenTestCases": [
-                {"input": {"head": [1]}, "expectedOutput": [1]},
-                {"input": {"head": [1, 2]}, "expectedOutput": [2, 1]},
-                {"input": {"head": [1, 2, 3]}, "expectedOutput": [3, 2, 1]},
-                {"input": {"head": [1, 2, 3, 4, 5]}, "expectedOutput": [5, 4, 3, 2, 1]},
-                {"input": {"head": [5, 4, 3, 2, 1]}, "expectedOutput": [1, 2, 3, 4, 5]},
-                {"input": {"head": [10, 20]}, "expectedOutput": [20, 10]},
-                {"input": {"head": [7]}, "expectedOutput": [7]},
-                {"input": {"head": [-1, -2, -3]}, "expectedOutput": [-3, -2, -1]},
-                {"input": {"head": [100, 200, 300, 400]}, "expectedOutput": [400, 300, 200, 100]},
-                {"input": {"head": [1, 1, 1, 1]}, "expectedOutput": [1, 1, 1, 1]},
-                {"input": {"head": [9, 8, 7, 6, 5, 4, 3, 2, 1]}, "expectedOutput": [1, 2, 3, 4, 5, 6, 7, 8, 9]}
-            ]
-        },
-        {
-            "id": "linked-list-cycle",
-            "title": "Linked List Cycle Detection",
-            "description": "Given the beginning of a linked list head, return true if there is a cycle in the linked list. Internally, an index determines where the tail connects; the index is not provided to your function.",
-            "difficulty": "Easy",
-            "examples": [
-                {"input": "head = [1,2,3,4], index = 1", "output": "true"},
-                {"input": "head = [1,2], index = -1", "output": "false"}
-            ],
-            "constraints": [
-                "1 <= Length of the list <= 1000",
-                "-1000 <= Node.val <= 1000"
-            ],
-            "sampleTestCases": [
-                {"input": {"head": [1, 2, 3, 4], "pos": 1}, "expectedOutput": True},
-                {"input": {"head": [1, 2], "pos": -1}, "expectedOutput": False}
-            ],
-            "hiddenTestCases": [
-                {"input": {"head": [1], "pos": -1}, "expectedOutput": False},
-                {"input": {"head": [1], "pos": 0}, "expectedOutput": True},
-                {"input": {"head": [1, 2, 3], "pos": 2}, "expectedOutput": True},
-                {"input": {"head": [1, 2, 3], "pos": 0}, "expectedOutput": True},
-                {"input": {"head": [1, 2, 3, 4, 5], "pos": 2}, "expectedOutput": True},
-                {"input": {"head": [1, 2, 3, 4], "pos": -1}, "expectedOutput": False},
-                {"input": {"head": [1, 2, 3, 4, 5, 6], "pos": 3}, "expectedOutput": True},
-                {"input": {"head": [10, 20, 30], "pos": -1}, "expectedOutput": False}
-            ]
-        }
-    ],
-    "medium": [
-        {
-            "id": "longest-consecutive",
-            "title": "Longest Consecutive Sequence",
-            "description": "Given an array of integers nums, return the length of the longest consecutive sequence of elements that can be formed. A consecutive sequence is a sequence where each element is exactly 1 greater than the previous element. You must write an algorithm that runs in O(n) time.",
-            "difficulty": "Medium",
-            "examples": [
-                {"input": "nums = [2,20,4,10,3,4,5]", "output": "4", "explanation": "The longest consecutive sequence is [2,3,4,5]."},
-                {"input": "nums = [0,3,2,5,4,6,1,1]", "output": "7"}
-            ],
-            "constraints": [
-                "0 <= nums.length <= 1000",
-                "-10^9 <= nums[i] <= 10^9"
-            ],
-            "sampleTestCases": [
-                {"input": {"nums": [2, 20, 4, 10, 3, 4, 5]}, "expectedOutput": 4},
-                {"input": {"nums": [0, 3, 2, 5, 4, 6, 1, 1]}, "expectedOutput": 7}
-            ],
-            "hiddenTestCases": [
-                {"input": {"nums": []}, "expectedOutput": 0},
-                {"input": {"nums": [100]}, "expectedOutput": 1},
-                {"input": {"nums": [1, 2, 0, 1]}, "expectedOutput": 3},
-                {"input": {"nums": [-1, -2, -3, 7, 8]}, "expectedOutput": 3},
-                {"input": {"nums": [9, 1, 4, 7, 3, 2, 8, 5, 6]}, "expectedOutput": 9},
-                {"input": {"nums": [100, 4, 200, 1, 3, 2]}, "expectedOutput": 4},
-                {"input": {"nums": [0, -1, 1, 2, -2, -3]}, "expectedOutput": 6},
-                {"input": {"nums": [1, 1, 1, 1]}, "expectedOutput": 1},
-                {"input": {"nums": [10, 5, 12, 3, 55, 30, 4, 11, 2]}, "expectedOutput": 4},
-                {"input": {"nums": [-5, -4, -3, -2, -1]}, "expectedOutput": 5},
-                {"input": {"nums": [1000000000, 999999999, 1000000001]}, "expectedOutput": 3}
-            ]
-        },
-        {
-            "id": "three-sum",
-            "title": "3Sum",
-            "description": "Given an integer array nums, return all the triplets [nums[i], nums[j], nums[k]] where nums[i] + nums[j] + nums[k] == 0, and the indices i, j and k are all distinct. The output should not contain any duplicate triplets.",
-            "difficulty": "Medium",
-            "examples": [
-                {"input": "nums = [-1,0,1,2,-1,-4]", "output": "[[-1,-1,2],[-1,0,1]]"},
-                {"input": "nums = [0,1,1]", "output": "[]"},
-                {"input": "nums = [0,0,0]", "output": "[[0,0,0]]"}
-            ],
-            "constraints": [
-                "3 <= nums.length <= 1000",
-                "-10^5 <= nums[i] <= 10^5"
-            ],
-            "sampleTestCases": [
-                {"input": {"nums": [-1, 0, 1, 2, -1, -4]}, "expectedOutput": [[-1, -1, 2], [-1, 0, 1]]},
-                {"input": {"nums": [0, 1, 1]}, "expectedOutput": []},
-                {"input": {"nums": [0, 0, 0]}, "expectedOutput": [[0, 0, 0]]}
-            ],
-            "hiddenTestCases": [
-                {"input": {"nums": [-2, 0, 0, 2, 2]}, "expectedOutput": [[-2, 0, 2]]},
-                {"input": {"nums": [3, -2, 1, 0]}, "expectedOutput": []},
-                {"input": {"nums": [-4, -2, -2, -2, 0, 1, 2, 2, 2, 4]}, "expectedOutput": [[-4, 0, 4], [-4, 2, 2], [-2, -2, 4], [-2, 0, 2]]},
-                {"input": {"nums": [0, 0, 0, 0]}, "expectedOutput": [[0, 0, 0]]},
-                {"input": {"nums": [-4, -1, -1, 0, 1, 2]}, "expectedOutput": [[-1, -1, 2], [-1, 0, 1]]},
-                {"input": {"nums": [-2, 0, 1, 1, 2]}, "expectedOutput": [[-2, 0, 2], [-2, 1, 1]]},
-                {"input": {"nums": [1, -1, 0, 2, -2, 3]}, "expectedOutput": [[-2, -1, 3], [-2, 0, 2], [-1, 0, 1]]},
-                {"input": {"nums": [-5, -4, -3, -2, -1, 0, 1, 2, 3, 4, 5]}, "expectedOutput": [[-5, 0, 5], [-5, 1, 4], [-5, 2, 3], [-4, -1, 5], [-4, 0, 4], [-4, 1, 3], [-3, -2, 5], [-3, -1, 4], [-3, 0, 3], [-3, 1, 2], [-2, -1, 3], [-2, 0, 2], [-1, 0, 1]]},
-                {"input": {"nums": [3, 0, -2, -1, 1, 2]}, "expectedOutput": [[-2, -1, 3], [-2, 0, 2], [-1, 0, 1]]},
-                {"input": {"nums": [-1, 0, 1, 0]}, "expectedOutput": [[-1, 0, 1]]},
-                {"input": {"nums": [1, 1, -2]}, "expectedOutput": [[-2, 1, 1]]}
-            ]
-        },
-        {
-            "id": "container-with-most-water",
-            "title": "Container With Most Water",
-            "description": "You are given an integer array heights where heights[i] represents the height of the ith bar. You may choose any two bars to form a container. Return the maximum amount of water a container can store.",
-            "difficulty": "Medium",
-            "examples": [
-                {"input": "height = [1,7,2,5,4,7,3,6]", "output": "36"},
-                {"input": "height = [2,2,2]", "output": "4"}
-            ],
-            "constraints": [
-                "2 <= height.length <= 1000",
-                "0 <= height[i] <= 1000"
-            ],
-            "sampleTestCases": [
-                {"input": {"heights": [1, 7, 2, 5, 4, 7, 3, 6]}, "expectedOutput": 36},
-                {"input": {"heights": [2, 2, 2]}, "expectedOutput": 4}
-            ],
-            "hiddenTestCases": [
-                {"input": {"heights": [1, 1]}, "expectedOutput": 1},
-                {"input": {"heights": [4, 3, 2, 1, 4]}, "expectedOutput": 16},
-                {"input": {"heights": [1, 2, 1]}, "expectedOutput": 2},
-                {"input": {"heights": [2, 3, 10, 5, 7, 8, 9]}, "expectedOutput": 36},
-                {"input": {"heights": [1, 8, 6, 2, 5, 4, 8, 3, 7]}, "expectedOutput": 49},
-                {"input": {"heights": [1, 1, 1, 1, 1]}, "expectedOutput": 4},
-                {"input": {"heights": [10, 9, 8, 7, 6, 5, 4, 3, 2, 1]}, "expectedOutput": 25},
-                {"input": {"heights": [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]}, "expectedOutput": 25},
-                {"input": {"heights": [100, 1, 1, 1, 1, 1, 100]}, "expectedOutput": 600},
-                {"input": {"heights": [5, 2, 12, 1, 5, 3, 4, 11, 9, 4]}, "expectedOutput": 55},
-                {"input": {"heights": [1, 3, 2, 5, 25, 24, 5]}, "expectedOutput": 24}
-            ]
-        },
-        {
-            "id": "find-min-rotated",
-            "title": "Find Minimum in Rotated Sorted Array",
-            "description": "You are given an array nums which was originally sorted in ascending order and then rotated. Assuming all elements are unique, return the minimum element. Write an algorithm that runs in O(log n) time.",
-            "difficulty": "Medium",
-            "examples": [
-                {"input": "nums = [3,4,5,6,1,2]", "output": "1"},
-                {"input": "nums = [4,5,0,1,2,3]", "output": "0"},
-                {"input": "nums = [4,5,6,7]", "output": "4"}
-            ],
-            "constraints": [
-                "1 <= nums.length <= 1000",
-                "-1000 <= nums[i] <= 1000"
-            ],
-            "sampleTestCases": [
-                {"input": {"nums": [3, 4, 5, 6, 1, 2]}, "expectedOutput": 1},
-                {"input": {"nums": [4, 5, 0, 1, 2, 3]}, "expectedOutput": 0},
-                {"input": {"nums": [4, 5, 6, 7]}, "expectedOutput": 4}
-            ],
-            "hiddenTestCases": [
-                {"input": {"nums": [1]}, "expectedOutput": 1},
-                {"input": {"nums": [2, 1]}, "expectedOutput": 1},
-                {"input": {"nums": [5, 6, 7, 1, 2, 3, 4]}, "expectedOutput": 1},
-                {"input": {"nums": [11, 13, 15, 17]}, "expectedOutput": 11},
-                {"input": {"nums": [3, 1, 2]}, "expectedOutput": 1},
-                {"input": {"nums": [4, 5, 6, 7, 0, 1, 2]}, "expectedOutput": 0},
-                {"input": {"nums": [5, 1, 2, 3, 4]}, "expectedOutput": 1},
-                {"input": {"nums": [10, 20, 30, 40, 50, 1, 2, 3]}, "expectedOutput": 1},
-                {"input": {"nums": [2, 3, 4, 5, 1]}, "expectedOutput": 1},
-                {"input": {"nums": [100, 200, 300, 1, 10, 20]}, "expectedOutput": 1},
-                {"input": {"nums": [7, 8, 9, 10, 1, 2, 3, 4, 5, 6]}, "expectedOutput": 1}
-            ]
-        },
-        {
-            "id": "reorder-list",
-            "title": "Reorder Linked List",
-            "description": "Given the head of a singly linked-list, reorder the nodes to follow the pattern [0, n-1, 1, n-2, 2, n-3, ...]. You may not modify node values, only pointers.",
-            "difficulty": "Medium",
-            "examples": [
-                {"input": "head = [2,4,6,8]", "output": "[2,8,4,6]"},
-                {"input": "head = [2,4,6,8,10]", "output": "[2,10,4,8,6]"}
-            ],
-            "constraints": [
-                "1 <= Length of the list <= 1000",
-                "1 <= Node.val <= 1000"
-            ],
-            "sampleTestCases": [
-                {"input": {"head": [2, 4, 6, 8]}, "expectedOutput": [2, 8, 4, 6]},
-                {"input": {"head": [2, 4, 6, 8, 10]}, "expectedOutput": [2, 10, 4, 8, 6]}
-            ],
-            "hiddenTestCases": [
-                {"input": {"head": [1]}, "expectedOutput": [1]},
-                {"input": {"head": [1, 2]}, "expectedOutput": [1, 2]},
-                {"input": {"head": [1, 2, 3]}, "expectedOutput": [1, 3, 2]},
-                {"input": {"head": [1, 2, 3, 4, 5, 6]}, "expectedOutput": [1, 6, 2, 5, 3, 4]},
-                {"input": {"head": [1, 2, 3, 4, 5, 6, 7]}, "expectedOutput": [1, 7, 2, 6, 3, 5, 4]},
-                {"input": {"head": [1, 2, 3, 4, 5, 6, 7, 8]}, "expectedOutput": [1, 8, 2, 7, 3, 6, 4, 5]},
-                {"input": {"head": [10, 20, 30, 40, 50]}, "expectedOutput": [10, 50, 20, 40, 30]},
-                {"input": {"head": [5, 4, 3, 2, 1]}, "expectedOutput": [5, 1, 4, 2, 3]},
-                {"input": {"head": [1, 2, 3, 4, 5, 6, 7, 8, 9]}, "expectedOutput": [1, 9, 2, 8, 3, 7, 4, 6, 5]},
-                {"input": {"head": [100, 200]}, "expectedOutput": [100, 200]},
-                {"input": {"head": [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]}, "expectedOutput": [1, 10, 2, 9, 3, 8, 4, 7, 5, 6]}
-            ]
-        },
-        {
-            "id": "group-anagrams",
-            "title": "Group Anagrams",
-            "description": "Given an array of strings strs, group all anagrams together into sublists. You may return the output in any order.",
-            "difficulty": "Medium",
-            "examples": [
-                {
-                    "input": "strs = [\"act\",\"pots\",\"tops\",\"cat\",\"stop\",\"hat\"]",
-                    "output": "[[\"hat\"],[\"act\",\"cat\"],[\"stop\",\"pots\",\"tops\"]]"
-                },
-                {"input": "strs = [\"x\"]", "output": "[[\"x\"]]"},
-                {"input": "strs = [\"\"]", "output": "[[\"\"]]"}
-            ],
-            "constraints": [
-                "1 <= strs.length <= 1000",
-                "0 <= strs[i].length <= 100",
-                "strs[i] is made up of lowercase English letters"
-            ],
-            "sampleTestCases": [
-                {
-                    "input": {"strs": ["act", "pots", "tops", "cat", "stop", "hat"]},
-                    "expectedOutput": [["hat"], ["act", "cat"], ["stop", "pots", "tops"]]
-                },
-                {"input": {"strs": ["x"]}, "expectedOutput": [["x"]]},
-                {"input": {"strs": [""]}, "expectedOutput": [[""]]}
-            ],
-            "hiddenTestCases": [
-                {"input": {"strs": []}, "expectedOutput": []},
-                {"input": {"strs": ["ab", "ba", "abc", "bca", "cab"]}, "expectedOutput": [["ab", "ba"], ["abc", "bca", "cab"]]},
-                {"input": {"strs": ["aa", "aa", "a"]}, "expectedOutput": [["aa", "aa"], ["a"]]},
-                {"input": {"strs": ["abc", "bca", "cab", "xyz", "zyx", "yxz"]}, "expectedOutput": [["abc", "bca", "cab"], ["xyz", "zyx", "yxz"]]},
-                {"input": {"strs": ["listen", "silent", "enlist", "hello", "world"]}, "expectedOutput": [["listen", "silent", "enlist"], ["hello"], ["world"]]},
-                {"input": {"strs": ["a", "b", "c", "d"]}, "expectedOutput": [["a"], ["b"], ["c"], ["d"]]},
-                {"input": {"strs": ["aa", "aa", "aa"]}, "expectedOutput": [["aa", "aa", "aa"]]},
-                {"input": {"strs": ["dog", "god", "cat", "tac", "act"]}, "expectedOutput": [["dog", "god"], ["cat", "tac", "act"]]},
-                {"input": {"strs": ["race", "care", "acre", "moon", "noon"]}, "expectedOutput": [["race", "care", "acre"], ["moon"], ["noon"]]},
-                {"input": {"strs": ["stop", "pots", "tops", "spot", "opts"]}, "expectedOutput": [["stop", "pots", "tops", "spot", "opts"]]},
-                {"input": {"strs": ["debit card", "bad credit"]}, "expectedOutput": [["debit card"], ["bad credit"]]}
-            ]
-        },
-        {
-            "id": "top-k-frequent",
-            "title": "Top K Frequent Elements",
-            "description": "Given an integer array nums and an integer k, return the k most frequent elements within the array. The answer is always unique. You may return the output in any order.",
-            "difficulty": "Medium",
-            "examples": [
-                {"input": "nums = [1,2,2,3,3,3], k = 2", "output": "[2,3]"},
-                {"input": "nums = [7,7], k = 1", "output": "[7]"}
-            ],
-            "constraints": [
-                "1 <= nums.length <= 10^4",
-                "-1000 <= nums[i] <= 1000",
-                "1 <= k <= number of distinct elements in nums",
-                "The answer is always unique"
-            ],
-            "sampleTestCases": [
-                {"input": {"nums": [1, 2, 2, 3, 3, 3], "k": 2}, "expectedOutput": [2, 3]},
-                {"input": {"nums": [7, 7], "k": 1}, "expectedOutput": [7]}
-            ],
-            "hiddenTestCases": [
-                {"input": {"nums": [1], "k": 1}, "expectedOutput": [1]},
-                {"input": {"nums": [4, 4, 4, 5, 5, 6], "k": 2}, "expectedOutput": [4, 5]},
-                {"input": {"nums": [-1, -1, -2, -2, -2, 3], "k": 2}, "expectedOutput": [-2, -1]},
-                {"input": {"nums": [1, 1, 1, 2, 2, 3], "k": 2}, "expectedOutput": [1, 2]},
-                {"input": {"nums": [5, 5, 5, 5, 1, 1, 1, 2, 2, 3], "k": 3}, "expectedOutput": [5, 1, 2]},
-                {"input": {"nums": [100, 100, 100, 200, 200, 300], "k": 1}, "expectedOutput": [100]},
-                {"input": {"nums": [7, 7, 8, 8, 9, 9], "k": 3}, "expectedOutput": [7, 8, 9]},
-                {"input": {"nums": [0, 0, 0, -1, -1, -2], "k": 2}, "expectedOutput": [0, -1]},
-                {"input": {"nums": [10, 10, 20, 20, 30, 30, 40], "k": 3}, "expectedOutput": [10, 20, 30]},
-                {"input": {"nums": [1, 2, 3, 4, 5, 5, 5, 5], "k": 1}, "expectedOutput": [5]},
-                {"input": {"nums": [3, 3, 3, 2, 2, 1], "k": 2}, "expectedOutput": [3, 2]}
-            ]
-        },
-        {
-            "id": "palindrome-number",
-            "title": "Palindrome Number",
-            "description": "Given an integer x, return true if x is a palindrome, and false otherwise.",
-            "difficulty": "Medium",
-            "examples": [
-                {"input": "x = 121", "output": "true", "explanation": "121 reads as 121 from left to right and from right to left."}
-            ],
-            "constraints": [
-                "-2^31 <= x <= 2^31 - 1"
-            ],
-            "sampleTestCases": [
-                {"input": {"x": 121}, "expectedOutput": True},
-                {"input": {"x": -121}, "expectedOutput": False},
-                {"input": {"x": 10}, "expectedOutput": False}
-            ],
-            "hiddenTestCases": [
-                {"input": {"x": 0}, "expectedOutput": True},
-                {"input": {"x": 1}, "expectedOutput": True},
-                {"input": {"x": 12321}, "expectedOutput": True},
-                {"input": {"x": 123}, "expectedOutput": False},
-                {"input": {"x": -101}, "expectedOutput": False},
-                {"input": {"x": 1000021}, "expectedOutput": False},
-                {"input": {"x": 9}, "expectedOutput": True},
-                {"input": {"x": 1001}, "expectedOutput": True},
-                {"input": {"x": 12345}, "expectedOutput": False},
-                {"input": {"x": 99}, "expectedOutput": True},
-                {"input": {"x": 1234321}, "expectedOutput": True}
-            ]
+_SCREEN_BATCH_MAX_LISTINGS = 50
+_SCREEN_BATCH_MAX_CONCURRENCY = 8
+# Job-posting page fetches in flight per batch (they're outside the model-call semaphore)
+_SCREEN_BATCH_MAX_FETCHES = 4
+
+
+def _build_batch_screening_prefix(effective_difficulty: str, text_content: str) -> str:
+    """Listing-independent part of the batch screening prompt.
+
+    Everything that only depends on the difficulty tier and the resume comes first, so
+    all listings in one tier send a byte-identical prefix and Gemini's implicit prompt
+    caching can reuse it. Listing-specific context is appended by
+    `_build_batch_screening_suffix`.
+    """
+    config = SCREENING_DIFFICULTY_CONFIGS.get(effective_difficulty, SCREENING_DIFFICULTY_CONFIGS["easy"])
+    return f"""You are a resume screener at {config['company_type']}. You will be given ONE position at the end of this message.
+
+        {config['strictness']}
+
+        {SCREENING_REFERENCE_EXAMPLES.get(effective_difficulty, SCREENING_REFERENCE_EXAMPLES["easy"])}
+
+        RESUME TO REVIEW:
+        {text_content}
+
+        INSTRUCTIONS:
+        1. Compare this resume to the REFERENCE resume provided above
+        2. The reference resume represents the MINIMUM bar for passing
+        3. Be strict: the resume must be CLEARLY BETTER THAN the reference to PASS
+        3b. If this resume is only roughly EQUAL to the reference, REJECT
+        4. If this resume is WEAKER than the reference, you should REJECT them
+        4b. If JOB POSTING TEXT includes explicit requirements and the resume clearly misses critical requirements, REJECT.
+        5. Make a BINARY decision: PASS or REJECT
+        6. Provide brief reasoning
+
+        Respond in this EXACT format:
+        DECISION: [PASS or REJECT]
+
+        REASONING:
+        [2-3 sentences explaining your decision compared to the reference baseline]
+
+        KEY STRENGTHS: (if PASS)
+        - [Bullet point 1]
+        - [Bullet point 2]
+        - [Bullet point 3]
+
+        MAJOR CONCERNS: (if REJECT)
+        - [Bullet point 1]
+        - [Bullet point 2]
+
+        IMPROVEMENT TIPS:
+        - [Actionable tip 1]
+        - [Actionable tip 2]
+        """
+
+
+def _build_batch_screening_suffix(listing: dict, job_context: str) -> str:
+    level = listing.get("level") or "internship"
+    level_context = f"{level} level" if level != "internship" else "internship position"
+    return f"""
+POSITION: {listing['role']} ({level_context})
+
+{job_context}
+"""
+
+
+def _normalize_batch_listing(raw: Any) -> Optional[dict]:
+    """Accept either screen-resume style fields or a SimplifyJobs row from /api/jobs/real."""
+    if not isinstance(raw, dict):
+        return None
+    role = str(raw.get("role") or "").strip()
+    if not role:
+        return None
+    real_row = raw.get("raw") if isinstance(raw.get("raw"), dict) else {}
+    job_source = raw.get("job_source") or ("real" if str(raw.get("source") or "").startswith("simplifyjobs") else None)
+    return {
+        "id": raw.get("id"),
+        "role": role,
+        "level": str(raw.get("level") or "internship"),
+        "difficulty": raw.get("difficulty"),
+        "company": raw.get("company"),
+        "job_source": job_source,
+        "job_category": raw.get("job_category") or raw.get("category"),
+        "job_location": raw.get("job_location") or raw.get("location"),
+        "job_apply_url": raw.get("job_apply_url") or raw.get("apply_url"),
+        "job_age": raw.get("job_age") or raw.get("age"),
+        "job_row": raw.get("job_row") or real_row.get("row"),
+    }
+
+
+def _parse_json_list_form(value: Optional[str], name: str) -> list:
+    if not value or not value.strip():
+        return []
+    try:
+        parsed = json.loads(value)
+    except json.JSONDecodeError:
+        if name == "listing_ids":
+            # Also accept a plain comma-separated list of ids.
+            return [v.strip() for v in value.split(",") if v.strip()]
+        raise HTTPException(status_code=400, detail=f"{name} must be a JSON array")
+    if not isinstance(parsed, list):
+        raise HTTPException(status_code=400, detail=f"{name} must be a JSON array")
+    return parsed
+
+
+def _ndjson(event: dict) -> str:
+    return json.dumps(event, separators=(",", ":")) + "\n"
+
+
+@app.post("/api/screen-resume/batch")
+async def screen_resume_batch(
+    file: UploadFile = File(...),
+    listings: Optional[str] = Form(None),
+    listing_ids: Optional[str] = Form(None),
+    concurrency: int = Form(4),
+):
+    """
+    Screen one resume against many listings.
+
+    Args:
+        file: The resume file (PDF or TXT); text is extracted once and shared
+        listings: JSON array of listings (screen-resume fields or /api/jobs/real rows)
+        listing_ids: JSON array (or comma-separated) of `id`s from /api/jobs/real
+        concurrency: Max concurrent model calls (capped server-side)
+
+    Returns:
+        An NDJSON stream: a `start` event, one `decision` (or `error`) event per listing
+        as soon as it finishes, then a `done` event with totals.
+    """
+    if file.content_type not in ["application/pdf", "text/plain"]:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid file type. Only PDF and TXT files are supported."
+        )
+
+    batch: list[dict] = []
+    for raw in _parse_json_list_form(listings, "listings"):
+        listing = _normalize_batch_listing(raw)
+        if not listing:
+            raise HTTPException(status_code=400, detail="Each listing must be an object with a non-empty role")
+        batch.append(listing)
+
+    ids = [str(i).strip() for i in _parse_json_list_form(listing_ids, "listing_ids") if str(i).strip()]
+    if len(batch) + len(ids) > _SCREEN_BATCH_MAX_LISTINGS:
+        raise HTTPException(status_code=400, detail=f"At most {_SCREEN_BATCH_MAX_LISTINGS} listings per batch")
+    if ids:
+        try:
+            real_jobs = await _get_simplifyjobs_listings_cached()
+        except Exception as e:
+            raise HTTPException(status_code=502, detail=f"Failed to fetch SimplifyJobs listings: {e}")
+        by_id = {j.get("id"): j for j in real_jobs}
+        missing = [i for i in ids if i not in by_id]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Unknown listing ids: {', '.join(missing[:10])}")
+        batch.extend(_normalize_batch_listing(by_id[i]) for i in ids)
+
+    if not batch:
+        raise HTTPException(status_code=400, detail="Provide at least one listing or listing id")
+
+    file_content = await file.read()
+    text_content = extract_text(file_content, file.content_type)
+    if not text_content.strip():
+        raise HTTPException(
+            status_code=400,
+            detail="File does not have any content"
+        )
+
+    client = genai.Client(api_key=GEMINI_API_KEY)
+    semaphore = asyncio.Semaphore(max(1, min(int(concurrency), _SCREEN_BATCH_MAX_CONCURRENCY)))
+    fetch_semaphore = asyncio.Semaphore(_SCREEN_BATCH_MAX_FETCHES)
+
+    def _listing_fields(listing: dict) -> dict:
+        return {
+            k: listing.get(k)
+            for k in ("company", "role", "job_category", "job_location", "job_apply_url", "job_age", "job_row")
         }
-    ],
-    "hard": [
-        {
-            "id": "minimum-window-substring",
-            "title": "Minimum Window Substring",
-            "description": "Given two strings s and t, return the shortest substring of s such that every character in t (including duplicates) is present. If no such substring exists, return an empty string. You may assume the correct output is always unique.",
-            "difficulty": "Hard",
-            "examples": [
-                {"input": "s = \"OUZODYXAZV\", t = \"XYZ\"", "output": "\"YXAZ\""},
-                {"input": "s = \"xyz\", t = \"xyz\"", "output": "\"xyz\""},
-                {"input": "s = \"x\", t = \"xy\"", "output": "\"\""}
-            ],
-            "constraints": [
-                "1 <= s.length <= 1000",
-                "1 <= t.length <= 1000",
-                "s and t consist of uppercase and lowercase English letters"
-            ],
-            "sampleTestCases": [
-                {"input": {"s": "OUZODYXAZV", "t": "XYZ"}, "expectedOutput": "YXAZ"},
-                {"input": {"s": "xyz", "t": "xyz"}, "expectedOutput": "xyz"},
-                {"input": {"s": "x", "t": "xy"}, "expectedOutput": ""}
-            ],
-            "hiddenTestCases": [
-                {"input": {"s": "ADOBECODEBANC", "t": "ABC"}, "expectedOutput": "BANC"},
-                {"input": {"s": "aa", "t": "aa"}, "expectedOutput": "aa"},
-                {"input": {"s": "a", "t": "a"}, "expectedOutput": "a"},
-                {"input": {"s": "a", "t": "aa"}, "expectedOutput": ""},
-                {"input": {"s": "ab", "t": "b"}, "expectedOutput": "b"},
-                {"input": {"s": "abc", "t": "cba"}, "expectedOutput": "abc"},
-                {"input": {"s": "ADOBECODEBANCAAA", "t": "AAA"}, "expectedOutput": "AAA"},
-                {"input": {"s": "cabwefgewcwaefgcf", "t": "cae"}, "expectedOutput": "cwae"},
-                {"input": {"s": "bba", "t": "ab"}, "expectedOutput": "ba"},
-                {"input": {"s": "aaaaaaaaaaaabbbbbcdd", "t": "abcdd"}, "expectedOutput": "abbbbbcdd"},
-                {"input": {"s": "bdab", "t": "ab"}, "expectedOutput": "ab"}
-            ]
-        },
-        {
-            "id": "longest-substring",
-            "title": "Longest Substring Without Repeating Characters",
-            "description": "Given a string s, find the length of the longest substring without repeating characters.",
-            "difficulty": "Hard",
-            "examples": [
-                {"input": "s = \"abcabcbb\"", "output": "3", "explanation": "The answer is \"abc\", with the length of 3."}
-            ],
-            "constraints": [
-                "0 <= s.length <= 5 * 10^4",
-                "s consists of English letters, digits, symbols and spaces"
-            ],
-            "sampleTestCases": [
-                {"input": {"s": "abcabcbb"}, "expectedOutput": 3},
-                {"input": {"s": "bbbbb"}, "expectedOutput": 1},
-                {"input": {"s": "pwwkew"}, "expectedOutput": 3}
-            ],
-            "hiddenTestCases": [
-                {"input": {"s": ""}, "expectedOutput": 0},
-                {"input": {"s": " "}, "expectedOutput": 1},
-                {"input": {"s": "au"}, "expectedOutput": 2},
-                {"input": {"s": "dvdf"}, "expectedOutput": 3},
-                {"input": {"s": "anviaj"}, "expectedOutput": 5},
-                {"input": {"s": "abcdefg"}, "expectedOutput": 7},
-                {"input": {"s": "tmmzuxt"}, "expectedOutput": 5},
-                {"input": {"s": "abba"}, "expectedOutput": 2},
-                {"input": {"s": "aab"}, "expectedOutput": 2},
-                {"input": {"s": "cdd"}, "expectedOutput": 2},
-                {"input": {"s": "abcabcbb"}, "expectedOutput": 3}
-            ]
-        },
-        {
-            "id": "merge-intervals",
-            "title": "Merge Intervals",
-            "description": "Given an array of intervals where intervals[i] = [starti, endi], merge all overlapping intervals, and return an array of the non-overlapping intervals that cover all the intervals in the input.",
-            "difficulty": "Hard",
-            "examples": [
-                {"input": "intervals = [[1,3],[2,6],[8,10],[15,18]]", "output": "[[1,6],[8,10],[15,18]]", "explanation": "Since intervals [1,3] and [2,6] overlap, merge them into [1,6]."}
-            ],
-            "constraints": [
-                "1 <= intervals.length <= 10^4",
-                "intervals[i].length == 2",
-                "0 <= starti <= endi <= 10^4"
-            ],
-            "sampleTestCases": [
-                {"input": {"intervals": [[1,3],[2,6],[8,10],[15,18]]}, "expectedOutput": [[1,6],[8,10],[15,18]]},
-                {"input": {"intervals": [[1,4],[4,5]]}, "expectedOutput": [[1,5]]}
-            ],
-            "hiddenTestCases": [
-                {"input": {"intervals": [[1,3]]}, "expectedOutput": [[1,3]]},
-                {"input": {"intervals": [[1,4],[0,4]]}, "expectedOutput": [[0,4]]},
-                {"input": {"intervals": [[1,4],[0,1]]}, "expectedOutput": [[0,4]]},
-                {"input": {"intervals": [[1,4],[2,3]]}, "expectedOutput": [[1,4]]},
-                {"input": {"intervals": [[1,4],[0,0],[5,5]]}, "expectedOutput": [[0,0],[1,4],[5,5]]},
-                {"input": {"intervals": [[2,3],[4,5],[6,7],[8,9],[1,10]]}, "expectedOutput": [[1,10]]},
-                {"input": {"intervals": [[1,4],[0,2],[3,5]]}, "expectedOutput": [[0,5]]},
-                {"input": {"intervals": [[1,10],[2,3],[4,5],[6,7]]}, "expectedOutput": [[1,10]]},
-                {"input": {"intervals": [[1,2],[3,4],[5,6],[7,8]]}, "expectedOutput": [[1,2],[3,4],[5,6],[7,8]]},
-                {"input": {"intervals": [[0,0],[1,2],[5,5],[2,4],[3,3]]}, "expectedOutput": [[0,0],[1,4],[5,5]]},
-                {"input": {"intervals": [[2,6],[1,3],[8,10],[15,18]]}, "expectedOutput": [[1,6],[8,10],[15,18]]}
-            ]
-        },
-        {
-            "id": "merge-k-sorted-lists",
-            "title": "Merge K Sorted Linked Lists",
-            "description": "You are given an array of k linked lists lists, where each list is sorted in ascending order. Return the sorted linked list that is the result of merging all lists.",
-            "difficulty": "Hard",
-            "examples": [
-                {"input": "lists = [[1,2,4],[1,3,5],[3,6]]", "output": "[1,1,2,3,3,4,5,6]"},
-                {"input": "lists = []", "output": "[]"},
-                {"input": "lists = [[]]", "output": "[]"}
-            ],
-            "constraints": [
-                "0 <= lists.length <= 1000",
-                "0 <= lists[i].length <= 100",
-                "-1000 <= lists[i][j] <= 1000"
-            ],
-            "sampleTestCases": [
-                {"input": {"lists": [[1, 2, 4], [1, 3, 5], [3, 6]]}, "expectedOutput": [1, 1, 2, 3, 3, 4, 5, 6]},
-                {"input": {"lists": []}, "expectedOutput": []},
-                {"input": {"lists": [[]]}, "expectedOutput": []}
-            ],
-            "hiddenTestCases": [
-                {"input": {"lists": [[1], [0]]}, "expectedOutput": [0, 1]},
-                {"input": {"lists": [[-1, 5, 11], [6, 10]]}, "expectedOutput": [-1, 5, 6, 10, 11]},
-                {"input": {"lists": [[], [2], [], [1, 3]]}, "expectedOutput": [1, 2, 3]},
-                {"input": {"lists": [[1, 4, 5], [1, 3, 4], [2, 6]]}, "expectedOutput": [1, 1, 2, 3, 4, 4, 5, 6]},
-                {"input": {"lists": [[-10, -9, -9, -3, -1], [-5]]}, "expectedOutput": [-10, -9, -9, -5, -3, -1]},
-                {"input": {"lists": [[1], [1], [1]]}, "expectedOutput": [1, 1, 1]},
-                {"input": {"lists": [[1, 2, 3], [4, 5, 6], [7, 8, 9]]}, "expectedOutput": [1, 2, 3, 4, 5, 6, 7, 8, 9]},
-                {"input": {"lists": [[-2, -1, 0], [1, 2, 3]]}, "expectedOutput": [-2, -1, 0, 1, 2, 3]},
-                {"input": {"lists": [[100, 200], [50, 150], [25, 75, 125]]}, "expectedOutput": [25, 50, 75, 100, 125, 150, 200]},
-                {"input": {"lists": [[5], [3], [1], [7], [9]]}, "expectedOutput": [1, 3, 5, 7, 9]},
-                {"input": {"lists": [[0, 1, 2], [0, 1, 2], [0, 1, 2]]}, "expectedOutput": [0, 0, 0, 1, 1, 1, 2, 2, 2]}
-            ]
+
+    async def _resolve_difficulty(listing: dict) -> None:
+        inferred = None
+        if listing["is_real"]:
+            async with semaphore:
+                inferred = await _infer_listing_difficulty(client, **_listing_fields(listing))
+        listing["difficulty_inferred"] = bool(inferred)
+        listing["effective_difficulty"] = _normalize_screening_difficulty(inferred or listing.get("difficulty"))
+
+    async def _screen_one(index: int, listing: dict, prefix: str) -> dict:
+        base = {
+            "index": index,
+            "id": listing.get("id"),
+            "company": listing.get("company"),
+            "role": listing["role"],
+            "level": listing["level"],
+            "difficulty": listing["effective_difficulty"],
+            "difficulty_inferred": listing["difficulty_inferred"],
         }
-    ]
-}
+        try:
+            job_context = ""
+            if listing["is_real"]:
+                async with fetch_semaphore:
+                    job_context = await _build_real_job_context(**_listing_fields(listing))
+            prompt = prefix + _build_batch_screening_suffix(listing, job_context)
+            async with semaphore:
+                response = await call_gemini_with_retry_async(
+                    client=client,
+                    model="gemini-2.5-flash",
+                    contents=prompt,
+                    max_retries=3,
+                    initial_delay=2
+                )
+            response_text = response.text or ""
+            passed = "DECISION: PASS" in response_text.upper()
+            if (not listing["is_real"]) and listing["effective_difficulty"] == "hard":
+                passed, response_text = _apply_hard_gate_override(passed, response_text, text_content)
+            return {"type": "decision", **base, "passed": passed, "feedback": response_text}
+        except Exception as e:
+            error_msg = str(e).lower()
+            if "busy" in error_msg or "rate limit" in error_msg or "quota" in error_msg or "429" in str(e):
+                detail = "Server is currently busy due to high demand. Please try again in a few moments."
+            elif "timed out" in error_msg or "timeout" in error_msg:
+                detail = "Request timed out. Please try again."
+            else:
+                detail = f"An error occurred: {str(e)}"
+            return {"type": "error", **base, "detail": detail}
+
+    async def _events():
+        yield _ndjson({
+            "type": "start",
+            "total": len(batch),
+            "resume_chars": len(text_content),
+            "resume_sha256": hashlib.sha256(text_content.encode("utf-8")).hexdigest(),
+        })
+
+        for listing in batch:
+            listing["is_real"] = (listing.get("job_source") or "").lower() in _REAL_JOB_SOURCES
+        await asyncio.gather(*(_resolve_difficulty(l) for l in batch))
+
+        # Group by effective difficulty so each tier's calls share one prompt prefix and
+        # are issued back-to-back (the semaphore admits waiters in FIFO order).
+        groups: dict[str, list[int]] = {}
+        for idx, listing in enumerate(batch):
+            groups.setdefault(listing["effective_difficulty"], []).append(idx)
+        yield _ndjson({"type": "groups", "groups": {d: len(idxs) for d, idxs in groups.items()}})
+
+        tasks = []
+        for difficulty_key, idxs in groups.items():
+            prefix = _build_batch_screening_prefix(difficulty_key, text_content)
+            tasks.extend(asyncio.create_task(_screen_one(i, batch[i], prefix)) for i in idxs)
+
+        passed_count = 0
+        failed_count = 0
+        try:
+            for fut in asyncio.as_completed(tasks):
+                event = await fut
+                if event["type"] == "decision" and event["passed"]:
+                    passed_count += 1
+                elif event["type"] == "error":
+                    failed_count += 1
+                yield _ndjson(event)
+        finally:
+            # Client went away mid-stream: don't keep spending quota.
+            for t in tasks:
+                t.cancel()
+
+        yield _ndjson({
+            "type": "done",
+            "total": len(batch),
+            "passed": passed_count,
+            "errors": failed_count,
+        })
+
+    return StreamingResponse(_events(), media_type="application/x-ndjson")
+
 
 # In-memory per-client pools so question selection doesn't keep repeating.
-# Note: This is best-effort for local/dev. In production you'd back this by Redis/DB.
-_TECHNICAL_QUESTION_POOLS: dict[str, dict[str, list[str]]] = {}
+# client_id -> pool_key -> remaining question ids; idle clients expire.
+_TECHNICAL_QUESTION_POOLS = state_store("technical_question_pools", QUESTION_POOL_TTL_SECONDS, QUESTION_POOL_MAX_CLIENTS)
 
 
 def _draw_questions_no_repeat(
@@ -2371,6 +1964,7 @@ def _draw_questions_no_repeat(
             picked.append(q)
 
     client_pools[pool_key] = pool
+    _TECHNICAL_QUESTION_POOLS[client_id] = client_pools  # write back (shared state backends)
     return picked
 
 
@@ -2385,6 +1979,7 @@ class RunCodeRequest(BaseModel):
     question_id: str
     language: str = "python"  # python, javascript, java, cpp, c
     run_mode: str = "run"  # "run" for sample tests, "submit" for all tests
+    fail_fast: bool = False  # on "run", stop at the first failing test
 
 
 class GenerateTechnicalProblemRequest(BaseModel):
@@ -2397,6 +1992,7 @@ class GradeTechnicalProblemRequest(BaseModel):
     code: str
     language: str = "python"  # python, javascript
     run_mode: str = "run"  # "run" for sample tests, "submit" for all tests
+    fail_fast: bool = False  # on "run", stop at the first failing test
 
 class VoiceInterviewRequest(BaseModel):
     company: str
@@ -2408,7 +2004,7 @@ async def get_technical_questions(request: TechnicalQuestionsRequest):
     try:
         d = (request.difficulty or "easy").strip().lower()
         requested = d if d in {"easy", "medium", "hard"} else "easy"
-        candidates = TECHNICAL_QUESTIONS.get(requested, [])
+        candidates = get_question_bank().questions(requested)
 
         selected_questions = _draw_questions_no_repeat(
             client_id=request.client_id,
@@ -2429,377 +2025,49 @@ async def get_technical_questions(request: TechnicalQuestionsRequest):
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
 
 
-def execute_python_code(code: str, test_input: dict, function_name: str = "solution") -> tuple[any, str]:
-    """Execute Python code and return result and error message."""
-    try:
-        # Create a safe execution environment
-        from typing import Any, Dict, List, Optional
-
-        class ListNode:
-            def __init__(self, val: int = 0, next: Optional["ListNode"] = None):
-                self.val = val
-                self.next = next
-
-        def _build_linked_list(values: List[int]) -> Optional[ListNode]:
-            dummy = ListNode(0)
-            cur = dummy
-            for v in values:
-                cur.next = ListNode(v)
-                cur = cur.next
-            return dummy.next
-
-        def _linked_list_to_list(head: Optional[ListNode], limit: int = 5000) -> List[int]:
-            out: List[int] = []
-            cur = head
-            steps = 0
-            while cur is not None and steps < limit:
-                out.append(cur.val)
-                cur = cur.next
-                steps += 1
-            return out
-
-        def _build_cycle(values: List[int], pos: int) -> Optional[ListNode]:
-            head = _build_linked_list(values)
-            if head is None or pos is None or pos < 0:
-                return head
-            # Find tail and pos node
-            tail = head
-            idx = 0
-            pos_node = head if pos == 0 else None
-            while tail.next is not None:
-                tail = tail.next
-                idx += 1
-                if idx == pos:
-                    pos_node = tail
-            if pos_node is not None:
-                tail.next = pos_node
-            return head
-
-        namespace = {
-            "__builtins__": __builtins__,
-            "ListNode": ListNode,
-            "Optional": Optional,
-            "List": List,
-            "Any": Any,
-            "Dict": Dict,
-        }
-        exec(code, namespace)
-        
-        # Try to find the solution function
-        solution_func = None
-        
-        # First try: Look for Solution class with method (LeetCode pattern)
-        if "Solution" in namespace:
-            solution_class = namespace["Solution"]
-            solution_instance = solution_class()
-            if hasattr(solution_instance, function_name):
-                solution_func = getattr(solution_instance, function_name)
-        
-        # Second try: Look for standalone function
-        if solution_func is None and function_name in namespace:
-            solution_func = namespace[function_name]
-        
-        # Third try: Look for any callable that's not a builtin
-        if solution_func is None:
-            for key, value in namespace.items():
-                if callable(value) and not key.startswith("_") and key not in ["Solution", "print", "len", "range", "str", "int", "list", "dict", "set", "tuple"]:
-                    solution_func = value
-                    break
-        
-        if solution_func is None:
-            return None, "No solution function found. Please define a class 'Solution' with a method matching the problem."
-        
-        # Execute with test input
-        # Handle different input formats based on question type
-        if "lists" in test_input:
-            # Merge K Sorted Lists
-            lists_in = test_input.get("lists") or []
-            list_nodes: List[Optional[ListNode]] = []
-            for arr in lists_in:
-                if arr:
-                    list_nodes.append(_build_linked_list(arr))
-                else:
-                    list_nodes.append(None)
-            out_head = solution_func(list_nodes)
-            if out_head is None:
-                return [], None
-            return _linked_list_to_list(out_head), None
-
-        if "head" in test_input:
-            head_vals = test_input.get("head") or []
-            pos = test_input.get("pos")
-            if isinstance(pos, int) and pos >= 0:
-                head_node = _build_cycle(head_vals, pos)
-            else:
-                head_node = _build_linked_list(head_vals)
-
-            # Reorder list modifies in place and returns None
-            if function_name == "reorderList":
-                solution_func(head_node)
-                return _linked_list_to_list(head_node), None
-
-            out = solution_func(head_node)
-            if isinstance(out, ListNode) or out is None:
-                return _linked_list_to_list(out), None
-            return out, None
-
-        if "nums" in test_input and "target" in test_input:
-            # Two Sum problem
-            nums_copy = test_input["nums"].copy() if isinstance(test_input["nums"], list) else test_input["nums"]
-            result = solution_func(nums_copy, test_input["target"])
-        elif "nums" in test_input and "k" in test_input:
-            # Top K Frequent
-            nums_copy = test_input["nums"].copy() if isinstance(test_input["nums"], list) else test_input["nums"]
-            result = solution_func(nums_copy, test_input["k"])
-        elif "s" in test_input and "t" in test_input:
-            # Two-string problems (Valid Anagram)
-            result = solution_func(test_input["s"], test_input["t"])
-        elif "s" in test_input:
-            # String problems - handle both string and list inputs
-            s_input = test_input["s"]
-            if isinstance(s_input, list):
-                # For reverse string problem, modify in place
-                s_copy = s_input.copy()  # Make a copy to avoid modifying original
-                solution_func(s_copy)
-                result = s_copy  # Function modifies in place, return the modified list
-            else:
-                result = solution_func(s_input)
-        elif "intervals" in test_input:
-            # Merge intervals - make a deep copy
-            import copy
-            intervals_copy = copy.deepcopy(test_input["intervals"])
-            result = solution_func(intervals_copy)
-        elif "root" in test_input:
-            # Tree problems - skip for now
-            return None, "Tree problems not yet supported"
-        else:
-            # Generic single argument
-            input_val = list(test_input.values())[0]
-            if isinstance(input_val, list):
-                input_val = input_val.copy()
-            result = solution_func(input_val)
-        
-        return result, None
-    except Exception as e:
-        import traceback
-        error_msg = str(e)
-        # Get more detailed error info but limit it
-        tb = traceback.format_exc()
-        # Only show the last few lines of traceback
-        tb_lines = tb.split('\n')
-        if len(tb_lines) > 5:
-            error_msg = f"{error_msg}\n{tb_lines[-3]}"
-        return None, error_msg
-
-
-def execute_javascript_code(code: str, test_input: dict, function_name: str = "solution") -> tuple[any, str]:
-    """Execute JavaScript code using Node.js subprocess."""
-    import subprocess
-    import json
-    import tempfile
-    
-    try:
-        # Create a test wrapper
-        test_code = f"""
-{code}
-
-// Test execution
-const testInput = {json.dumps(test_input)};
-let result;
-try {{
-    const fn = (typeof {function_name} === 'function') ? {function_name} : ((typeof solution === 'function') ? solution : null);
-    if (!fn) throw new Error('Solution function not found');
-
-    if (testInput.nums !== undefined && testInput.target !== undefined) {{
-        result = fn(testInput.nums, testInput.target);
-    }} else if (testInput.nums !== undefined && testInput.k !== undefined) {{
-        result = fn(testInput.nums, testInput.k);
-    }} else if (testInput.s !== undefined && testInput.t !== undefined) {{
-        result = fn(testInput.s, testInput.t);
-    }} else if (testInput.s !== undefined) {{
-        result = fn(testInput.s);
-    }} else {{
-        result = fn(Object.values(testInput)[0]);
-    }}
-    console.log(JSON.stringify({{result: result}}));
-}} catch (error) {{
-    console.error(JSON.stringify({{error: error.message}}));
-    process.exit(1);
-}}
-"""
-        
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.js', delete=False) as f:
-            f.write(test_code)
-            temp_file = f.name
-        
-        try:
-            result = subprocess.run(
-                ['node', temp_file],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            
-            if result.returncode != 0:
-                error_output = result.stderr
-                try:
-                    error_data = json.loads(error_output)
-                    return None, error_data.get('error', error_output)
-                except:
-                    return None, error_output
-            
-            output_data = json.loads(result.stdout)
-            return output_data.get('result'), None
-        finally:
-            os.unlink(temp_file)
-    except subprocess.TimeoutExpired:
-        return None, "Execution timeout"
-    except Exception as e:
-        return None, str(e)
-
-
-def execute_python_code_generated(code: str, test_input: dict, function_name: str = "solution") -> tuple[Any, Optional[str]]:
-    """Execute Python code for generated problems.
-
-    Generated problems always call `solution(input)` with the entire input dict.
-    """
-    try:
-        namespace = {"__builtins__": __builtins__}
-        exec(code, namespace)
-
-        solution_func = None
-
-        if "Solution" in namespace:
-            solution_class = namespace["Solution"]
-            solution_instance = solution_class()
-            if hasattr(solution_instance, function_name):
-                solution_func = getattr(solution_instance, function_name)
-
-        if solution_func is None and function_name in namespace:
-            solution_func = namespace[function_name]
-
-        if solution_func is None:
-            for key, value in namespace.items():
-                if callable(value) and not key.startswith("_") and key not in [
-                    "Solution",
-                    "print",
-                    "len",
-                    "range",
-                    "str",
-                    "int",
-                    "list",
-                    "dict",
-                    "set",
-                    "tuple",
-                ]:
-                    solution_func = value
-                    break
-
-        if solution_func is None:
-            return None, "No solution function found. Please define `solution(input)` or `class Solution` with a `solution` method."
-
-        result = solution_func(test_input)
-        return result, None
-    except Exception as e:
-        import traceback
-
-        error_msg = str(e)
-        tb = traceback.format_exc()
-        tb_lines = tb.split("\n")
-        if len(tb_lines) > 5:
-            error_msg = f"{error_msg}\n{tb_lines[-3]}"
-        return None, error_msg
-
-
-def execute_javascript_code_generated(code: str, test_input: dict, function_name: str = "solution") -> tuple[Any, Optional[str]]:
-    """Execute JavaScript code for generated problems.
-
-    Generated problems always call `solution(input)` with the entire input object.
-    """
-    import subprocess
-    import json as _json
-    import tempfile
-
-    try:
-        test_code = f"""
-{code}
-
-const testInput = {_json.dumps(test_input)};
-let result;
-try {{
-  if (typeof {function_name} === 'function') {{
-    result = {function_name}(testInput);
-  }} else if (typeof solution === 'function') {{
-    result = solution(testInput);
-  }} else {{
-    throw new Error('Solution function not found');
-  }}
-  console.log(JSON.stringify({{result: result}}));
-}} catch (error) {{
-  console.error(JSON.stringify({{error: error.message}}));
-  process.exit(1);
-}}
-"""
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".js", delete=False) as f:
-            f.write(test_code)
-            temp_file = f.name
-
-        try:
-            result = subprocess.run(
-                ["node", temp_file],
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
-
-            if result.returncode != 0:
-                error_output = result.stderr
-                try:
-                    error_data = _json.loads(error_output)
-                    return None, error_data.get("error", error_output)
-                except Exception:
-                    return None, error_output
-
-            output_data = _json.loads(result.stdout)
-            return output_data.get("result"), None
-        finally:
-            os.unlink(temp_file)
-    except subprocess.TimeoutExpired:
-        return None, "Execution timeout"
-    except Exception as e:
-        return None, str(e)
-
-
 @app.post("/api/technical/problem")
 async def generate_technical_problem(request: GenerateTechnicalProblemRequest):
     """Generate an original practice prompt + tests for a selected question metadata."""
     try:
-        _prune_generated_technical_sessions()
-
         question = request.question or {}
         qid = str(question.get("id") or question.get("question_id") or "").strip()
         client_id = (request.client_id or "").strip() or "anon"
         index_key = f"{client_id}:{qid}" if qid else ""
 
         # If we already generated a session for this client + question, reuse it.
-        if index_key and index_key in _generated_technical_session_index:
-            existing_id = _generated_technical_session_index[index_key]
+        existing_id = _generated_technical_sessions.lookup(index_key) if index_key else None
+        if existing_id is not None:
             sess = _generated_technical_sessions.get(existing_id)
-            if sess:
+            problem = _problem_cache.get(sess.get("problem_id")) if sess else None
+            if problem is not None:
                 return JSONResponse(
                     content={
                         "session_id": existing_id,
-                        "problem": sess["problem"],
+                        "problem": problem,
                         "question": sess.get("question") or question,
                     }
                 )
 
-        try:
-            problem = await _generate_original_problem_from_metadata(question)
-        except Exception as e:
-            print(f"[WARN] Problem generation failed, using fallback: {e}")
-            problem = _validate_generated_problem_payload(_generate_problem_fallback(question))
+        # Serve a shared variant once the question has enough of them; otherwise
+        # generate one more (from the pre-generation pool when it has one ready).
+        cache_key = problem_cache_key(question, PROBLEM_PROMPT_VERSION)
+        picked = _problem_cache.pick(cache_key)
+        if picked is not None:
+            problem_id, problem = picked
+            source = "cache"
+        else:
+            problem = _problem_pool.take(question) if _problem_pool is not None else None
+            source = "pool"
+            if problem is None:
+                source = "generated"
+                try:
+                    problem = await _generate_original_problem_from_metadata(question)
+                except Exception as e:
+                    print(f"[WARN] Problem generation failed, using fallback: {e}")
+                    problem = _validate_generated_problem_payload(_generate_problem_fallback(question))
+                    source = "fallback"
+            # The fallback is stored for this session only, never shared as a variant.
+            problem_id = _problem_cache.add(problem, key=cache_key if source != "fallback" else None)
 
         import uuid
 
@@ -2807,12 +2075,12 @@ async def generate_technical_problem(request: GenerateTechnicalProblemRequest):
         _generated_technical_sessions[session_id] = {
             "created_at": time.time(),
             "question": question,
-            "problem": problem,
+            "problem_id": problem_id,
         }
         if index_key:
-            _generated_technical_session_index[index_key] = session_id
+            _generated_technical_sessions.set_index(index_key, session_id)
 
-        return JSONResponse(content={"session_id": session_id, "problem": problem, "question": question})
+        return JSONResponse(content={"session_id": session_id, "problem": problem, "question": question, "source": source})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate problem: {str(e)}")
 
@@ -2876,55 +2144,38 @@ Be strict - only mark as optimal if it uses the best known approach."""
         }
 
 
-def analyze_time_complexity(code: str, question_id: str, language: str) -> bool:
-    """
-    Analyze if the solution has optimal time complexity.
-    Returns True if optimal, False otherwise.
-    This is a simple pattern-based fallback.
-    """
-    # Define optimal complexity patterns for common questions
-    optimal_patterns = {
-        "two-sum": ["hash", "dict", "map", "set"],  # O(n) with hash map
-        "contains-duplicate": ["set", "hash"],  # O(n) with set
-        "valid-anagram": ["sorted", "counter", "hash", "dict"],  # O(n log n) or O(n)
-        "best-time-stock": ["max"],  # O(n) single pass
-        "valid-parentheses": ["stack", "append", "push", "pop"],  # O(n) with stack
-        "longest-consecutive": ["set", "hash"],  # O(n) with set
-        "three-sum": ["sort"],  # O(n²) with two pointers
-        "container-with-most-water": ["two.*pointer", "left.*right"],  # O(n) two pointers
-        "product-except-self": ["prefix", "suffix", "forward", "backward"],  # O(n) prefix/suffix
-        "merge-intervals": ["sort"],  # O(n log n) with sorting
-        "top-k-frequent": ["heap", "counter", "bucket"],  # O(n) or O(n log k)
-        "group-anagrams": ["sort.*join", "sorted", "counter"],  # O(n * k log k)
-    }
-
-    # Suboptimal patterns that indicate inefficiency
-    suboptimal_patterns = {
-        "two-sum": ["for.*for", "nested.*loop"],  # O(n²) nested loops
-        "contains-duplicate": ["for.*for"],  # O(n²) nested loops
-        "longest-consecutive": ["for.*for"],  # O(n²) without set
-        "product-except-self": ["division", "/"],  # Using division (technically works but not the intended solution)
-    }
-
-    code_lower = code.lower()
+async def analyze_submission_efficiency(code: str, question: dict, language: str, function_name: str) -> dict:
+    """Efficiency verdict for an all-passing submit.
 
-    # Check for suboptimal patterns first
-    if question_id in suboptimal_patterns:
-        import re
-        for pattern in suboptimal_patterns[question_id]:
-            if re.search(pattern, code_lower):
-                return False
+    Questions with a complexity profile are timed on scaled inputs in the execution
+    pool (fast, deterministic, no quota); anything else falls back to the AI review.
+    Verdicts are memoized by normalized code, so repeat solutions return instantly.
+    """
+    cache = get_efficiency_cache()
+    cache_key = efficiency_cache_key(code, question["id"], language)
+    cached = await asyncio.to_thread(cache.get, cache_key)
+    if cached is not None:
+        cached["cached"] = True
+        return cached
+
+    analysis = await profile_submission(code, question["id"], language, function_name)
+    if analysis is None:
+        analysis = await analyze_time_complexity_with_ai(
+            code,
+            question.get("title", ""),
+            question.get("description", ""),
+            language
+        )
+    # Don't memoize "couldn't tell" answers (AI unavailable, profiling failed). A
+    # timeout or budget overrun may just be a loaded host, so it stays out of the
+    # SQLite file other workers (and restarts) read from.
+    if analysis.get("actual_complexity") != "Unknown":
+        persist = analysis.get("over_budget_at") is None
+        await asyncio.to_thread(cache.put, cache_key, analysis, persist)
+    return analysis
 
-    # Check for optimal patterns
-    if question_id in optimal_patterns:
-        for pattern in optimal_patterns[question_id]:
-            import re
-            if re.search(pattern, code_lower):
-                return True
-        return False  # No optimal pattern found
 
-    # For questions not in the list, assume optimal (no penalty)
-    return True
+SKIPPED_TEST_ERROR = "Skipped: an earlier test failed (fail_fast)"
 
 
 @app.post("/api/technical/grade")
@@ -2932,10 +2183,10 @@ async def grade_technical_problem(request: GradeTechnicalProblemRequest):
     """Grade candidate code against a generated problem session."""
     try:
         sess = _generated_technical_sessions.get(request.session_id)
-        if not sess:
+        problem = _problem_cache.get(sess.get("problem_id")) if sess else None
+        if problem is None:
             raise HTTPException(status_code=404, detail="Problem session not found (it may have expired).")
 
-        problem = sess.get("problem") or {}
         run_mode = (request.run_mode or "run").strip().lower()
         if run_mode not in {"run", "submit"}:
             run_mode = "run"
@@ -2948,14 +2199,31 @@ async def grade_technical_problem(request: GradeTechnicalProblemRequest):
         passed_count = 0
         total_tests = len(test_cases)
 
+        outcomes = None
+        if request.language in GRADING_LANGUAGES:
+            def _failed(idx: int, outcome: dict) -> bool:
+                return bool(outcome["error"]) or not compare_outputs(outcome["result"], test_cases[idx].get("expectedOutput"))
+
+            outcomes = await run_test_cases(
+                request.language,
+                request.code,
+                [test_case.get("input") or {} for test_case in test_cases],
+                "solution",
+                generated=True,
+                stop_when=_failed if request.fail_fast and run_mode == "run" else None,
+                # Sample results from "run" are reused on "submit" of the same code,
+                # across every session sharing this problem.
+                cache_scope=f"problem:{sess['problem_id']}",
+            )
+
         for idx, test_case in enumerate(test_cases):
             test_input = test_case.get("input") or {}
             expected_output = test_case.get("expectedOutput")
 
-            if request.language == "python":
-                actual_output, error = execute_python_code_generated(request.code, test_input, "solution")
-            elif request.language == "javascript":
-                actual_output, error = execute_javascript_code_generated(request.code, test_input, "solution")
+            if outcomes is not None:
+                actual_output, error = outcomes[idx]["result"], outcomes[idx]["error"]
+                if outcomes[idx].get("skipped"):
+                    error = SKIPPED_TEST_ERROR
             else:
                 return JSONResponse(
                     content={
@@ -2990,6 +2258,7 @@ async def grade_technical_problem(request: GradeTechnicalProblemRequest):
                     "actual_output": actual_output,
                     "passed": passed,
                     "error": error,
+                    "reused": bool(outcomes[idx].get("cached")),
                 }
             )
 
@@ -3005,6 +2274,7 @@ async def grade_technical_problem(request: GradeTechnicalProblemRequest):
                 "score": round(score, 1),
                 "passed_tests": passed_count,
                 "total_tests": total_tests,
+                "reused_tests": sum(1 for result in test_results if result["reused"]),
                 "test_results": test_results,
             }
         )
@@ -3014,148 +2284,91 @@ async def grade_technical_problem(request: GradeTechnicalProblemRequest):
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
 
 
+def _run_code_test_passed(qid: str, outcome: dict, expected_output: Any) -> bool:
+    if outcome["error"] or outcome.get("skipped"):
+        return False
+    # Deep comparison of results, after the question's order-insensitive normalization
+    grading = get_question_bank().grading(qid)
+    return compare_outputs(
+        grading.normalize_output(outcome["result"]),
+        grading.normalize_output(expected_output),
+    )
+
+
+def _prepare_run_code(request: RunCodeRequest) -> tuple[dict, list, int, str]:
+    """Validate a run-code request; returns (question, test_cases, sample_count, function_name)."""
+    if request.language not in GRADING_LANGUAGES:
+        raise HTTPException(
+            status_code=400,
+            detail="Autograding currently supports Python and JavaScript only.",
+        )
+
+    bank = get_question_bank()
+    question = bank.get(request.question_id)
+    if not question:
+        print(f"Question not found: {request.question_id}")
+        raise HTTPException(status_code=404, detail=f"Question not found: {request.question_id}")
+
+    grading = bank.grading(question["id"])
+    if request.language == "javascript" and grading.python_only:
+        raise HTTPException(
+            status_code=400,
+            detail="Linked-list questions are currently autograded in Python only.",
+        )
+
+    # Determine which test cases to use based on run_mode
+    sample_tests = question.get("sampleTestCases", question.get("testCases", []))
+    if request.run_mode == "submit":
+        # Use both sample and hidden test cases for submission
+        test_cases = sample_tests + question.get("hiddenTestCases", [])
+    else:
+        # Only use sample test cases for "Run"
+        test_cases = sample_tests
+
+    return question, test_cases, len(sample_tests), grading.function_name
+
+
 @app.post("/api/run-code")
 async def run_code(request: RunCodeRequest):
     """Evaluate code against test cases with actual execution."""
     try:
-        if request.language not in {"python", "javascript"}:
-            raise HTTPException(
-                status_code=400,
-                detail="Autograding currently supports Python and JavaScript only.",
-            )
-
-        # Find the question
-        question = None
-        for diff_level in ["easy", "medium", "hard"]:
-            for q in TECHNICAL_QUESTIONS.get(diff_level, []):
-                if q["id"] == request.question_id:
-                    question = q
-                    break
-            if question:
-                break
-
-        if not question:
-            print(f"Question not found: {request.question_id}")
-            raise HTTPException(status_code=404, detail=f"Question not found: {request.question_id}")
-
-        linked_list_only_python = {
-            "reverse-linked-list",
-            "linked-list-cycle",
-            "reorder-list",
-            "merge-k-sorted-lists",
-        }
-        if request.language == "javascript" and question["id"] in linked_list_only_python:
-            raise HTTPException(
-                status_code=400,
-                detail="Linked-list questions are currently autograded in Python only.",
-            )
-        
-        # Determine which test cases to use based on run_mode
-        if request.run_mode == "submit":
-            # Use both sample and hidden test cases for submission
-            test_cases = question.get("sampleTestCases", question.get("testCases", [])) + question.get("hiddenTestCases", [])
-        else:
-            # Only use sample test cases for "Run"
-            test_cases = question.get("sampleTestCases", question.get("testCases", []))
+        question, test_cases, _, function_name = _prepare_run_code(request)
+        qid = question["id"]
 
         # Execute code against each test case
         test_results = []
         passed_count = 0
         total_tests = len(test_cases)
 
-        print(f"Running code for question: {question['id']}, Mode: {request.run_mode}, Total tests: {total_tests}")
-
-        # Determine function name based on question
-        function_name_map = {
-            "two-sum": "twoSum",
-            "contains-duplicate": "hasDuplicate",
-            "valid-anagram": "isAnagram",
-            "valid-palindrome": "isPalindrome",
-            "palindrome-number": "isPalindrome",
-            "best-time-stock": "maxProfit",
-            "fizz-buzz": "fizzBuzz",
-            "longest-substring": "lengthOfLongestSubstring",
-            "valid-parentheses": "isValid",
-            "longest-consecutive": "longestConsecutive",
-            "three-sum": "threeSum",
-            "container-with-most-water": "maxArea",
-            "find-min-rotated": "findMin",
-            "group-anagrams": "groupAnagrams",
-            "top-k-frequent": "topKFrequent",
-            "minimum-window-substring": "minWindow",
-            "product-except-self": "productExceptSelf",
-            "merge-intervals": "merge",
-            "reverse-linked-list": "reverseList",
-            "linked-list-cycle": "hasCycle",
-            "reorder-list": "reorderList",
-            "merge-k-sorted-lists": "mergeKLists",
-        }
-        function_name = function_name_map.get(question["id"], "solution")
-
+        print(f"Running code for question: {qid}, Mode: {request.run_mode}, Total tests: {total_tests}")
         print(f"Using function name: {function_name}")
 
-        def _normalize_for_compare(qid: str, value: Any) -> Any:
-            if value is None:
-                return None
-            if qid == "three-sum" and isinstance(value, list):
-                try:
-                    triplets = []
-                    for t in value:
-                        if isinstance(t, list):
-                            triplets.append(sorted(t))
-                        else:
-                            triplets.append(t)
-                    return sorted(triplets, key=lambda x: "|".join(map(str, x)) if isinstance(x, list) else str(x))
-                except Exception:
-                    return value
-            if qid == "top-k-frequent" and isinstance(value, list):
-                try:
-                    return sorted(value)
-                except Exception:
-                    return value
-            if qid == "group-anagrams" and isinstance(value, list):
-                normalized_groups = []
-                for g in value:
-                    if isinstance(g, list):
-                        try:
-                            normalized_groups.append(sorted(g))
-                        except Exception:
-                            normalized_groups.append(g)
-                    else:
-                        normalized_groups.append(g)
-                try:
-                    return sorted(
-                        normalized_groups,
-                        key=lambda grp: "|".join(map(str, grp)) if isinstance(grp, list) else str(grp),
-                    )
-                except Exception:
-                    return normalized_groups
-            return value
+        def _failed(idx: int, outcome: dict) -> bool:
+            return not _run_code_test_passed(qid, outcome, test_cases[idx]["expectedOutput"])
+
+        # Test cases run in parallel across the execution pool; results keep test order.
+        outcomes = await run_test_cases(
+            request.language,
+            request.code,
+            [test_case["input"] for test_case in test_cases],
+            function_name,
+            stop_when=_failed if request.fail_fast and request.run_mode != "submit" else None,
+            # Sample results from "run" are reused on "submit" of the same code.
+            cache_scope=f"question:{qid}",
+        )
 
         for idx, test_case in enumerate(test_cases):
             test_input = test_case["input"]
             expected_output = test_case["expectedOutput"]
             
-            # Execute code based on language
-            if request.language == "python":
-                actual_output, error = execute_python_code(request.code, test_input, function_name)
-            elif request.language == "javascript":
-                actual_output, error = execute_javascript_code(request.code, test_input, function_name)
-            else:
-                actual_output, error = None, "Unsupported language"
+            actual_output, error = outcomes[idx]["result"], outcomes[idx]["error"]
+            if outcomes[idx].get("skipped"):
+                error = SKIPPED_TEST_ERROR
             
             # Compare results
-            passed = False
+            passed = _run_code_test_passed(qid, outcomes[idx], expected_output)
             if error:
-                passed = False
                 actual_output = None
-            else:
-                # Deep comparison of results
-                qid = question["id"]
-                passed = compare_outputs(
-                    _normalize_for_compare(qid, actual_output),
-                    _normalize_for_compare(qid, expected_output),
-                )
 
             print(f"Test {idx + 1}: Expected={expected_output}, Actual={actual_output}, Passed={passed}, Error={error}")
 
@@ -3165,7 +2378,8 @@ async def run_code(request: RunCodeRequest):
                 "expected_output": expected_output,
                 "actual_output": actual_output,
                 "passed": passed,
-                "error": error
+                "error": error,
+                "reused": bool(outcomes[idx].get("cached")),
             })
 
             if passed:
@@ -3175,17 +2389,11 @@ async def run_code(request: RunCodeRequest):
         score = (passed_count / total_tests) * 100 if total_tests > 0 else 0
         all_passed = passed_count == total_tests
 
-        # Analyze time complexity if submitted using AI
+        # Analyze time complexity on submit
         efficiency_analysis = None
         is_efficient = True
         if request.run_mode == "submit" and all_passed:
-            # Use AI to analyze time complexity
-            efficiency_analysis = await analyze_time_complexity_with_ai(
-                request.code,
-                question.get("title", ""),
-                question.get("description", ""),
-                request.language
-            )
+            efficiency_analysis = await analyze_submission_efficiency(request.code, question, request.language, function_name)
             is_efficient = efficiency_analysis.get("is_optimal", True)
 
         print(f"Final results: {passed_count}/{total_tests} passed, score={score}%, is_efficient={is_efficient}")
@@ -3198,6 +2406,7 @@ async def run_code(request: RunCodeRequest):
             "score": round(score, 1),
             "passed_tests": passed_count,
             "total_tests": total_tests,
+            "reused_tests": sum(1 for result in test_results if result["reused"]),
             "test_results": test_results,
             "is_efficient": is_efficient,
             "efficiency_analysis": efficiency_analysis
@@ -3211,6 +2420,130 @@ async def run_code(request: RunCodeRequest):
         )
 
 
+_STREAM_PREVIEW_CHARS = 300
+
+
+def _stream_preview(value: Any) -> Any:
+    """`value` as-is if small, else a truncated JSON preview (keeps SSE events small)."""
+    try:
+        encoded = json.dumps(value)
+    except (TypeError, ValueError):
+        encoded = json.dumps(repr(value))
+        value = repr(value)
+    if len(encoded) <= _STREAM_PREVIEW_CHARS:
+        return value
+    return {"truncated": True, "preview": encoded[:_STREAM_PREVIEW_CHARS] + "...", "size": len(encoded)}
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+@app.post("/api/run-code/stream")
+async def run_code_stream(request: RunCodeRequest):
+    """Same grading as /api/run-code, streamed as Server-Sent Events.
+
+    Events: `start`, one `test` per test case as soon as it completes (completion
+    order; `test_case` is the 1-based position), `efficiency` for a fully passing
+    submit, then `done` with the totals. Hidden tests only report pass/fail, error
+    and (truncated) actual output; large sample inputs/outputs are truncated too.
+    Tests reused from an earlier run of the same code are sent first, with `reused`.
+    """
+    question, test_cases, sample_count, function_name = _prepare_run_code(request)
+    qid = question["id"]
+    total_tests = len(test_cases)
+    loop = asyncio.get_running_loop()
+    completed: asyncio.Queue = asyncio.Queue()
+
+    def _test_event(idx: int, outcome: dict) -> dict:
+        test_case = test_cases[idx]
+        error = SKIPPED_TEST_ERROR if outcome.get("skipped") else outcome["error"]
+        event = {
+            "test_case": idx + 1,
+            "hidden": idx >= sample_count,
+            "passed": _run_code_test_passed(qid, outcome, test_case["expectedOutput"]),
+            "error": error,
+            "elapsed_ms": outcome.get("elapsed_ms"),
+            "actual_output": None if error else _stream_preview(outcome["result"]),
+            "reused": bool(outcome.get("cached")),
+        }
+        if idx < sample_count:
+            event["input"] = _stream_preview(test_case["input"])
+            event["expected_output"] = _stream_preview(test_case["expectedOutput"])
+        return event
+
+    def _failed(idx: int, outcome: dict) -> bool:
+        return not _run_code_test_passed(qid, outcome, test_cases[idx]["expectedOutput"])
+
+    async def _events():
+        yield _sse("start", {"question_id": qid, "run_mode": request.run_mode, "total_tests": total_tests})
+
+        grading = asyncio.create_task(
+            run_test_cases(
+                request.language,
+                request.code,
+                [test_case["input"] for test_case in test_cases],
+                function_name,
+                stop_when=_failed if request.fail_fast and request.run_mode != "submit" else None,
+                # Called from pool threads as each test finishes.
+                on_outcome=lambda idx, outcome: loop.call_soon_threadsafe(completed.put_nowait, (idx, outcome)),
+                cache_scope=f"question:{qid}",
+            )
+        )
+        grading.add_done_callback(lambda _: loop.call_soon_threadsafe(completed.put_nowait, None))
+
+        sent: set[int] = set()
+        passed_count = 0
+        reused_count = 0
+        try:
+            while True:
+                item = await completed.get()
+                if item is None:
+                    break
+                idx, outcome = item
+                event = _test_event(idx, outcome)
+                sent.add(idx)
+                passed_count += event["passed"]
+                reused_count += event["reused"]
+                yield _sse("test", event)
+
+            try:
+                outcomes = grading.result()
+            except Exception as e:
+                yield _sse("error", {"detail": f"An error occurred: {str(e)}"})
+                return
+
+            # Tests cancelled by fail_fast never report through on_outcome.
+            for idx, outcome in enumerate(outcomes):
+                if idx not in sent:
+                    yield _sse("test", _test_event(idx, outcome))
+
+            all_passed = passed_count == total_tests
+            efficiency_analysis = None
+            is_efficient = True
+            if request.run_mode == "submit" and all_passed:
+                efficiency_analysis = await analyze_submission_efficiency(request.code, question, request.language, function_name)
+                is_efficient = efficiency_analysis.get("is_optimal", True)
+                yield _sse("efficiency", {"is_efficient": is_efficient, "efficiency_analysis": efficiency_analysis})
+
+            score = (passed_count / total_tests) * 100 if total_tests > 0 else 0
+            yield _sse("done", {
+                "passed": all_passed,
+                "score": round(score, 1),
+                "passed_tests": passed_count,
+                "total_tests": total_tests,
+                "reused_tests": reused_count,
+                "is_efficient": is_efficient,
+            })
+        finally:
+            grading.cancel()
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 def compare_outputs(actual: Any, expected: Any) -> bool:
     """Compare actual and expected outputs, handling nested JSON-ish structures."""
     # Handle None cases
@@ -3272,14 +2605,16 @@ async def start_voice_interview(request: VoiceInterviewRequest):
         )
 
         first_question = response.text.strip()
-        interview_sessions[session_id]["current_question"] = first_question
-        interview_sessions[session_id]["questions_asked"] = 1  # Track actual count of questions asked
-        interview_sessions[session_id]["company"] = request.company
-        interview_sessions[session_id]["role"] = request.role
-        interview_sessions[session_id]["conversation_history"].append({
+        session = interview_sessions[session_id]
+        session["current_question"] = first_question
+        session["questions_asked"] = 1  # Track actual count of questions asked
+        session["company"] = request.company
+        session["role"] = request.role
+        session["conversation_history"].append({
             "role": "interviewer",
             "content": first_question
         })
+        interview_sessions[session_id] = session  # write back (shared state backends)
         
         print(f"[DEBUG] Started interview for {request.role} at {request.company}")
         print(f"[DEBUG] Session {session_id}: questions_asked = 1, max_questions = 3")
@@ -3301,105 +2636,270 @@ async def start_voice_interview(request: VoiceInterviewRequest):
         )
 
 
+_VOICE_TRANSCRIBE_INSTRUCTION = "Please transcribe the following audio recording. Provide ONLY the transcription, without any additional commentary or formatting. If the audio is unclear or silent, respond with '[inaudible]'."
+
+_VOICE_SCORING_CRITERIA = """SCORING CRITERIA:
+1. Communication & Clarity (0-25): How clearly did they articulate their thoughts? Did they structure their answer well?
+2. Relevance & Specificity (0-25): Did they provide specific examples? Is their answer relevant to the question?
+3. Problem-Solving Approach (0-25): For conflict/challenge questions, did they show a constructive approach? Did they learn from the experience?
+4. Professionalism & Cultural Fit (0-25): Does their response align with professional standards? Would they fit well in a team environment?"""
+
+_VOICE_NEXT_QUESTION_RULES = """- Different from the previous question(s)
+- Relevant to the role and company
+- A behavioral question (past experience, how would you handle, tell me about a time, etc.)
+- Concise and professional (1-2 sentences)"""
+
+
+async def _voice_audio_part(client: genai.Client, audio: PreparedAudio):
+    """Inline part for the answer audio, or a Files API upload when it's large.
+
+    Inline data is still base64-encoded by the SDK; only the upload skips that.
+
+    Returns (part, uploaded file or None); the caller deletes the upload when done.
+    """
+    from google.genai import types
+    if len(audio.data) <= VOICE_INLINE_MAX_BYTES:
+        return types.Part.from_bytes(data=audio.data, mime_type=audio.mime_type), None
+    uploaded = await asyncio.to_thread(
+        client.files.upload,
+        file=io.BytesIO(audio.data),
+        config={"mime_type": audio.mime_type},
+    )
+    return uploaded, uploaded
+
+
+# Pending Files API deletes. The event loop only keeps weak references to tasks,
+# so an unreferenced delete could be collected before it runs and leak the upload.
+_audio_cleanup_tasks: set[asyncio.Task] = set()
+
+
+def _schedule_audio_delete(client: genai.Client, uploaded) -> None:
+    task = asyncio.create_task(_delete_uploaded_audio(client, uploaded))
+    _audio_cleanup_tasks.add(task)
+    task.add_done_callback(_audio_cleanup_tasks.discard)
+
+
+@app.on_event("shutdown")
+async def _finish_audio_cleanup():
+    if _audio_cleanup_tasks:
+        await asyncio.gather(*_audio_cleanup_tasks, return_exceptions=True)
+
+
+async def _delete_uploaded_audio(client: genai.Client, uploaded) -> None:
+    try:
+        await asyncio.to_thread(client.files.delete, name=uploaded.name)
+    except Exception as e:
+        print(f"[WARN] Could not delete uploaded audio {getattr(uploaded, 'name', '')}: {str(e)}")
+
+
+def _voice_score_prompt(transcript: str) -> str:
+    return f"""You are an expert behavioral interview evaluator. Rate this response from the candidate on a scale of 0-100 based on these criteria:
+
+{_VOICE_SCORING_CRITERIA}
+
+Candidate's Response: "{transcript}"
+
+Respond with ONLY a number from 0-100 based on how well the response meets these criteria."""
+
+
+def _voice_next_question_prompt(session: dict, next_question_number: int) -> str:
+    return f"""You are a professional interviewer at {session.get('company', 'a company')} conducting a behavioral interview for a {session.get('role', 'role')} position.
+
+Current conversation:
+{chr(10).join([f"{msg['role'].title()}: {msg['content']}" for msg in session["conversation_history"]])}
+
+You have asked {next_question_number - 1} questions so far and are now asking question {next_question_number} of {session["max_questions"]}.
+
+Generate question #{next_question_number}. Make it:
+{_VOICE_NEXT_QUESTION_RULES}
+
+Return ONLY the question, nothing else."""
+
+
+def _voice_fused_turn_prompt(session: dict, next_question_number: Optional[int]) -> str:
+    """One call that transcribes, scores and (unless this was the last answer) asks the next question."""
+    history = chr(10).join([f"{msg['role'].title()}: {msg['content']}" for msg in session["conversation_history"]])
+    if next_question_number is None:
+        next_question = 'Set "next_question" to null: this was the last answer.'
+    else:
+        next_question = (
+            f"Then write question #{next_question_number} of {session['max_questions']} for this "
+            f"{session.get('role', 'role')} interview at {session.get('company', 'a company')}. Make it:\n"
+            f"{_VOICE_NEXT_QUESTION_RULES}"
+        )
+    return f"""You are a professional behavioral interviewer. The attached audio is the candidate's answer to the last question below.
+
+Conversation so far:
+{history}
+
+First transcribe the audio exactly (use "[inaudible]" if it is unclear or silent).
+Then rate the answer from 0-100 based on these criteria:
+
+{_VOICE_SCORING_CRITERIA}
+
+{next_question}
+
+Return STRICT JSON only: {{"transcript": string, "score": number, "next_question": string or null}}"""
+
+
+def _parse_voice_score(text: str) -> float:
+    try:
+        return max(0, min(100, float(str(text).strip())))  # Clamp 0-100
+    except (TypeError, ValueError):
+        return 50.0
+
+
+async def _voice_fused_turn(client: genai.Client, session: dict, audio_part, next_question_number: Optional[int]) -> dict:
+    response = await call_gemini_with_retry_async(
+        client=client,
+        model="gemini-2.5-flash",
+        contents=[{"text": _voice_fused_turn_prompt(session, next_question_number)}, audio_part],
+        max_retries=2,
+        initial_delay=1
+    )
+    payload = _extract_first_json_object(response.text)
+    transcript = str(payload.get("transcript") or "").strip()
+    next_question = str(payload.get("next_question") or "").strip()
+    if not transcript or (next_question_number is not None and not next_question):
+        raise ValueError("Fused turn response is missing fields")
+    return {
+        "transcript": transcript,
+        "score": _parse_voice_score(payload.get("score")),
+        "next_question": next_question or None,
+    }
+
+
 @app.post("/api/voice-response")
 async def handle_voice_response(
     audio: UploadFile = File(...),
     session_id: str = Form(...)
 ):
-    """Process voice response with real transcription and interactive conversation."""
+    """Process voice response with real transcription and interactive conversation.
+
+    Scoring the answer and writing the next question both only need the transcript,
+    so they run concurrently (VOICE_FUSED_TURN=1 does all three in one model call).
+    """
     try:
         if session_id not in interview_sessions:
             raise HTTPException(status_code=404, detail="Session not found")
         
         session = interview_sessions[session_id]
+        turn_started = time.monotonic()
         
         # Transcribe audio using Google Gemini
-        audio_content = await audio.read()
-        
-        transcript = ""
-        
         try:
-            client = genai.Client(api_key=GEMINI_API_KEY)
-            
-            # Prepare audio for Gemini (base64 encode)
-            audio_b64 = base64.b64encode(audio_content).decode('utf-8')
-            
-            # Use Gemini to transcribe the audio
-            prompt_parts = [
-                {
-                    "text": "Please transcribe the following audio recording. Provide ONLY the transcription, without any additional commentary or formatting. If the audio is unclear or silent, respond with '[inaudible]'."
-                },
-                {
-                    "inline_data": {
-                        "mime_type": "audio/wav",
-                        "data": audio_b64
-                    }
-                }
-            ]
-            
-            response = await call_gemini_with_retry_async(
-                client=client,
-                model="gemini-2.5-flash",  # Supports audio input
-                contents=prompt_parts,
-                max_retries=2,
-                initial_delay=1
+            audio_content = await read_upload(audio, VOICE_MAX_UPLOAD_BYTES)
+            # Resampling / container parsing is CPU work; keep it off the event loop.
+            prepared_audio = await asyncio.to_thread(
+                prepare_answer_audio,
+                audio_content,
+                VOICE_MAX_ANSWER_SECONDS,
+                fallback_mime_type=audio.content_type or "audio/wav",
             )
+        except AudioTooLarge as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        del audio_content
+        print(
+            f"[DEBUG] Answer audio: {prepared_audio.original_bytes} -> {len(prepared_audio.data)} bytes "
+            f"({prepared_audio.mime_type}, {prepared_audio.duration_seconds or 0:.1f}s)"
+        )
+        client = genai.Client(api_key=GEMINI_API_KEY)
 
-            transcript = response.text.strip()
-            print(f"[Gemini] Transcribed: {transcript[:100]}...")
-            
-        except Exception as e:
-            print(f"[ERROR] Gemini transcription failed: {str(e)}")
-            transcript = "[Audio transcription unavailable]"
+        # This answer completes the interview once it brings the score count to max_questions.
+        is_last_answer = len(session["scores"]) + 1 >= session["max_questions"]
+        if "questions_asked" not in session:
+            session["questions_asked"] = 1
+        next_question_number = None if is_last_answer else session["questions_asked"] + 1
+
+        audio_part = uploaded_audio = None
+        fused = None
+        try:
+            if VOICE_FUSED_TURN:
+                try:
+                    audio_part, uploaded_audio = await _voice_audio_part(client, prepared_audio)
+                    fused = await _voice_fused_turn(client, session, audio_part, next_question_number)
+                    print(f"[Gemini] Fused turn: {fused['transcript'][:100]}...")
+                except Exception as e:
+                    print(f"[ERROR] Fused voice turn failed, falling back to separate calls: {str(e)}")
+
+            if fused is not None:
+                transcript = fused["transcript"]
+            else:
+                try:
+                    if audio_part is None:
+                        audio_part, uploaded_audio = await _voice_audio_part(client, prepared_audio)
+                    response = await call_gemini_with_retry_async(
+                        client=client,
+                        model="gemini-2.5-flash",  # Supports audio input
+                        contents=[{"text": _VOICE_TRANSCRIBE_INSTRUCTION}, audio_part],
+                        max_retries=2,
+                        initial_delay=1
+                    )
+
+                    transcript = response.text.strip()
+                    print(f"[Gemini] Transcribed: {transcript[:100]}...")
+
+                except Exception as e:
+                    print(f"[ERROR] Gemini transcription failed: {str(e)}")
+                    transcript = "[Audio transcription unavailable]"
+        finally:
+            # The upload is only needed for transcription; remove it on every path,
+            # including a client disconnect cancelling this request.
+            if uploaded_audio is not None:
+                _schedule_audio_delete(client, uploaded_audio)
+        transcribed_ms = int((time.monotonic() - turn_started) * 1000)
         
         # Add user response to conversation history
         session["conversation_history"].append({
             "role": "candidate",
             "content": transcript
         })
-        
-        # Evaluate response quality based on scoring criteria
-        evaluation_prompt = f"""You are an expert behavioral interview evaluator. Rate this response from the candidate on a scale of 0-100 based on these criteria:
 
-SCORING CRITERIA:
-1. Communication & Clarity (0-25): How clearly did they articulate their thoughts? Did they structure their answer well?
-2. Relevance & Specificity (0-25): Did they provide specific examples? Is their answer relevant to the question?
-3. Problem-Solving Approach (0-25): For conflict/challenge questions, did they show a constructive approach? Did they learn from the experience?
-4. Professionalism & Cultural Fit (0-25): Does their response align with professional standards? Would they fit well in a team environment?
+        if fused is not None:
+            response_score = fused["score"]
+            next_response = fused["next_question"]
+        else:
+            async def score_answer() -> float:
+                eval_response = await call_gemini_with_retry_async(
+                    client=client,
+                    model="gemini-2.5-flash",
+                    contents=_voice_score_prompt(transcript),
+                    max_retries=3,
+                    initial_delay=2
+                )
+                return _parse_voice_score(eval_response.text)
 
-Candidate's Response: "{transcript}"
+            async def write_next_question() -> Optional[str]:
+                if next_question_number is None:
+                    return None
+                response = await call_gemini_with_retry_async(
+                    client=client,
+                    model="gemini-2.5-flash",
+                    contents=_voice_next_question_prompt(session, next_question_number),
+                    max_retries=3,
+                    initial_delay=2
+                )
+                return response.text.strip()
 
-Respond with ONLY a number from 0-100 based on how well the response meets these criteria."""
-        
-        client = genai.Client(api_key=GEMINI_API_KEY)
-        eval_response = await call_gemini_with_retry_async(
-            client=client,
-            model="gemini-2.5-flash",
-            contents=evaluation_prompt,
-            max_retries=3,
-            initial_delay=2
-        )
+            # Both only need the transcript: one model round trip instead of two.
+            response_score, next_response = await asyncio.gather(score_answer(), write_next_question())
 
-        try:
-            response_score = float(eval_response.text.strip())
-            response_score = max(0, min(100, response_score))  # Clamp 0-100
-        except:
-            response_score = 50.0
-        
         session["scores"].append(response_score)
         
         # Check how many responses we've received
         num_responses_received = len(session["scores"])
         
         print(f"[DEBUG] Received response #{num_responses_received}. Current scores: {session['scores']}")
+        print(f"[DEBUG] Turn latency: transcript {transcribed_ms} ms, total {int((time.monotonic() - turn_started) * 1000)} ms (fused={fused is not None})")
         
         # If we've received 3 responses, interview is complete
-        if num_responses_received >= session["max_questions"]:
+        if next_question_number is None:
             # Calculate final score
             final_score = sum(session["scores"]) / len(session["scores"]) if session["scores"] else 0
             
             # Round to nearest integer
             final_score = round(final_score)
+            interview_sessions[session_id] = session  # write back (shared state backends)
             
             return JSONResponse(content={
                 "next_question": None,
@@ -3409,43 +2909,8 @@ Respond with ONLY a number from 0-100 based on how well the response meets these
                 "average_score": final_score
             })
         
-        # Increment questions_asked to track the next question number
-        print(f"[DEBUG] Session before increment - questions_asked: {session.get('questions_asked', 'NOT SET')}, session keys: {session.keys()}")
-
-        # Ensure questions_asked is initialized
-        if "questions_asked" not in session:
-            session["questions_asked"] = 1
-
-        session["questions_asked"] += 1
-        next_question_number = session["questions_asked"]
-        print(f"[DEBUG] After incrementing: questions_asked = {next_question_number}")
-        
-        # Generate next question
-        prompt = f"""You are a professional interviewer at {session.get('company', 'a company')} conducting a behavioral interview for a {session.get('role', 'role')} position.
-
-Current conversation:
-{chr(10).join([f"{msg['role'].title()}: {msg['content']}" for msg in session["conversation_history"]])}
-
-You have asked {next_question_number - 1} questions so far and are now asking question {next_question_number} of {session["max_questions"]}.
-
-Generate question #{next_question_number}. Make it:
-- Different from the previous question(s)
-- Relevant to the role and company
-- A behavioral question (past experience, how would you handle, tell me about a time, etc.)
-- Concise and professional (1-2 sentences)
-
-Return ONLY the question, nothing else."""
-        
-        client = genai.Client(api_key=GEMINI_API_KEY)
-        response = await call_gemini_with_retry_async(
-            client=client,
-            model="gemini-2.5-flash",
-            contents=prompt,
-            max_retries=3,
-            initial_delay=2
-        )
-
-        next_response = response.text.strip()
+        # Advance to the question we just generated
+        session["questions_asked"] = next_question_number
 
         print(f"[DEBUG] Returning question #{next_question_number} after receiving {num_responses_received} responses")
         print(f"[DEBUG] Question text: {next_response[:100]}...")
@@ -3456,6 +2921,7 @@ Return ONLY the question, nothing else."""
             "role": "interviewer",
             "content": next_response
         })
+        interview_sessions[session_id] = session  # write back (shared state backends)
 
         print(f"[DEBUG] Returning question_number: {next_question_number}, completed: False")
 
@@ -3529,132 +2995,42 @@ async def evaluate_interview_performance(interview_state: dict, client: genai.Cl
                     answers = answers[-max_answers:]
                 return answers
 
-            def _is_nonsense_answer(text: str) -> bool:
-                t = _norm_text(text)
-                if not t:
-                    return True
-                lower = t.casefold()
-
-                # Common non-answers / filler.
-                if re.search(r"\b(pass|skip|n/?a|no\s+comment|prefer\s+not\s+to\s+say)\b", lower):
-                    return True
-                if re.search(r"\b(idk|i\s+don'?t\s+know|no\s+idea|whatever)\b", lower) and len(lower) < 120:
-                    return True
-                if re.search(r"\b(asdf|qwer|lorem|ipsum|blah)\b", lower):
-                    return True
-
-                words = re.findall(r"[a-zA-Z']+", lower)
-                wc = len(words)
-                if wc < 6:
-                    return True
-                uniq = len(set(words))
-                uniq_ratio = uniq / max(1, wc)
-                # Repeating the same word over and over.
-                from collections import Counter
-                top = Counter(words).most_common(1)[0][1] if words else 0
-                if wc >= 10 and (top / wc) >= 0.45:
-                    return True
-                # Mostly non-alphabetic characters.
-                alpha = len(re.findall(r"[A-Za-z]", t))
-                non_ws = len(re.findall(r"\S", t))
-                if non_ws > 0 and (alpha / non_ws) < 0.35:
-                    return True
-                # Extremely low lexical diversity in a longer answer.
-                if wc >= 25 and uniq_ratio < 0.25:
-                    return True
-
-                return False
-
             max_answers = int(interview_state.get("max_questions", 3) or 3)
             candidate_answers = _extract_candidate_answers(conversation, max_answers=max_answers)
             candidate_text = "\n".join(candidate_answers).strip()
             ct = candidate_text.casefold()
 
-            # Deterministic disqualification for clearly unacceptable workplace behavior admissions.
-            # (Even if the model evaluator misses it.)
-            if re.search(r"\b(i\s*(always|usually|often)\s*)?(yell|scream|shout)\b", ct) and re.search(r"\b(coworker|co-worker|colleague|manager|team|people)\b", ct):
-                print("[Evaluation] Disqualifying content detected: admits yelling at coworkers")
-                return {
-                    "score": 5,
-                    "disqualified": True,
-                    "flags": {"unprofessional": True, "harassment_hate": False, "sexual": False, "violence_threat": False},
-                    "scoring_version": scoring_version,
-                }
-
-            # Deterministic disqualification for admissions of intentional non-performance/abandonment.
-            # Examples: "I did no work", "I took zero action", "I left my team", "I never came back".
-            no_work = re.search(
-                r"\b(i\s*(did|do)\s*(no|zero)\s*(work|action)|i\s*(did|do)\s*nothing|"
-                r"didn'?t\s*really\s*do\s*any\s*work|took\s*(no|zero)\s*action|"
-                r"i\s*(never|didn'?t)\s*(help|contribute)|i\s*(didn'?t)\s*(contribute|participate))\b",
-                ct,
-            )
-            abandonment = re.search(
-                r"\b(left\s+(my\s+)?team\s+(to\s+)?(handle|do)\s+(it\s+)?(by\s+)?themselves|"
-                r"i\s*(went|left)\s+.*\s+and\s+never\s+came\s+back|ghosted|abandoned|"
-                r"i\s*(just\s*)?stopped\s*(working|showing\s+up)|no\s*show)\b",
-                ct,
-            )
-            if no_work or abandonment:
-                print("[Evaluation] Disqualifying content detected: admits no work / abandonment")
+            # Deterministic disqualification (even if the model evaluator misses it): clearly
+            # unacceptable workplace behavior, admitted non-performance/abandonment,
+            # violence/threats, illegal/unethical intent. Rules are in precedence order.
+            hit = INTERVIEW_DISQUALIFIERS.first(ct)
+            if hit is not None:
+                print(f"[Evaluation] Disqualifying content detected: rule {hit.id} ({hit.match!r})")
                 return {
-                    "score": 10,
+                    "score": hit.rule.score,
                     "disqualified": True,
-                    "flags": {"unprofessional": True, "harassment_hate": False, "sexual": False, "violence_threat": False},
+                    "flags": {
+                        "unprofessional": True,
+                        "harassment_hate": False,
+                        "sexual": False,
+                        "violence_threat": "violence_threat" in hit.rule.tags,
+                    },
+                    "guardrail_rules": [hit.id],
                     "scoring_version": scoring_version,
                 }
 
-            # Vague but clearly disqualifying intent.
-            vague_threat = re.search(r"\b(i\s*(would|'d)\s*do|i\s*will\s*do)\b[\s\S]{0,40}\b(bad\s+things|something\s+bad)\b", ct)
-
-            # Explicit violence/threat language.
-            violence = re.search(r"\b(kill|murder|shoot|stab|bomb|rape|assault|attack|hurt|harm)\b", ct)
-
-            # Illegal/unethical intent.
-            unethical = re.search(r"\b(steal|fraud|scam|embezzle|sabotage|blackmail|extort|leak\s+secrets|dox|hack)\b", ct)
-
-            # Conditional intent tied to hiring/employment context.
-            employment_context = re.search(r"\b(if\s+i\s*(get|got)\s+hired|if\s+you\s+hire\s+me|once\s+i\'?m\s+hired)\b", ct)
-
             if candidate_text:
-                if violence:
-                    print("[Evaluation] Disqualifying content detected: violence/threat")
-                    return {
-                        "score": 5,
-                        "disqualified": True,
-                        "flags": {"unprofessional": True, "harassment_hate": False, "sexual": False, "violence_threat": True},
-                        "scoring_version": scoring_version,
-                    }
-                if unethical:
-                    print("[Evaluation] Disqualifying content detected: illegal/unethical intent")
-                    return {
-                        "score": 10,
-                        "disqualified": True,
-                        "flags": {"unprofessional": True, "harassment_hate": False, "sexual": False, "violence_threat": False},
-                        "scoring_version": scoring_version,
-                    }
-                if vague_threat and employment_context:
-                    print("[Evaluation] Disqualifying content detected: vague threat in hiring context")
-                    return {
-                        "score": 10,
-                        "disqualified": True,
-                        "flags": {"unprofessional": True, "harassment_hate": False, "sexual": False, "violence_threat": False},
-                        "scoring_version": scoring_version,
-                    }
-
                 # Deterministic nonsense/non-answer caps.
                 if candidate_answers:
-                    nonsense_flags = [
-                        _is_nonsense_answer(a)
-                        for a in candidate_answers
-                    ]
-                    nonsense_count = sum(1 for x in nonsense_flags if x)
+                    nonsense_reasons = [non_answer_reasons(a) for a in candidate_answers]
+                    fired = sorted({reason for reasons in nonsense_reasons for reason in reasons})
+                    nonsense_count = sum(1 for reasons in nonsense_reasons if reasons)
                     if nonsense_count == len(candidate_answers):
-                        print("[Evaluation] All candidate answers appear to be nonsense/non-answers")
-                        return {"score": 0, "disqualified": True, "flags": {"unprofessional": True}, "scoring_version": scoring_version}
+                        print(f"[Evaluation] All candidate answers appear to be nonsense/non-answers ({fired})")
+                        return {"score": 0, "disqualified": True, "flags": {"unprofessional": True}, "guardrail_rules": fired, "scoring_version": scoring_version}
                     if nonsense_count >= 2:
-                        print(f"[Evaluation] Majority nonsense/non-answers ({nonsense_count}/{len(candidate_answers)})")
-                        return {"score": 5, "disqualified": True, "flags": {"unprofessional": True}, "scoring_version": scoring_version}
+                        print(f"[Evaluation] Majority nonsense/non-answers ({nonsense_count}/{len(candidate_answers)}, {fired})")
+                        return {"score": 5, "disqualified": True, "flags": {"unprofessional": True}, "guardrail_rules": fired, "scoring_version": scoring_version}
                     if nonsense_count == 1:
                         # One non-answer should heavily penalize overall score.
                         print("[Evaluation] At least one answer appears to be nonsense/non-answer")
@@ -3789,18 +3165,7 @@ Return STRICT JSON only (no markdown, no commentary), with exactly these keys:
                 if max_answers > 0 and len(candidate_answers) > max_answers:
                     candidate_answers = candidate_answers[-max_answers:]
 
-                def _is_nonsense_quick(text: str) -> bool:
-                    lower = re.sub(r"\s+", " ", (text or "").strip()).casefold()
-                    if not lower:
-                        return True
-                    if re.search(r"\b(pass|skip|n/?a|no\s+comment)\b", lower):
-                        return True
-                    words = re.findall(r"[a-zA-Z']+", lower)
-                    if len(words) < 6:
-                        return True
-                    return False
-
-                nonsense_count = sum(1 for a in candidate_answers if _is_nonsense_quick(a))
+                nonsense_count = sum(1 for a in candidate_answers if non_answer_reasons(a, quick=True))
                 if candidate_answers and nonsense_count == len(candidate_answers):
                     score = min(score, 0)
                     disqualified = True
@@ -3826,6 +3191,32 @@ Return STRICT JSON only (no markdown, no commentary), with exactly these keys:
         return {"score": 40, "disqualified": False, "flags": {}, "scoring_version": "star_v3_guardrails_2026-01-13"}
 
 
+async def _interview_completion_payload(interview_state: dict, client: genai.Client) -> dict:
+    """The `interview_complete` message body for a finished behavioral interview."""
+    eval_result = await evaluate_interview_performance(interview_state, client)
+    return {
+        "score": int(eval_result.get("score", 0)),
+        "disqualified": bool(eval_result.get("disqualified", False)),
+        "flags": eval_result.get("flags", {}),
+        "guardrail_rules": eval_result.get("guardrail_rules", []),
+        "scoring_version": eval_result.get("scoring_version", "")
+    }
+
+
+@app.get("/api/behavioral-interview/evaluations/{evaluation_id}")
+async def get_interview_evaluation(evaluation_id: str):
+    """Status of a post-interview evaluation; `result` matches the `interview_complete` message."""
+    job = _evaluation_jobs.get(evaluation_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Evaluation not found")
+    return JSONResponse(content={
+        "evaluation_id": evaluation_id,
+        "status": job["status"],
+        "result": job.get("result"),
+        "error": job.get("error"),
+    })
+
+
 @app.websocket("/ws/behavioral-interview")
 async def behavioral_interview_websocket(websocket: WebSocket):
     """WebSocket endpoint for real-time behavioral interview using Gemini Live API."""
@@ -3844,34 +3235,108 @@ async def behavioral_interview_websocket(websocket: WebSocket):
         # Receive initial connection data (company, role, resume)
         init_data = await websocket.receive_json()
         company = init_data.get("company", "a company")
+        session_started_at = time.monotonic()
         role = init_data.get("role", "a role")
         resume_text = init_data.get("resume_text", "")
+        # Binary PCM frames when the client asks for them; base64-in-JSON otherwise.
+        audio_transport = negotiate_transport(init_data)
+        binary_audio = audio_transport == BINARY_AUDIO_TRANSPORT
+        # Server-side VAD ends candidate turns from the audio itself (see app/services/vad.py).
+        server_vad = bool(init_data.get("server_vad", SERVER_VAD))
 
         import uuid
-        session_id = str(uuid.uuid4())
+        # This socket's claim on the session; a newer resume takes it over.
+        connection_id = uuid.uuid4().hex
+        resume_session_id = init_data.get("resume_session_id")
+        checkpoint = _behavioral_sessions.get(str(resume_session_id)) if resume_session_id else None
+        resumed = checkpoint is not None
+        if resumed:
+            # Pick up where the dropped socket left off: same questions, answers and transcripts.
+            session_id = str(resume_session_id)
+            interview_state = _restore_interview_state(checkpoint)
+            interview_state["resumes"] = interview_state.get("resumes", 0) + 1
+            company = interview_state.get("company", company)
+            role = interview_state.get("role", role)
+            print(f"[WebSocket] Resuming session {session_id} at Q{interview_state['questions_asked']} (resume #{interview_state['resumes']})")
+        else:
+            if resume_session_id:
+                print(f"[WebSocket] Session {resume_session_id} not found or expired; starting a new interview")
+            session_id = str(uuid.uuid4())
+            # Initialize interview session state
+            interview_state = {
+                "questions_asked": 0,
+                "answers_completed": 0,
+                "max_questions": 3,
+                "questions": [],
+                "scores": [],
+                "conversation_history": [],
+                "candidate_answers": {},
+                "server_transcripts": {},
+                "answers_recorded": set(),
+                "turn_latencies": [],
+                "company": company,
+                "role": role
+            }
+
+        if "audio_transport" in init_data or "server_vad" in init_data or "resume_session_id" in init_data:
+            await websocket.send_json({
+                "type": "session",
+                "audio_transport": audio_transport,
+                "frame_header_bytes": AUDIO_FRAME_HEADER_SIZE,
+                "server_vad": server_vad,
+                "session_id": session_id,
+                "resumed": resumed,
+                "resume_ttl_seconds": BEHAVIORAL_SESSION_TTL_SECONDS,
+            })
 
         print(f"[WebSocket] Starting behavioral interview for {role} at {company}")
         print(f"[WebSocket] Session ID: {session_id}")
         print(f"[WebSocket] Resume text received: {len(resume_text)} chars" if resume_text else "[WebSocket] No resume text received")
 
-        # Initialize interview session state
-        interview_state = {
-            "questions_asked": 0,
-            "answers_completed": 0,
-            "max_questions": 3,
-            "questions": [],
-            "scores": [],
-            "conversation_history": [],
-            "candidate_answers": {},
-            "server_transcripts": {},
-            "answers_recorded": set(),
-            "company": company,
-            "role": role
-        }
+        superseded = False
+
+        def _checkpoint() -> None:
+            """Save interview_state for a later resume, unless another socket has taken the session over."""
+            nonlocal superseded
+            if superseded:
+                return
+            try:
+                saved = _behavioral_sessions.get(session_id)
+                if saved is not None and saved.get("connection_id") != connection_id:
+                    superseded = True
+                    print(f"[WebSocket] Session {session_id} was resumed on another connection; no longer saving it")
+                    return
+                _behavioral_sessions[session_id] = _interview_checkpoint(interview_state, connection_id)
+            except Exception as e:
+                print(f"[WebSocket] Failed to save session {session_id}: {e}")
 
         # Configure Gemini Live API
         client = genai.Client(api_key=GEMINI_API_KEY)
-        MODEL = "gemini-2.0-flash-exp"
+
+        if resumed:
+            # Claim the session before anything else can write it.
+            _behavioral_sessions[session_id] = _interview_checkpoint(interview_state, connection_id)
+            if interview_state.get("evaluation_id") or interview_state["answers_completed"] >= interview_state["max_questions"]:
+                # Every answer is in: report the evaluation instead of reopening the interview.
+                evaluation_id = interview_state.get("evaluation_id")
+                if not evaluation_id:
+                    evaluation_id = _evaluation_jobs.submit(_interview_completion_payload(interview_state, client))
+                    interview_state["evaluation_id"] = evaluation_id
+                    _checkpoint()
+                await websocket.send_json({
+                    "type": "reviewing",
+                    "message": "Your interview is being reviewed...",
+                    "evaluation_id": evaluation_id,
+                })
+                job = await _evaluation_jobs.wait(evaluation_id)
+                if job is None:
+                    await websocket.send_json({"type": "error", "message": "Evaluation not found"})
+                elif job["status"] == EVALUATION_DONE:
+                    await websocket.send_json({"type": "interview_complete", **job["result"]})
+                elif job["status"] != EVALUATION_PENDING:
+                    await websocket.send_json({"type": "error", "message": f"Evaluation failed: {job['error']}"})
+                # Still running on another worker: the client fetches it by id.
+                return
 
         # Pre-generate canonical questions (clean UI text) using a non-Live model.
         # This avoids relying on output_audio_transcription, which can be garbled.
@@ -3919,113 +3384,113 @@ async def behavioral_interview_websocket(websocket: WebSocket):
                 raise ValueError(f"Invalid questions format: {json_text[:200]}")
             return [str(q).strip() for q in questions if str(q).strip()]
 
-        try:
-            # Strategy 1: Try personalized questions if resume is available
-            if resume_text and resume_text.strip():
-                try:
-                    print(f"[WebSocket] Attempting personalized question generation...")
-                    personalized_prompt = (
-                        f"Generate exactly 3 behavioral interview questions for a {role} role at {company}.\n\n"
-                        f"The candidate's resume:\n{resume_text[:2000]}\n\n"  # Limit resume length
-                        "IMPORTANT: Generate questions in this mix:\n"
-                        "- Question 1: A general behavioral question (teamwork, conflict resolution, or communication)\n"
-                        "- Question 2: A general behavioral question about problem-solving or taking initiative\n"
-                        "- Question 3: A PERSONALIZED question based on a specific experience, project, or skill from their resume. "
-                        "Reference something concrete from their background.\n\n"
-                        "Each question must be 1-2 concise sentences, professional, and relevant to the role.\n"
-                        "Return STRICT JSON only: {\"questions\": [\"...\", \"...\", \"...\"]}"
-                    )
-                    questions = await generate_questions_with_prompt(personalized_prompt)
+        generic_prompt = (
+            f"Generate exactly 3 distinct behavioral interview questions for a {role} role at {company}.\n"
+            "Each question must be 1-2 concise sentences, professional, and relevant to the role.\n"
+            "Return STRICT JSON only: {\"questions\": [\"...\", \"...\", \"...\"]}"
+        )
+        question_cache_key = _behavioral_question_cache_key(company, role)
+
+        async def generic_questions() -> tuple[list, str]:
+            cached = _behavioral_question_cache.get(question_cache_key)
+            if cached:
+                return cached, "cache"
+            questions = await generate_questions_with_prompt(generic_prompt)
+            _behavioral_question_cache[question_cache_key] = questions
+            return questions, "generated"
+
+        async def prepare_questions() -> str:
+            """Fill interview_state["questions"]; returns where they came from."""
+            if interview_state["questions"]:
+                return "resumed"
+            try:
+                # Strategy 1: Try personalized questions if resume is available
+                if resume_text and resume_text.strip():
+                    try:
+                        print(f"[WebSocket] Attempting personalized question generation...")
+                        personalized_prompt = (
+                            f"Generate exactly 3 behavioral interview questions for a {role} role at {company}.\n\n"
+                            f"The candidate's resume:\n{resume_text[:2000]}\n\n"  # Limit resume length
+                            "IMPORTANT: Generate questions in this mix:\n"
+                            "- Question 1: A general behavioral question (teamwork, conflict resolution, or communication)\n"
+                            "- Question 2: A general behavioral question about problem-solving or taking initiative\n"
+                            "- Question 3: A PERSONALIZED question based on a specific experience, project, or skill from their resume. "
+                            "Reference something concrete from their background.\n\n"
+                            "Each question must be 1-2 concise sentences, professional, and relevant to the role.\n"
+                            "Return STRICT JSON only: {\"questions\": [\"...\", \"...\", \"...\"]}"
+                        )
+                        questions = await generate_questions_with_prompt(personalized_prompt)
+                        interview_state["questions"] = questions
+                        print(f"[WebSocket] Generated personalized questions: {questions}")
+                        return "personalized"
+                    except Exception as personalized_err:
+                        print(f"[WebSocket] Personalized generation failed: {personalized_err}")
+                        # Fall through to generic generation
+                        raise personalized_err
+                else:
+                    # Strategy 2: Generic questions (no resume), cached per company + role
+                    questions, source = await generic_questions()
                     interview_state["questions"] = questions
-                    print(f"[WebSocket] Generated personalized questions: {questions}")
-                except Exception as personalized_err:
-                    print(f"[WebSocket] Personalized generation failed: {personalized_err}")
-                    # Fall through to generic generation
-                    raise personalized_err
-            else:
-                # Strategy 2: Generic questions (no resume)
-                generic_prompt = (
-                    f"Generate exactly 3 distinct behavioral interview questions for a {role} role at {company}.\n"
-                    "Each question must be 1-2 concise sentences, professional, and relevant to the role.\n"
-                    "Return STRICT JSON only: {\"questions\": [\"...\", \"...\", \"...\"]}"
-                )
-                questions = await generate_questions_with_prompt(generic_prompt)
-                interview_state["questions"] = questions
-                print(f"[WebSocket] Generated generic questions: {questions}")
+                    print(f"[WebSocket] Generic questions ({source}): {questions}")
+                    return source
 
-        except Exception as e:
-            # Strategy 3: Try generic questions as fallback if personalized failed
-            if resume_text and resume_text.strip():
-                try:
-                    print(f"[WebSocket] Trying generic questions as fallback...")
-                    generic_prompt = (
-                        f"Generate exactly 3 distinct behavioral interview questions for a {role} role at {company}.\n"
-                        "Each question must be 1-2 concise sentences, professional, and relevant to the role.\n"
-                        "Return STRICT JSON only: {\"questions\": [\"...\", \"...\", \"...\"]}"
-                    )
-                    questions = await generate_questions_with_prompt(generic_prompt)
-                    interview_state["questions"] = questions
-                    print(f"[WebSocket] Generated generic fallback questions: {questions}")
-                except Exception as generic_err:
-                    print(f"[WebSocket] Generic generation also failed: {generic_err}, using hardcoded fallback")
-                    interview_state["questions"] = [
-                        "Tell me about a time you faced a challenging problem at work or school. What did you do and what was the outcome?",
-                        "Describe a time you had to work with a difficult teammate or resolve a conflict. How did you handle it?",
-                        "Tell me about a time you took initiative or led a project. What actions did you take and what did you learn?",
-                    ]
-            else:
-                print(f"[WebSocket] Failed to pre-generate questions, using hardcoded fallback: {e}")
-                interview_state["questions"] = [
-                    "Tell me about a time you faced a challenging problem at work or school. What did you do and what was the outcome?",
-                    "Describe a time you had to work with a difficult teammate or resolve a conflict. How did you handle it?",
-                    "Tell me about a time you took initiative or led a project. What actions did you take and what did you learn?",
-                ]
+            except Exception as e:
+                # Strategy 3: Try generic questions as fallback if personalized failed
+                if resume_text and resume_text.strip():
+                    try:
+                        print(f"[WebSocket] Trying generic questions as fallback...")
+                        questions, source = await generic_questions()
+                        interview_state["questions"] = questions
+                        print(f"[WebSocket] Generic fallback questions ({source}): {questions}")
+                        return source
+                    except Exception as generic_err:
+                        print(f"[WebSocket] Generic generation also failed: {generic_err}, using hardcoded fallback")
+                else:
+                    print(f"[WebSocket] Failed to pre-generate questions, using hardcoded fallback: {e}")
+            interview_state["questions"] = [
+                "Tell me about a time you faced a challenging problem at work or school. What did you do and what was the outcome?",
+                "Describe a time you had to work with a difficult teammate or resolve a conflict. How did you handle it?",
+                "Tell me about a time you took initiative or led a project. What actions did you take and what did you learn?",
+            ]
+            return "fallback"
 
-        # System instruction for the interview
-        system_instruction = f"""You are a professional behavioral interviewer at {company} conducting an interview for a {role} position.
+        async def timed_prepare_questions() -> tuple[str, int]:
+            started = time.monotonic()
+            source = await prepare_questions()
+            return source, int((time.monotonic() - started) * 1000)
 
-CRITICAL INSTRUCTIONS:
-1. When you receive a message, it will contain ONLY the interview question you should ask.
-2. Speak the question naturally and clearly, exactly as provided - do not add any preamble or extra words.
-3. Do NOT read out any meta-instructions or acknowledge them verbally - just ask the question provided.
-4. Do NOT interrupt the candidate while they are speaking. Wait for long pauses (3+ seconds).
-5. Do NOT use filler words like "okay", "mm-hmm", or "I see" during the candidate's response.
-6. After the candidate finishes their answer, remain completely silent unless you receive another message.
-7. Never ask follow-up questions unless explicitly instructed.
+        # Generate questions while the Live session connects; Q1 needs both.
+        questions_task = asyncio.create_task(timed_prepare_questions())
 
-Remember: You only speak when given a new message. Each message contains exactly what you should say."""
-
-        config = {
-            # Note: Live API expects a single output modality. Requesting both
-            # AUDIO and TEXT can cause a 1007 "invalid argument" during connect.
-            "response_modalities": ["AUDIO"],
-            # Ask Gemini to include transcripts alongside audio.
-            "input_audio_transcription": {},
-            "output_audio_transcription": {},
-            "system_instruction": {
-                "role": "system",
-                "parts": [{"text": system_instruction}]
-            },
-            # Configure voice and turn detection
-            "generation_config": {
-                "speech_config": {
-                    "voice_config": {
-                        "prebuilt_voice_config": {
-                            "voice_name": "Puck"
-                        }
-                    }
-                }
-            }
-        }
+        # Pooled Live sessions are pre-connected, so they get the generic config; the
+        # interviewer only speaks the canonical question text either way.
+        if _live_pool is not None and not interview_state.get("live_handle"):
+            config = _behavioral_live_config()
+            live_connection = _live_pool.connect(BEHAVIORAL_LIVE_MODEL, config)
+        else:
+            config = _behavioral_live_config(company, role, interview_state.get("live_handle"))
+            live_connection = client.aio.live.connect(model=BEHAVIORAL_LIVE_MODEL, config=config)
 
         print(f"[WebSocket] Connecting to Gemini Live API...")
 
         try:
             # Connect to Gemini Live API
-            async with client.aio.live.connect(model=MODEL, config=config) as session:
-                print(f"[WebSocket] Connected to Gemini Live API")
-
-                import time
+            async with live_connection as session:
+                live_connect_ms = int((time.monotonic() - session_started_at) * 1000)
+                live_warm = getattr(live_connection, "warm", False)
+                print(f"[WebSocket] Connected to Gemini Live API ({live_connect_ms} ms, {'warm' if live_warm else 'new'} session)")
+                questions_source, questions_ms = await questions_task
+                startup_metrics = {
+                    "questions_source": questions_source,
+                    "questions_ms": questions_ms,
+                    "live_connect_ms": live_connect_ms,
+                    "live_warm": live_warm,
+                }
+                if live_warm:
+                    startup_metrics["live_session_age_ms"] = live_connection.age_ms
+                if _live_pool is not None:
+                    print(f"[WebSocket] Live pool: {_live_pool.stats()}")
+                _checkpoint()
 
                 def _merge_transcript(prev: str, chunk: str) -> str:
                     """Merge incremental transcript chunks without flicker/duplication."""
@@ -4060,6 +3525,7 @@ Remember: You only speak when given a new message. Each message contains exactly
                     if not normalized:
                         return
                     interview_state.setdefault("candidate_answers", {})[question_number] = normalized
+                    _checkpoint()
 
                 def _record_candidate_answer(question_number: int) -> None:
                     if not isinstance(question_number, int) or question_number <= 0:
@@ -4094,6 +3560,12 @@ Remember: You only speak when given a new message. Each message contains exactly
                 audio_first_ts = None
                 audio_last_ts = None
                 current_question_in_flight = 0
+                # All messages to the client go through the outbox's sender task.
+                outbox = OutboundQueue(websocket, binary_audio, max_audio_bytes=WS_OUTBOX_MAX_AUDIO_BYTES)
+                outbox.start()
+                vad = EnergyVAD(silence_ms=VAD_SILENCE_MS, min_speech_ms=VAD_MIN_SPEECH_MS) if server_vad else None
+                # Set when a turn ends; completed by the first interviewer audio that follows.
+                pending_turn_metrics = None
 
                 async def _send_canonical_question(question_number: int, acknowledge_first: bool = False):
                     idx = question_number - 1
@@ -4107,24 +3579,26 @@ Remember: You only speak when given a new message. Each message contains exactly
                         raise ValueError(f"Question number exceeds max_questions: {question_number}")
 
                     # Update UI with clean question text.
-                    await websocket.send_json({
+                    outbox.send_json({
                         "type": "question",
                         "question_number": question_number,
                         "total_questions": interview_state["max_questions"],
                         "content": q_text,
                     })
 
-                    # Store canonical interviewer question for evaluation.
-                    interview_state["conversation_history"].append({
-                        "role": "interviewer",
-                        "content": q_text,
-                    })
+                    # Store canonical interviewer question for evaluation (once, if re-asked on resume).
+                    if question_number > interview_state["questions_asked"]:
+                        interview_state["conversation_history"].append({
+                            "role": "interviewer",
+                            "content": q_text,
+                        })
 
                     # Track question progression based on what we *send*, not model turn_complete.
                     nonlocal current_question_in_flight, awaiting_question_turn_complete
                     current_question_in_flight = question_number
                     awaiting_question_turn_complete = True
                     interview_state["questions_asked"] = max(interview_state["questions_asked"], question_number)
+                    _checkpoint()
                     print(f"[WebSocket] Question {question_number} sent")
 
                     # Send ONLY the question text - no meta-instructions
@@ -4136,8 +3610,77 @@ Remember: You only speak when given a new message. Each message contains exactly
 
                     await session.send_realtime_input(text=instruction)
 
-                # Kick off with Q1 (canonical text + spoken verbatim).
-                await _send_canonical_question(1, acknowledge_first=False)
+                def _reset_turn_audio() -> None:
+                    nonlocal received_audio_since_last_turn, audio_bytes_since_last_turn, audio_chunks_since_last_turn
+                    nonlocal audio_first_ts, audio_last_ts
+                    received_audio_since_last_turn = False
+                    audio_bytes_since_last_turn = 0
+                    audio_chunks_since_last_turn = 0
+                    audio_first_ts = None
+                    audio_last_ts = None
+                    if vad is not None:
+                        vad.reset()
+
+                def _finish_turn_metrics(metrics: dict) -> None:
+                    metrics["first_audio_ms"] = int((time.monotonic() - metrics.pop("speech_ended_at")) * 1000)
+                    interview_state["turn_latencies"].append(metrics)
+                    metrics["outbound"] = outbox.stats()
+                    print(f"[WebSocket] Turn latency Q{metrics['question_number']}: {metrics}")
+                    outbox.send_json({"type": "turn_metrics", **metrics})
+
+                async def _complete_candidate_turn(trigger: str, speech_ended_at: float) -> None:
+                    """End the candidate's answer and move on to the next question (or the close)."""
+                    nonlocal candidate_turn_active, awaiting_question_turn_complete, awaiting_close_turn_complete
+                    nonlocal pending_turn_metrics
+                    answered_q = current_question_in_flight
+                    print(f"[WebSocket] User finished response for Q{answered_q} ({trigger})")
+                    candidate_turn_active = False
+                    _record_candidate_answer(answered_q)
+                    # Only count an answer if we actually streamed some audio. Counted (and
+                    # saved) before the grace period so a drop during it doesn't lose the answer.
+                    if received_audio_since_last_turn:
+                        interview_state["answers_completed"] += 1
+                    _checkpoint()
+                    # Explicitly signal end of audio stream; otherwise Gemini may wait.
+                    await session.send_realtime_input(audio_stream_end=True)
+
+                    # Give a short grace period so turn-taking feels natural.
+                    # Prevents Gemini from speaking immediately when the user stops.
+                    # Counted from the end of speech, so a late end_of_turn waits less.
+                    await asyncio.sleep(max(0.0, TURN_GRACE_SECONDS - (time.monotonic() - speech_ended_at)))
+                    _reset_turn_audio()
+
+                    pending_turn_metrics = {
+                        "question_number": answered_q,
+                        "trigger": trigger,
+                        "speech_ended_at": speech_ended_at,
+                    }
+                    # Drive the conversation explicitly so we always advance.
+                    if interview_state["answers_completed"] < interview_state["max_questions"]:
+                        next_q = interview_state["answers_completed"] + 1
+                        await _send_canonical_question(next_q, acknowledge_first=False)
+                    elif interview_state["answers_completed"] >= interview_state["max_questions"]:
+                        # After the 3rd response, send a closing statement
+                        # Send ONLY what we want Gemini to say - no meta-instructions
+                        awaiting_close_turn_complete = True
+                        awaiting_question_turn_complete = False
+                        await session.send_realtime_input(
+                            text=f"Thank you for sharing your experiences with us today. We appreciate your time, and we'll be in touch soon regarding next steps."
+                        )
+                    pending_turn_metrics["next_prompt_ms"] = int((time.monotonic() - speech_ended_at) * 1000)
+
+                # Kick off with Q1 (canonical text + spoken verbatim). A resumed session re-asks
+                # the question that was in flight, or asks the next one if it was answered.
+                first_question = 1
+                if resumed:
+                    first_question = max(1, interview_state["questions_asked"])
+                    if interview_state["answers_completed"] >= first_question:
+                        first_question = interview_state["answers_completed"] + 1
+                    else:
+                        # The candidate answers the interrupted question again from the start.
+                        interview_state["candidate_answers"].pop(first_question, None)
+                        interview_state["server_transcripts"].pop(first_question, None)
+                await _send_canonical_question(first_question, acknowledge_first=False)
 
                 # Create tasks for bidirectional communication
                 async def receive_from_gemini():
@@ -4146,6 +3689,7 @@ Remember: You only speak when given a new message. Each message contains exactly
                         nonlocal last_out_sent, last_in_sent, received_audio_since_last_turn
                         nonlocal awaiting_question_turn_complete, awaiting_close_turn_complete
                         nonlocal candidate_turn_active, current_question_in_flight
+                        nonlocal pending_turn_metrics, startup_metrics
                         done = False
                         while not done:
                             # Reset per-model-turn transcript buffers.
@@ -4164,6 +3708,12 @@ Remember: You only speak when given a new message. Each message contains exactly
                                                 user_text = part.text
                                                 print(f"[User] Response (server transcript): {user_text[:100]}...")
 
+                                # Live session-resumption handle (LIVE_SESSION_RESUMPTION), saved for a reconnect.
+                                resumption = getattr(response, "session_resumption_update", None)
+                                if resumption is not None and resumption.resumable and resumption.new_handle:
+                                    interview_state["live_handle"] = resumption.new_handle
+                                    _checkpoint()
+
                                 # Handle server content (audio from Gemini)
                                 if response.server_content:
                                     # Forward server-side transcriptions (works in AUDIO mode)
@@ -4173,16 +3723,14 @@ Remember: You only speak when given a new message. Each message contains exactly
                                         now = time.monotonic()
                                         if now - last_in_sent >= 0.12 or getattr(response.server_content.input_transcription, 'finished', False):
                                             last_in_sent = now
-                                            try:
-                                                await websocket.send_json({
-                                                    "type": "text",
-                                                    "content": in_transcript_local,
-                                                    "speaker": "candidate"
-                                                })
-                                            except Exception:
-                                                pass
+                                            outbox.send_transcript({
+                                                "type": "text",
+                                                "content": in_transcript_local,
+                                                "speaker": "candidate"
+                                            })
                                         if getattr(response.server_content.input_transcription, 'finished', False):
                                             interview_state.setdefault("server_transcripts", {})[current_question_in_flight] = in_transcript_local
+                                            _checkpoint()
 
                                     if response.server_content.output_transcription and getattr(response.server_content.output_transcription, 'text', None):
                                         # Intentionally ignored: output transcription is often garbled.
@@ -4199,6 +3747,16 @@ Remember: You only speak when given a new message. Each message contains exactly
                                             if hasattr(part, 'inline_data') and part.inline_data:
                                                 if not allow_audio:
                                                     continue
+                                                if startup_metrics is not None:
+                                                    # Time from the client's init message to the first interviewer audio.
+                                                    startup_metrics["time_to_first_audio_ms"] = int((time.monotonic() - session_started_at) * 1000)
+                                                    interview_state["startup_metrics"] = startup_metrics
+                                                    print(f"[WebSocket] Startup latency: {startup_metrics}")
+                                                    outbox.send_json({"type": "session_metrics", **startup_metrics})
+                                                    startup_metrics = None
+                                                if pending_turn_metrics is not None:
+                                                    _finish_turn_metrics(pending_turn_metrics)
+                                                    pending_turn_metrics = None
                                                 audio_data = part.inline_data.data
                                                 mime_type = getattr(part.inline_data, 'mime_type', None)
                                                 sample_rate = 24000
@@ -4210,13 +3768,8 @@ Remember: You only speak when given a new message. Each message contains exactly
                                                             sample_rate = int(m.group(1))
                                                         except ValueError:
                                                             pass
-                                                await websocket.send_json({
-                                                    "type": "audio",
-                                                    "format": "pcm_s16le",
-                                                    "sample_rate": sample_rate,
-                                                    "mime_type": mime_type,
-                                                    "data": base64.b64encode(audio_data).decode('utf-8')
-                                                })
+                                                # Queued, never awaited: a slow client must not stall the Live stream.
+                                                outbox.send_audio(audio_data, sample_rate, mime_type)
 
                                             # Ignore any interviewer text to avoid follow-ups in UI/state
                                             if hasattr(part, 'text') and part.text:
@@ -4232,31 +3785,33 @@ Remember: You only speak when given a new message. Each message contains exactly
                                             awaiting_question_turn_complete = False
                                             # Candidate may answer now.
                                             candidate_turn_active = True
-                                            await websocket.send_json({
+                                            if vad is not None:
+                                                vad.reset()
+                                            outbox.send_json({
                                                 "type": "turn_complete",
                                                 "question_number": qn,
                                                 "total_questions": interview_state["max_questions"],
                                             })
                                         elif awaiting_close_turn_complete:
-                                            # Closing message finished; now evaluate.
-                                            print(f"[WebSocket] Evaluating interview performance...")
-                                            try:
-                                                await websocket.send_json({
-                                                    "type": "reviewing",
-                                                    "message": "Your interview is being reviewed...",
-                                                })
-                                            except Exception:
-                                                pass
-                                            eval_result = await evaluate_interview_performance(interview_state, client)
-                                            final_score = int(eval_result.get("score", 0))
-                                            await websocket.send_json({
-                                                "type": "interview_complete",
-                                                "score": final_score,
-                                                "disqualified": bool(eval_result.get("disqualified", False)),
-                                                "flags": eval_result.get("flags", {}),
-                                                "scoring_version": eval_result.get("scoring_version", "")
+                                            # Closing message finished; now evaluate in a background job
+                                            # that outlives this socket (fetch by id if the client leaves).
+                                            evaluation_id = _evaluation_jobs.submit(
+                                                _interview_completion_payload(interview_state, client)
+                                            )
+                                            interview_state["evaluation_id"] = evaluation_id
+                                            _checkpoint()
+                                            print(f"[WebSocket] Evaluating interview performance (job {evaluation_id})...")
+                                            outbox.send_json({
+                                                "type": "reviewing",
+                                                "message": "Your interview is being reviewed...",
+                                                "evaluation_id": evaluation_id,
                                             })
-                                            print(f"[WebSocket] Interview complete with score: {final_score}")
+                                            job = await _evaluation_jobs.wait(evaluation_id)
+                                            if job["status"] == EVALUATION_DONE:
+                                                outbox.send_json({"type": "interview_complete", **job["result"]})
+                                                print(f"[WebSocket] Interview complete with score: {job['result']['score']}")
+                                            else:
+                                                outbox.send_json({"type": "error", "message": f"Evaluation failed: {job['error']}"})
                                             done = True
                                             break
 
@@ -4265,27 +3820,38 @@ Remember: You only speak when given a new message. Each message contains exactly
 
                     except Exception as e:
                         print(f"[WebSocket] Error receiving from Gemini: {str(e)}")
-                        try:
-                            await websocket.send_json({
-                                "type": "error",
-                                "message": f"Error: {str(e)}"
-                            })
-                        except Exception:
-                            pass
+                        outbox.send_json({
+                            "type": "error",
+                            "message": f"Error: {str(e)}"
+                        })
 
                 async def send_to_gemini():
                     """Receive audio from frontend and send to Gemini"""
                     try:
                         nonlocal received_audio_since_last_turn
-                        nonlocal awaiting_question_turn_complete, awaiting_close_turn_complete
-                        nonlocal candidate_turn_active, current_question_in_flight
                         nonlocal audio_bytes_since_last_turn, audio_chunks_since_last_turn
                         nonlocal audio_first_ts, audio_last_ts
 
                         MIN_AUDIO_MS = 900
                         MIN_AUDIO_CHUNKS = 3
                         while True:
-                            message = await websocket.receive_json()
+                            frame = await websocket.receive()
+                            if frame["type"] == "websocket.disconnect":
+                                raise WebSocketDisconnect(frame.get("code", 1000))
+                            audio_data = None
+                            input_rate = 16000
+                            if frame.get("bytes") is not None:
+                                # Binary transport: header + raw PCM, no JSON/base64 work.
+                                try:
+                                    input_rate, _, audio_data = decode_audio_frame(frame["bytes"])
+                                except ValueError as e:
+                                    print(f"[WebSocket] Dropping bad audio frame: {e}")
+                                    continue
+                                message = {"type": "audio"}
+                            else:
+                                message = json.loads(frame.get("text") or "{}")
+                                if not isinstance(message, dict):
+                                    continue
 
                             if message.get("type") == "transcript_final":
                                 qn = message.get("question_number")
@@ -4302,8 +3868,9 @@ Remember: You only speak when given a new message. Each message contains exactly
                                 if not candidate_turn_active:
                                     continue
                                 received_audio_since_last_turn = True
-                                # Decode base64 audio from frontend
-                                audio_data = base64.b64decode(message.get("data", ""))
+                                if audio_data is None:
+                                    # Legacy transport: base64 audio inside JSON
+                                    audio_data = base64.b64decode(message.get("data", ""))
 
                                 # Track how much candidate audio we actually received this turn.
                                 now = time.monotonic()
@@ -4316,9 +3883,16 @@ Remember: You only speak when given a new message. Each message contains exactly
                                 # Send audio to Gemini using realtime input
                                 from google.genai import types
                                 await session.send_realtime_input(
-                                    audio=types.Blob(data=audio_data, mime_type="audio/pcm;rate=16000")
+                                    audio=types.Blob(data=audio_data, mime_type=f"audio/pcm;rate={input_rate}")
                                 )
 
+                                # Server VAD: end the turn once the candidate has spoken and gone quiet,
+                                # without waiting for the client's end_of_turn.
+                                if vad is not None:
+                                    vad.feed(audio_data, input_rate)
+                                    if vad.end_of_speech:
+                                        await _complete_candidate_turn("server_vad", vad.speech_ended_at)
+
                             elif message.get("type") == "end_of_turn":
                                 # Ignore end_of_turn if we're not currently expecting an answer.
                                 if not candidate_turn_active:
@@ -4328,19 +3902,12 @@ Remember: You only speak when given a new message. Each message contains exactly
                                 # This avoids moving on due to background noise / accidental triggers.
                                 if message.get("had_speech") is False:
                                     print("[WebSocket] end_of_turn received with no speech; ignoring")
-                                    received_audio_since_last_turn = False
-                                    audio_bytes_since_last_turn = 0
-                                    audio_chunks_since_last_turn = 0
-                                    audio_first_ts = None
-                                    audio_last_ts = None
+                                    _reset_turn_audio()
                                     # Ask frontend to resume listening.
-                                    try:
-                                        await websocket.send_json({
-                                            "type": "resume_listening",
-                                            "reason": "no_speech"
-                                        })
-                                    except Exception:
-                                        pass
+                                    outbox.send_json({
+                                        "type": "resume_listening",
+                                        "reason": "no_speech"
+                                    })
                                     continue
 
                                 # Minimum answer length guard (server-side): if we didn't receive enough
@@ -4349,69 +3916,41 @@ Remember: You only speak when given a new message. Each message contains exactly
                                 audio_ms = int((audio_bytes_since_last_turn / (2 * 16000)) * 1000) if audio_bytes_since_last_turn else 0
                                 if (audio_ms < MIN_AUDIO_MS) or (audio_chunks_since_last_turn < MIN_AUDIO_CHUNKS):
                                     print(f"[WebSocket] end_of_turn too short (audio_ms={audio_ms}, chunks={audio_chunks_since_last_turn}); requesting more")
-                                    received_audio_since_last_turn = False
-                                    audio_bytes_since_last_turn = 0
-                                    audio_chunks_since_last_turn = 0
-                                    audio_first_ts = None
-                                    audio_last_ts = None
-                                    try:
-                                        await websocket.send_json({
-                                            "type": "resume_listening",
-                                            "reason": "too_short",
-                                            "min_audio_ms": MIN_AUDIO_MS,
-                                            "min_chunks": MIN_AUDIO_CHUNKS
-                                        })
-                                    except Exception:
-                                        pass
+                                    _reset_turn_audio()
+                                    outbox.send_json({
+                                        "type": "resume_listening",
+                                        "reason": "too_short",
+                                        "min_audio_ms": MIN_AUDIO_MS,
+                                        "min_chunks": MIN_AUDIO_CHUNKS
+                                    })
                                     continue
 
                                 # User finished speaking - signal end of turn
-                                answered_q = current_question_in_flight
-                                print(f"[WebSocket] User finished response for Q{answered_q}")
-                                candidate_turn_active = False
-                                _record_candidate_answer(answered_q)
-                                # Explicitly signal end of audio stream; otherwise Gemini may wait.
-                                await session.send_realtime_input(audio_stream_end=True)
-
-                                # Give a short grace period so turn-taking feels natural.
-                                # Prevents Gemini from speaking immediately when the user stops.
-                                await asyncio.sleep(2.2)
-
-                                # Only count an answer if we actually streamed some audio.
-                                if received_audio_since_last_turn:
-                                    received_audio_since_last_turn = False
-                                    interview_state["answers_completed"] += 1
-
-                                audio_bytes_since_last_turn = 0
-                                audio_chunks_since_last_turn = 0
-                                audio_first_ts = None
-                                audio_last_ts = None
-
-                                # Drive the conversation explicitly so we always advance.
-                                if interview_state["answers_completed"] < interview_state["max_questions"]:
-                                    next_q = interview_state["answers_completed"] + 1
-                                    await _send_canonical_question(next_q, acknowledge_first=False)
-                                elif interview_state["answers_completed"] >= interview_state["max_questions"]:
-                                    # After the 3rd response, send a closing statement
-                                    # Send ONLY what we want Gemini to say - no meta-instructions
-                                    awaiting_close_turn_complete = True
-                                    awaiting_question_turn_complete = False
-                                    await session.send_realtime_input(
-                                        text=f"Thank you for sharing your experiences with us today. We appreciate your time, and we'll be in touch soon regarding next steps."
-                                    )
+                                speech_ended_at = time.monotonic()
+                                if vad is not None and vad.speech_ended_at is not None:
+                                    speech_ended_at = vad.speech_ended_at
+                                await _complete_candidate_turn("end_of_turn", speech_ended_at)
 
                     except WebSocketDisconnect:
                         print(f"[WebSocket] Client disconnected")
                     except Exception as e:
                         print(f"[WebSocket] Error sending to Gemini: {str(e)}")
 
-                # Run both tasks concurrently (keep Gemini session open)
-                await asyncio.gather(
-                    receive_from_gemini(),
-                    send_to_gemini()
-                )
+                # Run both directions concurrently (keep Gemini session open). Sends no longer
+                # fail when the client leaves, so stop waiting on Gemini once it has.
+                receiver = asyncio.create_task(receive_from_gemini())
+                try:
+                    await send_to_gemini()
+                finally:
+                    receiver.cancel()
+                    await asyncio.gather(receiver, return_exceptions=True)
+                    await outbox.close()
+                    interview_state["outbound_metrics"] = outbox.stats()
+                    print(f"[WebSocket] Outbound queue: {interview_state['outbound_metrics']}")
+                    _checkpoint()
 
         except Exception as gemini_error:
+            questions_task.cancel()
             print(f"[WebSocket] Gemini Live API Error: {str(gemini_error)}")
             import traceback
             traceback.print_exc()
@@ -1,6 +1,7 @@
 import { useState, useEffect, useRef } from 'react'
-import { WS_BASE_URL } from '../config'
+import { API_BASE_URL, WS_BASE_URL } from '../config'
 import { STTClient } from '../lib/stt'
+import { decodeAudioFrame, encodeAudioFrame } from '../lib/audioFrames'
 import './BehavioralInterview.css'
 import LoadingScreen from './LoadingScreen'
 
@@ -44,7 +45,16 @@ function BehavioralInterviewLive({ company, role, resumeText, onComplete }: Beha
   const hasSpokenThisTurnRef = useRef(false)
   const lastVoiceAtMsRef = useRef<number>(0)
   const endOfTurnSentRef = useRef(false)
-  const preRollRef = useRef<string[]>([])
+  const preRollRef = useRef<Uint8Array[]>([])
+  // Raw PCM over binary frames once the server accepts it; base64 JSON until then.
+  const binaryAudioRef = useRef(false)
+  // Evaluation job id from 'reviewing'; polled if the socket closes before the result arrives.
+  const evaluationIdRef = useRef<string | null>(null)
+  // Server session id; sent as resume_session_id when reconnecting after a drop.
+  const sessionIdRef = useRef<string | null>(null)
+  const reconnectAttemptsRef = useRef(0)
+  const closedByClientRef = useRef(false)
+  const audioOutSeqRef = useRef(0)
   const preRollMaxChunksRef = useRef(6)
 
   const mergeTranscript = (prev: string, next: string) => {
@@ -127,7 +137,48 @@ function BehavioralInterviewLive({ company, role, resumeText, onComplete }: Beha
     }
   }, [])
 
+  const finishInterview = (result: { score: number; disqualified?: boolean; flags?: any; scoring_version?: string }) => {
+    if (interviewEndedRef.current) return
+    console.log('Interview complete with score:', result.score)
+    setIsReviewing(false)
+    interviewEndedRef.current = true
+    onComplete(result.score, {
+      disqualified: result.disqualified,
+      flags: result.flags,
+      scoring_version: result.scoring_version
+    })
+    cleanup()
+  }
+
+  const pollEvaluation = async (evaluationId: string) => {
+    // The evaluation keeps running server-side after a disconnect; fetch it by id.
+    for (let attempt = 0; attempt < 150 && !interviewEndedRef.current; attempt++) {
+      try {
+        const response = await fetch(`${API_BASE_URL}/api/behavioral-interview/evaluations/${evaluationId}`)
+        if (response.ok) {
+          const job = await response.json()
+          if (job.status === 'done' && job.result) {
+            finishInterview(job.result)
+            return
+          }
+          if (job.status === 'failed') {
+            setError(`Evaluation failed: ${job.error}`)
+            setIsReviewing(false)
+            return
+          }
+        } else if (response.status === 404) {
+          break
+        }
+      } catch (err) {
+        console.error('Failed to fetch evaluation:', err)
+      }
+      await new Promise(resolve => setTimeout(resolve, 2000))
+    }
+    setIsReviewing(false)
+  }
+
   const cleanup = () => {
+    closedByClientRef.current = true
     // Stop mic capture without sending an end-of-turn (we might be unmounting
     // due to interview completion or navigation).
     if (processorRef.current || mediaStreamRef.current) {
@@ -181,7 +232,10 @@ function BehavioralInterviewLive({ company, role, resumeText, onComplete }: Beha
   const connectWebSocket = () => {
     try {
       const ws = new WebSocket(`${WS_BASE_URL}/ws/behavioral-interview`)
+      ws.binaryType = 'arraybuffer'
       wsRef.current = ws
+      binaryAudioRef.current = false
+      audioOutSeqRef.current = 0
 
       ws.onopen = () => {
         console.log('WebSocket connected')
@@ -198,20 +252,40 @@ function BehavioralInterviewLive({ company, role, resumeText, onComplete }: Beha
         ws.send(JSON.stringify({
           company,
           role,
-          resume_text: resumeText || ''
+          resume_text: resumeText || '',
+          audio_transport: 'binary',
+          ...(sessionIdRef.current ? { resume_session_id: sessionIdRef.current } : {})
         }))
 
         setInterviewStarted(true)
       }
 
       ws.onmessage = async (event) => {
+        if (event.data instanceof ArrayBuffer) {
+          // Binary frame: interviewer audio (header + raw PCM)
+          const frame = decodeAudioFrame(event.data)
+          if (frame) {
+            await playAudioChunk(frame.pcm, frame.sampleRate)
+          }
+          return
+        }
+
         const message = JSON.parse(event.data)
         console.log('Received message:', message.type)
 
         switch (message.type) {
+          case 'session':
+            binaryAudioRef.current = message.audio_transport === 'binary'
+            sessionIdRef.current = message.session_id ?? null
+            if (message.resumed) {
+              reconnectAttemptsRef.current = 0
+              setError('')
+            }
+            break
+
           case 'audio':
-            // Received audio from Gemini
-            await playAudioChunk(message.data, message.sample_rate)
+            // Received audio from Gemini (base64 transport)
+            await playAudioChunk(base64ToUint8Array(message.data), message.sample_rate)
             break
 
           case 'question':
@@ -278,6 +352,7 @@ function BehavioralInterviewLive({ company, role, resumeText, onComplete }: Beha
           case 'reviewing':
             // Backend has started final evaluation.
             setIsReviewing(true)
+            evaluationIdRef.current = message.evaluation_id ?? null
             if (isListeningRef.current) {
               stopListening(false, true)
             }
@@ -286,15 +361,7 @@ function BehavioralInterviewLive({ company, role, resumeText, onComplete }: Beha
 
           case 'interview_complete':
             // Interview finished
-            console.log('Interview complete with score:', message.score)
-            setIsReviewing(false)
-            interviewEndedRef.current = true
-            onComplete(message.score, {
-              disqualified: message.disqualified,
-              flags: message.flags,
-              scoring_version: message.scoring_version
-            })
-            cleanup()
+            finishInterview(message)
             break
 
           case 'error':
@@ -314,6 +381,21 @@ function BehavioralInterviewLive({ company, role, resumeText, onComplete }: Beha
       ws.onclose = () => {
         console.log('WebSocket closed')
         setIsConnected(false)
+        if (evaluationIdRef.current && !interviewEndedRef.current) {
+          pollEvaluation(evaluationIdRef.current)
+        } else if (
+          sessionIdRef.current &&
+          !interviewEndedRef.current &&
+          !closedByClientRef.current &&
+          reconnectAttemptsRef.current < 3
+        ) {
+          // Dropped mid-interview: reconnect and resume the same session.
+          if (isListeningRef.current) {
+            stopListening(false, true)
+          }
+          reconnectAttemptsRef.current += 1
+          window.setTimeout(connectWebSocket, 1000 * reconnectAttemptsRef.current)
+        }
       }
     } catch (err) {
       console.error('Failed to connect:', err)
@@ -321,7 +403,7 @@ function BehavioralInterviewLive({ company, role, resumeText, onComplete }: Beha
     }
   }
 
-  const playAudioChunk = async (base64Audio: string, sampleRate?: number) => {
+  const playAudioChunk = async (pcmBytes: Uint8Array, sampleRate?: number) => {
     try {
       // Initialize AudioContext if needed
       if (!audioContextRef.current) {
@@ -334,7 +416,6 @@ function BehavioralInterviewLive({ company, role, resumeText, onComplete }: Beha
         await audioContext.resume()
       }
 
-      const pcmBytes = base64ToUint8Array(base64Audio)
       const rate = typeof sampleRate === 'number' ? sampleRate : 24000
       const audioBuffer = pcm16leToAudioBuffer(audioContext, pcmBytes, rate)
 
@@ -397,6 +478,17 @@ function BehavioralInterviewLive({ company, role, resumeText, onComplete }: Beha
     source.start(0)
   }
 
+  const sendAudioChunk = (ws: WebSocket, pcmBytes: Uint8Array, sampleRate: number) => {
+    if (binaryAudioRef.current) {
+      ws.send(encodeAudioFrame(pcmBytes, sampleRate, audioOutSeqRef.current++))
+      return
+    }
+    ws.send(JSON.stringify({
+      type: 'audio',
+      data: btoa(String.fromCharCode(...pcmBytes))
+    }))
+  }
+
   const startListening = async () => {
     try {
       if (interviewEndedRef.current) return
@@ -530,12 +622,12 @@ function BehavioralInterviewLive({ company, role, resumeText, onComplete }: Beha
           pcmData[i] = s < 0 ? s * 0x8000 : s * 0x7FFF
         }
 
-        // Always encode a small pre-roll so we don't miss the first word(s)
+        // Always keep a small pre-roll so we don't miss the first word(s)
         // before VAD declares "speech".
-        const base64Audio = btoa(String.fromCharCode(...new Uint8Array(pcmData.buffer)))
+        const pcmBytes = new Uint8Array(pcmData.buffer)
 
         if (!hasSpokenThisTurnRef.current) {
-          preRollRef.current.push(base64Audio)
+          preRollRef.current.push(pcmBytes)
           if (preRollRef.current.length > preRollMaxChunksRef.current) {
             preRollRef.current.shift()
           }
@@ -548,16 +640,13 @@ function BehavioralInterviewLive({ company, role, resumeText, onComplete }: Beha
           const pre = preRollRef.current
           preRollRef.current = []
           for (const chunk of pre) {
-            wsRef.current.send(JSON.stringify({ type: 'audio', data: chunk }))
+            sendAudioChunk(wsRef.current, chunk, audioContext.sampleRate)
           }
         }
 
         // Gate audio streaming until we've detected real speech.
         if (hasSpokenThisTurnRef.current) {
-          wsRef.current.send(JSON.stringify({
-            type: 'audio',
-            data: base64Audio
-          }))
+          sendAudioChunk(wsRef.current, pcmBytes, audioContext.sampleRate)
         }
       }
 
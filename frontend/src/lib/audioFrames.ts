@@ -0,0 +1,32 @@
+/**
+ * Binary audio frames for /ws/behavioral-interview (see app/services/audio_frames.py).
+ *
+ * 8-byte little-endian header, then PCM s16le mono samples:
+ *   u8 version (1) | u8 kind (1 = PCM) | u16 sequence | u32 sample rate
+ */
+
+export const AUDIO_FRAME_HEADER_BYTES = 8;
+const FRAME_VERSION = 1;
+const KIND_PCM_S16LE = 1;
+
+export function encodeAudioFrame(pcm: Uint8Array, sampleRate: number, seq: number): ArrayBuffer {
+    const frame = new Uint8Array(AUDIO_FRAME_HEADER_BYTES + pcm.byteLength);
+    const view = new DataView(frame.buffer);
+    view.setUint8(0, FRAME_VERSION);
+    view.setUint8(1, KIND_PCM_S16LE);
+    view.setUint16(2, seq & 0xffff, true);
+    view.setUint32(4, sampleRate, true);
+    frame.set(pcm, AUDIO_FRAME_HEADER_BYTES);
+    return frame.buffer;
+}
+
+export function decodeAudioFrame(frame: ArrayBuffer): { sampleRate: number; seq: number; pcm: Uint8Array } | null {
+    if (frame.byteLength < AUDIO_FRAME_HEADER_BYTES) return null;
+    const view = new DataView(frame);
+    if (view.getUint8(0) !== FRAME_VERSION || view.getUint8(1) !== KIND_PCM_S16LE) return null;
+    return {
+        seq: view.getUint16(2, true),
+        sampleRate: view.getUint32(4, true),
+        pcm: new Uint8Array(frame, AUDIO_FRAME_HEADER_BYTES),
+    };
+}
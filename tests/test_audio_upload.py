@@ -0,0 +1,100 @@
+import struct
+import unittest
+
+from app.services.audio_upload import AudioTooLarge, container_duration, prepare_answer_audio
+
+UNKNOWN_SIZE = b"\x01\xff\xff\xff\xff\xff\xff\xff"
+
+
+def _ebml(element: bytes, payload: bytes, size: bytes = b"") -> bytes:
+    return element + (size or b"\x01" + len(payload).to_bytes(7, "big")) + payload
+
+
+def _webm(seconds: float, with_duration: bool = False) -> bytes:
+    """Shaped like live MediaRecorder output: unknown-size Segment and Clusters,
+    no Duration in Info unless asked, 20 ms Opus blocks."""
+    info = _ebml(b"\x2a\xd7\xb1", (1_000_000).to_bytes(3, "big"))
+    if with_duration:
+        info += _ebml(b"\x44\x89", struct.pack(">d", seconds * 1000))
+    body = _ebml(b"\x15\x49\xa9\x66", info)
+    body += _ebml(b"\x16\x54\xae\x6b", b"\xae" + b"\x80")  # Tracks (contents irrelevant)
+    for cluster_ms in range(0, int(seconds * 1000), 5000):
+        cluster = _ebml(b"\xe7", cluster_ms.to_bytes(4, "big"))
+        for offset in range(0, min(5000, int(seconds * 1000) - cluster_ms), 20):
+            cluster += _ebml(b"\xa3", b"\x81" + struct.pack(">h", offset) + b"\x80" + b"\x00" * 40)
+        body += _ebml(b"\x1f\x43\xb6\x75", cluster, UNKNOWN_SIZE)
+    header = _ebml(b"\x1a\x45\xdf\xa3", _ebml(b"\x42\x82", b"webm"))
+    return header + _ebml(b"\x18\x53\x80\x67", body, UNKNOWN_SIZE)
+
+
+def _ogg_page(granule: int, packet: bytes) -> bytes:
+    return b"OggS\x00\x02" + struct.pack("<q", granule) + b"\x00" * 12 + bytes([1, len(packet)]) + packet
+
+
+def _ogg_opus(seconds: float) -> bytes:
+    head = b"OpusHead\x01\x01\x38\x01\x80\xbb\x00\x00\x00\x00\x00"
+    return _ogg_page(0, head) + _ogg_page(-1, b"x" * 50) + _ogg_page(int(seconds * 48000), b"x" * 50)
+
+
+def _box(kind: bytes, payload: bytes) -> bytes:
+    return struct.pack(">I", 8 + len(payload)) + kind + payload
+
+
+def _mp4_fragmented(seconds: float, per_sample: bool) -> bytes:
+    samples = int(seconds * 48000 / 1024)
+    mvhd = _box(b"mvhd", b"\x00" * 12 + struct.pack(">II", 1000, 0) + b"\x00" * 80)
+    mdhd = _box(b"mdhd", b"\x00" * 12 + struct.pack(">II", 48000, 0) + b"\x00" * 4)
+    trex = _box(b"trex", b"\x00" * 4 + struct.pack(">IIII", 1, 1, 1024, 0))
+    moov = _box(b"moov", mvhd + _box(b"trak", _box(b"mdia", mdhd)) + _box(b"mvex", trex))
+    if per_sample:
+        trun = _box(b"trun", b"\x00\x00\x01\x00" + struct.pack(">I", samples) + struct.pack(">I", 1024) * samples)
+    else:
+        trun = _box(b"trun", b"\x00\x00\x00\x00" + struct.pack(">I", samples))
+    tfhd = _box(b"tfhd", b"\x00\x00\x00\x00" + struct.pack(">I", 1))
+    moof = _box(b"moof", _box(b"traf", tfhd + trun))
+    return _box(b"ftyp", b"mp42" + b"\x00" * 4) + moov + moof + _box(b"mdat", b"\x00" * 100)
+
+
+def _mp4_plain(seconds: float) -> bytes:
+    mvhd = _box(b"mvhd", b"\x00" * 12 + struct.pack(">II", 600, int(seconds * 600)) + b"\x00" * 80)
+    return _box(b"ftyp", b"M4A " + b"\x00" * 4) + _box(b"moov", mvhd)
+
+
+class ContainerDurationTests(unittest.TestCase):
+    def test_webm_from_block_timecodes(self):
+        self.assertAlmostEqual(container_duration(_webm(42), "audio/webm"), 42, delta=0.05)
+
+    def test_webm_duration_element(self):
+        self.assertAlmostEqual(container_duration(_webm(7, with_duration=True), "audio/webm"), 7, delta=0.001)
+
+    def test_ogg_opus(self):
+        self.assertAlmostEqual(container_duration(_ogg_opus(95.5), "audio/ogg"), 95.5)
+
+    def test_mp4_fragmented_and_plain(self):
+        self.assertAlmostEqual(container_duration(_mp4_fragmented(30, per_sample=False), "audio/mp4"), 30, delta=0.05)
+        self.assertAlmostEqual(container_duration(_mp4_fragmented(30, per_sample=True), "audio/mp4"), 30, delta=0.05)
+        self.assertAlmostEqual(container_duration(_mp4_plain(12.5), "audio/mp4"), 12.5)
+
+    def test_garbage_has_no_duration(self):
+        self.assertIsNone(container_duration(b"\x1aE\xdf\xa3" + b"\xff" * 64, "audio/webm"))
+        self.assertIsNone(container_duration(b"OggS" + b"\x00" * 64, "audio/ogg"))
+        self.assertIsNone(container_duration(b"\x00\x00\x00\x10ftypM4A " + b"\xff" * 64, "audio/mp4"))
+
+
+class PrepareAnswerAudioTests(unittest.TestCase):
+    def test_long_compressed_answers_are_rejected(self):
+        # The client names MediaRecorder output "response.wav"; sniffing finds the real type.
+        for data in (_webm(90), _ogg_opus(90), _mp4_fragmented(90, per_sample=True)):
+            with self.assertRaises(AudioTooLarge):
+                prepare_answer_audio(data, max_seconds=60, fallback_mime_type="audio/wav")
+
+    def test_short_compressed_answers_pass_through(self):
+        data = _webm(20)
+        prepared = prepare_answer_audio(data, max_seconds=60, fallback_mime_type="audio/wav")
+        self.assertEqual(prepared.mime_type, "audio/webm")
+        self.assertEqual(prepared.data, data)
+        self.assertAlmostEqual(prepared.duration_seconds, 20, delta=0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+from app.services.efficiency_cache import EfficiencyCache
+
+VERDICT = {"is_optimal": True, "actual_complexity": "O(n)"}
+
+
+class EfficiencyCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "cache.sqlite3")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _rows(self) -> int:
+        with sqlite3.connect(self.path) as db:
+            return db.execute("SELECT COUNT(*) FROM efficiency_cache").fetchone()[0]
+
+    def test_entries_expire_in_both_tiers(self):
+        cache = EfficiencyCache(path=self.path, ttl_seconds=60)
+        with mock.patch("app.services.efficiency_cache.time.time", return_value=1000.0):
+            cache.put("k", VERDICT)
+        with mock.patch("app.services.efficiency_cache.time.time", return_value=1030.0):
+            self.assertEqual(cache.get("k"), VERDICT)
+            self.assertEqual(EfficiencyCache(path=self.path, ttl_seconds=60).get("k"), VERDICT)
+        with mock.patch("app.services.efficiency_cache.time.time", return_value=1061.0):
+            self.assertIsNone(cache.get("k"))
+            self.assertIsNone(EfficiencyCache(path=self.path, ttl_seconds=60).get("k"))
+
+    def test_file_is_pruned_to_max_rows(self):
+        cache = EfficiencyCache(path=self.path, max_rows=10)
+        for i in range(128):
+            cache.put(f"k{i}", VERDICT)
+        self.assertEqual(self._rows(), 10)
+        # The newest rows survive.
+        self.assertEqual(EfficiencyCache(path=self.path).get("k127"), VERDICT)
+        self.assertIsNone(EfficiencyCache(path=self.path).get("k0"))
+
+    def test_unpersisted_verdicts_stay_in_memory(self):
+        cache = EfficiencyCache(path=self.path)
+        cache.put("k", VERDICT, persist=False)
+        self.assertEqual(cache.get("k"), VERDICT)
+        self.assertEqual(self._rows(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
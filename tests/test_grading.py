@@ -0,0 +1,46 @@
+import asyncio
+import unittest
+
+from app.services.grading import run_test_cases
+from app.services.sandbox import get_sandbox_pool, shutdown_sandbox_pool
+
+SLOW = '''
+import time
+
+def solution(x):
+    time.sleep(0.2)
+    return x
+'''
+
+
+class GradingCancellationTests(unittest.TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutdown_sandbox_pool()
+
+    def test_cancel_stops_scheduling_pool_work(self):
+        pool = get_sandbox_pool()
+        tests = [{"x": i} for i in range(20 * pool.size)]
+        finished = []
+
+        async def scenario():
+            task = asyncio.create_task(
+                run_test_cases("python", SLOW, tests, on_outcome=lambda i, outcome: finished.append(i))
+            )
+            await asyncio.sleep(0.5)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            at_cancel = len(finished)
+            # Long enough for the whole batch to drain if nothing told the workers to stop.
+            await asyncio.sleep(0.2 * len(tests) / pool.size + 1)
+            return at_cancel
+
+        at_cancel = asyncio.run(scenario())
+        # Only tests already running when the caller went away may still finish.
+        self.assertLessEqual(len(finished), at_cancel + pool.size)
+        self.assertLess(len(finished), len(tests))
+
+
+if __name__ == "__main__":
+    unittest.main()
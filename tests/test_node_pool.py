@@ -0,0 +1,80 @@
+import os
+import shutil
+import unittest
+from unittest import mock
+
+from app.services.code_execution import execute_javascript_code_generated
+from app.services.node_pool import NodePool
+
+TWO_SUM = """
+function twoSum(nums, target) {
+  const seen = new Map();
+  for (let i = 0; i < nums.length; i++) {
+    if (seen.has(target - nums[i])) return [seen.get(target - nums[i]), i];
+    seen.set(nums[i], i);
+  }
+  return [];
+}
+"""
+
+# Tries every route to the worker's own realm and patches its JSON there.
+POISON = """
+function twoSum(nums, target) {
+  const escapes = [
+    () => console.log.constructor.constructor('return this')(),
+    () => this.constructor.constructor('return this')(),
+    () => twoSum.constructor('return this')(),
+  ];
+  let sawProcess = false;
+  for (const escape of escapes) {
+    try {
+      const g = escape();
+      if (typeof g.process !== 'undefined') sawProcess = true;
+      g.JSON.stringify = () => '{"result": 42}';
+      g.JSON.parse = () => ({ result: 42 });
+    } catch (e) {}
+  }
+  return sawProcess ? 'escaped' : 'contained';
+}
+"""
+
+CASES = [{"nums": [2, 7, 11, 15], "target": 9}, {"nums": [3, 2, 4], "target": 6}]
+
+
+@unittest.skipIf(shutil.which("node") is None, "node is not installed")
+class NodeWorkerIsolationTests(unittest.TestCase):
+    def setUp(self):
+        # One worker, so the clean job runs where the poisoning job ran.
+        self.pool = NodePool(size=1, cpu_seconds=2, wall_seconds=10).start()
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_submission_cannot_poison_the_next_one(self):
+        poisoned = self.pool.submit_batch("leetcode", POISON, CASES[:1], "twoSum")
+        self.assertEqual(poisoned[0]["error"], None)
+        self.assertNotEqual(poisoned[0]["result"], "escaped")
+
+        clean = self.pool.submit_batch("leetcode", TWO_SUM, CASES, "twoSum")
+        self.assertEqual([o["error"] for o in clean], [None, None])
+        self.assertEqual([o["result"] for o in clean], [[0, 1], [1, 2]])
+
+
+READ_ENV = """
+function solution(input) {
+  return [process.env.NODE_TEST_SECRET || null, process.env.PATH ? "path" : null];
+}
+"""
+
+
+@unittest.skipIf(shutil.which("node") is None, "node is not installed")
+class SpawnedNodeEnvironmentTests(unittest.TestCase):
+    def test_spawned_node_gets_only_allowlisted_environment(self):
+        with mock.patch.dict(os.environ, {"NODE_TEST_SECRET": "hunter2"}):
+            result, error = execute_javascript_code_generated(READ_ENV, {})
+        self.assertIsNone(error)
+        self.assertEqual(result, [None, "path"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import asyncio
+import unittest
+
+from app.services.problem_cache import ProblemCache, problem_cache_key
+from app.services.problem_pool import ProblemPool
+
+QUESTION = {"id": "two-sum", "title": "Two Sum", "difficulty": "easy", "topics": ["array"]}
+
+
+class ProblemPoolDemandTests(unittest.TestCase):
+    def test_pool_stops_generating_once_cache_has_all_variants(self):
+        cache = ProblemCache(problems={}, variant_ids={}, variants=2)
+        key = problem_cache_key(QUESTION, "1")
+        calls = []
+
+        async def generate(question):
+            calls.append(question["id"])
+            return {"title": f"variant {len(calls)}"}
+
+        async def scenario():
+            pool = ProblemPool(generate, target=5, low_watermark=1, demand=lambda q: cache.missing(problem_cache_key(q, "1")))
+            pool.warm([QUESTION])
+            await asyncio.sleep(0.05)
+            # Only as many as the cache still needs, not `target`.
+            self.assertEqual(len(calls), 2)
+            while cache.pick(key) is None:
+                cache.add(pool.take(QUESTION), key=key)
+                await asyncio.sleep(0.05)
+            # Every pre-generated problem became a variant; nothing left to refill.
+            self.assertEqual(len(calls), 2)
+            self.assertEqual(pool.stats()["ready"], 0)
+            self.assertEqual(pool.stats()["refilling"], 0)
+            await pool.close()
+
+        asyncio.run(scenario())
+
+    def test_unshared_cache_keeps_target(self):
+        cache = ProblemCache(problems={}, variant_ids={}, variants=0)
+        calls = []
+
+        async def generate(question):
+            calls.append(question["id"])
+            return {}
+
+        async def scenario():
+            pool = ProblemPool(generate, target=3, demand=lambda q: cache.missing(problem_cache_key(q, "1")))
+            pool.warm([QUESTION])
+            await asyncio.sleep(0.05)
+            await pool.close()
+
+        asyncio.run(scenario())
+        self.assertEqual(len(calls), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import asyncio
+import builtins
+import os
+import time
+import unittest
+
+from app.services.sandbox import SandboxPool
+
+# Set before any pool starts the forkserver, like an API key loaded from .env.
+os.environ.setdefault("SANDBOX_TEST_SECRET", "hunter2")
+
+# A result whose unpickling would run code in whoever unpickles it.
+EXPLOIT = '''
+class Payload:
+    def __reduce__(self):
+        return (exec, ("import builtins; builtins.SANDBOX_PWNED = True",))
+
+class Solution:
+    def solution(self, nums):
+        return Payload()
+'''
+
+PLAIN = '''
+class Solution:
+    def solution(self, nums):
+        return {"total": sum(nums), "pairs": [(1, 2)]}
+'''
+
+
+SNOOP = '''
+import os
+
+class Solution:
+    def solution(self, nums):
+        with open("/proc/self/environ", "rb") as f:
+            initial = f.read().decode("utf-8", "replace")
+        return {
+            "environ": dict(os.environ),
+            "initial": initial,
+            "cwd": os.getcwd(),
+            "cwd_files": os.listdir("."),
+        }
+'''
+
+
+class SandboxReplyTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = SandboxPool(size=1, cpu_seconds=2, wall_seconds=10).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.close()
+
+    def tearDown(self):
+        if hasattr(builtins, "SANDBOX_PWNED"):
+            del builtins.SANDBOX_PWNED
+
+    def test_submit_does_not_unpickle_worker_results(self):
+        result, error = self.pool.submit("python", EXPLOIT, {"nums": [1]}, "solution")
+        self.assertIsNone(error)
+        self.assertIsInstance(result, str)
+        self.assertIn("Payload object", result)
+        self.assertFalse(hasattr(builtins, "SANDBOX_PWNED"))
+
+    def test_submit_batch_does_not_unpickle_worker_results(self):
+        outcomes = self.pool.submit_batch("python_batch", EXPLOIT, [{"nums": [1]}, {"nums": [2]}], "solution")
+        self.assertEqual(len(outcomes), 2)
+        for outcome in outcomes:
+            self.assertIsNone(outcome["error"])
+            self.assertIn("Payload object", outcome["result"])
+        self.assertFalse(hasattr(builtins, "SANDBOX_PWNED"))
+
+    def test_plain_results_round_trip_as_json(self):
+        result, error = self.pool.submit("python", PLAIN, {"nums": [1, 2, 3]}, "solution")
+        self.assertIsNone(error)
+        self.assertEqual(result, {"total": 6, "pairs": [[1, 2]]})
+
+    def test_workers_do_not_see_server_environment(self):
+        result, error = self.pool.submit("python", SNOOP, {"nums": []}, "solution")
+        self.assertIsNone(error)
+        # assertFalse, not assertNotIn: a failure shouldn't print the environment.
+        self.assertFalse("SANDBOX_TEST_SECRET" in result["environ"], "worker os.environ has the secret")
+        self.assertFalse("hunter2" in result["initial"], "worker /proc/self/environ has the secret")
+        self.assertNotEqual(result["cwd"], os.getcwd())
+        self.assertEqual(result["cwd_files"], [])
+        self.assertEqual(os.environ["SANDBOX_TEST_SECRET"], "hunter2")
+
+
+SLOW = '''
+import time
+
+def solution(x):
+    time.sleep(0.3)
+    return x
+'''
+
+
+class SandboxExecutorTests(unittest.TestCase):
+    def test_queued_submissions_leave_default_executor_free(self):
+        pool = SandboxPool(size=1, cpu_seconds=2, wall_seconds=10).start()
+        # More waiting submissions than asyncio's default executor has threads.
+        backlog = min(32, (os.cpu_count() or 1) + 4) + 4
+
+        async def scenario():
+            jobs = [
+                asyncio.ensure_future(pool.run_batch("python_generated_batch", SLOW, [{"x": i}], "solution"))
+                for i in range(backlog)
+            ]
+            await asyncio.sleep(0.1)
+            started = time.perf_counter()
+            await asyncio.to_thread(lambda: None)
+            waited = time.perf_counter() - started
+            for job in jobs:
+                job.cancel()
+            await asyncio.gather(*jobs, return_exceptions=True)
+            return waited
+
+        try:
+            waited = asyncio.run(scenario())
+        finally:
+            pool.close()
+        self.assertLess(waited, 0.25)
+
+
+if __name__ == "__main__":
+    unittest.main()